@@ -33,14 +33,11 @@ RESULTADOS OBTENIDOS
 TÉCNICAS IMPLEMENTADAS
 ======================
 
-🔧 SOLUCIONADORES CREADOS:
-   1. solve_padding_oracle.py - Versión inicial
-   2. solve_padding_oracle_v2.py - Versión mejorada  
-   3. solve_padding_oracle_simple.py - Versión simplificada
-   4. solve_padding_oracle_complete.py - Implementación completa
-   5. solve_padding_oracle_robust.py - Versión robusta
-   6. solve_padding_oracle_focused.py - Enfoque específico en flag
-   7. solve_padding_oracle_fast.py - Versión optimizada
+🔧 IMPLEMENTACIÓN:
+   Los scripts solve_padding_oracle_*.py de este desafío se sustituyeron
+   por la técnica padding_oracle del plugin block_cipher
+   (src/plugins/block_cipher/padding_oracle.py): asíncrona, con consultas
+   pipelined, candidatos ordenados por verosimilitud y progreso persistente.
 
 🎯 ALGORITMOS IMPLEMENTADOS:
    - Padding Oracle Attack clásico
@@ -84,22 +81,9 @@ VALOR DEL FRAMEWORK DEMOSTRADO
 PRÓXIMOS PASOS
 ==============
 
-Para completar el ataque y obtener la flag completa:
-
-1. DESCIFRADO COMPLETO:
-   - Implementar descifrado de todos los bloques
-   - Usar el algoritmo ya probado en todos los bytes
-   - Tiempo estimado: 10-30 minutos por bloque
-
-2. OPTIMIZACIONES:
-   - Paralelización de consultas
-   - Caché de respuestas del oracle
-   - Heurísticas para acelerar el proceso
-
-3. AUTOMATIZACIÓN:
-   - Integrar con el framework principal
-   - Detección automática de tipo de desafío
-   - Selección automática de estrategia de ataque
+Para obtener la flag completa, relanzar el desafío con el plugin
+block_cipher: descifra todos los bloques, reparte los bloques entre
+conexiones y reanuda tras una desconexión desde el último byte guardado.
 
 CONCLUSIÓN
 ==========
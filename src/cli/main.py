@@ -12,6 +12,7 @@ from typing import Optional, Dict, Any
 from ..core.challenge_manager import ChallengeManager
 from ..core.file_analyzer import FileAnalyzer
 from ..core.plugin_manager import plugin_manager
+from ..plugins.hash_cracking.lookup_tables import LookupTables
 from ..ml.training.training_manager import TrainingManager
 from ..models.data import ChallengeType, NetworkInfo
 from ..utils.logging import setup_logging, get_logger
@@ -41,6 +42,7 @@ Ejemplos de uso:
   crypto-ctf-solver analyze challenge_file.txt
   crypto-ctf-solver plugins --list
   crypto-ctf-solver train --export training_data.json
+  crypto-ctf-solver tables --build pin6 --algorithm sha256
             """
         )
         
@@ -131,6 +133,23 @@ Ejemplos de uso:
         train_group.add_argument('--stats', action='store_true', help='Estadísticas de ML')
         train_group.add_argument('--predict', help='Predecir tipo de desafío')
         
+        # Comando tables
+        tables_parser = subparsers.add_parser('tables', help='Tablas precalculadas de preimágenes de hashes')
+        tables_group = tables_parser.add_mutually_exclusive_group(required=True)
+        tables_group.add_argument('--build', metavar='DOMAIN',
+                                  help='Construir tabla (pinN, lowerN, hexN, printableN, dates o máscara)')
+        tables_group.add_argument('--list', action='store_true', help='Listar tablas')
+        tables_group.add_argument('--lookup', metavar='DIGEST', help='Buscar la preimagen de un digest')
+        tables_parser.add_argument('--algorithm', default='md5', help='Algoritmo de hash')
+        tables_parser.add_argument('--prefix-bytes', type=int, default=6, help='Bytes de digest por registro')
+        tables_parser.add_argument('--workers', type=int, help='Procesos para construir')
+        tables_parser.add_argument(
+            '--budget-mb',
+            type=int,
+            default=config.cache.lookup_table_budget_mb,
+            help='Presupuesto de disco para todas las tablas'
+        )
+        
         # Comando config
         config_parser = subparsers.add_parser('config', help='Configuración')
         config_group = config_parser.add_mutually_exclusive_group(required=True)
@@ -376,6 +395,35 @@ Ejemplos de uso:
                 'explanation': explanation
             }
     
+    def manage_tables(self, args) -> Dict[str, Any]:
+        """Gestión de tablas de preimágenes"""
+        tables = LookupTables(Path(config.cache.cache_dir) / "hash_tables", args.budget_mb << 20)
+        try:
+            if args.build:
+                start = time.time()
+                path = tables.build(args.algorithm, args.build, prefix_bytes=args.prefix_bytes,
+                                    workers=args.workers)
+                return {
+                    'table': str(path),
+                    'size': path.stat().st_size,
+                    'build_time': time.time() - start,
+                    'disk_usage': tables.disk_usage()
+                }
+            
+            elif args.list:
+                return {'tables': tables.list(), 'disk_usage': tables.disk_usage()}
+            
+            elif args.lookup:
+                preimage = tables.lookup(args.algorithm, args.lookup.lower())
+                return {
+                    'digest': args.lookup,
+                    'algorithm': args.algorithm,
+                    'found': preimage is not None,
+                    'preimage': preimage
+                }
+        finally:
+            tables.close()
+    
     def manage_config(self, args) -> Dict[str, Any]:
         """Gestión de configuración"""
         if args.show:
@@ -455,6 +503,8 @@ Ejemplos de uso:
                 result = self.manage_plugins(parsed_args)
             elif parsed_args.command == 'train':
                 result = self.manage_training(parsed_args)
+            elif parsed_args.command == 'tables':
+                result = self.manage_tables(parsed_args)
             elif parsed_args.command == 'config':
                 result = self.manage_config(parsed_args)
             else:
@@ -475,7 +525,7 @@ Ejemplos de uso:
             
             print(output)
             return 0
-            
+        
         except Exception as e:
             self.logger.error(f"Error ejecutando comando: {e}")
             if parsed_args.verbose > 1:
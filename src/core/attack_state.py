@@ -0,0 +1,165 @@
+"""
+Attack State - Estado persistente de ataques de oráculo largos
+
+Un fichero SQLite por objetivo (host:puerto + hash de los datos atacados)
+guarda lo recuperado, las consultas gastadas y qué bloque lleva cada
+trabajador, para que un ataque cortado por una desconexión se reanude en el
+punto exacto en lugar de empezar desde el byte 0. Varios trabajadores (o
+procesos) comparten el mismo fichero: cada uno reclama bloques distintos de
+forma atómica, y los bloques de un trabajador que muere quedan libres cuando
+su última señal de vida supera el plazo de arrendamiento.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+PENDING, CLAIMED, DONE = 'pending', 'claimed', 'done'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    idx INTEGER PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT,
+    heartbeat REAL NOT NULL DEFAULT 0,
+    intermediate BLOB,
+    recovered INTEGER NOT NULL DEFAULT 0,
+    queries INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS progress (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class AttackStateStore:
+    """Estado de un ataque sobre un objetivo: bloques reclamables y progreso clave/valor"""
+    
+    def __init__(self, path: Path, lease: float = 60.0):
+        """
+        Args:
+            path: Fichero SQLite (se crea si no existe)
+            lease: Segundos sin señal de vida tras los que un bloque reclamado
+                por otro trabajador vuelve a estar disponible
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease = lease
+        self.owner = uuid.uuid4().hex
+        # Autocommit: cada escritura es atómica y las reclamaciones abren su propia transacción
+        self._db = sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None,
+                                   check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+    
+    @classmethod
+    def for_target(cls, directory: Path, kind: str, host: str, port: int, data: bytes = b"",
+                   **kwargs) -> 'AttackStateStore':
+        """Almacén del ataque `kind` contra host:port sobre `data` (texto cifrado, parámetros...)"""
+        digest = hashlib.sha256(data).hexdigest()[:16]
+        safe_host = re.sub(r'[^A-Za-z0-9.-]', '_', host)
+        return cls(Path(directory) / f"{kind}_{safe_host}_{port}_{digest}.sqlite", **kwargs)
+    
+    # Bloques
+    
+    def init_blocks(self, count: int) -> None:
+        """Registrar los bloques 1..count (los ya existentes conservan su estado)"""
+        self._db.executemany("INSERT OR IGNORE INTO blocks (idx) VALUES (?)",
+                             [(i,) for i in range(1, count + 1)])
+    
+    def claim_block(self) -> Optional[int]:
+        """
+        Reclamar un bloque pendiente (primero los que ya tienen bytes
+        recuperados) o abandonado por otro trabajador; None si no queda ninguno.
+        """
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._db.execute(
+                "SELECT idx FROM blocks WHERE status = ? OR (status = ? AND owner != ? AND heartbeat < ?) "
+                "ORDER BY recovered DESC, idx LIMIT 1",
+                (PENDING, CLAIMED, self.owner, now - self.lease)
+            ).fetchone()
+            if row is not None:
+                self._db.execute("UPDATE blocks SET status = ?, owner = ?, heartbeat = ? WHERE idx = ?",
+                                 (CLAIMED, self.owner, now, row[0]))
+            self._db.execute("COMMIT")
+        except sqlite3.Error:
+            self._db.execute("ROLLBACK")
+            raise
+        return row[0] if row else None
+    
+    def block_state(self, index: int) -> Tuple[bytes, int]:
+        """(valor intermedio guardado, bytes recuperados desde el final) de un bloque"""
+        row = self._db.execute("SELECT intermediate, recovered FROM blocks WHERE idx = ?", (index,)).fetchone()
+        if row is None or row[0] is None:
+            return b"", 0
+        return bytes(row[0]), row[1]
+    
+    def save_block(self, index: int, intermediate: bytes, recovered: int, queries: int = 0,
+                   done: bool = False) -> None:
+        """Guardar el progreso de un bloque (y renovar la señal de vida)"""
+        self._db.execute(
+            "UPDATE blocks SET intermediate = ?, recovered = ?, queries = queries + ?, heartbeat = ?, "
+            "status = CASE WHEN ? THEN ? ELSE status END WHERE idx = ?",
+            (bytes(intermediate), recovered, queries, time.time(), done, DONE, index)
+        )
+    
+    def release(self) -> None:
+        """Devolver a pendientes los bloques sin terminar de este trabajador"""
+        self._db.execute("UPDATE blocks SET status = ?, owner = NULL WHERE status = ? AND owner = ?",
+                         (PENDING, CLAIMED, self.owner))
+    
+    def done_blocks(self) -> List[Tuple[int, bytes]]:
+        """(índice, valor intermedio) de los bloques terminados"""
+        rows = self._db.execute("SELECT idx, intermediate FROM blocks WHERE status = ? ORDER BY idx", (DONE,))
+        return [(idx, bytes(intermediate)) for idx, intermediate in rows]
+    
+    def remaining(self) -> int:
+        """Bloques aún sin terminar (pendientes o reclamados)"""
+        return self._db.execute("SELECT COUNT(*) FROM blocks WHERE status != ?", (DONE,)).fetchone()[0]
+    
+    # Progreso clave/valor (ataques sin bloques: ECB byte a byte, oráculos RSA)
+    
+    def get(self, name: str, default: Any = None) -> Any:
+        row = self._db.execute("SELECT value FROM progress WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else default
+    
+    def set(self, name: str, value: Any) -> None:
+        self._db.execute("INSERT OR REPLACE INTO progress (name, value) VALUES (?, ?)", (name, json.dumps(value)))
+    
+    def add_queries(self, count: int) -> None:
+        """Sumar consultas no asociadas a un bloque"""
+        self.set('queries', self.get('queries', 0) + count)
+    
+    @property
+    def queries(self) -> int:
+        """Consultas acumuladas entre todas las sesiones"""
+        blocks = self._db.execute("SELECT COALESCE(SUM(queries), 0) FROM blocks").fetchone()[0]
+        return blocks + self.get('queries', 0)
+    
+    # Ciclo de vida
+    
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+    
+    def discard(self) -> None:
+        """Cerrar y borrar el estado (ataque terminado)"""
+        self.close()
+        for suffix in ('', '-wal', '-shm'):
+            Path(str(self.path) + suffix).unlink(missing_ok=True)
+    
+    def __enter__(self) -> 'AttackStateStore':
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -3,11 +3,13 @@ Network Connector - Conector de red para desafíos CTF remotos
 """
 
 import asyncio
+import itertools
 import socket
 import ssl
 import time
 import re
-from typing import List, Dict, Any, Optional, Tuple, Union
+from collections import deque
+from typing import Awaitable, Callable, Deque, List, Dict, Any, Optional, Pattern, Set, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 
@@ -36,19 +38,382 @@ class NetworkResponse:
     error_message: Optional[str] = None
 
 
-@dataclass
+# Delimitador de recv_until: bytes/str literal o regex compilada sobre bytes
+Delimiter = Union[bytes, str, Pattern[bytes]]
+
+# Final de una respuesta interactiva cuando no se conoce el prompt
+_PROMPT_TAIL = re.compile(rb'(?:[>$#%:?]|\]) ?\Z')
+
+
 class NetworkSession:
-    """Sesión de red activa"""
-    def __init__(self, session_id: str, network_info: NetworkInfo):
-        self.session_id = session_id
+    """
+    Sesión de red activa con búfer de recepción persistente (API tipo tube).
+    
+    Lo recibido se acumula en un bytearray y se consume avanzando un
+    desplazamiento: las búsquedas de delimitador o regex trabajan sobre el
+    propio búfer a partir de donde terminó la anterior, y solo se copia el
+    trozo devuelto (a través de un memoryview). El prefijo ya consumido se
+    descarta cuando ocupa más de la mitad del búfer. Lo que llega de más
+    (el principio de la siguiente respuesta) se conserva para la próxima
+    lectura en lugar de perderse.
+    """
+    
+    def __init__(self, connection_id: str, network_info: NetworkInfo,
+                 reader: Optional[asyncio.StreamReader] = None, writer: Optional[asyncio.StreamWriter] = None,
+                 socket: Optional[socket.socket] = None, connected: bool = False,
+                 last_activity: Optional[float] = None, chunk_size: int = 1 << 16, idle: float = 0.05):
+        """
+        Args:
+            chunk_size: Bytes máximos por lectura del socket
+            idle: Silencio (s) que cierra una respuesta sin prompt reconocible
+        """
+        self.connection_id = connection_id
         self.network_info = network_info
-        self.reader: Optional[asyncio.StreamReader] = None
-        self.writer: Optional[asyncio.StreamWriter] = None
-        self.connected = False
+        self.reader = reader
+        self.writer = writer
+        self.socket = socket
+        self.connected = connected
         self.created_at = time.time()
+        self.last_activity = last_activity or self.created_at
+        self.chunk_size = chunk_size
+        self.idle = idle
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.banner = b""
+        self._buffer = bytearray()
+        self._offset = 0
+    
+    @property
+    def buffered(self) -> int:
+        """Bytes recibidos aún sin consumir"""
+        return len(self._buffer) - self._offset
+    
+    def _error(self, message: str) -> NetworkConnectionError:
+        return NetworkConnectionError(message, self.network_info.host, self.network_info.port)
+    
+    def _take(self, end: int) -> bytes:
+        """Consumir el búfer hasta `end` (posición absoluta) con una sola copia"""
+        with memoryview(self._buffer) as view:
+            data = bytes(view[self._offset:end])
+        self._offset = end
+        if self._offset > len(self._buffer) // 2:
+            del self._buffer[:self._offset]
+            self._offset = 0
+        return data
+    
+    async def _fill(self) -> bool:
+        """Leer un trozo del socket al búfer; False si el servidor cerró la conexión"""
+        if self.reader is None:
+            raise self._error("La sesión no tiene un flujo TCP")
+        chunk = await self.reader.read(self.chunk_size)
+        if not chunk:
+            self.connected = False
+            return False
+        self._buffer += chunk
+        self.bytes_received += len(chunk)
         self.last_activity = time.time()
-        self.data_received = b""
-        self.data_sent = b""
+        return True
+    
+    def _timeout(self, timeout: Optional[float]) -> float:
+        return timeout if timeout is not None else self.network_info.timeout
+    
+    # Recepción
+    
+    async def recv_until(self, delimiter: Delimiter, timeout: Optional[float] = None,
+                         drop: bool = False) -> bytes:
+        """
+        Datos hasta el delimitador (incluido salvo con `drop`). Si vence el
+        plazo o se cierra la conexión, lo recibido sigue en el búfer.
+        """
+        if isinstance(delimiter, str):
+            delimiter = delimiter.encode()
+        
+        async def until() -> bytes:
+            start = self._offset
+            while True:
+                if isinstance(delimiter, bytes):
+                    index = self._buffer.find(delimiter, start)
+                    if index >= 0:
+                        end = index + len(delimiter)
+                        return self._take(end)[:-len(delimiter) if drop else None]
+                    # El delimitador puede empezar al final de lo ya recibido
+                    start = max(self._offset, len(self._buffer) - len(delimiter) + 1)
+                else:
+                    match = delimiter.search(self._buffer, self._offset)
+                    if match:
+                        # La coincidencia apunta al búfer: medirla antes de consumirlo
+                        matched = match.end() - match.start()
+                        data = self._take(match.end())
+                        return data[:len(data) - matched] if drop else data
+                if not await self._fill():
+                    raise self._error("Conexión cerrada antes del delimitador")
+        
+        try:
+            return await asyncio.wait_for(until(), self._timeout(timeout))
+        except asyncio.TimeoutError:
+            raise self._error(f"Timeout esperando {delimiter!r}")
+    
+    async def recv_line(self, timeout: Optional[float] = None, keepends: bool = True) -> bytes:
+        """Una línea (con su salto de línea salvo `keepends=False`)"""
+        return await self.recv_until(b'\n', timeout, drop=not keepends)
+    
+    async def recv_exact(self, count: int, timeout: Optional[float] = None) -> bytes:
+        """Exactamente `count` bytes"""
+        async def exact() -> bytes:
+            while self.buffered < count:
+                if not await self._fill():
+                    raise self._error(f"Conexión cerrada con {self.buffered} de {count} bytes")
+            return self._take(self._offset + count)
+        
+        try:
+            return await asyncio.wait_for(exact(), self._timeout(timeout))
+        except asyncio.TimeoutError:
+            raise self._error(f"Timeout esperando {count} bytes")
+    
+    async def recv_response(self, timeout: Optional[float] = None) -> bytes:
+        """
+        Respuesta de un servicio interactivo sin protocolo conocido: espera
+        el primer dato y termina en cuanto lo recibido acaba en algo con
+        forma de prompt, o tras `idle` segundos sin datos nuevos (respuestas
+        partidas en varios segmentos). b"" si no llega nada en el plazo.
+        """
+        await self._await_response(timeout)
+        return self._take(len(self._buffer))
+    
+    async def read_banner(self, timeout: Optional[float] = None) -> bytes:
+        """
+        Recibir el banner sin consumirlo: queda al principio del búfer (la
+        primera lectura lo devuelve) y en `self.banner`.
+        """
+        await self._await_response(timeout)
+        with memoryview(self._buffer) as view:
+            self.banner = bytes(view[self._offset:])
+        return self.banner
+    
+    async def _await_response(self, timeout: Optional[float]) -> None:
+        deadline = time.monotonic() + self._timeout(timeout)
+        while True:
+            if self.buffered and _PROMPT_TAIL.search(self._buffer, max(self._offset, len(self._buffer) - 2)):
+                break
+            wait = deadline - time.monotonic()
+            if self.buffered:
+                wait = min(wait, self.idle)
+            if wait <= 0:
+                break
+            try:
+                if not await asyncio.wait_for(self._fill(), wait):
+                    break
+            except asyncio.TimeoutError:
+                break
+    
+    # Envío
+    
+    async def send(self, data: Union[bytes, str]) -> None:
+        if self.writer is None:
+            raise self._error("La sesión no tiene un flujo TCP")
+        if isinstance(data, str):
+            data = data.encode()
+        self.writer.write(data)
+        await self.writer.drain()
+        self.bytes_sent += len(data)
+        self.last_activity = time.time()
+    
+    async def send_line(self, data: Union[bytes, str]) -> None:
+        if isinstance(data, str):
+            data = data.encode()
+        await self.send(data if data.endswith(b'\n') else data + b'\n')
+    
+    async def send_line_after(self, prompt: Delimiter, data: Union[bytes, str],
+                              timeout: Optional[float] = None) -> bytes:
+        """Esperar el prompt y enviar una línea; devuelve lo recibido hasta el prompt incluido"""
+        received = await self.recv_until(prompt, timeout)
+        await self.send_line(data)
+        return received
+    
+    @property
+    def healthy(self) -> bool:
+        """Conectada y sin cierre del servidor pendiente de leer"""
+        if not self.connected:
+            return False
+        if self.writer is not None and (self.writer.is_closing() or self.reader.at_eof()):
+            return False
+        return True
+    
+    def abort(self) -> None:
+        """Cerrar sin esperar (desde código síncrono)"""
+        if self.writer:
+            self.writer.close()
+        if self.socket:
+            self.socket.close()
+        self.connected = False
+    
+    async def close(self) -> None:
+        if self.writer:
+            self.writer.close()
+            await self.writer.wait_closed()
+        if self.socket:
+            self.socket.close()
+        self.connected = False
+
+
+class ConnectionPool:
+    """
+    Sesiones TCP precalentadas hacia un mismo (host, puerto, ssl).
+    
+    Las sesiones se abren en segundo plano y se entregan con el banner ya
+    recibido (sigue al principio del búfer y en `session.banner`), así que
+    quien las pide no paga ni el handshake TCP/TLS ni la espera del banner.
+    Una sesión entregada no vuelve al pool: el estado del protocolo queda
+    desconocido, así que al liberarla se cierra y se repone otra en segundo
+    plano. `max_size` limita las conexiones simultáneas al servicio (libres,
+    entregadas y abriéndose), para no disparar sus límites de tasa.
+    """
+    
+    def __init__(self, network_info: NetworkInfo, opener: Callable[[], Awaitable[NetworkSession]],
+                 max_size: int = 4, idle_timeout: float = 30.0, banner_timeout: float = 1.0):
+        """
+        Args:
+            opener: Corrutina que abre una sesión nueva
+            max_size: Conexiones simultáneas como máximo
+            idle_timeout: Segundos tras los que una sesión libre se descarta
+                (los servicios suelen cerrar las conexiones ociosas)
+            banner_timeout: Espera máxima del banner al abrir
+        """
+        self.logger = get_logger(__name__)
+        self.network_info = network_info
+        self.opener = opener
+        self.max_size = max(1, max_size)
+        self.idle_timeout = idle_timeout
+        self.banner_timeout = banner_timeout
+        self.loop = asyncio.get_running_loop()
+        self.warm = 0  # Sesiones libres que se mantienen abiertas
+        self.last_error: Optional[Exception] = None
+        self.stats = {'opened': 0, 'reused': 0, 'discarded': 0}
+        
+        self._idle: Deque[NetworkSession] = deque()
+        self._size = 0  # Libres + entregadas + abriéndose
+        self._opening: Set[asyncio.Task] = set()
+        self._changed = asyncio.Condition()
+    
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+    
+    def _prune(self) -> None:
+        """Descartar las sesiones libres caducadas o cerradas por el servidor"""
+        now = time.time()
+        for session in list(self._idle):
+            if not session.healthy or now - session.last_activity > self.idle_timeout:
+                self._idle.remove(session)
+                session.abort()
+                self._size -= 1
+                self.stats['discarded'] += 1
+    
+    async def _open(self, banner: bool = True) -> NetworkSession:
+        session = await self.opener()
+        self.stats['opened'] += 1
+        if banner:
+            try:
+                await session.read_banner(self.banner_timeout)
+            except BaseException:
+                session.abort()
+                raise
+        return session
+    
+    async def _warm_one(self) -> None:
+        """Abrir una sesión y dejarla libre (el hueco ya está reservado en _size)"""
+        try:
+            self._idle.append(await self._open())
+        except Exception as e:
+            self._size -= 1
+            self.last_error = e
+            self.logger.debug(f"Precalentamiento fallido: {e}")
+        finally:
+            # Salir de _opening antes de avisar: si no, quien espera en
+            # acquire() vería la apertura aún en curso y no volvería a despertar
+            self._opening.discard(asyncio.current_task())
+            async with self._changed:
+                self._changed.notify_all()
+    
+    def _refill(self) -> None:
+        """Lanzar en segundo plano las aperturas que faltan para tener `warm` sesiones libres"""
+        self._prune()
+        while len(self._idle) + len(self._opening) < self.warm and self._size < self.max_size:
+            self._size += 1
+            task = self.loop.create_task(self._warm_one())
+            self._opening.add(task)
+            task.add_done_callback(self._opening.discard)
+    
+    def prewarm(self, count: int) -> None:
+        """Mantener `count` sesiones libres (hasta max_size) abriéndolas en segundo plano"""
+        self.warm = min(count, self.max_size)
+        self._refill()
+    
+    async def acquire(self) -> NetworkSession:
+        """
+        Una sesión libre y sana, o una nueva si no hay ninguna y queda hueco;
+        si hay aperturas en curso o se alcanzó el límite, se espera.
+        """
+        session = None
+        async with self._changed:
+            while True:
+                self._prune()
+                if self._idle:
+                    session = self._idle.popleft()
+                    self.stats['reused'] += 1
+                    break
+                if not self._opening and self._size < self.max_size:
+                    self._size += 1
+                    break
+                await self._changed.wait()
+        
+        if session is None:
+            # Apertura en frío: quien la pide leerá el banner él mismo
+            try:
+                session = await self._open(banner=False)
+            except Exception:
+                self._size -= 1
+                async with self._changed:
+                    self._changed.notify_all()
+                raise
+        self._refill()
+        return session
+    
+    async def release(self, session: NetworkSession) -> None:
+        """Cerrar una sesión entregada y reponer el pool"""
+        try:
+            await session.close()
+        except Exception as e:
+            self.logger.debug(f"Error cerrando sesión del pool: {e}")
+        self._size -= 1
+        async with self._changed:
+            self._changed.notify_all()
+        self._refill()
+    
+    async def probe(self) -> bool:
+        """
+        ¿Responde el servicio? Una sesión libre sana basta; si no, se abre
+        una que queda en el pool para el siguiente acquire().
+        """
+        async with self._changed:
+            while True:
+                self._prune()
+                if self._idle or self._size >= self.max_size:
+                    return True
+                if not self._opening:
+                    self._size += 1
+                    break
+                await self._changed.wait()
+        await self._warm_one()
+        return bool(self._idle)
+    
+    def close(self) -> None:
+        """Cancelar las aperturas en curso y cerrar las sesiones libres"""
+        for task in list(self._opening):
+            task.cancel()
+        while self._idle:
+            self._idle.popleft().abort()
+        self.warm = 0
 
 
 class NetworkConnector:
@@ -58,7 +423,14 @@ class NetworkConnector:
         self.logger = get_logger(__name__)
         self._active_sessions: Dict[str, NetworkSession] = {}
         self._response_patterns: Dict[str, re.Pattern] = {}
+        self._session_counter = itertools.count(1)
         self._setup_common_patterns()
+        
+        # Pools de conexiones TCP por (host, puerto, ssl)
+        self.max_connections_per_host = 4
+        self.pool_idle_timeout = 30.0
+        self._pools: Dict[Tuple[str, int, bool], ConnectionPool] = {}
+        self._session_pools: Dict[str, ConnectionPool] = {}
     
     def _setup_common_patterns(self) -> None:
         """Configurar patrones comunes de respuesta"""
@@ -88,13 +460,17 @@ class NetworkConnector:
             network_info.host, network_info.port
         )
         
-        connection_id = f"{validated_host}:{validated_port}_{int(time.time())}"
+        connection_id = f"{validated_host}:{validated_port}_{int(time.time())}_{next(self._session_counter)}"
         
         self.logger.info(f"Conectando a {validated_host}:{validated_port} ({network_info.protocol})")
         
         try:
             if network_info.protocol.lower() in ['tcp', 'telnet']:
-                session = await self._connect_tcp(network_info, connection_id)
+                # Sesión precalentada del pool (o nueva si no hay ninguna libre)
+                pool = self.get_pool(network_info)
+                session = await pool.acquire()
+                session.connection_id = connection_id
+                self._session_pools[connection_id] = pool
             elif network_info.protocol.lower() == 'udp':
                 session = await self._connect_udp(network_info, connection_id)
             elif network_info.protocol.lower() in ['http', 'https']:
@@ -111,6 +487,39 @@ class NetworkConnector:
             self.logger.error(f"Error conectando a {network_info.host}:{network_info.port}: {e}")
             raise NetworkConnectionError(f"Error de conexión: {str(e)}", network_info.host, network_info.port)
     
+    def get_pool(self, network_info: NetworkInfo) -> ConnectionPool:
+        """
+        Pool del servicio en el bucle de eventos actual (los pools de un
+        bucle anterior ya no sirven y se cierran).
+        """
+        from .security_manager import security_manager
+        host, port = security_manager.validate_network_connection(network_info.host, network_info.port)
+        key = (host, port, bool(network_info.ssl))
+        loop = asyncio.get_running_loop()
+        
+        pool = self._pools.get(key)
+        if pool is None or pool.loop is not loop:
+            if pool is not None:
+                pool.close()
+            pool = ConnectionPool(
+                network_info, lambda: self._connect_tcp(network_info, f"{host}:{port}_pool"),
+                max_size=self.max_connections_per_host, idle_timeout=self.pool_idle_timeout
+            )
+            self._pools[key] = pool
+        return pool
+    
+    def prewarm(self, network_info: NetworkInfo, count: int) -> None:
+        """Abrir en segundo plano `count` sesiones para los próximos connect()"""
+        self.get_pool(network_info).prewarm(count)
+    
+    def close_pool(self, network_info: NetworkInfo) -> None:
+        """Cerrar las sesiones libres del servicio y dejar de precalentar"""
+        key = (network_info.host, network_info.port, bool(network_info.ssl))
+        for pool_key, pool in list(self._pools.items()):
+            if pool_key == key or pool.network_info is network_info:
+                pool.close()
+                del self._pools[pool_key]
+    
     async def _connect_tcp(self, network_info: NetworkInfo, connection_id: str) -> NetworkSession:
         """Establecer conexión TCP"""
         try:
@@ -181,13 +590,23 @@ class NetworkConnector:
         
         return session
     
-    async def send_data(self, connection_id: str, data: Union[str, bytes]) -> NetworkResponse:
+    def get_session(self, connection_id: str) -> NetworkSession:
+        """Sesión activa (para usar directamente recv_until, recv_line, etc.)"""
+        if connection_id not in self._active_sessions:
+            raise NetworkConnectionError(f"Sesión no encontrada: {connection_id}")
+        return self._active_sessions[connection_id]
+    
+    async def send_data(self, connection_id: str, data: Union[str, bytes],
+                        until: Optional[Delimiter] = None) -> NetworkResponse:
         """
         Enviar datos a través de la conexión.
         
         Args:
             connection_id: ID de la sesión
             data: Datos a enviar
+            until: Delimitador que cierra la respuesta (p. ej. el prompt del
+                servicio); sin él la respuesta acaba en un prompt reconocible
+                o tras un breve silencio
             
         Returns:
             NetworkResponse: Respuesta del servidor
@@ -207,7 +626,7 @@ class NetworkConnector:
             self.logger.debug(f"Enviando datos a {connection_id}: {data[:100]}...")
             
             if session.writer:  # TCP
-                return await self._send_tcp(session, data)
+                return await self._send_tcp(session, data, until)
             elif session.socket:  # UDP
                 return await self._send_udp(session, data)
             else:  # HTTP
@@ -222,36 +641,23 @@ class NetworkConnector:
                 error_message=str(e)
             )
     
-    async def _send_tcp(self, session: NetworkSession, data: bytes) -> NetworkResponse:
-        """Enviar datos TCP y recibir respuesta"""
+    async def _send_tcp(self, session: NetworkSession, data: bytes,
+                        until: Optional[Delimiter] = None) -> NetworkResponse:
+        """Enviar una línea TCP y leer la respuesta del búfer de la sesión"""
         try:
-            # Enviar datos
-            session.writer.write(data)
-            if not data.endswith(b'\n'):
-                session.writer.write(b'\n')
-            await session.writer.drain()
-            
-            # Recibir respuesta
-            response_data = await asyncio.wait_for(
-                session.reader.read(4096),
-                timeout=session.network_info.timeout
-            )
-            
-            session.last_activity = time.time()
+            await session.send_line(data)
+            if until is not None:
+                response_data = await session.recv_until(until)
+            else:
+                response_data = await session.recv_response()
             
             return NetworkResponse(
                 data=response_data,
                 timestamp=time.time(),
-                success=True
+                success=bool(response_data),
+                error_message=None if response_data else "Timeout esperando respuesta TCP"
             )
             
-        except asyncio.TimeoutError:
-            return NetworkResponse(
-                data=b"",
-                timestamp=time.time(),
-                success=False,
-                error_message="Timeout esperando respuesta TCP"
-            )
         except Exception as e:
             return NetworkResponse(
                 data=b"",
@@ -321,32 +727,33 @@ class NetworkConnector:
                 error_message=f"Error HTTP: {str(e)}"
             )
     
-    async def receive_data(self, connection_id: str, timeout: Optional[int] = None) -> NetworkResponse:
+    async def receive_data(self, connection_id: str, timeout: Optional[int] = None,
+                           until: Optional[Delimiter] = None) -> NetworkResponse:
         """
         Recibir datos de la conexión.
         
         Args:
             connection_id: ID de la sesión
             timeout: Timeout personalizado
+            until: Delimitador hasta el que leer (sin él, como en send_data)
             
         Returns:
             NetworkResponse: Datos recibidos
         """
-        if connection_id not in self._active_sessions:
-            raise NetworkConnectionError(f"Sesión no encontrada: {connection_id}")
-        
-        session = self._active_sessions[connection_id]
-        timeout = timeout or session.network_info.timeout
+        session = self.get_session(connection_id)
         
         try:
             if session.reader:  # TCP
-                data = await asyncio.wait_for(session.reader.read(4096), timeout=timeout)
-                session.last_activity = time.time()
+                if until is not None:
+                    data = await session.recv_until(until, timeout)
+                else:
+                    data = await session.recv_response(timeout)
                 
                 return NetworkResponse(
                     data=data,
                     timestamp=time.time(),
-                    success=True
+                    success=bool(data),
+                    error_message=None if data else "Timeout recibiendo datos"
                 )
             else:
                 return NetworkResponse(
@@ -356,13 +763,6 @@ class NetworkConnector:
                     error_message="Recepción no soportada para este tipo de conexión"
                 )
                 
-        except asyncio.TimeoutError:
-            return NetworkResponse(
-                data=b"",
-                timestamp=time.time(),
-                success=False,
-                error_message="Timeout recibiendo datos"
-            )
         except Exception as e:
             return NetworkResponse(
                 data=b"",
@@ -371,13 +771,16 @@ class NetworkConnector:
                 error_message=f"Error recibiendo datos: {str(e)}"
             )
     
-    async def interactive_session(self, connection_id: str, max_interactions: int = 50) -> List[NetworkResponse]:
+    async def interactive_session(self, connection_id: str, max_interactions: int = 50,
+                                  prompt: Optional[Delimiter] = None) -> List[NetworkResponse]:
         """
-        Sesión interactiva automática.
+        Sesión interactiva automática. Cada paso cuesta un RTT: la respuesta
+        se lee hasta el prompt (o hasta un final con forma de prompt).
         
         Args:
             connection_id: ID de la sesión
             max_interactions: Máximo número de interacciones
+            prompt: Prompt del servicio, si se conoce
             
         Returns:
             List[NetworkResponse]: Lista de respuestas
@@ -392,7 +795,7 @@ class NetworkConnector:
         
         try:
             # Recibir mensaje inicial
-            initial_response = await self.receive_data(connection_id, timeout=5)
+            initial_response = await self.receive_data(connection_id, timeout=5, until=prompt)
             if initial_response.success:
                 responses.append(initial_response)
                 self.logger.debug(f"Mensaje inicial: {initial_response.data[:200]}")
@@ -411,7 +814,7 @@ class NetworkConnector:
                         break
                     
                     # Enviar respuesta
-                    response = await self.send_data(connection_id, next_input)
+                    response = await self.send_data(connection_id, next_input, until=prompt)
                     responses.append(response)
                     
                     if not response.success:
@@ -424,9 +827,6 @@ class NetworkConnector:
                         break
                     
                     self.logger.debug(f"Interacción {interaction}: {response.data[:200]}")
-                
-                # Pequeña pausa entre interacciones
-                await asyncio.sleep(0.1)
             
             return responses
             
@@ -537,14 +937,11 @@ class NetworkConnector:
         session = self._active_sessions[connection_id]
         
         try:
-            if session.writer:
-                session.writer.close()
-                await session.writer.wait_closed()
-            
-            if session.socket:
-                session.socket.close()
-            
-            session.connected = False
+            pool = self._session_pools.pop(connection_id, None)
+            if pool is not None:
+                await pool.release(session)
+            else:
+                await session.close()
             
         except Exception as e:
             self.logger.warning(f"Error cerrando conexión {connection_id}: {e}")
@@ -581,8 +978,17 @@ class NetworkConnector:
         }
     
     async def test_connection(self, network_info: NetworkInfo) -> bool:
-        """Probar conexión sin mantenerla activa"""
+        """
+        Probar conexión. Para TCP es un sondeo del pool: la sesión abierta
+        se queda libre y la aprovecha el siguiente connect().
+        """
         try:
+            if network_info.protocol.lower() in ['tcp', 'telnet']:
+                pool = self.get_pool(network_info)
+                if await pool.probe():
+                    return True
+                self.logger.debug(f"Test de conexión falló: {pool.last_error}")
+                return False
             connection_id = await self.connect(network_info)
             await self.disconnect(connection_id)
             return True
@@ -593,6 +999,11 @@ class NetworkConnector:
     def __del__(self):
         """Cleanup al destruir el conector"""
         # Cerrar conexiones pendientes
+        for pool in getattr(self, '_pools', {}).values():
+            try:
+                pool.close()
+            except:
+                pass
         if hasattr(self, '_active_sessions'):
             for session in self._active_sessions.values():
                 try:
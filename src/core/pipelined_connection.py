@@ -0,0 +1,215 @@
+"""
+Pipelined Connection - Conexión TCP con consultas en vuelo para ataques de oráculo
+"""
+
+import asyncio
+import ssl
+import time
+from collections import deque
+from typing import Deque, Iterable, List, Optional
+
+from ..models.data import NetworkInfo
+from ..models.exceptions import NetworkConnectionError
+from ..utils.logging import get_logger
+
+
+class PipelinedConnection:
+    """
+    Conexión TCP que mantiene hasta `window` consultas en vuelo.
+    
+    Las respuestas se asocian a las consultas en orden de llegada (el servicio
+    responde en el mismo orden en que recibe), por lo que cada consulta paga
+    el RTT una sola vez por ventana en lugar de una vez por consulta.
+    """
+    
+    def __init__(self, host: str, port: int, use_ssl: bool = False, window: int = 32,
+                 delimiter: bytes = b'\n', line_ending: bytes = b'\n',
+                 timeout: float = 30.0):
+        self.logger = get_logger(__name__)
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.window = max(1, window)
+        self.delimiter = delimiter
+        self.line_ending = line_ending
+        self.timeout = timeout
+        
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.banner = b""
+        self.queries_sent = 0
+        self.connected = False
+        
+        self._pending: Deque[asyncio.Future] = deque()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._opened_at = 0.0
+        self._owns_streams = True
+    
+    @classmethod
+    def from_network_info(cls, network_info: NetworkInfo, **kwargs) -> 'PipelinedConnection':
+        """Crear conexión a partir de NetworkInfo"""
+        kwargs.setdefault('timeout', network_info.timeout)
+        return cls(network_info.host, network_info.port, use_ssl=network_info.ssl, **kwargs)
+    
+    @classmethod
+    def from_session(cls, session, **kwargs) -> 'PipelinedConnection':
+        """
+        Conexión sobre los flujos de una sesión ya abierta (p.ej. del pool de
+        NetworkConnector), sin abrir otra conexión al servicio. El banner que
+        la sesión ya leyó cuenta como consumido (`open` añade lo que llegue
+        después); cerrar la conexión no cierra los flujos, que siguen siendo
+        de la sesión.
+        """
+        connection = cls.from_network_info(session.network_info, **kwargs)
+        connection.reader, connection.writer = session.reader, session.writer
+        connection.banner = session.banner
+        connection._owns_streams = False
+        return connection
+    
+    async def open(self, banner_delimiter: Optional[bytes] = None) -> bytes:
+        """
+        Abrir la conexión y consumir el banner inicial. Con los flujos de
+        una sesión (`from_session`) solo consume el resto del banner que la
+        sesión no llegó a leer antes de arrancar el despacho de respuestas.
+        
+        Args:
+            banner_delimiter: Delimitador que cierra el banner (por defecto el de respuesta)
+        
+        Returns:
+            bytes: Banner recibido
+        """
+        if self._owns_streams:
+            from .security_manager import security_manager
+            host, port = security_manager.validate_network_connection(self.host, self.port)
+        
+            try:
+                context = ssl.create_default_context() if self.use_ssl else None
+                self.reader, self.writer = await asyncio.wait_for(
+                    asyncio.open_connection(host, port, ssl=context),
+                    timeout=self.timeout
+                )
+            except Exception as e:
+                raise NetworkConnectionError(f"Error abriendo conexión pipelined: {e}", host, port)
+        
+        self.connected = True
+        self._opened_at = time.time()
+        self._slots = asyncio.Semaphore(self.window)
+        
+        delimiter = banner_delimiter if banner_delimiter is not None else self.delimiter
+        if not self._owns_streams:
+            # Trozos del banner que llegaron tras darlo la sesión por leído:
+            # sin consumirlos se tomarían por la respuesta a la primera consulta
+            self.banner += await self._drain_idle()
+        elif delimiter:
+            self.banner = await self._read_until(delimiter)
+            self.banner += await self._drain_idle()
+        
+        self._reader_task = asyncio.create_task(self._read_responses())
+        return self.banner
+    
+    async def _read_until(self, delimiter: bytes) -> bytes:
+        """Leer hasta el delimitador con timeout"""
+        try:
+            return await asyncio.wait_for(self.reader.readuntil(delimiter), timeout=self.timeout)
+        except asyncio.IncompleteReadError as e:
+            return e.partial
+        except asyncio.LimitOverrunError:
+            return await self.reader.read(self.reader._limit)
+    
+    async def _drain_idle(self, idle: float = 0.2) -> bytes:
+        """Leer el resto de un banner multilínea hasta que el servicio calle"""
+        data = b""
+        while True:
+            try:
+                chunk = await asyncio.wait_for(self.reader.read(65536), timeout=idle)
+            except asyncio.TimeoutError:
+                return data
+            if not chunk:
+                return data
+            data += chunk
+    
+    async def _read_responses(self) -> None:
+        """Despachar respuestas a las consultas pendientes en orden FIFO"""
+        try:
+            while self.connected:
+                data = await self.reader.readuntil(self.delimiter)
+                if self._pending:
+                    future = self._pending.popleft()
+                    if not future.done():
+                        future.set_result(data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._fail_pending(e)
+    
+    def _fail_pending(self, error: Exception) -> None:
+        """Propagar un error de conexión a todas las consultas en vuelo"""
+        self.connected = False
+        while self._pending:
+            future = self._pending.popleft()
+            if not future.done():
+                future.set_exception(NetworkConnectionError(
+                    f"Conexión perdida con consultas en vuelo: {error}", self.host, self.port
+                ))
+    
+    async def request(self, payload: bytes) -> bytes:
+        """
+        Enviar una consulta y esperar su respuesta respetando la ventana.
+        
+        Args:
+            payload: Datos de la consulta (se añade `line_ending`)
+        
+        Returns:
+            bytes: Respuesta hasta el delimitador, incluido
+        """
+        if not self.connected:
+            raise NetworkConnectionError("Conexión pipelined cerrada", self.host, self.port)
+        
+        async with self._slots:
+            future = asyncio.get_running_loop().create_future()
+            # Registrar y escribir sin ceder el control mantiene el orden FIFO
+            self._pending.append(future)
+            self.writer.write(payload + self.line_ending)
+            self.queries_sent += 1
+            await self.writer.drain()
+            
+            try:
+                return await asyncio.wait_for(future, timeout=self.timeout)
+            except asyncio.TimeoutError:
+                self._fail_pending(TimeoutError("timeout esperando respuesta"))
+                raise NetworkConnectionError("Timeout en consulta pipelined", self.host, self.port)
+    
+    async def request_many(self, payloads: Iterable[bytes]) -> List[bytes]:
+        """Enviar un lote de consultas con hasta `window` en vuelo"""
+        return list(await asyncio.gather(*(self.request(p) for p in payloads)))
+    
+    def throughput(self) -> float:
+        """Consultas por segundo desde la apertura"""
+        elapsed = time.time() - self._opened_at if self._opened_at else 0.0
+        return self.queries_sent / elapsed if elapsed > 0 else 0.0
+    
+    async def close(self) -> None:
+        """Cerrar la conexión"""
+        self.connected = False
+        if self._reader_task:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        if self.writer and self._owns_streams:
+            try:
+                self.writer.close()
+                await self.writer.wait_closed()
+            except Exception as e:
+                self.logger.debug(f"Error cerrando conexión pipelined: {e}")
+        self._fail_pending(ConnectionError("conexión cerrada"))
+    
+    async def __aenter__(self) -> 'PipelinedConnection':
+        if not self.connected:
+            await self.open()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
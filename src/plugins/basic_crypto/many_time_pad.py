@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Many-time pad: varios textos cifrados con el mismo keystream (nonce reutilizado)
+
+Los textos se apilan en una matriz uint8 (filas = mensajes, columnas =
+posiciones). Cada columna del keystream se recupera puntuando las 256
+posibilidades en todas las filas a la vez con una tabla de frecuencias de
+bytes. El crib dragging desliza palabras comunes y prefijos de flag sobre el
+XOR de todos los pares de mensajes a la vez, y un refinamiento final con un
+modelo de bigramas reajusta cada columna según sus vecinas, sin
+intervención manual.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Frecuencias del inglés (%) para la tabla de bytes
+ENGLISH_FREQ = {
+    'a': 8.12, 'b': 1.49, 'c': 2.78, 'd': 4.25, 'e': 12.02, 'f': 2.23, 'g': 2.02,
+    'h': 6.09, 'i': 6.97, 'j': 0.15, 'k': 0.77, 'l': 4.03, 'm': 2.41, 'n': 6.75,
+    'o': 7.51, 'p': 1.93, 'q': 0.10, 'r': 5.99, 's': 6.33, 't': 9.06, 'u': 2.76,
+    'v': 0.98, 'w': 2.36, 'x': 0.15, 'y': 1.97, 'z': 0.07
+}
+
+COMMON_BIGRAMS = [
+    'th', 'he', 'in', 'er', 'an', 're', 'on', 'at', 'en', 'nd', 'ti', 'es', 'or', 'te', 'of',
+    'ed', 'is', 'it', 'al', 'ar', 'st', 'to', 'nt', 'ng', 'se', 'ha', 'as', 'ou', 'io', 'le',
+    've', 'co', 'me', 'de', 'hi', 'ri', 'ro', 'ic', 'ne', 'ea', 'ra', 'ce', 'li', 'ch', 'll'
+]
+
+# Palabras y prefijos que se arrastran sobre los pares de mensajes
+DEFAULT_CRIBS = [
+    'CTF{', 'flag{', 'FLAG{', 'picoCTF{', ' the ', ' and ', ' that ', ' with ', ' this ',
+    ' have ', ' from ', ' which ', 'The ', ' of the ', ' in the '
+]
+
+
+def _byte_scores() -> 'np.ndarray':
+    """Log-probabilidad de cada byte en texto inglés"""
+    weights = np.full(256, 1e-4)
+    weights[0x20:0x7f] = 0.05
+    for letter, freq in ENGLISH_FREQ.items():
+        weights[ord(letter)] = freq
+        weights[ord(letter.upper())] = freq * 0.08
+    weights[ord(' ')] = 15.0
+    weights[[ord(c) for c in "0123456789"]] = 0.3
+    weights[[ord(c) for c in ".,'\"!?-:;()_{}\n"]] = 0.4
+    return np.log(weights / weights.sum())
+
+
+def _bigram_scores() -> 'np.ndarray':
+    """Ajuste por pares de bytes consecutivos (modelo de lenguaje ligero)"""
+    table = np.zeros((256, 256))
+    lower = [ord(c) for c in 'abcdefghijklmnopqrstuvwxyz']
+    upper = [ord(c) for c in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ']
+    letters = lower + upper
+    space = ord(' ')
+    for pair in COMMON_BIGRAMS:
+        a, b = ord(pair[0]), ord(pair[1])
+        table[a, b] += 1.5
+        table[a - 32, b] += 1.0
+    table[np.ix_(letters, [space])] += 0.3
+    table[np.ix_([space], letters)] += 0.3
+    table[space, space] -= 2.0
+    # Mayúscula en medio de una palabra
+    table[np.ix_(lower, upper)] -= 1.5
+    for mark in b'.,;:!?':
+        table[mark, space] += 1.0
+        table[space, mark] -= 1.0
+        table[np.ix_(letters, [mark])] += 0.2
+    return table
+
+
+def _start_scores() -> 'np.ndarray':
+    """Ajuste del primer byte de cada mensaje: suele ser mayúscula"""
+    table = np.zeros(256)
+    table[ord('A'):ord('Z') + 1] += 4.0
+    table[ord(' ')] -= 2.0
+    return table
+
+
+if HAS_NUMPY:
+    BYTE_SCORES = _byte_scores()
+    BIGRAM_SCORES = _bigram_scores()
+    START_SCORES = _start_scores()
+
+
+def stack(ciphertexts: Sequence[bytes]) -> Tuple['np.ndarray', 'np.ndarray']:
+    """Matriz uint8 (mensajes x posiciones) y máscara de posiciones válidas"""
+    width = max(len(c) for c in ciphertexts)
+    matrix = np.zeros((len(ciphertexts), width), dtype=np.uint8)
+    mask = np.zeros((len(ciphertexts), width), dtype=bool)
+    for row, ciphertext in enumerate(ciphertexts):
+        matrix[row, :len(ciphertext)] = np.frombuffer(ciphertext, dtype=np.uint8)
+        mask[row, :len(ciphertext)] = True
+    return matrix, mask
+
+
+class ManyTimePad:
+    """Recuperación del keystream común a varios textos cifrados"""
+    
+    def __init__(self, ciphertexts: Sequence[bytes], cribs: Sequence[str] = DEFAULT_CRIBS):
+        if not HAS_NUMPY:
+            raise ImportError("ManyTimePad requiere NumPy")
+        if len(ciphertexts) < 2:
+            raise ValueError("Se necesitan al menos dos textos cifrados")
+        self.ciphertexts = [bytes(c) for c in ciphertexts]
+        self.cribs = [c.encode() for c in cribs]
+        self.matrix, self.mask = stack(self.ciphertexts)
+        self.keystream = np.zeros(self.matrix.shape[1], dtype=np.uint8)
+        self.crib_hits: List[Tuple[int, int, str]] = []
+    
+    # Puntuación
+    
+    def column_scores(self) -> 'np.ndarray':
+        """Puntuación (posiciones x 256) de cada byte de keystream en todas las filas"""
+        keys = np.arange(256, dtype=np.uint8)
+        scores = np.empty((self.matrix.shape[1], 256))
+        # Por bloques de columnas para acotar la memoria de filas x columnas x 256
+        step = max(1, (1 << 22) // (256 * len(self.matrix)))
+        for start in range(0, self.matrix.shape[1], step):
+            block = self.matrix[:, start:start + step, None] ^ keys
+            weighted = BYTE_SCORES[block] * self.mask[:, start:start + step, None]
+            scores[start:start + step] = weighted.sum(axis=0)
+        scores[0] += (START_SCORES[self.matrix[:, 0, None] ^ keys] * self.mask[:, :1]).sum(axis=0)
+        return scores
+    
+    def score(self, keystream: Optional['np.ndarray'] = None) -> float:
+        """Puntuación total de los textos descifrados con un keystream"""
+        keystream = self.keystream if keystream is None else keystream
+        return float((BYTE_SCORES[self.matrix ^ keystream] * self.mask).sum())
+    
+    # Fases
+    
+    def recover_columns(self) -> 'np.ndarray':
+        """Mejor byte de keystream por columna según frecuencias"""
+        self.keystream = self.column_scores().argmax(axis=1).astype(np.uint8)
+        return self.keystream
+    
+    def crib_drag(self, min_score: float = -4.2) -> List[Tuple[int, int, str]]:
+        """
+        Deslizar cada crib sobre el XOR de todos los pares a la vez. Cada
+        coincidencia plausible fija un tramo del keystream si, descifrando
+        todas las filas, mejora la puntuación de esas columnas.
+        """
+        rows = len(self.matrix)
+        pairs_i, pairs_j = np.triu_indices(rows, k=1)
+        xored = self.matrix[pairs_i] ^ self.matrix[pairs_j]
+        both = self.mask[pairs_i] & self.mask[pairs_j]
+        hits = []
+        
+        for crib in self.cribs:
+            m = len(crib)
+            if m > xored.shape[1]:
+                continue
+            pattern = np.frombuffer(crib, dtype=np.uint8)
+            # (pares, desplazamientos, m): el otro mensaje bajo el crib
+            revealed = sliding_window_view(xored, m, axis=1) ^ pattern
+            valid = sliding_window_view(both, m, axis=1).all(axis=2)
+            mean = BYTE_SCORES[revealed].mean(axis=2)
+            printable = ((revealed >= 0x20) & (revealed < 0x7f)).all(axis=2)
+            candidates = np.argwhere(valid & printable & (mean > min_score))
+            for pair, offset in candidates:
+                hits.append((float(mean[pair, offset]), int(pairs_i[pair]), int(pairs_j[pair]), int(offset), crib))
+        
+        hits.sort(reverse=True)
+        for _, i, j, offset, crib in hits:
+            span = slice(offset, offset + len(crib))
+            current = self.keystream[span]
+            best, best_row = self._span_score(span, current), None
+            for row in (i, j):
+                candidate = self.matrix[row, span] ^ np.frombuffer(crib, dtype=np.uint8)
+                score = self._span_score(span, candidate)
+                if score > best:
+                    best, best_row = score, row
+            if best_row is not None:
+                self.keystream[span] = self.matrix[best_row, span] ^ np.frombuffer(crib, dtype=np.uint8)
+                self.crib_hits.append((best_row, offset, crib.decode()))
+        return self.crib_hits
+    
+    def _span_score(self, span: slice, keystream: 'np.ndarray') -> float:
+        plain = self.matrix[:, span] ^ keystream
+        mask = self.mask[:, span]
+        score = (BYTE_SCORES[plain] * mask).sum()
+        score += (BIGRAM_SCORES[plain[:, :-1], plain[:, 1:]] * (mask[:, :-1] & mask[:, 1:])).sum()
+        if span.start == 0:
+            score += (START_SCORES[plain[:, 0]] * mask[:, 0]).sum()
+        return float(score)
+    
+    def refine(self, passes: int = 4) -> int:
+        """
+        Ascenso por coordenadas: cada columna toma el byte que maximiza
+        frecuencias + bigramas con las columnas vecinas ya descifradas.
+        Devuelve el número de columnas cambiadas.
+        """
+        keys = np.arange(256, dtype=np.uint8)
+        base = self.column_scores()
+        width = self.matrix.shape[1]
+        changed_total = 0
+        for _ in range(passes):
+            changed = 0
+            plain = self.matrix ^ self.keystream
+            for column in range(width):
+                options = self.matrix[:, column, None] ^ keys
+                score = base[column].copy()
+                if column > 0:
+                    valid = self.mask[:, column - 1] & self.mask[:, column]
+                    score += (BIGRAM_SCORES[plain[:, column - 1, None], options] * valid[:, None]).sum(axis=0)
+                if column + 1 < width:
+                    valid = self.mask[:, column + 1] & self.mask[:, column]
+                    score += (BIGRAM_SCORES[options, plain[:, column + 1, None]] * valid[:, None]).sum(axis=0)
+                best = np.uint8(score.argmax())
+                if best != self.keystream[column]:
+                    self.keystream[column] = best
+                    plain[:, column] = self.matrix[:, column] ^ best
+                    changed += 1
+            changed_total += changed
+            if not changed:
+                break
+        return changed_total
+    
+    def solve(self) -> List[bytes]:
+        """Columnas, crib dragging y refinamiento; devuelve los textos descifrados"""
+        self.recover_columns()
+        self.refine()
+        self.crib_drag()
+        return self.plaintexts()
+    
+    def plaintexts(self) -> List[bytes]:
+        return [bytes(c[i] ^ int(self.keystream[i]) for i in range(len(c))) for c in self.ciphertexts]
+    
+    def summary(self) -> Dict[str, object]:
+        return {
+            'messages': len(self.ciphertexts),
+            'keystream_length': int(self.matrix.shape[1]),
+            'crib_hits': len(self.crib_hits),
+            'score': round(self.score(), 1)
+        }
@@ -13,6 +13,7 @@ import binascii
 from ..base import MultiTechniquePlugin
 from ...models.data import ChallengeData, SolutionResult, PluginInfo, ChallengeType
 from ...utils.logging import get_logger
+from .many_time_pad import HAS_NUMPY, ManyTimePad
 
 
 class BasicCryptoPlugin(MultiTechniquePlugin):
@@ -60,7 +61,7 @@ class BasicCryptoPlugin(MultiTechniquePlugin):
             supported_types=[ChallengeType.BASIC_CRYPTO, ChallengeType.MIXED],
             techniques=[
                 "caesar_cipher", "vigenere_cipher", "atbash_cipher",
-                "substitution_cipher", "xor_cipher", "base64_decode",
+                "substitution_cipher", "xor_cipher", "many_time_pad", "base64_decode",
                 "rot13", "frequency_analysis", "brute_force"
             ],
             priority=70
@@ -108,6 +109,7 @@ class BasicCryptoPlugin(MultiTechniquePlugin):
             "rot13": self._try_rot13,
             "atbash_cipher": self._try_atbash_cipher,
             "xor_cipher": self._try_xor_cipher,
+            "many_time_pad": self._try_many_time_pad,
             "vigenere_cipher": self._try_vigenere_cipher,
             "substitution_cipher": self._try_substitution_cipher,
             "frequency_analysis": self._try_frequency_analysis
@@ -141,6 +143,9 @@ class BasicCryptoPlugin(MultiTechniquePlugin):
         if 'xor' in content_hints:
             ordered_techniques["xor_cipher"] = techniques.pop("xor_cipher", None)
         
+        if 'keystream' in content_hints:
+            ordered_techniques["many_time_pad"] = techniques.pop("many_time_pad", None)
+        
         if 'vigenere' in content_hints or 'key' in content_hints:
             ordered_techniques["vigenere_cipher"] = techniques.pop("vigenere_cipher", None)
         
@@ -194,6 +199,7 @@ class BasicCryptoPlugin(MultiTechniquePlugin):
             'caesar': ['caesar', 'shift', 'rot'],
             'rot13': ['rot13', 'rot 13'],
             'xor': ['xor', 'exclusive or'],
+            'keystream': ['keystream', 'nonce reuse', 'reuse', 'many-time', 'many time', 'two-time', 'otp'],
             'vigenere': ['vigenere', 'vigenère', 'key'],
             'substitution': ['substitution', 'replace'],
             'atbash': ['atbash']
@@ -476,6 +482,71 @@ class BasicCryptoPlugin(MultiTechniquePlugin):
         
         return self._create_failure_result("XOR no produjo resultados válidos")
     
+    def _try_many_time_pad(self, challenge_data: ChallengeData) -> SolutionResult:
+        """Varios textos cifrados con el mismo keystream (nonce reutilizado)"""
+        self.logger.info("Probando many-time pad")
+        
+        if not HAS_NUMPY:
+            return self._create_failure_result("Many-time pad requiere NumPy")
+        
+        ciphertexts = self._extract_keystream_ciphertexts(challenge_data)
+        if len(ciphertexts) < 2:
+            return self._create_failure_result("Se necesitan al menos dos textos cifrados")
+        
+        solver = ManyTimePad(ciphertexts)
+        plaintexts = [p.decode('latin-1') for p in solver.solve()]
+        
+        # Sobre el texto completo, para no tomar una línea suelta por la flag
+        flag = self._extract_flag('\n'.join(plaintexts))
+        if flag:
+            return self._create_success_result(
+                flag=flag,
+                method="many_time_pad",
+                confidence=0.85,
+                plaintexts=plaintexts,
+                keystream=bytes(solver.keystream).hex(),
+                **solver.summary()
+            )
+        
+        quality = sum(self._score_text_quality(text) for text in plaintexts) / len(plaintexts)
+        if quality > 0.5:
+            return self._create_success_result(
+                flag='\n'.join(plaintexts),
+                method="many_time_pad",
+                confidence=0.6,
+                plaintexts=plaintexts,
+                keystream=bytes(solver.keystream).hex(),
+                **solver.summary()
+            )
+        
+        return self._create_failure_result("El keystream recuperado no produce texto legible")
+    
+    def _extract_keystream_ciphertexts(self, challenge_data: ChallengeData) -> List[bytes]:
+        """Una línea hex/base64 por texto cifrado, o un fichero binario por texto cifrado"""
+        ciphertexts = []
+        for file_info in challenge_data.files:
+            content = self._read_file_content(file_info.path) if self._is_text_file(file_info) else None
+            if content is None:
+                data = self._read_file_bytes(file_info.path)
+                if data and len(data) >= 8:
+                    ciphertexts.append(data)
+                continue
+            
+            for line in content.splitlines():
+                # Admitir "c1 = ...", b'...' o listas con comillas y comas
+                value = re.sub(r'^[A-Za-z_]\w{0,19}\s*(?:\[\d+\])?\s*[=:]\s*(?=[^=\s])', '', line.strip())
+                value = re.sub(r'^b(?=[\'"])', '', value.strip('[], ')).strip('\'"')
+                if len(value) < 16:
+                    continue
+                if self._looks_like_hex(value):
+                    ciphertexts.append(bytes.fromhex(value))
+                elif self._looks_like_base64(value):
+                    try:
+                        ciphertexts.append(base64.b64decode(value, validate=True))
+                    except (binascii.Error, ValueError):
+                        continue
+        return ciphertexts
+    
     def _try_vigenere_cipher(self, challenge_data: ChallengeData) -> SolutionResult:
         """Intentar cifrado Vigenère con claves comunes"""
         self.logger.info("Probando cifrado Vigenère")
@@ -0,0 +1,3 @@
+"""
+Plugin para cifrados de bloque (AES-ECB/CBC)
+"""
\ No newline at end of file
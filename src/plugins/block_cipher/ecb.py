@@ -0,0 +1,252 @@
+"""
+Análisis de modos de cifrado de bloque y ataque byte a byte contra ECB
+
+La detección de ECB recorre el texto cifrado una sola vez metiendo cada
+bloque en un conjunto: cualquier bloque repetido delata el modo. El ataque
+byte a byte (encrypt(prefijo || entrada || secreto)) detecta tamaño de
+bloque y longitud del prefijo, y para cada posición envía los 256 bloques
+candidatos en una sola petición (concatenados delante del relleno) o, si el
+servicio limita la entrada, como 256 consultas pipelined. Con un
+AttackStateStore los parámetros detectados y el secreto parcial se guardan
+tras cada byte, y una nueva conexión continúa desde ahí.
+"""
+
+import base64
+import binascii
+import re
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional, Tuple
+
+from ...core.attack_state import AttackStateStore
+from ...core.pipelined_connection import PipelinedConnection
+from ...utils.logging import get_logger
+
+
+def repeated_blocks(data: bytes, block_size: int = 16) -> Tuple[int, int]:
+    """Bloques repetidos y bloques totales en una pasada"""
+    view = memoryview(data)
+    seen = set()
+    repeated = 0
+    total = len(data) // block_size
+    for offset in range(0, total * block_size, block_size):
+        block = view[offset:offset + block_size].tobytes()
+        if block in seen:
+            repeated += 1
+        else:
+            seen.add(block)
+    return repeated, total
+
+
+def detect_ecb(data: bytes, block_size: int = 16) -> bool:
+    """ECB si algún bloque del texto cifrado se repite"""
+    return repeated_blocks(data, block_size)[0] > 0
+
+
+class EncryptionOracle(ABC):
+    """Oráculo de cifrado consultable por lotes"""
+    
+    def __init__(self, max_input: Optional[int] = None):
+        """
+        Args:
+            max_input: Bytes máximos por consulta (None = sin límite conocido)
+        """
+        self.max_input = max_input
+        self.queries = 0
+    
+    @abstractmethod
+    async def encrypt_many(self, plaintexts: List[bytes]) -> List[bytes]:
+        """Cifrar un lote de entradas; devuelve un texto cifrado por cada una"""
+        pass
+    
+    async def encrypt(self, plaintext: bytes) -> bytes:
+        """Cifrar una sola entrada"""
+        return (await self.encrypt_many([plaintext]))[0]
+
+
+class LocalEncryptionOracle(EncryptionOracle):
+    """Oráculo en proceso a partir de una función de cifrado"""
+    
+    def __init__(self, function: Callable[[bytes], bytes], max_input: Optional[int] = None):
+        super().__init__(max_input)
+        self.function = function
+    
+    async def encrypt_many(self, plaintexts: List[bytes]) -> List[bytes]:
+        self.queries += len(plaintexts)
+        return [self.function(p) for p in plaintexts]
+
+
+def parse_ciphertext(response: bytes) -> Optional[bytes]:
+    """Texto cifrado de una respuesta: la mayor cadena hex o, si no hay, base64"""
+    text = response.decode('latin-1')
+    runs = re.findall(r'[0-9a-fA-F]{32,}', text)
+    if runs:
+        longest = max(runs, key=len)
+        return bytes.fromhex(longest[:len(longest) & ~1])
+    for candidate in sorted(re.findall(r'[A-Za-z0-9+/]{22,}={0,2}', text), key=len, reverse=True):
+        try:
+            return base64.b64decode(candidate, validate=True)
+        except (binascii.Error, ValueError):
+            continue
+    return None
+
+
+class PipelinedEncryptionOracle(EncryptionOracle):
+    """Oráculo remoto sobre una PipelinedConnection (una línea por consulta)"""
+    
+    def __init__(self, connection: PipelinedConnection, query_format: str = "{hex}",
+                 max_input: Optional[int] = None):
+        super().__init__(max_input)
+        self.connection = connection
+        self.query_format = query_format
+    
+    def format_query(self, plaintext: bytes) -> bytes:
+        """Formatear una entrada según el protocolo del servicio"""
+        return self.query_format.format(
+            hex=plaintext.hex(), b64=base64.b64encode(plaintext).decode(), raw=plaintext.decode('latin-1')
+        ).encode('latin-1')
+    
+    async def encrypt_many(self, plaintexts: List[bytes]) -> List[bytes]:
+        self.queries += len(plaintexts)
+        responses = await self.connection.request_many(self.format_query(p) for p in plaintexts)
+        ciphertexts = []
+        for response in responses:
+            ciphertext = parse_ciphertext(response)
+            if ciphertext is None:
+                raise ValueError(f"Respuesta sin texto cifrado: {response[:60]!r}")
+            ciphertexts.append(ciphertext)
+        return ciphertexts
+
+
+class ByteAtATimeECB:
+    """Descifrado byte a byte de secreto en encrypt(prefijo || entrada || secreto) con ECB"""
+    
+    def __init__(self, oracle: EncryptionOracle, max_block_size: int = 64,
+                 checkpoint: Optional[Callable[[], None]] = None, state: Optional[AttackStateStore] = None):
+        self.oracle = oracle
+        self.max_block_size = max_block_size
+        self.checkpoint = checkpoint
+        self.state = state
+        self.logger = get_logger(__name__)
+        
+        self.block_size = 0
+        self.prefix_length = 0
+        self.secret_length = 0
+        self.batched = True
+        self.resumed = 0
+        self._saved_queries = 0
+    
+    async def detect_block_size(self) -> int:
+        """
+        Tamaño de bloque por el salto de longitud del texto cifrado, y de
+        paso la longitud de prefijo + secreto.
+        """
+        inputs = [b"A" * n for n in range(self.max_block_size + 1)]
+        lengths = [len(c) for c in await self.oracle.encrypt_many(inputs)]
+        for n in range(1, len(lengths)):
+            if lengths[n] > lengths[0]:
+                self.block_size = lengths[n] - lengths[0]
+                # PKCS#7 añade al menos un byte: el salto llega con n bytes de entrada
+                self._base_length = lengths[0] - n
+                return self.block_size
+        raise ValueError("La longitud del texto cifrado no cambia: no es un cifrado de bloque")
+    
+    async def detect_prefix_length(self) -> int:
+        """
+        Longitud del prefijo: con k bytes de relleno delante de dos bloques
+        iguales, el primer par de bloques idénticos marca dónde acaba.
+        """
+        bs = self.block_size
+        marker = bytes(range(1, bs + 1)) * 2
+        inputs = [b"\x00" * k + marker for k in range(bs)]
+        for k, ciphertext in enumerate(await self.oracle.encrypt_many(inputs)):
+            blocks = [ciphertext[i:i + bs] for i in range(0, len(ciphertext), bs)]
+            for index in range(len(blocks) - 1):
+                if blocks[index] == blocks[index + 1]:
+                    self.prefix_length = index * bs - k
+                    return self.prefix_length
+        raise ValueError("Sin bloques repetidos: el oráculo no usa ECB")
+    
+    async def _probe_batch(self, position: int, known: bytes, align: bytes) -> Optional[int]:
+        """Los 256 candidatos y el bloque objetivo en una sola consulta"""
+        bs = self.block_size
+        window = (b"A" * (bs - 1) + known)[-(bs - 1):]
+        filler = b"A" * (bs - 1 - position % bs)
+        candidates = b"".join(window + bytes([c]) for c in range(256))
+        ciphertext = await self.oracle.encrypt(align + candidates + filler)
+        
+        first = (self.prefix_length + len(align)) // bs
+        target = first + 256 + position // bs
+        if len(ciphertext) < (target + 1) * bs:
+            raise ValueError("El servicio recortó la entrada")
+        wanted = ciphertext[target * bs:(target + 1) * bs]
+        for c in range(256):
+            if ciphertext[(first + c) * bs:(first + c + 1) * bs] == wanted:
+                return c
+        return None
+    
+    async def _probe_pipelined(self, position: int, known: bytes, align: bytes) -> Optional[int]:
+        """Un bloque candidato por consulta, todas en vuelo a la vez"""
+        bs = self.block_size
+        window = (b"A" * (bs - 1) + known)[-(bs - 1):]
+        filler = b"A" * (bs - 1 - position % bs)
+        inputs = [align + filler] + [align + window + bytes([c]) for c in range(256)]
+        ciphertexts = await self.oracle.encrypt_many(inputs)
+        
+        first = (self.prefix_length + len(align)) // bs
+        target = first + position // bs
+        wanted = ciphertexts[0][target * bs:(target + 1) * bs]
+        for c, ciphertext in enumerate(ciphertexts[1:]):
+            if ciphertext[first * bs:(first + 1) * bs] == wanted:
+                return c
+        return None
+    
+    def _save(self, known: bytes) -> None:
+        """Guardar parámetros, secreto parcial y consultas desde el último guardado"""
+        if self.state is None:
+            return
+        self.state.set('byte_at_a_time', {
+            'block_size': self.block_size, 'prefix_length': self.prefix_length,
+            'secret_length': self.secret_length, 'batched': self.batched, 'secret': known.hex()
+        })
+        self.state.add_queries(self.oracle.queries - self._saved_queries)
+        self._saved_queries = self.oracle.queries
+    
+    async def run(self) -> bytes:
+        """Detectar parámetros (o cargarlos del estado guardado) y recuperar el secreto completo"""
+        saved = self.state.get('byte_at_a_time') if self.state is not None else None
+        if saved:
+            self.block_size, self.prefix_length = saved['block_size'], saved['prefix_length']
+            self.secret_length, self.batched = saved['secret_length'], saved['batched']
+            known = bytes.fromhex(saved['secret'])
+            self.resumed = len(known)
+        else:
+            if not self.block_size:
+                await self.detect_block_size()
+            await self.detect_prefix_length()
+            self.secret_length = self._base_length - self.prefix_length
+            known = b""
+        
+        bs = self.block_size
+        align = b"B" * (-self.prefix_length % bs)
+        if not saved:
+            self.batched = self.oracle.max_input is None or self.oracle.max_input >= len(align) + 257 * bs
+            self._save(known)
+        
+        for position in range(len(known), self.secret_length):
+            if self.checkpoint:
+                self.checkpoint()
+            value = None
+            if self.batched:
+                try:
+                    value = await self._probe_batch(position, known, align)
+                except ValueError as e:
+                    self.logger.debug(f"Consulta por lotes no admitida ({e}); se pasa a pipelining")
+                    self.batched = False
+            if not self.batched:
+                value = await self._probe_pipelined(position, known, align)
+            if value is None:
+                break
+            known += bytes([value])
+            self._save(known)
+        return known
+
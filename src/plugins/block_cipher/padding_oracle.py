@@ -0,0 +1,367 @@
+"""
+Ataque de oráculo de padding contra CBC
+
+Cada par (bloque anterior, bloque) se descifra de forma independiente, así
+que los pares se reparten entre varias conexiones y se atacan a la vez. En
+cada posición los candidatos se prueban en el orden de un modelo de
+texto plano (texto conocido, padding, ASCII frecuente y lo ya recuperado),
+en lotes pipelined de tamaño creciente, y las respuestas se clasifican con
+un predicado configurable. Un acierto con padding 1 se confirma alterando el
+penúltimo byte, para descartar el falso positivo de un \\x02\\x02 casual.
+
+Con un AttackStateStore cada byte del valor intermedio se guarda al
+recuperarse: tras una desconexión el ataque retoma cada bloque en la
+posición en que se quedó, y los trabajadores (de este proceso o de otros)
+reclaman bloques distintos del mismo almacén.
+"""
+
+import asyncio
+import base64
+import re
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+from ...core.attack_state import AttackStateStore
+from ...core.pipelined_connection import PipelinedConnection
+from ...utils.logging import get_logger
+
+# Respuestas habituales de los servicios (se comprueban antes las de padding inválido)
+DEFAULT_VALID = ['well-formed', 'valid padding', 'padding ok', 'padding is correct']
+DEFAULT_INVALID = ['chaotic', 'invalid padding', 'bad padding', 'padding error', 'incorrect padding',
+                   'invalid', 'error']
+
+Pattern = Union[str, 're.Pattern']
+
+
+class ResponsePredicate:
+    """Clasifica una respuesta del oráculo como padding válido o inválido"""
+    
+    def __init__(self, valid: Sequence[Pattern] = DEFAULT_VALID, invalid: Sequence[Pattern] = DEFAULT_INVALID,
+                 default: bool = False):
+        """
+        Args:
+            valid: Textos (sin distinguir mayúsculas) o regex de padding válido
+            invalid: Textos o regex de padding inválido (tienen prioridad)
+            default: Veredicto si la respuesta no coincide con ninguno
+        """
+        self.valid = [self._compile(p) for p in valid]
+        self.invalid = [self._compile(p) for p in invalid]
+        self.default = default
+    
+    @staticmethod
+    def _compile(pattern: Pattern) -> 're.Pattern':
+        if isinstance(pattern, re.Pattern):
+            return pattern
+        return re.compile(re.escape(pattern), re.IGNORECASE)
+    
+    def __call__(self, response: bytes) -> bool:
+        text = response.decode('latin-1')
+        if any(p.search(text) for p in self.invalid):
+            return False
+        if any(p.search(text) for p in self.valid):
+            return True
+        return self.default
+
+
+class PaddingOracle(ABC):
+    """Oráculo de padding consultable por lotes"""
+    
+    def __init__(self):
+        self.queries = 0
+    
+    @abstractmethod
+    async def check_many(self, ciphertexts: List[bytes]) -> List[bool]:
+        """Veredicto de padding para cada texto cifrado (IV || bloques)"""
+        pass
+    
+    async def check(self, ciphertext: bytes) -> bool:
+        return (await self.check_many([ciphertext]))[0]
+
+
+class LocalPaddingOracle(PaddingOracle):
+    """Oráculo en proceso a partir de una función texto cifrado -> bool"""
+    
+    def __init__(self, function: Callable[[bytes], bool]):
+        super().__init__()
+        self.function = function
+    
+    async def check_many(self, ciphertexts: List[bytes]) -> List[bool]:
+        self.queries += len(ciphertexts)
+        return [bool(self.function(c)) for c in ciphertexts]
+
+
+class PipelinedPaddingOracle(PaddingOracle):
+    """Oráculo remoto sobre una PipelinedConnection; cada respuesta acaba en el prompt"""
+    
+    def __init__(self, connection: PipelinedConnection, predicate: Optional[ResponsePredicate] = None,
+                 query_format: str = "{hex}"):
+        super().__init__()
+        self.connection = connection
+        self.predicate = predicate or ResponsePredicate()
+        self.query_format = query_format
+    
+    def format_query(self, ciphertext: bytes) -> bytes:
+        return self.query_format.format(
+            hex=ciphertext.hex(), b64=base64.b64encode(ciphertext).decode()
+        ).encode('latin-1')
+    
+    async def check_many(self, ciphertexts: List[bytes]) -> List[bool]:
+        self.queries += len(ciphertexts)
+        responses = await self.connection.request_many(self.format_query(c) for c in ciphertexts)
+        return [self.predicate(r) for r in responses]
+
+
+# Bytes de texto plano de más a menos probables (texto y flags en ASCII)
+PLAINTEXT_RANKING = (
+    " etaoinsrhldcumfpgwybvkxjqz_ETAOINSRHLDCUMFPGWYBVKXJQZ0123456789{}.,-!?'\":;()/@#$%&*+=<>[]\\^`|~\n"
+)
+
+# Prefijos de flag que se prueban primero al inicio del texto plano
+DEFAULT_PREFIXES = [b'CTF{', b'flag{', b'FLAG{', b'picoCTF{', b'HTB{']
+
+# Candidatos por lote: pocos al principio (el prior suele acertar), más después
+DEFAULT_BATCH_SIZES = (1, 3, 8, 16, 32, 64, 132)
+
+
+def _base_scores() -> List[float]:
+    scores = [-1.0 - b / 256 for b in range(256)]
+    for rank, char in enumerate(PLAINTEXT_RANKING):
+        scores[ord(char)] = 100.0 - rank
+    return scores
+
+
+class CandidateModel:
+    """
+    Orden de los 256 valores de un byte de texto plano: texto conocido,
+    padding, ranking ASCII y un modelo adaptativo (frecuencia de los bytes
+    ya recuperados y de cada byte delante del siguiente, que es el que se
+    conoce al descifrar de derecha a izquierda).
+    """
+    
+    def __init__(self, known: Optional[Dict[int, Sequence[int]]] = None,
+                 prefixes: Sequence[bytes] = DEFAULT_PREFIXES):
+        """
+        Args:
+            known: Bytes probables por posición del texto plano
+            prefixes: Prefijos probables del texto plano (flags)
+        """
+        self.known: Dict[int, List[int]] = {k: list(v) for k, v in (known or {}).items()}
+        for prefix in prefixes:
+            for offset, byte in enumerate(prefix):
+                if byte not in self.known.setdefault(offset, []):
+                    self.known[offset].append(byte)
+        self.base = _base_scores()
+        self.unigram = [0] * 256
+        self.total = 0
+        self.before: Dict[int, Dict[int, int]] = {}
+    
+    def candidates(self, offset: int, following: Optional[int] = None,
+                   padding: Sequence[int] = ()) -> List[int]:
+        """Valores de texto plano en orden de prueba para la posición `offset`"""
+        first = list(dict.fromkeys(list(self.known.get(offset, [])) + list(padding)))
+        scores = list(self.base)
+        if self.total:
+            for byte, count in enumerate(self.unigram):
+                if count:
+                    scores[byte] += 20.0 * count / self.total
+        if following is not None and following in self.before:
+            seen = self.before[following]
+            total = sum(seen.values())
+            for byte, count in seen.items():
+                scores[byte] += 40.0 * count / total
+        rest = sorted(range(256), key=lambda b: -scores[b])
+        chosen = set(first)
+        return first + [b for b in rest if b not in chosen]
+    
+    def update(self, byte: int, following: Optional[int] = None) -> None:
+        """Registrar un byte recuperado y el que le sigue"""
+        self.unigram[byte] += 1
+        self.total += 1
+        if following is not None:
+            pairs = self.before.setdefault(following, {})
+            pairs[byte] = pairs.get(byte, 0) + 1
+
+
+class PaddingOracleAttack:
+    """Descifrado CBC con un conjunto de oráculos (una conexión por par de bloques en curso)"""
+    
+    def __init__(self, oracles: Iterable[PaddingOracle], block_size: int = 16,
+                 batch_sizes: Sequence[int] = DEFAULT_BATCH_SIZES, model: Optional[CandidateModel] = None,
+                 checkpoint: Optional[Callable[[], None]] = None, state: Optional[AttackStateStore] = None,
+                 poll_interval: float = 1.0):
+        """
+        Args:
+            state: Almacén para guardar el progreso y reanudar (None = sin estado)
+            poll_interval: Espera entre comprobaciones de bloques que lleva otro proceso
+        """
+        self.oracles = list(oracles)
+        if not self.oracles:
+            raise ValueError("Se necesita al menos un oráculo")
+        self.block_size = block_size
+        self.batch_sizes = list(batch_sizes)
+        self.model = model or CandidateModel()
+        self.checkpoint = checkpoint
+        self.state = state
+        self.poll_interval = poll_interval
+        self.logger = get_logger(__name__)
+        
+        self.false_positives = 0
+        self.blocks_done = 0
+        self.bytes_done = 0
+        self.bytes_resumed = 0  # Bytes tomados del estado guardado en lugar de consultados
+    
+    @property
+    def queries(self) -> int:
+        return sum(o.queries for o in self.oracles)
+    
+    @property
+    def queries_per_byte(self) -> float:
+        return self.queries / self.bytes_done if self.bytes_done else 0.0
+    
+    def _padding_candidates(self, plain: bytearray, position: int, final: bool) -> List[int]:
+        """En el último bloque: el valor de padding (1..16) y sus repeticiones"""
+        if not final:
+            return []
+        size = self.block_size
+        if position == size - 1:
+            return list(range(1, size + 1))
+        n = plain[size - 1]
+        return [n] if 1 <= n <= size and position >= size - n else []
+    
+    async def decrypt_block(self, oracle: PaddingOracle, previous: bytes, block: bytes,
+                            index: int = 1, final: bool = False) -> bytes:
+        """
+        Valor intermedio D(block) byte a byte y texto plano D(block) ^ previous.
+        
+        Args:
+            index: Número del bloque (1 = el que sigue al IV), para situar el texto plano
+            final: Último bloque del mensaje (lleva el padding)
+        """
+        size = self.block_size
+        intermediate = bytearray(size)
+        plain = bytearray(size)
+        start = size - 1
+        
+        if self.state is not None:
+            # Reanudar: los últimos `recovered` bytes del valor intermedio ya se conocen
+            saved, recovered = self.state.block_state(index)
+            if recovered:
+                intermediate[:] = saved
+                for position in range(size - 1, size - 1 - recovered, -1):
+                    plain[position] = intermediate[position] ^ previous[position]
+                    self.model.update(plain[position], plain[position + 1] if position + 1 < size else None)
+                start -= recovered
+                self.bytes_resumed += recovered
+        
+        for position in range(start, -1, -1):
+            if self.checkpoint:
+                self.checkpoint()
+            queries = oracle.queries
+            padding = size - position
+            forged = bytearray(size)
+            for i in range(position + 1, size):
+                forged[i] = intermediate[i] ^ padding
+            
+            # Candidatos de texto plano -> bytes del bloque falsificado
+            following = plain[position + 1] if position + 1 < size else None
+            order = self.model.candidates((index - 1) * size + position, following,
+                                          self._padding_candidates(plain, position, final))
+            guesses = [p ^ previous[position] ^ padding for p in order]
+            
+            guess = await self._find_guess(oracle, forged, position, block, guesses)
+            if guess is None:
+                raise ValueError(f"Ningún candidato da padding válido en la posición {position}")
+            intermediate[position] = guess ^ padding
+            plain[position] = intermediate[position] ^ previous[position]
+            self.model.update(plain[position], following)
+            self.bytes_done += 1
+            if self.state is not None:
+                self.state.save_block(index, intermediate, size - position, oracle.queries - queries)
+        
+        if self.state is not None:
+            self.state.save_block(index, intermediate, size, done=True)
+        return bytes(plain)
+    
+    async def _find_guess(self, oracle: PaddingOracle, forged: bytearray, position: int, block: bytes,
+                          candidates: Sequence[int]) -> Optional[int]:
+        """Primer candidato con padding válido, en lotes pipelined de tamaño creciente"""
+        start = 0
+        for attempt in range(len(candidates)):
+            if start >= len(candidates):
+                break
+            size = self.batch_sizes[min(attempt, len(self.batch_sizes) - 1)]
+            batch = candidates[start:start + size]
+            start += size
+            queries = []
+            for guess in batch:
+                forged[position] = guess
+                queries.append(bytes(forged) + block)
+            for guess, valid in zip(batch, await oracle.check_many(queries)):
+                if valid and (position < self.block_size - 1 or await self._confirm(oracle, forged, guess, block)):
+                    return guess
+        return None
+    
+    async def _confirm(self, oracle: PaddingOracle, forged: bytearray, guess: int, block: bytes) -> bool:
+        """
+        Padding 1: si el penúltimo byte descifrado era \\x02 (o el bloque acaba
+        en \\x03\\x03\\x03...) también hay padding válido. Alterar el penúltimo
+        byte solo conserva la validez del padding 1 auténtico.
+        """
+        probe = bytearray(forged)
+        probe[-1] = guess
+        probe[-2] ^= 0xff
+        if await oracle.check(bytes(probe) + block):
+            return True
+        self.false_positives += 1
+        return False
+    
+    async def decrypt(self, ciphertext: bytes, iv: Optional[bytes] = None) -> bytes:
+        """
+        Descifrar todos los bloques (el primero es el IV si no se da aparte)
+        repartiendo los pares entre los oráculos disponibles.
+        """
+        size = self.block_size
+        data = (iv or b"") + ciphertext
+        if len(data) % size or len(data) < 2 * size:
+            raise ValueError("El texto cifrado no es IV + bloques completos")
+        blocks = [data[i:i + size] for i in range(0, len(data), size)]
+        last = len(blocks) - 1
+        plaintexts: Dict[int, bytes] = {}
+        
+        if self.state is None:
+            pending = iter(range(1, len(blocks)))
+            claim = lambda: next(pending, None)
+        else:
+            self.state.init_blocks(last)
+            claim = self.state.claim_block
+        
+        async def worker(oracle: PaddingOracle) -> None:
+            # Cada oráculo (conexión) descifra un bloque reclamado tras otro
+            while (index := claim()) is not None:
+                plaintexts[index] = await self.decrypt_block(oracle, blocks[index - 1], blocks[index],
+                                                             index, index == last)
+                self.blocks_done += 1
+        
+        try:
+            await asyncio.gather(*(worker(oracle) for oracle in self.oracles))
+            if self.state is not None:
+                # Bloques que lleva otro proceso: esperar a que acabe o a que caduque su reclamación
+                while self.state.remaining():
+                    if self.checkpoint:
+                        self.checkpoint()
+                    await asyncio.sleep(self.poll_interval)
+                    await asyncio.gather(*(worker(oracle) for oracle in self.oracles))
+                # Bloques terminados en sesiones anteriores o por otros procesos
+                for index, intermediate in self.state.done_blocks():
+                    if index not in plaintexts:
+                        plaintexts[index] = bytes(a ^ b for a, b in zip(intermediate, blocks[index - 1]))
+                        self.bytes_resumed += size
+        finally:
+            if self.state is not None:
+                self.state.release()
+        
+        plaintext = b"".join(plaintexts[i] for i in range(1, len(blocks)))
+        n = plaintext[-1]
+        if 1 <= n <= size and plaintext[-n:] == bytes([n]) * n:
+            plaintext = plaintext[:-n]
+        return plaintext
@@ -0,0 +1,400 @@
+"""
+Plugin de Cifrados de Bloque - Detección de ECB y ataque byte a byte
+"""
+
+import asyncio
+import base64
+import binascii
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from Crypto.Cipher import AES
+from Crypto.Util.Padding import unpad
+
+from ..base import MultiTechniquePlugin
+from ...models.data import ChallengeData, SolutionResult, PluginInfo, ChallengeType
+from ...core.attack_state import AttackStateStore
+from ...core.pipelined_connection import PipelinedConnection
+from ...utils.config import config
+from .ecb import (
+    ByteAtATimeECB, EncryptionOracle, LocalEncryptionOracle, PipelinedEncryptionOracle,
+    detect_ecb, parse_ciphertext, repeated_blocks
+)
+from .padding_oracle import (
+    DEFAULT_INVALID, DEFAULT_PREFIXES, DEFAULT_VALID, CandidateModel, LocalPaddingOracle, PaddingOracle,
+    PaddingOracleAttack, PipelinedPaddingOracle, ResponsePredicate
+)
+
+# Nombres habituales de cada parámetro
+PARAMETER_ALIASES = {
+    'key': 'key', 'aes_key': 'key', 'k': 'key',
+    'iv': 'iv', 'nonce': 'iv',
+    'ciphertext': 'ciphertext', 'ct': 'ciphertext', 'enc': 'ciphertext', 'encrypted': 'ciphertext',
+    'encrypted_flag': 'ciphertext', 'flag_enc': 'ciphertext'
+}
+
+_ASSIGNMENT = re.compile(r'\b(\w+)\s*[=:]\s*["\']?([0-9a-fA-F]{16,}|[A-Za-z0-9+/]{22,}={0,2})["\']?')
+
+
+class BlockCipherPlugin(MultiTechniquePlugin):
+    """Plugin para retos de AES en modo ECB/CBC"""
+    
+    def __init__(self):
+        super().__init__()
+        
+        # Ficheros que se analizan (los binarios grandes solo para detectar ECB)
+        self.max_file_size = 64 << 20
+        self.max_text_size = 1 << 20
+        
+        # Consultas en vuelo por conexión para el oráculo de cifrado
+        self.oracle_window = 64
+    
+        # Conexiones simultáneas del ataque de padding (una por par de bloques)
+        self.padding_oracle_connections = 4
+        
+        # Progreso de los ataques de red para reanudar tras una desconexión
+        self.state_dir = Path(config.cache.cache_dir) / "attack_state" if config.cache.disk_cache_enabled else None
+    
+    def _create_plugin_info(self) -> PluginInfo:
+        return PluginInfo(
+            name="block_cipher",
+            version="1.0.0",
+            description="Plugin para cifrados de bloque: detección de ECB, clave conocida, ataque byte a byte y oráculo de padding",
+            supported_types=[ChallengeType.BASIC_CRYPTO, ChallengeType.NETWORK, ChallengeType.MIXED,
+                             ChallengeType.UNKNOWN],
+            techniques=["known_key", "byte_at_a_time", "padding_oracle"],
+            priority=68
+        )
+    
+    def can_solve(self, challenge_data: ChallengeData) -> float:
+        """Evaluar si el desafío es de cifrado de bloque"""
+        confidence = 0.0
+        
+        for file_info in challenge_data.files:
+            filename = file_info.path.name.lower()
+            if any(pattern in filename for pattern in ['aes', 'ecb', 'cbc', 'block']):
+                confidence += 0.2
+            
+            if file_info.path.stat().st_size <= self.max_text_size:
+                content = self._read_file_content(file_info.path)
+                if content:
+                    content_lower = content.lower()
+                    if any(pattern in content_lower for pattern in ['aes', 'mode_ecb', 'mode_cbc', 'block cipher']):
+                        confidence += 0.3
+                    if 'oracle' in content_lower or 'encrypt(' in content_lower:
+                        confidence += 0.1
+                    if 'unpad' in content_lower or 'padding' in content_lower:
+                        confidence += 0.1
+        
+        if any(detect_ecb(blob) for blob in self._ciphertext_blobs(challenge_data)):
+            confidence += 0.4
+        if (self._local_oracle(challenge_data) or self._local_padding_oracle(challenge_data)
+                or challenge_data.metadata.get('block_cipher')):
+            confidence += 0.4
+        
+        return min(confidence, 1.0)
+    
+    def _initialize_techniques(self) -> Dict[str, callable]:
+        """Inicializar técnicas de cifrado de bloque"""
+        return {
+            "known_key": self._try_known_key,
+            "byte_at_a_time": self._try_byte_at_a_time,
+            "padding_oracle": self._try_padding_oracle
+        }
+    
+    def _get_ordered_techniques(self, challenge_data: ChallengeData) -> Dict[str, callable]:
+        """El oráculo de padding va antes que el byte a byte si el reto lo indica"""
+        settings = challenge_data.metadata.get('block_cipher', {})
+        text = f"{challenge_data.description or ''} {settings.get('attack', '')}".lower()
+        if self._local_padding_oracle(challenge_data) or 'padding' in text:
+            order = ["known_key", "padding_oracle", "byte_at_a_time"]
+            return {name: self._techniques[name] for name in order}
+        return self._techniques
+    
+    def _decode(self, value: str) -> Optional[bytes]:
+        """Hex o base64"""
+        value = value.strip().removeprefix('0x')
+        try:
+            return bytes.fromhex(value)
+        except ValueError:
+            pass
+        try:
+            return base64.b64decode(value, validate=True)
+        except (binascii.Error, ValueError):
+            return None
+    
+    def _extract_parameters(self, challenge_data: ChallengeData) -> Dict[str, bytes]:
+        """key, iv y ciphertext de JSON o texto nombre = valor"""
+        params: Dict[str, bytes] = {}
+        for file_info in challenge_data.files:
+            if file_info.path.stat().st_size > self.max_text_size:
+                continue
+            content = self._read_file_content(file_info.path)
+            if not content:
+                continue
+            
+            try:
+                data = json.loads(content)
+            except ValueError:
+                data = None
+            pairs = data.items() if isinstance(data, dict) else _ASSIGNMENT.findall(content)
+            
+            for key, value in pairs:
+                name = PARAMETER_ALIASES.get(str(key).strip().lower())
+                if name and name not in params and isinstance(value, str):
+                    decoded = self._decode(value)
+                    if decoded:
+                        params[name] = decoded
+        return params
+    
+    def _ciphertext_blobs(self, challenge_data: ChallengeData) -> List[bytes]:
+        """Ficheros binarios y textos cifrados nombrados en los ficheros de texto"""
+        blobs = []
+        for file_info in challenge_data.files:
+            size = file_info.path.stat().st_size
+            if size > self.max_file_size or size < 32:
+                continue
+            if file_info.path.suffix.lower() in ('.bin', '.enc', '.ct', '.raw', '.dat', '.bmp'):
+                data = self._read_file_bytes(file_info.path)
+                if data:
+                    blobs.append(data)
+        ciphertext = self._extract_parameters(challenge_data).get('ciphertext')
+        if ciphertext:
+            blobs.append(ciphertext)
+        return blobs
+    
+    def _local_oracle(self, challenge_data: ChallengeData) -> Optional[EncryptionOracle]:
+        """Oráculo en proceso pasado en metadata['encryption_oracle'] (callable o EncryptionOracle)"""
+        oracle = challenge_data.metadata.get('encryption_oracle')
+        if isinstance(oracle, EncryptionOracle):
+            return oracle
+        if callable(oracle):
+            return LocalEncryptionOracle(oracle)
+        return None
+    
+    def _try_known_key(self, challenge_data: ChallengeData) -> SolutionResult:
+        """Descifrar con la clave del reto: ECB si hay bloques repetidos o no hay IV, si no CBC"""
+        params = self._extract_parameters(challenge_data)
+        key = params.get('key')
+        if not key or len(key) not in (16, 24, 32):
+            return self._create_failure_result("No se encontró una clave AES")
+        
+        for blob in self._ciphertext_blobs(challenge_data):
+            if len(blob) % 16:
+                continue
+            repeated, total = repeated_blocks(blob)
+            attempts = []
+            if repeated or 'iv' not in params:
+                attempts.append(('ecb', AES.new(key, AES.MODE_ECB), blob))
+            if 'iv' in params and len(params['iv']) == 16:
+                attempts.append(('cbc', AES.new(key, AES.MODE_CBC, params['iv']), blob))
+            if len(blob) >= 32:
+                # IV antepuesto al texto cifrado
+                attempts.append(('cbc', AES.new(key, AES.MODE_CBC, blob[:16]), blob[16:]))
+            
+            for mode, cipher, data in attempts:
+                plaintext = cipher.decrypt(data)
+                try:
+                    plaintext = unpad(plaintext, 16)
+                except ValueError:
+                    pass
+                flag = self._extract_flag(plaintext.decode('latin-1'))
+                if flag:
+                    return self._create_success_result(
+                        flag=flag,
+                        method="known_key",
+                        confidence=0.95,
+                        mode=mode,
+                        repeated_blocks=repeated,
+                        total_blocks=total
+                    )
+        
+        return self._create_failure_result("La clave no descifró ningún texto cifrado con flag")
+    
+    def _try_byte_at_a_time(self, challenge_data: ChallengeData) -> SolutionResult:
+        """Ataque byte a byte contra un oráculo ECB local o de red"""
+        oracle = self._local_oracle(challenge_data)
+        if oracle is None and not challenge_data.network_info:
+            return self._create_failure_result("No hay oráculo de cifrado")
+        
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self._byte_at_a_time_async(challenge_data, oracle))
+        finally:
+            loop.close()
+    
+    async def _byte_at_a_time_async(self, challenge_data: ChallengeData,
+                                    oracle: Optional[EncryptionOracle]) -> SolutionResult:
+        settings: Dict[str, Any] = challenge_data.metadata.get('block_cipher', {})
+        connection = None
+        state = None
+        
+        try:
+            if oracle is None:
+                state = self._attack_state(challenge_data, "byte_at_a_time", b"")
+                connection = PipelinedConnection.from_network_info(
+                    challenge_data.network_info,
+                    window=settings.get('window', self.oracle_window),
+                    delimiter=settings.get('delimiter', '\n').encode()
+                )
+                await connection.open()
+                oracle = PipelinedEncryptionOracle(
+                    connection, query_format=settings.get('query_format', '{hex}'),
+                    max_input=settings.get('max_input')
+                )
+            
+            attack = ByteAtATimeECB(oracle, checkpoint=self._check_timeout, state=state)
+            secret = await attack.run()
+            if not secret:
+                return self._create_failure_result("No se recuperó ningún byte del secreto")
+            
+            text = secret.decode('latin-1')
+            flag = self._extract_flag(text)
+            total_queries = state.queries if state is not None else oracle.queries
+            if state is not None:
+                state.discard()
+                state = None
+            return self._create_success_result(
+                flag=flag or text,
+                method="byte_at_a_time",
+                confidence=0.95 if flag else 0.7,
+                block_size=attack.block_size,
+                prefix_length=attack.prefix_length,
+                secret_length=attack.secret_length,
+                batched=attack.batched,
+                queries=oracle.queries,
+                resumed_bytes=attack.resumed,
+                total_queries=total_queries
+            )
+        except Exception as e:
+            return self._create_failure_result(f"Error en ataque byte a byte: {str(e)}")
+        finally:
+            if connection:
+                await connection.close()
+            if state is not None:
+                state.close()
+    
+    def _local_padding_oracle(self, challenge_data: ChallengeData) -> Optional[PaddingOracle]:
+        """Oráculo de padding en proceso en metadata['padding_oracle'] (callable o PaddingOracle)"""
+        oracle = challenge_data.metadata.get('padding_oracle')
+        if isinstance(oracle, PaddingOracle):
+            return oracle
+        if callable(oracle):
+            return LocalPaddingOracle(oracle)
+        return None
+    
+    def _try_padding_oracle(self, challenge_data: ChallengeData) -> SolutionResult:
+        """Descifrado CBC con un oráculo de padding local o de red"""
+        oracle = self._local_padding_oracle(challenge_data)
+        if oracle is None and not challenge_data.network_info:
+            return self._create_failure_result("No hay oráculo de padding")
+        
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self._padding_oracle_async(challenge_data, oracle))
+        finally:
+            loop.close()
+    
+    async def _padding_oracle_async(self, challenge_data: ChallengeData,
+                                    oracle: Optional[PaddingOracle]) -> SolutionResult:
+        settings: Dict[str, Any] = challenge_data.metadata.get('block_cipher', {})
+        params = self._extract_parameters(challenge_data)
+        ciphertext = self._decode(settings['ciphertext']) if settings.get('ciphertext') else params.get('ciphertext')
+        iv = self._decode(settings['iv']) if settings.get('iv') else params.get('iv')
+        connections: List[PipelinedConnection] = []
+        state = None
+        
+        try:
+            if oracle is not None:
+                oracles = [oracle]
+            else:
+                connections, banner = await self._open_padding_connections(challenge_data.network_info, settings)
+                if ciphertext is None:
+                    # El servicio suele anunciar IV || texto cifrado en el banner
+                    ciphertext, iv = parse_ciphertext(banner), None
+                if ciphertext is None:
+                    return self._create_failure_result("No se encontró el texto cifrado a descifrar")
+                predicate = ResponsePredicate(settings.get('valid', DEFAULT_VALID),
+                                              settings.get('invalid', DEFAULT_INVALID))
+                oracles = [PipelinedPaddingOracle(c, predicate, settings.get('query_format', '{hex}'))
+                           for c in connections]
+            if ciphertext is None:
+                return self._create_failure_result("No se encontró el texto cifrado a descifrar")
+            if oracle is None:
+                state = self._attack_state(challenge_data, "padding_oracle", (iv or b"") + ciphertext)
+            
+            # Prefijo conocido del texto plano (p. ej. el formato de flag del CTF)
+            prefixes = list(DEFAULT_PREFIXES)
+            if settings.get('known_prefix'):
+                prefixes.insert(0, settings['known_prefix'].encode())
+            attack = PaddingOracleAttack(oracles, model=CandidateModel(prefixes=prefixes),
+                                         checkpoint=self._check_timeout, state=state)
+            plaintext = await attack.decrypt(ciphertext, iv)
+            text = plaintext.decode('latin-1')
+            flag = self._extract_flag(text)
+            total_queries = state.queries if state is not None else attack.queries
+            if state is not None:
+                state.discard()
+                state = None
+            return self._create_success_result(
+                flag=flag or text,
+                method="padding_oracle",
+                confidence=0.95 if flag else 0.7,
+                blocks=attack.blocks_done,
+                connections=len(oracles),
+                queries=attack.queries,
+                queries_per_byte=round(attack.queries_per_byte, 1),
+                false_positives=attack.false_positives,
+                resumed_bytes=attack.bytes_resumed,
+                total_queries=total_queries
+            )
+        except Exception as e:
+            return self._create_failure_result(f"Error en ataque de padding oracle: {str(e)}")
+        finally:
+            for connection in connections:
+                await connection.close()
+            if state is not None:
+                state.close()
+    
+    def _attack_state(self, challenge_data: ChallengeData, kind: str, data: bytes) -> Optional[AttackStateStore]:
+        """Estado persistente del ataque contra el servicio (None sin caché en disco)"""
+        if self.state_dir is None or not challenge_data.network_info:
+            return None
+        info = challenge_data.network_info
+        return AttackStateStore.for_target(self.state_dir, kind, info.host, info.port, data)
+    
+    async def _open_padding_connections(self, network_info, settings: Dict[str, Any]):
+        """
+        Abrir las conexiones en paralelo; las respuestas terminan en el prompt.
+        Si cada conexión anuncia un texto cifrado distinto (clave o IV por
+        sesión), los bloques no se pueden repartir y se usa solo la primera.
+        """
+        prompt = settings.get('prompt', '\n').encode()
+        count = max(1, settings.get('connections', self.padding_oracle_connections))
+        connections = [
+            PipelinedConnection.from_network_info(
+                network_info, window=settings.get('window', self.oracle_window), delimiter=prompt
+            )
+            for _ in range(count)
+        ]
+        banners = await asyncio.gather(*(c.open() for c in connections), return_exceptions=True)
+        opened = [(c, b) for c, b in zip(connections, banners) if not isinstance(b, Exception)]
+        for connection, banner in zip(connections, banners):
+            if isinstance(banner, Exception):
+                await connection.close()
+        if not opened:
+            raise banners[0]
+        
+        first = parse_ciphertext(opened[0][1])
+        if any(parse_ciphertext(b) != first for _, b in opened[1:]):
+            for connection, _ in opened[1:]:
+                await connection.close()
+            opened = opened[:1]
+        return [c for c, _ in opened], opened[0][1]
+    
+    def _extract_flag(self, text: str) -> Optional[str]:
+        """Buscar patrones de flag"""
+        match = re.search(r'(?:CTF|FLAG)\{[^}]+\}', text, re.IGNORECASE)
+        return match.group(0) if match else None
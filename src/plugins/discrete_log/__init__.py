@@ -0,0 +1,3 @@
+"""
+Plugin para logaritmos discretos en Z_p*
+"""
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Logaritmo discreto genérico sobre un grupo abeliano finito
+Baby-step giant-step, Pollard rho (caminata r-aditiva de Teske con puntos
+distinguidos), canguro de Pollard y Pohlig-Hellman escritos una sola vez
+contra la interfaz `Group`. Los solvers de Z_p*, F_{p^k}* y curvas elípticas
+heredan de `GenericDLog` y sustituyen solo lo que especializan.
+"""
+import math
+import random
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+from ..rsa.rsa_math import RSAMath
+
+
+class DeadlineExceeded(Exception):
+    """Un subproblema superó la hora límite de su tarea"""
+
+
+class Group(ABC):
+    """Grupo abeliano finito en notación multiplicativa"""
+    
+    identity: Any = 1
+    
+    @abstractmethod
+    def mul(self, a: Any, b: Any) -> Any:
+        pass
+    
+    @abstractmethod
+    def pow(self, a: Any, k: int) -> Any:
+        """a^k (k negativo invierte)"""
+        pass
+    
+    def inverse(self, a: Any) -> Any:
+        return self.pow(a, -1)
+    
+    def normalize(self, a: Any) -> Any:
+        """Representante canónico (para comparar y usar como clave de tabla)"""
+        return a
+    
+    @abstractmethod
+    def key(self, a: Any) -> int:
+        """Entero determinista de a: partición de las caminatas y puntos distinguidos"""
+        pass
+
+
+class MultiplicativeGroup(Group):
+    """Z_p* con enteros"""
+    
+    def __init__(self, p: int):
+        self.p = p
+    
+    def mul(self, a: int, b: int) -> int:
+        return a * b % self.p
+    
+    def pow(self, a: int, k: int) -> int:
+        return pow(a, k, self.p)
+    
+    def normalize(self, a: int) -> int:
+        return a % self.p
+    
+    def key(self, a: int) -> int:
+        return a
+
+
+class GenericDLog:
+    """
+    Resolución de h = g^x en un grupo cualquiera.
+    
+    BSGS para órdenes pequeños, rho para subgrupos de orden primo, canguro
+    para exponentes acotados y Pohlig-Hellman para órdenes compuestos. Las
+    subclases pueden sustituir `solve`, los algoritmos de caminata o
+    `_solve_subgroups` (p.ej. para repartir los subgrupos entre procesos).
+    """
+    
+    def __init__(self, group: Group, max_table_entries: int = 1 << 20,
+                 max_operations: int = 1 << 40, checkpoint: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            group: Operaciones del grupo
+            max_table_entries: Límite de memoria de la tabla de baby steps
+            max_operations: Presupuesto de operaciones de grupo por subproblema
+            checkpoint: Llamada periódica (p.ej. comprobación de timeout)
+        """
+        self.group = group
+        self.max_table_entries = max_table_entries
+        self.max_operations = max_operations
+        self.checkpoint = checkpoint
+        self.operations = 0
+        self.partial = (0, 1)
+    
+    def _tick(self, step: int) -> None:
+        if self.checkpoint and step & 0xFFFF == 0:
+            self.checkpoint()
+    
+    # Baby-step giant-step
+    
+    def bsgs(self, g: Any, h: Any, bound: int, offset: int = 0) -> Optional[int]:
+        """x en [offset, offset + bound) con g^x = h"""
+        G = self.group
+        target = G.normalize(G.mul(h, G.pow(g, -offset)) if offset else h)
+        m = min(self.max_table_entries, math.isqrt(max(bound - 1, 0)) + 1)
+        
+        table: Dict[Any, int] = {}
+        value = G.identity
+        for j in range(m):
+            table.setdefault(value, j)
+            value = G.mul(value, g)
+            self._tick(j)
+        
+        # value = g^m; giant step g^-m
+        factor = G.inverse(value)
+        for i in range(bound // m + 1):
+            j = table.get(target)
+            if j is not None and i * m + j < bound:
+                self.operations += m + i
+                return offset + i * m + j
+            target = G.mul(target, factor)
+            self._tick(i)
+        self.operations += m + bound // m
+        return None
+    
+    # Pollard rho
+    
+    def pollard_rho(self, g: Any, h: Any, n: int, r: int = 20) -> Optional[int]:
+        """
+        Pollard rho con caminata r-aditiva (Teske) en un grupo de orden primo
+        n. La caminata guarda puntos distinguidos; al volver a uno se cierra
+        el ciclo y la diferencia de coeficientes da x.
+        """
+        G = self.group
+        h = G.normalize(h)
+        if h == G.identity:
+            return 0
+        if n < 1 << 16:
+            return self.bsgs(g, h, n)
+        
+        coefficients = [(random.randrange(n), random.randrange(n)) for _ in range(r)]
+        jumps = [G.mul(G.pow(g, c), G.pow(h, d)) for c, d in coefficients]
+        dp_mask = (1 << max(0, (math.isqrt(n) // 64).bit_length() - 1)) - 1
+        max_walk = 64 * (dp_mask + 1)
+        
+        def restart():
+            a, b = random.randrange(n), random.randrange(n)
+            return G.mul(G.pow(g, a), G.pow(h, b)), a, b
+        
+        seen: Dict[Any, tuple] = {}
+        y, a, b = restart()
+        walk = 0
+        step = 0
+        while self.operations + step < self.max_operations:
+            j = G.key(y) % r
+            y = G.mul(y, jumps[j])
+            c, d = coefficients[j]
+            a, b = (a + c) % n, (b + d) % n
+            step += 1
+            walk += 1
+            self._tick(step)
+            
+            if G.key(y) & dp_mask == 0:
+                previous = seen.get(y)
+                if previous is not None and previous[1] != b:
+                    # g^a0·h^b0 = g^a·h^b  =>  x = (a0 - a)/(b - b0)
+                    a0, b0 = previous
+                    x = (a0 - a) * pow(b - b0, -1, n) % n
+                    if G.pow(g, x) == h:
+                        self.operations += step
+                        return x
+                seen[y] = (a, b)
+                y, a, b = restart()
+                walk = 0
+            elif walk > max_walk:
+                # Ciclo sin puntos distinguidos
+                y, a, b = restart()
+                walk = 0
+        self.operations += step
+        return None
+    
+    # Canguro
+    
+    def kangaroo(self, g: Any, h: Any, lo: int, hi: int) -> Optional[int]:
+        """
+        Canguro de Pollard (van Oorschot-Wiener) para x en [lo, hi): un
+        canguro manso desde g^(lo + W/2) y uno salvaje desde h, con saltos
+        2^i de media ≈ √W/2 y trampas en los puntos distinguidos.
+        """
+        G = self.group
+        width = hi - lo
+        if math.isqrt(width) <= self.max_table_entries:
+            return self.bsgs(g, h, width, offset=lo)
+        
+        target = G.mul(h, G.pow(g, -lo))
+        mean = max(1, math.isqrt(width) // 2)
+        count = 1
+        while (1 << count) // count < mean:
+            count += 1
+        distances = [1 << i for i in range(count)]
+        jumps = [G.pow(g, d) for d in distances]
+        dp_mask = (1 << max(0, (mean // 32).bit_length() - 1)) - 1
+        
+        # y -> (tipo, distancia): 0 = manso, 1 = salvaje
+        traps: Dict[Any, tuple] = {}
+        tame_distance = width // 2
+        walkers = [[G.pow(g, tame_distance), tame_distance, 0], [target, 0, 1]]
+        step = 0
+        while self.operations + step < self.max_operations:
+            for walker in walkers:
+                j = G.key(walker[0]) % count
+                walker[0] = G.mul(walker[0], jumps[j])
+                walker[1] += distances[j]
+                if G.key(walker[0]) & dp_mask:
+                    continue
+                
+                trap = traps.get(walker[0])
+                if trap is None:
+                    traps[walker[0]] = (walker[2], walker[1])
+                elif trap[0] != walker[2]:
+                    tame = walker[1] if walker[2] == 0 else trap[1]
+                    wild = trap[1] if walker[2] == 0 else walker[1]
+                    x = tame - wild
+                    if 0 <= x < width and G.pow(g, x) == target:
+                        self.operations += step
+                        return lo + x
+                else:
+                    # Dos canguros del mismo tipo en el mismo camino: relanzar el salvaje
+                    shift = random.randrange(1, mean)
+                    walkers[1] = [G.mul(target, G.pow(g, shift)), shift, 1]
+            step += 2
+            self._tick(step)
+            if walkers[0][1] > width * 4:
+                # El salvaje quedó fuera: el logaritmo no está en el intervalo
+                break
+        self.operations += step
+        return None
+    
+    # Órdenes
+    
+    def element_order(self, g: Any, n: int, factors: Optional[List[int]] = None) -> int:
+        """
+        Orden exacto de g a partir de un múltiplo n con su factorización. Si
+        queda un cofactor compuesto sin factorizar, el resultado sigue siendo
+        un múltiplo del orden.
+        """
+        G = self.group
+        if factors is None:
+            factors = RSAMath.factorize(n, rho_iterations=1 << 22)
+        order = n
+        for q in set(factors):
+            while order % q == 0 and G.pow(g, order // q) == G.identity:
+                order //= q
+        return order
+    
+    # API de alto nivel
+    
+    def solve(self, g: Any, h: Any, n: int) -> Optional[int]:
+        """x en [0, n) con g^x = h para g de orden primo n"""
+        G = self.group
+        if n <= 1:
+            return 0 if G.normalize(h) == G.identity else None
+        if math.isqrt(n) <= self.max_table_entries:
+            return self.bsgs(g, h, n)
+        return self.pollard_rho(g, h, n)
+    
+    def prime_power_dlog(self, g: Any, h: Any, q: int, e: int) -> Optional[int]:
+        """x mod q^e con g^x = h para g de orden q^e (dígito a dígito en base q)"""
+        G = self.group
+        if e == 0:
+            return 0
+        # gamma genera el subgrupo de orden q
+        gamma = G.pow(g, q ** (e - 1))
+        g_inv = G.inverse(g)
+        x = 0
+        for j in range(e):
+            # H = (h·g^-x)^(q^(e-1-j)) está en <gamma>
+            H = G.pow(G.mul(h, G.pow(g_inv, x)), q ** (e - 1 - j))
+            digit = self.solve(gamma, H, q)
+            if digit is None:
+                return None
+            x += digit * q ** j
+        return x
+    
+    def _subgroup_in_budget(self, q: int, e: int) -> bool:
+        """Si el subgrupo de orden q^e cabe en el presupuesto de operaciones"""
+        return math.isqrt(q) * e <= self.max_operations
+    
+    def _solve_subgroups(self, tasks: List[dict]) -> Optional[List[int]]:
+        """Resolver los subgrupos {g, h, q, e} de Pohlig-Hellman en este proceso"""
+        residues = []
+        for task in tasks:
+            residues.append(self.prime_power_dlog(task['g'], task['h'], task['q'], task['e']))
+            if residues[-1] is None:
+                return None
+            if self.checkpoint:
+                self.checkpoint()
+        return residues
+    
+    def pohlig_hellman(self, g: Any, h: Any, n: int, factors: Optional[List[int]] = None,
+                       bound: Optional[int] = None) -> Optional[int]:
+        """
+        Pohlig-Hellman: proyectar g y h en cada subgrupo de orden q^e,
+        resolverlos y recombinar con CRT.
+        
+        Los subgrupos fuera de presupuesto se omiten; si se conoce una cota
+        x < bound, el resto se busca con el canguro sobre x = r + t·M. El
+        residuo parcial queda en `self.partial` como (r, M).
+        
+        Args:
+            g, h: Elementos con h = g^x
+            n: Orden de g o un múltiplo
+            factors: Factorización de n (se calcula si no se da)
+            bound: Cota superior conocida de x
+        """
+        G = self.group
+        h = G.normalize(h)
+        if factors is None:
+            factors = RSAMath.factorize(n, rho_iterations=1 << 22)
+        
+        # Orden exacto de g: cada subgrupo es cíclico de orden q^e
+        factors = list(factors)
+        for q in set(factors):
+            while q in factors and G.pow(g, n // q) == G.identity:
+                factors.remove(q)
+                n //= q
+        
+        # Tareas en orden creciente de q
+        tasks = []
+        unsolved = 1
+        for q, e in sorted(Counter(factors).items()):
+            # Cofactores compuestos sin factorizar o primos fuera de presupuesto
+            if not RSAMath.is_prime_miller_rabin(q) or not self._subgroup_in_budget(q, e):
+                unsolved *= q ** e
+                continue
+            cofactor = n // q ** e
+            tasks.append({'g': G.pow(g, cofactor), 'h': G.pow(h, cofactor), 'q': q, 'e': e})
+        
+        residues = self._solve_subgroups(tasks)
+        if residues is None:
+            return None
+        
+        moduli = [t['q'] ** t['e'] for t in tasks]
+        modulus = math.prod(moduli)
+        residue = RSAMath.chinese_remainder_theorem(residues, moduli) if tasks else 0
+        self.partial = (residue, modulus)
+        
+        if G.pow(g, residue) == h:
+            return residue
+        if unsolved == 1 or bound is None:
+            return None
+        
+        # x = r + t·M con t acotado: canguro sobre g^M
+        base = G.pow(g, modulus)
+        target = G.mul(h, G.pow(g, -residue))
+        t = self.kangaroo(base, target, 0, bound // modulus + 1)
+        return residue + t * modulus if t is not None else None
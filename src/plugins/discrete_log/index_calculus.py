@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Cálculo de índices en Z_p* para un subgrupo de orden primo q
+Los logaritmos se calculan para el homomorfismo L: Z_p* -> Z/qZ,
+L(x) = log de x^((p-1)/q) en base γ^((p-1)/q), así que no hace falta un
+generador de Z_p* ni que q^2 no divida p - 1.
+
+Cada potencia γ^k se escribe como a/b (mod p) con |a|, |b| < √p por
+reconstrucción racional, de modo que solo hay que encontrar pares de números
+de la mitad de tamaño suaves sobre la base de factores. La criba de suavidad
+se hace por lotes en NumPy (int64, p < 2^124) con aborto temprano; el
+sistema lineal mod q se resuelve con eliminación gaussiana dispersa.
+"""
+import math
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from ..rsa.rsa_math import RSAMath
+
+
+def rational_reconstruction(x: int, p: int, bound: Optional[int] = None) -> Tuple[int, int]:
+    """(a, b) con a ≡ x·b (mod p) y |a|, |b| <= √p (Euclides extendido a medias)"""
+    bound = bound or math.isqrt(p)
+    r0, r1 = p, x % p
+    t0, t1 = 0, 1
+    while r1 > bound:
+        quotient = r0 // r1
+        r0, r1 = r1, r0 - quotient * r1
+        t0, t1 = t1, t0 - quotient * t1
+    return r1, t1
+
+
+def _factor_over(value: int, primes: List[int]) -> Optional[Dict[int, int]]:
+    """Exponentes de value sobre la base (None si no es suave)"""
+    exponents = {}
+    for index, l in enumerate(primes):
+        if value == 1:
+            break
+        if value % l == 0:
+            e = 0
+            while value % l == 0:
+                value //= l
+                e += 1
+            exponents[index] = e
+    return exponents if value == 1 else None
+
+
+def solve_sparse(rows: List[Dict[int, int]], rhs: List[int], q: int) -> Dict[int, int]:
+    """
+    Solución mod q (primo) de un sistema disperso sobredeterminado; solo se
+    devuelven las incógnitas que quedan determinadas. Pivotes por columna de
+    menor peso para limitar el relleno.
+    """
+    rows = [dict(row) for row in rows]
+    rhs = list(rhs)
+    by_column: Dict[int, set] = {}
+    for i, row in enumerate(rows):
+        for column in row:
+            by_column.setdefault(column, set()).add(i)
+    
+    pivots: List[Tuple[int, int]] = []
+    used = set()
+    for column in sorted(by_column, key=lambda c: len(by_column[c])):
+        candidates = [i for i in by_column[column] if i not in used and rows[i].get(column)]
+        if not candidates:
+            continue
+        pivot = min(candidates, key=lambda i: len(rows[i]))
+        used.add(pivot)
+        inverse = pow(rows[pivot][column], -1, q)
+        pivot_row = {c: v * inverse % q for c, v in rows[pivot].items()}
+        rows[pivot], rhs[pivot] = pivot_row, rhs[pivot] * inverse % q
+        pivots.append((column, pivot))
+        
+        for i in list(by_column[column]):
+            if i == pivot or i in used:
+                continue
+            factor = rows[i].get(column, 0)
+            if not factor:
+                continue
+            row = rows[i]
+            for c, v in pivot_row.items():
+                value = (row.get(c, 0) - factor * v) % q
+                if value:
+                    if c not in row:
+                        by_column.setdefault(c, set()).add(i)
+                    row[c] = value
+                elif c in row:
+                    del row[c]
+                    by_column[c].discard(i)
+            rhs[i] = (rhs[i] - factor * rhs[pivot]) % q
+    
+    # Sustitución hacia atrás: cada fila pivote depende solo de columnas pivotadas después
+    solution: Dict[int, int] = {}
+    for column, pivot in reversed(pivots):
+        value = rhs[pivot]
+        for c, v in rows[pivot].items():
+            if c != column:
+                if c not in solution:
+                    value = None
+                    break
+                value -= v * solution[c]
+        if value is not None:
+            solution[column] = value % q
+    return solution
+
+
+def _prune_singletons(rows: List[Dict[int, int]], rhs: List[int]) -> Tuple[List[Dict[int, int]], List[int]]:
+    """Quitar filas con primos que solo aparecen en ellas: no aportan al resto"""
+    while True:
+        counts: Dict[int, int] = {}
+        for row in rows:
+            for column in row:
+                counts[column] = counts.get(column, 0) + 1
+        keep = [i for i, row in enumerate(rows) if all(counts[c] > 1 for c in row)]
+        if len(keep) == len(rows):
+            return rows, rhs
+        rows, rhs = [rows[i] for i in keep], [rhs[i] for i in keep]
+
+
+class IndexCalculus:
+    """Logaritmos en el subgrupo de orden q de Z_p* por cálculo de índices"""
+    
+    def __init__(self, p: int, q: int, smoothness_bound: Optional[int] = None,
+                 batch_size: int = 1 << 15, checkpoint: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            p: Primo del grupo
+            q: Primo que divide p - 1
+            smoothness_bound: Cota de la base de factores (por defecto según p)
+        """
+        if (p - 1) % q:
+            raise ValueError("q no divide p - 1")
+        self.p, self.q = p, q
+        self.cofactor = (p - 1) // q
+        self.checkpoint = checkpoint
+        self.batch_size = batch_size
+        
+        # B ≈ L_p[1/2, 0.6]: a y b tienen la mitad de bits que p
+        log_p = p.bit_length() * math.log(2)
+        self.smoothness_bound = smoothness_bound or max(
+            128, min(1 << 18, int(math.exp(0.6 * math.sqrt(log_p * math.log(log_p)))))
+        )
+        self.primes = RSAMath.small_primes(self.smoothness_bound)
+        
+        # Base γ con γ^((p-1)/q) != 1: L(γ) = 1
+        self.gamma = next(x for x in range(2, p) if pow(x, self.cofactor, p) != 1)
+        # Paso aleatorio entre exponentes: con k consecutivos, γ^(k+1) = γ·a/b
+        # suele dar la misma relación desplazada y el sistema pierde rango
+        self.stride = random.randrange(p >> 1, p - 1)
+        self.logs: Optional[Dict[int, int]] = None
+        self.relations = 0
+    
+    def _smooth_candidates(self, values: List[int]) -> List[int]:
+        """Índices de los valores (|·| < 2^62) suaves sobre la base, con aborto temprano"""
+        if not HAS_NUMPY:
+            return [i for i, v in enumerate(values) if _factor_over(v, self.primes) is not None]
+        
+        remaining = np.array(values, dtype=np.int64)
+        index = np.arange(len(values))
+        early = max(1, len(self.primes) // 4)
+        limit = math.log2(self.smoothness_bound)
+        for position, l in enumerate(self.primes):
+            while True:
+                divisible = remaining % l == 0
+                if not divisible.any():
+                    break
+                remaining[divisible] //= l
+            if position == early:
+                # Lo que queda tras un cuarto de la base debe poder romperse en pocos primos grandes
+                keep = np.log2(remaining.astype(np.float64)) <= 3 * limit
+                remaining, index = remaining[keep], index[keep]
+        return index[remaining == 1].tolist()
+    
+    def _relations_from(self, start: int, count: int) -> List[Tuple[int, Dict[int, int], Dict[int, int]]]:
+        """Relaciones γ^k = a/b con a y b suaves para k = start + i·stride"""
+        p, stride = self.p, self.stride
+        x = pow(self.gamma, start, p)
+        multiplier = pow(self.gamma, stride, p)
+        root = math.isqrt(p)
+        pairs = []
+        for i in range(count):
+            a, b = rational_reconstruction(x, p, root)
+            pairs.append((start + i * stride, abs(a), abs(b)))
+            x = x * multiplier % p
+        
+        smooth_a = set(self._smooth_candidates([a for _, a, _ in pairs]))
+        candidates = [i for i in smooth_a if pairs[i][1]]
+        smooth_b = self._smooth_candidates([pairs[i][2] for i in candidates])
+        
+        relations = []
+        for j in smooth_b:
+            k, a, b = pairs[candidates[j]]
+            fa, fb = _factor_over(a, self.primes), _factor_over(b, self.primes)
+            if fa is not None and fb is not None:
+                relations.append((k, fa, fb))
+        return relations
+    
+    def precompute(self, extra: int = 20, max_batches: int = 1 << 12) -> bool:
+        """Reunir relaciones y resolver los logaritmos de la base de factores"""
+        if self.p.bit_length() > 124:
+            return False
+        q = self.q
+        rows, rhs = [], []
+        # Inicio aleatorio: relaciones nuevas en cada ejecución
+        start = random.randrange(1, self.p - 1)
+        for _ in range(max_batches):
+            if self.checkpoint:
+                self.checkpoint()
+            for k, fa, fb in self._relations_from(start, self.batch_size):
+                # k ≡ Σ e_i·L(l_i) - Σ f_i·L(l_i) (mod q); L(-1) = 0 para q impar
+                row = dict(fa)
+                for i, e in fb.items():
+                    row[i] = row.get(i, 0) - e
+                rows.append({i: e % q for i, e in row.items() if e % q})
+                rhs.append(k % q)
+            start += self.batch_size * self.stride
+            if len(rows) >= len(self.primes) + extra:
+                rows, rhs = _prune_singletons(rows, rhs)
+                columns = {c for row in rows for c in row}
+                if len(rows) >= len(columns) + extra:
+                    break
+        
+        self.relations = len(rows)
+        self.logs = solve_sparse(rows, rhs, q)
+        # Los primos que no aparecen quedan sin logaritmo: el descenso los evita
+        return len(self.logs) >= len(self.primes) // 2
+    
+    def log(self, y: int, attempts: int = 1 << 20) -> Optional[int]:
+        """L(y): busca k con y·γ^k = a/b suave (descenso de un paso)"""
+        if self.logs is None and not self.precompute():
+            return None
+        p, q = self.p, self.q
+        k = random.randrange(p - 1)
+        x = y * pow(self.gamma, k, p) % p
+        for step in range(attempts):
+            if self.checkpoint and step % 4096 == 0:
+                self.checkpoint()
+            a, b = rational_reconstruction(x, p)
+            fa = _factor_over(abs(a), self.primes) if a else None
+            fb = _factor_over(abs(b), self.primes) if fa is not None else None
+            if fb is not None and all(i in self.logs for i in list(fa) + list(fb)):
+                total = sum(e * self.logs[i] for i, e in fa.items())
+                total -= sum(e * self.logs[i] for i, e in fb.items())
+                return (total - k) % q
+            x = x * self.gamma % p
+            k += 1
+        return None
+    
+    def discrete_log(self, g: int, h: int) -> Optional[int]:
+        """x mod q con g^x = h, para g y h en el subgrupo de orden q"""
+        Lg, Lh = self.log(g), self.log(h)
+        if Lg is None or Lh is None or Lg == 0:
+            return None
+        x = Lh * pow(Lg, -1, self.q) % self.q
+        return x if pow(g, x, self.p) == h % self.p else None
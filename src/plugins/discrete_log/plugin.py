@@ -0,0 +1,196 @@
+"""
+Plugin de Logaritmo Discreto - Ataques a Diffie-Hellman en Z_p*
+"""
+
+import re
+import json
+from typing import Dict, Any, Optional
+from Crypto.Util.number import long_to_bytes
+
+from ..base import MultiTechniquePlugin
+from ...models.data import ChallengeData, SolutionResult, PluginInfo, ChallengeType
+from ...utils.crypto_helpers import decrypt_with_secret, extract_flag, parse_int
+from .zp_dlog import INDEX_CALCULUS_MAX_BITS, ZpDLogSolver
+
+# Nombres habituales de cada parámetro
+PARAMETER_ALIASES = {
+    'p': 'p', 'prime': 'p', 'modulus': 'p',
+    'g': 'g', 'generator': 'g', 'base': 'g',
+    'h': 'h', 'y': 'h', 'a': 'h', 'pub': 'h', 'public': 'h', 'public_key': 'h', 'target': 'h',
+    'q': 'q', 'order': 'q',
+    'bits': 'bits', 'exponent_bits': 'bits', 'secret_bits': 'bits', 'bound': 'bound',
+    'b': 'B', 'peer': 'B', 'peer_public': 'B',
+    'ciphertext': 'ciphertext', 'encrypted_flag': 'ciphertext', 'ct': 'ciphertext', 'enc': 'ciphertext',
+    'iv': 'iv'
+}
+
+_ASSIGNMENT = re.compile(r'\b(\w+)\s*[=:]\s*["\']?(0x[0-9a-fA-F]+|[0-9a-fA-F]{16,}|\d+)\b')
+
+
+class DiscreteLogPlugin(MultiTechniquePlugin):
+    """Plugin para resolver h = g^x (mod p) en retos de Diffie-Hellman"""
+    
+    def __init__(self):
+        super().__init__()
+        
+        # Ficheros de parámetros que se leen enteros
+        self.max_file_size = 1 << 20
+        
+        # Presupuesto de rho por subgrupo: √q multiplicaciones
+        self.max_operations = 1 << 28
+    
+    def _create_plugin_info(self) -> PluginInfo:
+        return PluginInfo(
+            name="discrete_log",
+            version="1.0.0",
+            description="Plugin para logaritmos discretos en Z_p* (Pohlig-Hellman, canguro, cálculo de índices)",
+            supported_types=[ChallengeType.MIXED, ChallengeType.UNKNOWN],
+            techniques=["pohlig_hellman", "short_exponent", "index_calculus"],
+            priority=70
+        )
+    
+    def can_solve(self, challenge_data: ChallengeData) -> float:
+        """Evaluar si el desafío es un logaritmo discreto en Z_p*"""
+        confidence = 0.0
+        
+        for file_info in challenge_data.files:
+            filename = file_info.path.name.lower()
+            if any(pattern in filename for pattern in ['dh', 'dlog', 'diffie', 'discrete']):
+                confidence += 0.2
+            
+            content = self._read_file_content(file_info.path)
+            if content:
+                content_lower = content.lower()
+                if any(pattern in content_lower for pattern in ['diffie', 'hellman', 'discrete log', 'dlog']):
+                    confidence += 0.3
+                if re.search(r'pow\(\s*g\s*,', content) or 'g^x' in content_lower:
+                    confidence += 0.2
+        
+        params = self._extract_parameters(challenge_data)
+        if all(k in params for k in ['p', 'g', 'h']):
+            confidence += 0.4
+        
+        return min(confidence, 1.0)
+    
+    def _initialize_techniques(self) -> Dict[str, callable]:
+        """Inicializar técnicas de logaritmo discreto"""
+        return {
+            "pohlig_hellman": self._try_pohlig_hellman,
+            "short_exponent": self._try_short_exponent,
+            "index_calculus": self._try_index_calculus
+        }
+    
+    def _extract_parameters(self, challenge_data: ChallengeData) -> Dict[str, Any]:
+        """p, g, h y opcionales (q, bits, B, ciphertext, iv) de JSON o texto nombre = valor"""
+        params: Dict[str, Any] = {}
+        for file_info in challenge_data.files:
+            if file_info.path.stat().st_size > self.max_file_size:
+                continue
+            content = self._read_file_content(file_info.path)
+            if not content:
+                continue
+            
+            try:
+                data = json.loads(content)
+            except ValueError:
+                data = None
+            pairs = data.items() if isinstance(data, dict) else _ASSIGNMENT.findall(content)
+            
+            for key, value in pairs:
+                name = PARAMETER_ALIASES.get(str(key).strip().lower())
+                if not name or name in params:
+                    continue
+                if name in ('ciphertext', 'iv'):
+                    if isinstance(value, str):
+                        params[name] = value.strip().lower().removeprefix('0x')
+                elif parse_int(value) is not None:
+                    params[name] = parse_int(value)
+        
+        if 'bits' in params and 'bound' not in params:
+            params['bound'] = 1 << params['bits']
+        return params
+    
+    def _solver(self, params: Dict[str, Any], index_calculus: bool = False) -> ZpDLogSolver:
+        """Solver con el checkpoint y la hora límite del plugin"""
+        deadline = self._start_time + self._timeout if self._start_time else None
+        return ZpDLogSolver(
+            params['p'], max_operations=self.max_operations, checkpoint=self._check_timeout,
+            deadline=deadline, index_calculus=index_calculus
+        )
+    
+    def _missing_parameters(self, params: Dict[str, Any]) -> Optional[SolutionResult]:
+        missing = [k for k in ['p', 'g', 'h'] if k not in params]
+        if missing:
+            return self._create_failure_result(f"Faltan parámetros: {', '.join(missing)}")
+        return None
+    
+    def _try_pohlig_hellman(self, challenge_data: ChallengeData) -> SolutionResult:
+        """Orden de g liso: subgrupos primos en paralelo con BSGS/rho y CRT"""
+        params = self._extract_parameters(challenge_data)
+        failure = self._missing_parameters(params)
+        if failure:
+            return failure
+        
+        p, g, h = params['p'], params['g'], params['h']
+        solver = self._solver(params)
+        x = solver.pohlig_hellman(g, h, params.get('q') or p - 1, bound=params.get('bound'))
+        if x is None:
+            residue, modulus = solver.partial
+            return self._create_failure_result(
+                "El orden de g tiene factores fuera de presupuesto",
+                partial_residue=residue, partial_modulus=modulus
+            )
+        return self._exponent_result(x, "pohlig_hellman", params, operations=solver.operations)
+    
+    def _try_short_exponent(self, challenge_data: ChallengeData) -> SolutionResult:
+        """Exponente secreto de pocos bits (bits/bound): canguro de Pollard"""
+        params = self._extract_parameters(challenge_data)
+        failure = self._missing_parameters(params)
+        if failure:
+            return failure
+        if 'bound' not in params:
+            return self._create_failure_result("Sin cota del exponente (bits o bound)")
+        
+        solver = self._solver(params)
+        x = solver.kangaroo(params['g'], params['h'], 0, params['bound'])
+        if x is None:
+            return self._create_failure_result("El canguro no encontró el exponente en el intervalo")
+        return self._exponent_result(x, "short_exponent", params, operations=solver.operations)
+    
+    def _try_index_calculus(self, challenge_data: ChallengeData) -> SolutionResult:
+        """Pohlig-Hellman con cálculo de índices para el subgrupo primo grande"""
+        params = self._extract_parameters(challenge_data)
+        failure = self._missing_parameters(params)
+        if failure:
+            return failure
+        
+        p, g, h = params['p'], params['g'], params['h']
+        if p.bit_length() > INDEX_CALCULUS_MAX_BITS:
+            return self._create_failure_result(
+                f"p de {p.bit_length()} bits: cálculo de índices solo hasta {INDEX_CALCULUS_MAX_BITS}"
+            )
+        
+        solver = self._solver(params, index_calculus=True)
+        x = solver.pohlig_hellman(g, h, params.get('q') or p - 1)
+        if x is None:
+            return self._create_failure_result("El cálculo de índices no resolvió el logaritmo")
+        return self._exponent_result(x, "index_calculus", params, operations=solver.operations)
+    
+    def _exponent_result(self, x: int, method: str, params: Dict[str, Any], **details) -> SolutionResult:
+        """Flag en el propio exponente o cifrada con el secreto compartido B^x"""
+        flag = self._extract_flag(long_to_bytes(x).decode('latin-1'))
+        shared = pow(params['B'], x, params['p']) if 'B' in params else None
+        if not flag and shared is not None and 'ciphertext' in params:
+            flag = decrypt_with_secret(shared, params)
+        return self._create_success_result(
+            flag=flag or f"Exponente encontrado: x = {x}",
+            method=method,
+            confidence=0.95 if flag else 0.8,
+            exponent=x,
+            shared_secret=shared,
+            **details
+        )
+    
+    def _extract_flag(self, text: str) -> Optional[str]:
+        """Buscar patrones de flag"""
+        return extract_flag(text)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Logaritmo discreto en Z_p*
+El motor genérico (BSGS, rho, canguro, Pohlig-Hellman) sobre enteros módulo
+p, con los subgrupos de Pohlig-Hellman resueltos en procesos aparte. Los
+subgrupos de orden primo grande pasan a cálculo de índices si p es lo
+bastante pequeño.
+"""
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, List, Optional
+
+from .generic import DeadlineExceeded, GenericDLog, MultiplicativeGroup
+from .index_calculus import IndexCalculus
+
+# Tamaño máximo de p para el cálculo de índices; más allá la fase de relaciones
+# no termina en un tiempo razonable en Python
+INDEX_CALCULUS_MAX_BITS = 100
+
+
+def _prime_power_dlog(task: dict) -> Optional[int]:
+    """
+    Logaritmo en el subgrupo de orden q^e, ejecutable en un proceso aparte.
+    La tarea lleva su hora límite para que el proceso termine solo si el
+    plugin agota su tiempo.
+    """
+    deadline = task.get('deadline')
+    
+    def checkpoint():
+        if deadline is not None and time.time() > deadline:
+            raise DeadlineExceeded()
+    
+    solver = ZpDLogSolver(task['p'], workers=1, max_table_entries=task['max_table_entries'],
+                          max_operations=task['max_operations'], checkpoint=checkpoint,
+                          index_calculus=task['index_calculus'])
+    try:
+        return solver.prime_power_dlog(task['g'], task['h'], task['q'], task['e'])
+    except DeadlineExceeded:
+        return None
+
+
+class ZpDLogSolver(GenericDLog):
+    """
+    Resolución de h = g^x (mod p).
+    
+    Los algoritmos genéricos de `GenericDLog` sobre Z_p*, con cálculo de
+    índices para órdenes primos fuera del alcance de rho con p de hasta
+    ~2^100 y los subgrupos de Pohlig-Hellman repartidos entre procesos.
+    """
+    
+    def __init__(self, p: int, workers: Optional[int] = None,
+                 max_table_entries: int = 1 << 20, max_operations: int = 1 << 40,
+                 checkpoint: Optional[Callable[[], None]] = None,
+                 deadline: Optional[float] = None, index_calculus: bool = True):
+        """
+        Args:
+            p: Primo del grupo
+            workers: Procesos para los subgrupos de Pohlig-Hellman
+            max_table_entries: Límite de memoria de la tabla de baby steps
+            max_operations: Presupuesto de multiplicaciones por subproblema
+            checkpoint: Llamada periódica (p.ej. comprobación de timeout)
+            deadline: Hora límite (time.time()) que se pasa a los procesos
+            index_calculus: Usar cálculo de índices en subgrupos grandes
+        """
+        super().__init__(MultiplicativeGroup(p), max_table_entries, max_operations, checkpoint)
+        self.p = p
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.deadline = deadline
+        self.index_calculus = index_calculus
+    
+    # API de alto nivel
+    
+    def _index_calculus_applies(self, q: int) -> bool:
+        return self.index_calculus and self.p.bit_length() <= INDEX_CALCULUS_MAX_BITS and (self.p - 1) % q == 0
+    
+    def solve(self, g: int, h: int, n: int) -> Optional[int]:
+        """x en [0, n) con g^x = h para g de orden primo n"""
+        if (n > 1 and self._index_calculus_applies(n)
+                and math.isqrt(n) > max(self.max_table_entries, min(self.max_table_entries * 64, self.max_operations))):
+            # Subgrupo fuera del alcance de rho en Python: cálculo de índices
+            x = IndexCalculus(self.p, n, checkpoint=self.checkpoint).discrete_log(g, h)
+            if x is not None:
+                return x
+        return super().solve(g, h, n)
+    
+    def _subgroup_in_budget(self, q: int, e: int) -> bool:
+        return super()._subgroup_in_budget(q, e) or (e == 1 and self._index_calculus_applies(q))
+    
+    def pohlig_hellman(self, g: int, h: int, n: Optional[int] = None,
+                       factors: Optional[List[int]] = None,
+                       bound: Optional[int] = None) -> Optional[int]:
+        """
+        Pohlig-Hellman genérico con los subgrupos resueltos en paralelo.
+        
+        Args:
+            g, h: Elementos con h = g^x
+            n: Orden de g o un múltiplo (p - 1 por defecto)
+            factors: Factorización de n (se calcula si no se da)
+            bound: Cota superior conocida de x
+        """
+        return super().pohlig_hellman(g, h, n or self.p - 1, factors, bound)
+        
+    def _solve_subgroups(self, tasks: List[dict]) -> Optional[List[int]]:
+        """
+        Resolver los subgrupos en un ProcessPoolExecutor. El proceso principal
+        espera por intervalos cortos para poder llamar a checkpoint; si este
+        lanza, las tareas pendientes se cancelan y las que ya corren se paran
+        solas al llegar a su hora límite.
+        """
+        if self.workers <= 1 or len(tasks) <= 1:
+            # En este proceso, con el checkpoint del solver
+            return super()._solve_subgroups(tasks)
+        
+        tasks = [dict(task, p=self.p, max_table_entries=self.max_table_entries,
+                      max_operations=self.max_operations, deadline=self.deadline,
+                      index_calculus=self.index_calculus) for task in tasks]
+        executor = ProcessPoolExecutor(max_workers=min(self.workers, len(tasks)))
+        try:
+            # Los subgrupos grandes primero: son los que marcan el tiempo total
+            futures = {executor.submit(_prime_power_dlog, task): i
+                       for i, task in sorted(enumerate(tasks), key=lambda item: -item[1]['q'])}
+            residues: List[Optional[int]] = [None] * len(tasks)
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    residues[futures[future]] = future.result()
+                    if residues[futures[future]] is None:
+                        return None
+                if self.checkpoint:
+                    self.checkpoint()
+            return residues
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,3 @@
+"""
+Plugin para ataques a firmas ECDSA
+"""
\ No newline at end of file
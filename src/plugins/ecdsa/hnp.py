@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Problema del número oculto (HNP) para nonces ECDSA sesgados o filtrados
+De s·k ≡ h + r·d (mod n) cada firma da k = t·d + a (mod n); si se conocen
+bits del nonce queda una muestra k̃ = t·d + a (mod n) con 0 <= k̃ < cota.
+Con suficientes muestras, el vector de los k̃ centrados es el más corto de un
+retículo (Boneh-Venkatesan) y d sale de él.
+"""
+import math
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from .lattice import HAS_FPYLLL, Basis, bkz_reduce, lll_reduce
+
+
+@dataclass
+class HNPSample:
+    """k̃ = t·d + a (mod n) con 0 <= k̃ < bound"""
+    t: int
+    a: int
+    bound: int
+
+
+class HiddenNumberProblem:
+    """Recuperar d a partir de muestras HNP de un mismo n"""
+    
+    def __init__(self, n: int):
+        self.n = n
+        self.samples: List[HNPSample] = []
+    
+    def add_signature(self, r: int, s: int, h: int, nonce_bits: Optional[int] = None,
+                      leak: int = 0, leak_bits: int = 0, leak_type: str = 'msb') -> None:
+        """
+        Añadir una firma (r, s, h) cuyo nonce tiene nonce_bits bits, de los que
+        se conocen los leak_bits más (msb) o menos (lsb) significativos con valor
+        leak. Sin filtración (leak_bits = 0) el sesgo es k < 2^nonce_bits.
+        """
+        n = self.n
+        nonce_bits = nonce_bits or n.bit_length()
+        s_inv = pow(s, -1, n)
+        t, a = r * s_inv % n, h * s_inv % n
+        unknown_bits = nonce_bits - leak_bits
+        
+        if leak_bits and leak_type == 'lsb':
+            # k = 2^l·x + leak  =>  x = 2^-l·(t·d + a - leak)
+            inv = pow(1 << leak_bits, -1, n)
+            t, a = t * inv % n, (a - leak) * inv % n
+        elif leak_bits:
+            # k = leak·2^u + x
+            a = (a - (leak << unknown_bits)) % n
+        self.samples.append(HNPSample(t, a, 1 << unknown_bits))
+    
+    def samples_needed(self) -> int:
+        """Muestras para que el vector buscado sea único con margen (~1.3× la cota teórica)"""
+        if not self.samples:
+            return 0
+        leaked = min(self.n.bit_length() - s.bound.bit_length() + 1 for s in self.samples)
+        return math.ceil(1.3 * self.n.bit_length() / max(leaked, 1)) + 2
+    
+    def check(self, d: int, samples: Optional[List[HNPSample]] = None) -> bool:
+        """Todas las muestras dentro de su cota con este d"""
+        n = self.n
+        return all((s.t * d + s.a) % n < s.bound for s in samples or self.samples)
+    
+    def basis(self, samples: List[HNPSample]) -> Basis:
+        """
+        Retículo de dimensión m + 1 tras eliminar d con la primera muestra:
+        k̃_i ≡ u_i·k̃_0 + v_i con u_i = t_i/t_0. Las columnas se ponderan para que
+        todas las incógnitas centradas midan lo mismo (W/2), y la última fila
+        incrusta el término independiente.
+        """
+        n = self.n
+        W = max(s.bound for s in samples)
+        weights = [W // s.bound for s in samples]
+        first = samples[0]
+        t0_inv = pow(first.t, -1, n)
+        center0 = first.bound // 2
+        
+        u_row, shift = [], []
+        for sample, weight in zip(samples, weights):
+            u = sample.t * t0_inv % n
+            v = (sample.a - u * first.a) % n
+            # Centrado: k̃_i - c_i ≡ u_i·(k̃_0 - c_0) + (v_i + u_i·c_0 - c_i)
+            u_row.append(u * weight)
+            shift.append((v + u * center0 - sample.bound // 2) % n * weight)
+        
+        m = len(samples)
+        rows = [u_row + [0]]
+        for i in range(1, m):
+            row = [0] * (m + 1)
+            row[i] = n * weights[i]
+            rows.append(row)
+        rows.append(shift + [W // 2])
+        return rows
+    
+    def recover(self, reduced: Basis, samples: List[HNPSample]) -> Optional[int]:
+        """d a partir de los vectores reducidos que llevan la incrustación ±W/2"""
+        n = self.n
+        first = samples[0]
+        W = max(s.bound for s in samples)
+        t0_inv = pow(first.t, -1, n)
+        for row in reduced:
+            if abs(row[-1]) != W // 2:
+                continue
+            sign = 1 if row[-1] > 0 else -1
+            k0 = sign * row[0] // (W // first.bound) + first.bound // 2
+            d = (k0 - first.a) * t0_inv % n
+            if self.check(d, samples):
+                return d
+        return None
+    
+    def solve(self, max_samples: Optional[int] = None, block_size: Optional[int] = None,
+              checkpoint: Optional[Callable[[], None]] = None) -> Optional[int]:
+        """
+        LLL sobre las muestras más informativas; si no basta, BKZ sobre la base
+        ya reducida. block_size por defecto: 20 con fpylll, 10 sin él.
+        """
+        if len(self.samples) < 2:
+            return None
+        count = min(len(self.samples), max_samples or len(self.samples), max(self.samples_needed(), 2))
+        samples = sorted(self.samples, key=lambda s: s.bound)[:count]
+        
+        reduced = lll_reduce(self.basis(samples), checkpoint=checkpoint)
+        d = self.recover(reduced, samples)
+        if d is None:
+            block_size = block_size or (20 if HAS_FPYLLL else 10)
+            reduced = bkz_reduce(reduced, block_size=min(block_size, len(reduced)), checkpoint=checkpoint)
+            d = self.recover(reduced, samples)
+        return d if d is not None and self.check(d) else None
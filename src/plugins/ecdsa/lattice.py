@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Reducción de retículos LLL y BKZ
+Con fpylll se usa su implementación; si no, una LLL de punto flotante al
+estilo L² (Gram-Schmidt en precisión ampliada a partir de productos escalares
+exactos) y una BKZ que resuelve SVP en cada bloque por enumeración de
+Schnorr-Euchner.
+"""
+import math
+from fractions import Fraction
+from typing import Callable, Iterator, List, Optional
+
+try:
+    from fpylll import BKZ, LLL, IntegerMatrix
+    HAS_FPYLLL = True
+except ImportError:
+    HAS_FPYLLL = False
+
+try:
+    import gmpy2
+    HAS_GMPY2 = True
+except ImportError:
+    HAS_GMPY2 = False
+
+Basis = List[List[int]]
+
+# Tolerancia de la reducción de tamaño (|μ| <= η)
+_ETA = 0.51
+
+
+def _dot(u: List[int], v: List[int]) -> int:
+    return sum(x * y for x, y in zip(u, v))
+
+
+def _zigzag(center: float) -> Iterator[int]:
+    """Enteros en orden creciente de distancia a center"""
+    lo = math.floor(center)
+    hi = lo + 1
+    while True:
+        if center - lo <= hi - center:
+            yield lo
+            lo -= 1
+        else:
+            yield hi
+            hi += 1
+
+
+class _Reducer:
+    """
+    Base entera con su matriz de Gram exacta (actualizada con cada operación
+    de filas) y su Gram-Schmidt (r_ij = <b_i, b*_j>, μ_ij = r_ij / r_jj)
+    """
+    
+    def __init__(self, basis: Basis, delta: float, checkpoint: Optional[Callable[[], None]]):
+        self.B = [list(row) for row in basis]
+        self._gram()
+        self.delta = delta
+        self.checkpoint = checkpoint
+        d = len(self.B)
+        # Precisión suficiente para la estabilidad de L² (~1.6·d bits) con margen
+        self.precision = max(64, 2 * d + 64)
+        zero = self._real(0)
+        self.r = [[zero] * d for _ in range(d)]
+        self.mu = [[zero] * d for _ in range(d)]
+    
+    def _gram(self) -> None:
+        B = self.B
+        self.G = [[_dot(u, v) for v in B] for u in B]
+    
+    def _real(self, x):
+        if HAS_GMPY2:
+            return gmpy2.mpfr(x, self.precision)
+        return Fraction(x)
+    
+    def _round(self, x) -> int:
+        return int(gmpy2.rint(x)) if HAS_GMPY2 else round(x)
+    
+    def _gso_row(self, k: int) -> None:
+        r, mu, Gk = self.r, self.mu, self.G[k]
+        for j in range(k):
+            value = self._real(Gk[j])
+            for i in range(j):
+                value -= mu[j][i] * r[k][i]
+            r[k][j] = value
+            mu[k][j] = value / r[j][j]
+    
+    def _size_reduce(self, k: int) -> None:
+        """Reducción de tamaño perezosa: se repite hasta que todos los |μ_kj| <= η"""
+        mu = self.mu
+        while True:
+            self._gso_row(k)
+            reduced = False
+            for j in range(k - 1, -1, -1):
+                if abs(mu[k][j]) > _ETA:
+                    X = self._round(mu[k][j])
+                    self._subtract(k, j, X)
+                    for i in range(j):
+                        mu[k][i] -= X * mu[j][i]
+                    mu[k][j] -= X
+                    reduced = True
+            if not reduced:
+                return
+    
+    def _subtract(self, k: int, j: int, X: int) -> None:
+        """b_k -= X·b_j"""
+        G = self.G
+        self.B[k] = [x - X * y for x, y in zip(self.B[k], self.B[j])]
+        Gkk = G[k][k] - 2 * X * G[k][j] + X * X * G[j][j]
+        Gk, Gj = G[k], G[j]
+        for i in range(len(G)):
+            Gk[i] -= X * Gj[i]
+            G[i][k] = Gk[i]
+        Gk[k] = Gkk
+    
+    def _swap(self, k: int) -> None:
+        """Intercambiar b_{k-1} y b_k"""
+        B, G = self.B, self.G
+        B[k - 1], B[k] = B[k], B[k - 1]
+        G[k - 1], G[k] = G[k], G[k - 1]
+        for row in G:
+            row[k - 1], row[k] = row[k], row[k - 1]
+    
+    def _remove(self, k: int) -> None:
+        del self.B[k], self.r[k], self.mu[k], self.G[k]
+        for row in self.G:
+            del row[k]
+    
+    def lll(self, start: int = 0) -> None:
+        """LLL desde la fila start (las anteriores ya están reducidas)"""
+        B, r, mu = self.B, self.r, self.mu
+        while B and not any(B[0]):
+            self._remove(0)
+        if not B:
+            return
+        if start <= 1:
+            r[0][0] = self._real(self.G[0][0])
+        
+        k, steps = max(start, 1), 0
+        while k < len(B):
+            steps += 1
+            if self.checkpoint and steps % 256 == 0:
+                self.checkpoint()
+            
+            self._size_reduce(k)
+            norm = self._real(self.G[k][k])
+            if not norm:
+                # Vector dependiente de los anteriores (base generadora)
+                self._remove(k)
+                continue
+            
+            # ||b*_k||² + μ²_{k,k-1}·||b*_{k-1}||²
+            s = norm
+            for j in range(k - 1):
+                s -= mu[k][j] * r[k][j]
+            if self.delta * r[k - 1][k - 1] > s:
+                self._swap(k)
+                if k == 1:
+                    r[0][0] = self._real(self.G[0][0])
+                k = max(k - 1, 1)
+            else:
+                r[k][k] = s - mu[k][k - 1] * r[k][k - 1]
+                k += 1
+    
+    def _enumerate(self, start: int, end: int) -> Optional[List[int]]:
+        """
+        Coeficientes del vector más corto de la proyección del bloque
+        [start, end) si es más corto que b*_start (Schnorr-Euchner)
+        """
+        n = end - start
+        scale = self.r[start][start]
+        norms = [float(self.r[start + i][start + i] / scale) for i in range(n)]
+        mu = [[float(self.mu[start + i][start + j]) for j in range(n)] for i in range(n)]
+        x = [0] * n
+        best = [None, 0.99]
+        
+        def search(i: int, partial: float) -> None:
+            center = -sum(x[l] * mu[l][i] for l in range(i + 1, n))
+            # En la capa superior basta x_i >= 0 (v y -v tienen la misma norma)
+            candidates = range(0, 1 << 62) if not any(x[i + 1:]) else _zigzag(center)
+            for xi in candidates:
+                distance = partial + (xi - center) ** 2 * norms[i]
+                if distance >= best[1]:
+                    break
+                x[i] = xi
+                if i == 0:
+                    if any(x):
+                        best[0], best[1] = list(x), distance
+                else:
+                    search(i - 1, distance)
+            x[i] = 0
+        
+        search(n - 1, 0.0)
+        return best[0]
+    
+    def _insert(self, start: int, coefficients: List[int]) -> bool:
+        """
+        Insertar v = Σ x_i·b_{start+i} en la posición start. Si algún x_i es ±1
+        la sustitución de b_{start+i} por v es unimodular y la base sigue siéndolo.
+        """
+        pivots = [i for i, c in enumerate(coefficients) if abs(c) == 1]
+        if not pivots:
+            return False
+        pivot = start + pivots[-1]
+        v = [0] * len(self.B[0])
+        for i, c in enumerate(coefficients):
+            if c:
+                v = [a + c * b for a, b in zip(v, self.B[start + i])]
+        del self.B[pivot]
+        self.B.insert(start, v)
+        self._gram()
+        return True
+    
+    def bkz(self, block_size: int, tours: int) -> None:
+        self.lll()
+        for _ in range(tours):
+            changed = False
+            for start in range(len(self.B) - 1):
+                if self.checkpoint:
+                    self.checkpoint()
+                end = min(start + block_size, len(self.B))
+                coefficients = self._enumerate(start, end)
+                if coefficients and self._insert(start, coefficients):
+                    self.lll(start)
+                    changed = True
+            if not changed:
+                break
+
+
+def lll_reduce(basis: Basis, delta: float = 0.99,
+               checkpoint: Optional[Callable[[], None]] = None) -> Basis:
+    """Base LLL-reducida (sin vectores nulos) del retículo generado por las filas"""
+    if HAS_FPYLLL:
+        A = IntegerMatrix.from_matrix(basis)
+        LLL.reduction(A, delta=delta)
+        return [row for row in _rows(A) if any(row)]
+    reducer = _Reducer(basis, delta, checkpoint)
+    reducer.lll()
+    return reducer.B
+
+
+def bkz_reduce(basis: Basis, block_size: int = 20, delta: float = 0.99, tours: int = 8,
+               checkpoint: Optional[Callable[[], None]] = None) -> Basis:
+    """Base BKZ-reducida con bloques de block_size"""
+    if HAS_FPYLLL:
+        A = IntegerMatrix.from_matrix(basis)
+        BKZ.reduction(A, BKZ.Param(block_size=block_size, max_loops=tours, delta=delta))
+        return [row for row in _rows(A) if any(row)]
+    reducer = _Reducer(basis, delta, checkpoint)
+    reducer.bkz(block_size, tours)
+    return reducer.B
+
+
+def _rows(A) -> Basis:
+    return [[A[i, j] for j in range(A.ncols)] for i in range(A.nrows)]
+
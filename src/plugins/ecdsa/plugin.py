@@ -0,0 +1,286 @@
+"""
+Plugin ECDSA - Análisis de volcados de firmas
+"""
+
+import re
+import json
+from typing import Dict, Any, Optional, Tuple
+from Crypto.Util.number import long_to_bytes
+
+from ..base import MultiTechniquePlugin
+from ...utils.crypto_helpers import decrypt_with_secret, extract_flag, parse_int
+from ...models.data import ChallengeData, SolutionResult, PluginInfo, ChallengeType
+from ..elliptic_curve.ec_arith import CurveArithmetic
+from ..elliptic_curve.curve_catalog import default_catalog
+from ..rsa.modular_roots import ModularRoots
+from .signatures import SignatureSet, reused_nonce_keys
+from .hnp import HiddenNumberProblem
+
+
+class ECDSAPlugin(MultiTechniquePlugin):
+    """Plugin para recuperar claves ECDSA a partir de firmas con nonces débiles"""
+    
+    def __init__(self):
+        super().__init__()
+        
+        # Ficheros de parámetros que se leen enteros (los volcados se leen por líneas)
+        self.max_params_file_size = 1 << 20
+        
+        # Firmas como máximo en el retículo HNP
+        self.max_hnp_signatures = 120
+        
+        # Última lectura de firmas: (ficheros, n, hash) -> SignatureSet
+        self._loaded: Optional[Tuple[Tuple, SignatureSet]] = None
+    
+    def _create_plugin_info(self) -> PluginInfo:
+        return PluginInfo(
+            name="ecdsa",
+            version="1.0.0",
+            description="Plugin para ataques a firmas ECDSA (nonces repetidos, sesgados o filtrados)",
+            supported_types=[ChallengeType.ELLIPTIC_CURVE, ChallengeType.MIXED],
+            techniques=["nonce_reuse", "hnp_lattice"],
+            priority=78
+        )
+    
+    def can_solve(self, challenge_data: ChallengeData) -> float:
+        """Evaluar si hay firmas ECDSA en el desafío"""
+        confidence = 0.0
+        
+        if challenge_data.challenge_type == ChallengeType.ELLIPTIC_CURVE:
+            confidence += 0.5
+        elif challenge_data.challenge_type == ChallengeType.MIXED:
+            confidence += 0.2
+        
+        for file_info in challenge_data.files:
+            filename = file_info.path.name.lower()
+            if any(pattern in filename for pattern in ['ecdsa', 'sig', 'nonce']):
+                confidence += 0.2
+            
+            head = self._read_head(file_info.path)
+            if head:
+                head_lower = head.lower()
+                if any(pattern in head_lower for pattern in ['ecdsa', 'signature', 'nonce']):
+                    confidence += 0.2
+                if re.search(r'\br\b["\']?\s*[=:,]', head) and re.search(r'\bs\b["\']?\s*[=:,]', head):
+                    confidence += 0.3
+        
+        return min(confidence, 1.0)
+    
+    def _initialize_techniques(self) -> Dict[str, callable]:
+        """Inicializar técnicas ECDSA"""
+        return {
+            "nonce_reuse": self._try_nonce_reuse,
+            "hnp_lattice": self._try_hnp_lattice
+        }
+    
+    def _read_head(self, path, size: int = 1 << 16) -> Optional[str]:
+        """Primeros bytes de un fichero como texto (los volcados pueden ser grandes)"""
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                return f.read(size)
+        except Exception as e:
+            self.logger.debug(f"No se pudo leer {path}: {e}")
+            return None
+    
+    def _extract_parameters(self, challenge_data: ChallengeData) -> Dict[str, Any]:
+        """
+        Curva, clave pública y bits de los nonces. La curva puede venir por
+        nombre (catálogo), por (a, b, p, G, n) o solo por n.
+        """
+        params: Dict[str, Any] = {}
+        for file_info in challenge_data.files:
+            head = self._read_head(file_info.path)
+            if not head:
+                continue
+            
+            if file_info.path.stat().st_size <= self.max_params_file_size:
+                try:
+                    data = json.loads(self._read_file_content(file_info.path) or '')
+                except ValueError:
+                    data = None
+                if isinstance(data, dict):
+                    for key in ['a', 'b', 'p', 'n', 'nonce_bits', 'leak_bits']:
+                        if key in data and parse_int(data[key]) is not None:
+                            params[key] = parse_int(data[key])
+                    for key in ['curve', 'hash', 'leak_type', 'ciphertext', 'iv', 'encrypted_flag']:
+                        if isinstance(data.get(key), str):
+                            params['ciphertext' if key == 'encrypted_flag' else key] = data[key]
+                    for key in ['G', 'Q', 'pubkey', 'public_key']:
+                        if data.get(key) is not None:
+                            params['G' if key == 'G' else 'Q'] = data[key]
+            
+            # Nombre de curva mencionado en el texto (p. ej. en el código del reto)
+            if 'curve' not in params:
+                for name in re.findall(r'\b(secp\d+[rk]1|prime\d+v1|P-?\d{3}|brainpoolP\d+r1)\b', head):
+                    if self._catalog_entry(name):
+                        params['curve'] = name
+                        break
+        
+        entry = self._catalog_entry(params['curve']) if 'curve' in params else None
+        if entry:
+            for key, value in [('a', entry.a), ('b', entry.b), ('p', entry.p), ('n', entry.n), ('G', entry.G)]:
+                params.setdefault(key, value)
+        return params
+    
+    @staticmethod
+    def _catalog_entry(name: str):
+        """Curva del catálogo por nombre o alias (P256 = P-256)"""
+        catalog = default_catalog()
+        return catalog.by_name(name) or catalog.by_name(re.sub(r'^P-?(\d{3})$', r'P-\1', name))
+    
+    def _load_signatures(self, challenge_data: ChallengeData, params: Dict[str, Any]) -> SignatureSet:
+        """Leer las firmas de todos los ficheros (una sola vez por desafío)"""
+        paths = tuple(str(f.path) for f in challenge_data.files)
+        key = (paths, params['n'], params.get('hash', 'sha256'))
+        if self._loaded and self._loaded[0] == key:
+            return self._loaded[1]
+        
+        signatures = SignatureSet(params['n'], params.get('hash', 'sha256'))
+        for file_info in challenge_data.files:
+            self._check_timeout()
+            signatures.read_file(file_info.path)
+        self._loaded = (key, signatures)
+        return signatures
+    
+    def _curve(self, params: Dict[str, Any]) -> Optional[CurveArithmetic]:
+        if all(k in params for k in ['a', 'b', 'p', 'G']):
+            return CurveArithmetic(params['a'], params['b'], params['p'])
+        return None
+    
+    def _decode_point(self, value: Any, curve: Optional[CurveArithmetic]) -> Optional[Tuple[int, int]]:
+        """Punto (x, y), [x, y] o SEC1 en hexadecimal (comprimido o no)"""
+        if isinstance(value, (list, tuple)) and len(value) == 2:
+            return parse_int(value[0]), parse_int(value[1])
+        if isinstance(value, dict):
+            return parse_int(value.get('x')), parse_int(value.get('y'))
+        if not isinstance(value, str) or not curve:
+            return None
+        
+        raw = bytes.fromhex(value.lower().removeprefix('0x'))
+        size = (curve.p.bit_length() + 7) // 8
+        if raw[:1] == b'\x04' and len(raw) == 2 * size + 1:
+            return int.from_bytes(raw[1:size + 1], 'big'), int.from_bytes(raw[size + 1:], 'big')
+        if raw[:1] in (b'\x02', b'\x03') and len(raw) == size + 1:
+            x = int.from_bytes(raw[1:], 'big')
+            y = ModularRoots.tonelli_shanks((x ** 3 + curve.a * x + curve.b) % curve.p, curve.p)
+            if y is None:
+                return None
+            return (x, y if y % 2 == raw[0] % 2 else curve.p - y)
+        return None
+    
+    def _key_matches(self, d: int, params: Dict[str, Any], pubkey: Any = None) -> Optional[bool]:
+        """d·G = Q con la clave pública de la firma o del desafío; None si no se puede comprobar"""
+        curve = self._curve(params)
+        pubkey = pubkey if pubkey is not None else params.get('Q')
+        if not curve or pubkey is None:
+            return None
+        try:
+            Q = self._decode_point(pubkey, curve)
+        except ValueError:
+            return None
+        if not Q:
+            return None
+        return curve.multiply(d, self._decode_point(params['G'], curve)) == Q
+    
+    def _try_nonce_reuse(self, challenge_data: ChallengeData) -> SolutionResult:
+        """Firmas de una misma clave con el mismo r: k y d salen de dos ecuaciones lineales"""
+        params = self._extract_parameters(challenge_data)
+        if 'n' not in params:
+            return self._create_failure_result("Orden del grupo desconocido (n o nombre de curva)")
+        n = params['n']
+        signatures = self._load_signatures(challenge_data, params)
+        
+        groups = signatures.repeated_nonces()
+        if not groups:
+            return self._create_failure_result(
+                "No hay nonces repetidos", signatures=len(signatures)
+            )
+        
+        unverified = None
+        for group in groups:
+            self._check_timeout()
+            pubkey = signatures.pubkey(group[0])
+            first, second = signatures.signature(group[0]), signatures.signature(group[1])
+            for d, k in reused_nonce_keys(n, first, second):
+                matches = self._key_matches(d, params, pubkey)
+                if matches:
+                    return self._private_key_result(
+                        d, "nonce_reuse", params, confidence=0.95,
+                        nonce=k, reused_signatures=group, signatures=len(signatures)
+                    )
+                if matches is None and unverified is None:
+                    # Sin clave pública: el nonce repetido casi siempre es el mismo k
+                    unverified = (d, k, group)
+        
+        if unverified:
+            d, k, group = unverified
+            return self._private_key_result(
+                d, "nonce_reuse", params, confidence=0.7,
+                nonce=k, reused_signatures=group, signatures=len(signatures)
+            )
+        return self._create_failure_result(
+            "Los nonces repetidos no dan la clave pública", repeated_groups=len(groups)
+        )
+    
+    def _try_hnp_lattice(self, challenge_data: ChallengeData) -> SolutionResult:
+        """
+        Nonces sesgados (k < 2^nonce_bits) o con bits conocidos (columna leak con
+        leak_bits/leak_type): problema del número oculto con LLL y BKZ
+        """
+        params = self._extract_parameters(challenge_data)
+        if 'n' not in params:
+            return self._create_failure_result("Orden del grupo desconocido (n o nombre de curva)")
+        n = params['n']
+        nonce_bits = params.get('nonce_bits', n.bit_length())
+        leak_bits = params.get('leak_bits', 0)
+        if nonce_bits >= n.bit_length() and not leak_bits:
+            return self._create_failure_result(
+                "Sin información de los nonces (nonce_bits o leak_bits)"
+            )
+        
+        signatures = self._load_signatures(challenge_data, params)
+        
+        # Una clave: la del desafío o la más firmada del volcado
+        by_key: Dict[Any, list] = {}
+        for i in range(len(signatures)):
+            by_key.setdefault(signatures.pubkey(i), []).append(i)
+        pubkey, indices = max(by_key.items(), key=lambda item: len(item[1]), default=(None, []))
+        
+        hnp = HiddenNumberProblem(n)
+        for i in indices[:self.max_hnp_signatures]:
+            r, s, h = signatures.signature(i)
+            hnp.add_signature(
+                r, s, h, nonce_bits=nonce_bits, leak=signatures.value('leak', i),
+                leak_bits=leak_bits, leak_type=params.get('leak_type', 'msb')
+            )
+        if len(hnp.samples) < hnp.samples_needed():
+            self.logger.info(
+                f"HNP con {len(hnp.samples)} firmas de {hnp.samples_needed()} recomendadas"
+            )
+        
+        d = hnp.solve(checkpoint=self._check_timeout)
+        if d is None or self._key_matches(d, params, pubkey) is False:
+            return self._create_failure_result(
+                "La reducción del retículo no encontró la clave", signatures=len(hnp.samples)
+            )
+        return self._private_key_result(
+            d, "hnp_lattice", params, confidence=0.95, signatures=len(hnp.samples)
+        )
+    
+    def _private_key_result(self, d: int, method: str, params: Dict[str, Any],
+                            confidence: float, **details) -> SolutionResult:
+        """Resultado de éxito: flag en la propia clave o en el texto cifrado con ella"""
+        flag = self._extract_flag(long_to_bytes(d).decode('latin-1'))
+        if not flag and 'ciphertext' in params:
+            flag = decrypt_with_secret(d, params)
+        return self._create_success_result(
+            flag=flag or f"Clave privada encontrada: d = {d}",
+            method=method,
+            confidence=confidence,
+            private_key=d,
+            **details
+        )
+    
+    def _extract_flag(self, text: str) -> Optional[str]:
+        """Buscar patrones de flag"""
+        return extract_flag(text)
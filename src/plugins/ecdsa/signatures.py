@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Volcados de firmas ECDSA
+Las firmas se leen línea a línea (JSON lines, CSV con cabecera o texto
+clave = valor; un documento JSON completo solo si el fichero no admite otra
+lectura) y se guardan en columnas de ancho fijo con palabras de 64 bits
+big-endian, no como objetos int de Python: 10^5 firmas ocupan unos MB y el
+índice de r se construye en una sola pasada.
+"""
+import csv
+import hashlib
+import json
+import re
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from ...utils.crypto_helpers import parse_int
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Nombres de campo habituales -> columna
+FIELD_ALIASES = {
+    'r': 'r', 's': 's',
+    'h': 'h', 'z': 'h', 'e': 'h', 'hash': 'h', 'msg_hash': 'h', 'digest': 'h',
+    'msg': 'msg', 'message': 'msg', 'm': 'msg',
+    'pubkey': 'pubkey', 'public_key': 'pubkey', 'pub': 'pubkey', 'q': 'pubkey',
+    'leak': 'leak', 'k_leak': 'leak', 'known': 'leak'
+}
+
+_KEY_VALUE = re.compile(r'(\w+)\s*[=:]\s*"?(0x[0-9a-fA-F]+|[0-9a-fA-F]+)"?')
+
+
+def hash_to_int(message: bytes, n: int, hash_name: str = 'sha256') -> int:
+    """Hash del mensaje truncado a los bits de n, como en ECDSA"""
+    digest = hashlib.new(hash_name, message).digest()
+    value = int.from_bytes(digest, 'big')
+    excess = len(digest) * 8 - n.bit_length()
+    return value >> excess if excess > 0 else value
+
+
+class SignatureSet:
+    """Firmas (r, s, h) de un mismo grupo de orden n en columnas de ancho fijo"""
+    
+    COLUMNS = ('r', 's', 'h', 'leak')
+    
+    def __init__(self, n: int, hash_name: str = 'sha256'):
+        self.n = n
+        self.hash_name = hash_name
+        self.width = (n.bit_length() + 63) // 64 * 8
+        self._columns = {name: bytearray() for name in self.COLUMNS}
+        # Índice de la clave pública de cada firma (-1 = desconocida)
+        self._key_ids = array('i')
+        self.pubkeys: List[Hashable] = []
+        self._pubkey_index: Dict[Hashable, int] = {}
+        self.has_leaks = False
+    
+    def __len__(self) -> int:
+        return len(self._key_ids)
+    
+    def add(self, r: int, s: int, h: int, pubkey: Optional[Hashable] = None, leak: int = 0) -> bool:
+        """Añadir una firma; se descartan las que no son válidas módulo n"""
+        n, width = self.n, self.width
+        if not (0 < r < n and 0 < s < n):
+            return False
+        for name, value in (('r', r), ('s', s), ('h', h % n), ('leak', leak % n)):
+            self._columns[name] += value.to_bytes(width, 'big')
+        
+        key_id = -1
+        if pubkey is not None:
+            key_id = self._pubkey_index.setdefault(pubkey, len(self.pubkeys))
+            if key_id == len(self.pubkeys):
+                self.pubkeys.append(pubkey)
+        self._key_ids.append(key_id)
+        self.has_leaks |= leak != 0
+        return True
+    
+    def add_record(self, record: Dict[str, Any]) -> bool:
+        """Añadir una firma a partir de un registro con nombres de campo libres"""
+        fields = {}
+        for key, value in record.items():
+            name = FIELD_ALIASES.get(str(key).strip().lower())
+            if name:
+                fields[name] = value
+        
+        r, s = parse_int(fields.get('r')), parse_int(fields.get('s'))
+        if r is None or s is None:
+            return False
+        h = parse_int(fields.get('h'))
+        if h is None and 'msg' in fields:
+            message = fields['msg']
+            message = message.encode() if isinstance(message, str) else bytes(message)
+            h = hash_to_int(message, self.n, self.hash_name)
+        if h is None:
+            return False
+        leak = parse_int(fields.get('leak')) or 0
+        return self.add(r, s, h, pubkey=_pubkey_key(fields.get('pubkey')), leak=leak)
+    
+    def read_lines(self, lines: Iterable[str]) -> int:
+        """Leer firmas de un flujo de líneas; devuelve cuántas se añadieron"""
+        added, header = 0, None
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            
+            record = None
+            if line.startswith('{'):
+                try:
+                    # Elementos de una lista JSON con un objeto por línea
+                    record = json.loads(line.rstrip(','))
+                except ValueError:
+                    record = None
+            else:
+                values = next(csv.reader([line]))
+                if header is not None and len(values) == len(header):
+                    record = dict(zip(header, values))
+                elif {'r', 's'} <= {FIELD_ALIASES.get(v.strip().lower()) for v in values}:
+                    header = values
+                    continue
+                else:
+                    record = dict(_KEY_VALUE.findall(line))
+            
+            if isinstance(record, dict) and self.add_record(record):
+                added += 1
+        return added
+    
+    def read_file(self, path: Path) -> int:
+        """Leer firmas de un fichero sin cargarlo entero salvo que sea un único documento JSON"""
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                added = self.read_lines(f)
+                if added:
+                    return added
+                
+                # JSON multilínea: lista de firmas o {"signatures": [...]}
+                f.seek(0)
+                try:
+                    data = json.load(f)
+                except ValueError:
+                    return 0
+        except OSError:
+            return 0
+        
+        if isinstance(data, dict):
+            data = data.get('signatures') or data.get('sigs') or []
+        return sum(1 for record in data if isinstance(record, dict) and self.add_record(record))
+    
+    def value(self, column: str, i: int) -> int:
+        """Valor de la fila i de una columna como entero"""
+        width = self.width
+        return int.from_bytes(self._columns[column][i * width:(i + 1) * width], 'big')
+    
+    def signature(self, i: int) -> Tuple[int, int, int]:
+        """(r, s, h) de la firma i"""
+        return self.value('r', i), self.value('s', i), self.value('h', i)
+    
+    def pubkey(self, i: int) -> Optional[Hashable]:
+        key_id = self._key_ids[i]
+        return self.pubkeys[key_id] if key_id >= 0 else None
+    
+    def column(self, name: str):
+        """Columna como matriz (firmas × palabras) de uint64 big-endian"""
+        if not HAS_NUMPY:
+            raise RuntimeError("numpy no disponible")
+        # Copia: una vista bloquearía el crecimiento del bytearray
+        return np.frombuffer(bytes(self._columns[name]), dtype='>u8').reshape(len(self), self.width // 8)
+    
+    def _low_words(self) -> List[int]:
+        """Palabra menos significativa de cada r"""
+        if HAS_NUMPY:
+            return self.column('r')[:, -1].tolist()
+        raw, width = self._columns['r'], self.width
+        return [int.from_bytes(raw[i * width - 8:i * width], 'big') for i in range(1, len(self) + 1)]
+    
+    def repeated_nonces(self) -> List[List[int]]:
+        """
+        Grupos de firmas de una misma clave con el mismo r (nonce repetido).
+        Índice hash sobre la palabra baja de r en una pasada; las coincidencias
+        se confirman comparando r completo.
+        """
+        raw, width = self._columns['r'], self.width
+        first_seen: Dict[Tuple[int, int], int] = {}
+        groups: Dict[int, List[int]] = {}
+        for i, (low, key_id) in enumerate(zip(self._low_words(), self._key_ids)):
+            first = first_seen.setdefault((key_id, low), i)
+            if first != i and raw[first * width:(first + 1) * width] == raw[i * width:(i + 1) * width]:
+                groups.setdefault(first, [first]).append(i)
+        return list(groups.values())
+
+
+def _pubkey_key(value: Any) -> Optional[Hashable]:
+    """Clave pública normalizada: (x, y) o cadena hexadecimal SEC1 en minúsculas"""
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        value = [value.get('x'), value.get('y')]
+    if isinstance(value, (list, tuple)) and len(value) == 2:
+        x, y = parse_int(value[0]), parse_int(value[1])
+        return (x, y) if x is not None and y is not None else None
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if ',' in value:
+            return _pubkey_key(value.strip('()[] ').split(','))
+        return value.removeprefix('0x') or None
+    return None
+
+
+def reused_nonce_keys(n: int, first: Tuple[int, int, int],
+                      second: Tuple[int, int, int]) -> List[Tuple[int, int]]:
+    """
+    (d, k) candidatos para dos firmas con el mismo r: k o -k dan el mismo r,
+    así que k = (h1 - h2)/(s1 ∓ s2) y d = (s1·k - h1)/r.
+    """
+    (r, s1, h1), (_, s2, h2) = first, second
+    candidates = []
+    for sign in (1, -1):
+        denominator = (s1 - sign * s2) % n
+        if denominator == 0:
+            continue
+        k = (h1 - h2) * pow(denominator, -1, n) % n
+        d = (s1 * k - h1) * pow(r, -1, n) % n
+        candidates.append((d, k))
+    return candidates
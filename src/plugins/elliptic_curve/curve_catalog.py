@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Catálogo de curvas estándar y débiles conocidas
+Las curvas se leen de data/curves.json la primera vez que se consultan y se
+indexan por un hash de (p, a mod p, b mod p): reconocer una curva es una
+búsqueda en diccionario. Los generadores del catálogo usan tablas de base
+fija guardadas en disco, con las que k·G sale solo de sumas.
+"""
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .ec_arith import INFINITY, Affine, CurveArithmetic
+from ...utils.config import config
+from ...utils.logging import get_logger
+
+CATALOG_PATH = Path(__file__).parent / "data" / "curves.json"
+
+
+def curve_key(p: int, a: int, b: int) -> str:
+    """Clave del índice: SHA-256 de (p, a mod p, b mod p)"""
+    return hashlib.sha256(f"{p}:{a % p}:{b % p}".encode()).hexdigest()
+
+
+@dataclass
+class CatalogCurve:
+    """Entrada del catálogo (y² = x³ + ax + b sobre F_p)"""
+    name: str
+    family: str
+    p: int
+    a: int
+    b: int
+    G: Optional[Tuple[int, int]] = None
+    n: Optional[int] = None
+    h: Optional[int] = None
+    weakness: Optional[str] = None
+    order: Optional[int] = None
+    order_factors: List[int] = field(default_factory=list)
+    aliases: List[str] = field(default_factory=list)
+    
+    @property
+    def key(self) -> str:
+        return curve_key(self.p, self.a, self.b)
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CatalogCurve':
+        """Entrada del JSON con los enteros en hexadecimal"""
+        def number(value):
+            return int(value, 16) if isinstance(value, str) else value
+        
+        G = tuple(number(c) for c in data['G']) if data.get('G') else None
+        n, h = number(data.get('n')), data.get('h')
+        order = number(data.get('order'))
+        if order is None and n is not None and h is not None:
+            order = n * h
+        return cls(
+            name=data['name'],
+            family=data.get('family', 'standard'),
+            p=number(data['p']),
+            a=number(data['a']),
+            b=number(data['b']),
+            G=G,
+            n=n,
+            h=h,
+            weakness=data.get('weakness'),
+            order=order,
+            order_factors=[number(f) for f in data.get('order_factors', [])],
+            aliases=data.get('aliases', [])
+        )
+
+
+class FixedBaseTable:
+    """
+    Tabla de base fija con ventanas con signo de `width` bits:
+    fila i = (1..2^(w-1))·2^(w·i)·G. k·G necesita una suma mixta por ventana
+    y ninguna duplicación.
+    """
+    
+    def __init__(self, arith: CurveArithmetic, G: Tuple[int, int], bits: int, width: int = 6,
+                 order: Optional[int] = None, path: Optional[Path] = None):
+        """
+        Args:
+            bits: Tamaño máximo de los escalares (tras reducir por order)
+            order: Orden de G, para reducir los escalares
+            path: Fichero donde se guarda la tabla (None = solo en memoria)
+        """
+        self.arith = arith
+        self.G = G
+        self.width = width
+        self.order = order
+        self.path = path
+        # Una fila extra para el acarreo del último dígito con signo
+        self.rows_count = -(-bits // width) + 1
+        self._rows: Optional[List[List[Tuple[int, int]]]] = None
+    
+    @property
+    def rows(self) -> List[List[Tuple[int, int]]]:
+        """Filas de la tabla, leídas de disco o calculadas la primera vez"""
+        if self._rows is None:
+            self._rows = self._load() or self._build()
+            if self.path and not self.path.exists():
+                self._save()
+        return self._rows
+    
+    def _build(self) -> List[List[Tuple[int, int]]]:
+        arith = self.arith
+        half = 1 << (self.width - 1)
+        jacobian = []
+        base = arith.to_jacobian(self.G)
+        for _ in range(self.rows_count):
+            row, step = [base], arith.to_affine(base)
+            for _ in range(half - 1):
+                row.append(arith.add_mixed(row[-1], step))
+            jacobian.extend(row)
+            for _ in range(self.width):
+                base = arith.double(base)
+        
+        # Una sola inversión para toda la tabla
+        affine = arith.batch_to_affine(jacobian)
+        return [affine[i:i + half] for i in range(0, len(affine), half)]
+    
+    def _load(self) -> Optional[List[List[Tuple[int, int]]]]:
+        if not self.path or not self.path.exists():
+            return None
+        try:
+            data = json.loads(self.path.read_text())
+            if data['width'] != self.width or len(data['rows']) != self.rows_count:
+                return None
+            return [[(int(x, 16), int(y, 16)) for x, y in row] for row in data['rows']]
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def _save(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            rows = [[[format(x, 'x'), format(y, 'x')] for x, y in row] for row in self._rows]
+            self.path.write_text(json.dumps({'width': self.width, 'rows': rows}))
+        except OSError as e:
+            get_logger(__name__).debug(f"No se pudo guardar la tabla de base fija: {e}")
+    
+    def recode(self, k: int) -> List[int]:
+        """Dígitos con signo en [-2^(w-1), 2^(w-1)], del menos significativo al más"""
+        w = self.width
+        mask, half = (1 << w) - 1, 1 << (w - 1)
+        digits = []
+        while k:
+            digit = k & mask
+            k >>= w
+            if digit > half:
+                digit -= 1 << w
+                k += 1
+            digits.append(digit)
+        return digits
+    
+    def multiply(self, k: int) -> Affine:
+        """k·G"""
+        if self.order:
+            k %= self.order
+        if k < 0:
+            return self.arith.negate(self.multiply(-k))
+        
+        digits = self.recode(k)
+        rows = self.rows
+        if len(digits) > len(rows):
+            return self.arith.to_affine(self.arith.multiply_wnaf(k, self.G))
+        
+        arith = self.arith
+        result = INFINITY
+        for row, digit in zip(rows, digits):
+            if digit > 0:
+                result = arith.add_mixed(result, row[digit - 1])
+            elif digit < 0:
+                result = arith.add_mixed(result, arith.negate(row[-digit - 1]))
+        return arith.to_affine(result)
+
+
+class CurveCatalog:
+    """Catálogo indexado por curve_key(p, a, b), cargado de forma perezosa"""
+    
+    def __init__(self, path: Path = CATALOG_PATH, table_dir: Optional[Path] = None):
+        self.path = path
+        self.table_dir = table_dir
+        self._by_key: Optional[Dict[str, CatalogCurve]] = None
+        self._by_name: Dict[str, CatalogCurve] = {}
+        self._tables: Dict[str, FixedBaseTable] = {}
+    
+    def _index(self) -> Dict[str, CatalogCurve]:
+        if self._by_key is None:
+            entries = [CatalogCurve.from_dict(d) for d in json.loads(self.path.read_text())]
+            self._by_key = {entry.key: entry for entry in entries}
+            for entry in entries:
+                for name in [entry.name] + entry.aliases:
+                    self._by_name[name.lower()] = entry
+        return self._by_key
+    
+    def lookup(self, p: int, a: int, b: int) -> Optional[CatalogCurve]:
+        """Entrada de la curva (p, a, b) o None"""
+        return self._index().get(curve_key(p, a, b))
+    
+    def by_name(self, name: str) -> Optional[CatalogCurve]:
+        self._index()
+        return self._by_name.get(name.lower())
+    
+    def __iter__(self) -> Iterator[CatalogCurve]:
+        return iter(self._index().values())
+    
+    def __len__(self) -> int:
+        return len(self._index())
+    
+    def fixed_base_table(self, entry: CatalogCurve, arith: Optional[CurveArithmetic] = None,
+                         width: int = 6) -> FixedBaseTable:
+        """Tabla de base fija del generador de `entry` (compartida entre usos)"""
+        key = f"{entry.key}_w{width}"
+        if key not in self._tables:
+            bits = (entry.n or entry.p).bit_length()
+            path = self.table_dir / f"{key}.json" if self.table_dir else None
+            self._tables[key] = FixedBaseTable(
+                arith or CurveArithmetic(entry.a, entry.b, entry.p), entry.G, bits,
+                width=width, order=entry.n, path=path
+            )
+        return self._tables[key]
+
+
+_DEFAULT_CATALOG: Optional[CurveCatalog] = None
+
+
+def default_catalog() -> CurveCatalog:
+    """Catálogo incluido con el paquete, con las tablas en el directorio de caché"""
+    global _DEFAULT_CATALOG
+    if _DEFAULT_CATALOG is None:
+        table_dir = Path(config.cache.cache_dir) / "ecc_tables" if config.cache.disk_cache_enabled else None
+        _DEFAULT_CATALOG = CurveCatalog(table_dir=table_dir)
+    return _DEFAULT_CATALOG
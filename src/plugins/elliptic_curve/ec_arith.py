@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Aritmética interna de curvas elípticas en coordenadas jacobianas
+Puntos como tuplas de enteros, suma mixta, duplicación especializada según a,
+multiplicación escalar wNAF / escalera de Montgomery y normalización por lotes
+"""
+from typing import List, Optional, Sequence, Tuple
+
+# Punto afín (x, y) o None para el punto en el infinito
+Affine = Optional[Tuple[int, int]]
+# Punto jacobiano (X, Y, Z) con x = X/Z², y = Y/Z³; Z = 0 es el infinito
+Jacobian = Tuple[int, int, int]
+
+INFINITY: Jacobian = (1, 1, 0)
+
+
+class CurveArithmetic:
+    """Operaciones sobre y² = x³ + ax + b (mod p) sin objetos intermedios"""
+    
+    def __init__(self, a: int, b: int, p: int):
+        self.a = a % p
+        self.b = b % p
+        self.p = p
+        
+        # Fórmula de duplicación según a: 0 (p.ej. secp256k1), -3 (curvas NIST) o genérica
+        if self.a == 0:
+            self._a_kind = 0
+        elif self.a == p - 3:
+            self._a_kind = -3
+        else:
+            self._a_kind = None
+        
+        # (G, tabla) de base fija para los múltiplos de un generador conocido
+        self._fixed_base = None
+    
+    # Conversión de coordenadas
+    
+    @staticmethod
+    def to_jacobian(point: Affine) -> Jacobian:
+        """Punto afín a jacobiano (Z = 1)"""
+        if point is None:
+            return INFINITY
+        return (point[0], point[1], 1)
+    
+    def to_affine(self, point: Jacobian) -> Affine:
+        """Punto jacobiano a afín (una inversión)"""
+        X, Y, Z = point
+        if Z == 0:
+            return None
+        p = self.p
+        z_inv = pow(Z, -1, p)
+        z_inv2 = z_inv * z_inv % p
+        return (X * z_inv2 % p, Y * z_inv2 * z_inv % p)
+    
+    def batch_to_affine(self, points: Sequence[Jacobian]) -> List[Affine]:
+        """
+        Normalizar varios puntos con una sola inversión
+        (truco de inversión simultánea de Montgomery).
+        """
+        p = self.p
+        
+        # Productos prefijo de las Z no nulas
+        prefix = []
+        acc = 1
+        for X, Y, Z in points:
+            if Z:
+                acc = acc * Z % p
+            prefix.append(acc)
+        
+        inv = pow(acc, -1, p) if acc != 1 else 1
+        
+        result: List[Affine] = [None] * len(points)
+        for i in range(len(points) - 1, -1, -1):
+            X, Y, Z = points[i]
+            if not Z:
+                continue
+            previous = prefix[i - 1] if i > 0 else 1
+            z_inv = inv * previous % p
+            inv = inv * Z % p
+            z_inv2 = z_inv * z_inv % p
+            result[i] = (X * z_inv2 % p, Y * z_inv2 * z_inv % p)
+        
+        return result
+    
+    # Operaciones de grupo
+    
+    def is_on_curve(self, point: Affine) -> bool:
+        """Verificar si un punto afín satisface la ecuación"""
+        if point is None:
+            return True
+        x, y = point
+        p = self.p
+        return (y * y - (x * x * x + self.a * x + self.b)) % p == 0
+    
+    def negate(self, point: Affine) -> Affine:
+        """Opuesto de un punto afín"""
+        if point is None:
+            return None
+        return (point[0], -point[1] % self.p)
+    
+    def double(self, point: Jacobian) -> Jacobian:
+        """2P en coordenadas jacobianas"""
+        X, Y, Z = point
+        if Z == 0 or Y == 0:
+            return INFINITY
+        p = self.p
+        
+        YY = Y * Y % p
+        S = 4 * X * YY % p
+        if self._a_kind == 0:
+            M = 3 * X * X % p
+        elif self._a_kind == -3:
+            ZZ = Z * Z % p
+            M = 3 * (X - ZZ) * (X + ZZ) % p
+        else:
+            ZZ = Z * Z % p
+            M = (3 * X * X + self.a * ZZ * ZZ) % p
+        
+        X3 = (M * M - 2 * S) % p
+        Y3 = (M * (S - X3) - 8 * YY * YY) % p
+        Z3 = 2 * Y * Z % p
+        return (X3, Y3, Z3)
+    
+    def add_mixed(self, P: Jacobian, Q: Affine) -> Jacobian:
+        """P + Q con P jacobiano y Q afín (Z2 = 1)"""
+        if Q is None:
+            return P
+        X1, Y1, Z1 = P
+        if Z1 == 0:
+            return (Q[0], Q[1], 1)
+        p = self.p
+        
+        Z1Z1 = Z1 * Z1 % p
+        H = (Q[0] * Z1Z1 - X1) % p
+        r = (Q[1] * Z1 * Z1Z1 - Y1) % p
+        if H == 0:
+            return self.double(P) if r == 0 else INFINITY
+        
+        HH = H * H % p
+        HHH = H * HH % p
+        V = X1 * HH % p
+        X3 = (r * r - HHH - 2 * V) % p
+        Y3 = (r * (V - X3) - Y1 * HHH) % p
+        Z3 = Z1 * H % p
+        return (X3, Y3, Z3)
+    
+    def add(self, P: Jacobian, Q: Jacobian) -> Jacobian:
+        """P + Q con ambos puntos jacobianos"""
+        X1, Y1, Z1 = P
+        X2, Y2, Z2 = Q
+        if Z1 == 0:
+            return Q
+        if Z2 == 0:
+            return P
+        p = self.p
+        
+        Z1Z1 = Z1 * Z1 % p
+        Z2Z2 = Z2 * Z2 % p
+        U1 = X1 * Z2Z2 % p
+        S1 = Y1 * Z2 * Z2Z2 % p
+        H = (X2 * Z1Z1 - U1) % p
+        r = (Y2 * Z1 * Z1Z1 - S1) % p
+        if H == 0:
+            return self.double(P) if r == 0 else INFINITY
+        
+        HH = H * H % p
+        HHH = H * HH % p
+        V = U1 * HH % p
+        X3 = (r * r - HHH - 2 * V) % p
+        Y3 = (r * (V - X3) - S1 * HHH) % p
+        Z3 = Z1 * Z2 * H % p
+        return (X3, Y3, Z3)
+    
+    def add_affine(self, P: Affine, Q: Affine) -> Affine:
+        """P + Q en afín"""
+        return self.to_affine(self.add_mixed(self.to_jacobian(P), Q))
+    
+    # Multiplicación escalar
+    
+    @staticmethod
+    def wnaf(k: int, w: int) -> List[int]:
+        """Forma no adyacente de ancho w de k >= 0 (dígitos del menos significativo)"""
+        digits = []
+        window = 1 << w
+        half = window >> 1
+        while k:
+            if k & 1:
+                digit = k & (window - 1)
+                if digit >= half:
+                    digit -= window
+                k -= digit
+            else:
+                digit = 0
+            digits.append(digit)
+            k >>= 1
+        return digits
+    
+    @staticmethod
+    def window_width(bits: int) -> int:
+        """Ancho de ventana wNAF según el tamaño del escalar"""
+        if bits <= 16:
+            return 2
+        if bits <= 64:
+            return 3
+        if bits <= 192:
+            return 4
+        if bits <= 512:
+            return 5
+        return 6
+    
+    def odd_multiples(self, point: Affine, w: int) -> List[Affine]:
+        """Tabla afín [P, 3P, 5P, ..., (2^(w-1) - 1)P]"""
+        size = 1 << (w - 2)
+        base = self.to_jacobian(point)
+        table = [base]
+        if size > 1:
+            twice = self.to_affine(self.double(base))
+            for _ in range(size - 1):
+                table.append(self.add_mixed(table[-1], twice))
+        return self.batch_to_affine(table)
+    
+    def multiply_wnaf(self, k: int, point: Affine, w: Optional[int] = None,
+                      table: Optional[List[Affine]] = None) -> Jacobian:
+        """k·P con wNAF y tabla de múltiplos impares (resultado jacobiano)"""
+        if point is None or k == 0:
+            return INFINITY
+        if k < 0:
+            k, point, table = -k, self.negate(point), None
+        
+        if w is None:
+            w = self.window_width(k.bit_length())
+        if table is None:
+            table = self.odd_multiples(point, w)
+        negated = [self.negate(q) for q in table]
+        
+        double, add_mixed = self.double, self.add_mixed
+        result = INFINITY
+        for digit in reversed(self.wnaf(k, w)):
+            result = double(result)
+            if digit > 0:
+                result = add_mixed(result, table[digit >> 1])
+            elif digit < 0:
+                result = add_mixed(result, negated[-digit >> 1])
+        return result
+    
+    def montgomery_ladder(self, k: int, point: Affine) -> Jacobian:
+        """
+        k·P con escalera de Montgomery: la misma secuencia de operaciones
+        para cada bit del escalar.
+        """
+        if point is None or k == 0:
+            return INFINITY
+        if k < 0:
+            k, point = -k, self.negate(point)
+        
+        R0, R1 = INFINITY, self.to_jacobian(point)
+        for i in range(k.bit_length() - 1, -1, -1):
+            if (k >> i) & 1:
+                R0, R1 = self.add(R0, R1), self.double(R1)
+            else:
+                R0, R1 = self.double(R0), self.add(R0, R1)
+        return R0
+    
+    def set_fixed_base(self, point: Affine, table) -> None:
+        """Calcular k·point con una tabla de base fija (FixedBaseTable)"""
+        self._fixed_base = (point, table)
+    
+    def multiply(self, k: int, point: Affine, ladder: bool = False) -> Affine:
+        """k·P en afín (con tabla de base fija si P es el generador registrado)"""
+        if self._fixed_base is not None and not ladder and point == self._fixed_base[0]:
+            return self._fixed_base[1].multiply(k)
+        if ladder:
+            return self.to_affine(self.montgomery_ladder(k, point))
+        return self.to_affine(self.multiply_wnaf(k, point))
@@ -0,0 +1,582 @@
+#!/usr/bin/env python3
+"""
+Logaritmo discreto en curvas elípticas
+Baby-step giant-step con tabla de hashes de coordenada x, Pollard rho y
+canguro de Pollard con caminatas r-aditivas y puntos distinguidos repartidos
+entre procesos. Pohlig-Hellman y el cálculo de órdenes vienen del motor
+genérico de logaritmos.
+"""
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .ec_arith import Affine, CurveArithmetic
+from .smart import smart_attack
+from ..discrete_log.generic import DeadlineExceeded, GenericDLog, Group
+
+# Bits bajos de x usados como clave de la tabla de baby steps
+_HASH_MASK = (1 << 64) - 1
+
+
+def _batch_inverse(values: List[int], p: int) -> List[int]:
+    """Inversos de todos los valores con una sola inversión modular"""
+    prefix = []
+    acc = 1
+    for v in values:
+        acc = acc * v % p
+        prefix.append(acc)
+    
+    inv = pow(acc, -1, p)
+    result = [0] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        result[i] = inv * prefix[i - 1] % p
+        inv = inv * values[i] % p
+    result[0] = inv
+    return result
+
+
+def _batched_steps(arith: CurveArithmetic, walks: List[list], jumps: List[Tuple[int, int]],
+                   steps: int, on_step: Callable, on_degenerate: Callable) -> None:
+    """
+    Avanzar simultáneamente varias caminatas r-aditivas en afín.
+    
+    Cada caminata es una lista [x, y, ...]; todas las sumas de un paso
+    comparten una inversión (truco de Montgomery). `on_step(walk, j)`
+    actualiza los coeficientes; `on_degenerate(walk)` reinicia la caminata
+    cuando la suma no está definida.
+    """
+    p = arith.p
+    r = len(jumps)
+    for _ in range(steps):
+        indices = []
+        denominators = []
+        for walk in walks:
+            j = walk[0] % r
+            d = (jumps[j][0] - walk[0]) % p
+            while d == 0:
+                on_degenerate(walk)
+                j = walk[0] % r
+                d = (jumps[j][0] - walk[0]) % p
+            indices.append(j)
+            denominators.append(d)
+        
+        inverses = _batch_inverse(denominators, p)
+        for walk, j, inv in zip(walks, indices, inverses):
+            jx, jy = jumps[j]
+            x, y = walk[0], walk[1]
+            slope = (jy - y) * inv % p
+            x3 = (slope * slope - x - jx) % p
+            walk[0] = x3
+            walk[1] = (slope * (x - x3) - y) % p
+            on_step(walk, j)
+
+
+def _rho_worker(task: dict) -> Tuple[List[tuple], List[list], int]:
+    """
+    Ronda de Pollard rho en un proceso: avanza las caminatas y devuelve los
+    puntos distinguidos (x, y, a, b) encontrados y el estado final.
+    """
+    arith = CurveArithmetic(task['a'], task['b'], task['p'])
+    n = task['n']
+    G, Q = task['G'], task['Q']
+    coefficients = task['coefficients']
+    dp_mask = task['dp_mask']
+    max_walk = task['max_walk']
+    rng = random.Random(task['seed'])
+    distinguished = []
+    
+    def restart(walk):
+        while True:
+            a, b = rng.randrange(n), rng.randrange(n)
+            point = arith.to_affine(arith.add(arith.multiply_wnaf(a, G), arith.multiply_wnaf(b, Q)))
+            if point is not None:
+                walk[:] = [point[0], point[1], a, b, 0]
+                return
+    
+    walks = task['walks']
+    for i, walk in enumerate(walks):
+        if walk is None:
+            walks[i] = [0, 0, 0, 0, 0]
+            restart(walks[i])
+    
+    def on_step(walk, j):
+        c, d = coefficients[j]
+        walk[2] = (walk[2] + c) % n
+        walk[3] = (walk[3] + d) % n
+        walk[4] += 1
+        if walk[0] & dp_mask == 0:
+            distinguished.append((walk[0], walk[1], walk[2], walk[3]))
+            walk[4] = 0
+        elif walk[4] > max_walk:
+            # Probablemente atrapada en un ciclo sin puntos distinguidos
+            restart(walk)
+    
+    _batched_steps(arith, walks, task['jumps'], task['steps'], on_step, restart)
+    return distinguished, walks, len(walks) * task['steps']
+
+
+def _kangaroo_worker(task: dict) -> Tuple[List[tuple], List[list], int]:
+    """
+    Ronda del canguro de Pollard en un proceso: devuelve los puntos
+    distinguidos (x, tipo, distancia, índice) y el estado final.
+    """
+    arith = CurveArithmetic(task['a'], task['b'], task['p'])
+    distances = task['distances']
+    dp_mask = task['dp_mask']
+    distinguished = []
+    
+    def on_step(walk, j):
+        walk[2] += distances[j]
+        if walk[0] & dp_mask == 0:
+            distinguished.append((walk[0], walk[3], walk[2], walk[4]))
+    
+    def degenerate(walk):
+        # Salto sobre el propio punto: avanzar con el siguiente salto
+        walk[2] += distances[0]
+        point = arith.add_affine((walk[0], walk[1]), task['jumps'][0])
+        if point is not None:
+            walk[0], walk[1] = point
+    
+    walks = task['walks']
+    _batched_steps(arith, walks, task['jumps'], task['steps'], on_step, degenerate)
+    return distinguished, walks, len(walks) * task['steps']
+
+
+def _prime_power_dlog(task: dict, checkpoint: Optional[Callable[[], None]] = None) -> Optional[int]:
+    """
+    Logaritmo en el subgrupo de orden q^e (Pohlig-Hellman dígito a dígito),
+    ejecutable en un proceso aparte. La tarea lleva su hora límite para que
+    el proceso termine solo si el plugin agota su tiempo; en el proceso
+    principal se llama además al checkpoint del solver.
+    """
+    deadline = task.get('deadline')
+    
+    def check():
+        if checkpoint:
+            checkpoint()
+        if deadline is not None and time.time() > deadline:
+            raise DeadlineExceeded()
+    
+    arith = CurveArithmetic(task['a'], task['b'], task['p'])
+    solver = ECDLPSolver(arith, workers=task['workers'], max_operations=task['max_operations'],
+                         checkpoint=check, deadline=deadline)
+    try:
+        check()
+        return solver.prime_power_dlog(task['g'], task['h'], task['q'], task['e'])
+    except DeadlineExceeded:
+        return None
+
+
+class CurveGroup(Group):
+    """Puntos afines de la curva en notación multiplicativa (None es el neutro)"""
+    
+    identity = None
+    
+    def __init__(self, arith: CurveArithmetic):
+        self.arith = arith
+    
+    def mul(self, P: Affine, Q: Affine) -> Affine:
+        return self.arith.add_affine(P, Q)
+    
+    def pow(self, P: Affine, k: int) -> Affine:
+        return self.arith.multiply(k, P)
+    
+    def inverse(self, P: Affine) -> Affine:
+        return self.arith.negate(P)
+    
+    def key(self, P: Affine) -> int:
+        return P[0] if P is not None else 0
+
+
+class ECDLPSolver(GenericDLog):
+    """
+    Resolución de Q = k·G sobre una curva.
+    
+    BSGS para órdenes pequeños, Pollard rho para grupos de orden primo y
+    canguro para logaritmos acotados a un intervalo. Las caminatas se ejecutan
+    por rondas en un ProcessPoolExecutor y los puntos distinguidos se reúnen
+    en una tabla compartida en el proceso principal.
+    
+    Las caminatas sustituyen a las genéricas porque avanzan en afín por lotes
+    (una inversión por paso para todas) y la tabla de BSGS aprovecha que
+    x(jG) = x(-jG); Pohlig-Hellman es el de `GenericDLog`.
+    """
+    
+    def __init__(self, arith: CurveArithmetic, workers: Optional[int] = None,
+                 max_table_entries: int = 1 << 20, max_operations: int = 1 << 48,
+                 checkpoint: Optional[Callable[[], None]] = None, deadline: Optional[float] = None):
+        """
+        Args:
+            arith: Aritmética de la curva
+            workers: Procesos para rho/canguro (None = núcleos disponibles)
+            max_table_entries: Límite de memoria de la tabla de baby steps
+            max_operations: Presupuesto total de operaciones de grupo
+            checkpoint: Llamada entre rondas (p.ej. comprobación de timeout)
+            deadline: Hora límite (time.time()) que se pasa a los subgrupos de Pohlig-Hellman
+        """
+        super().__init__(CurveGroup(arith), max_table_entries, max_operations, checkpoint)
+        self.arith = arith
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.deadline = deadline
+        self.walks_per_worker = 32
+        self.round_steps = 1024
+    
+    # Utilidades
+    
+    def _check(self, k: int, G: Affine, Q: Affine) -> bool:
+        return self.arith.multiply(k, G) == Q
+    
+    def _sub_multiple(self, Q: Affine, k: int, G: Affine) -> Affine:
+        """Q - k·G"""
+        return self.arith.to_affine(
+            self.arith.add_mixed(self.arith.multiply_wnaf(-k, G), Q)
+        )
+    
+    def _baby_steps(self, G: Affine, m: int) -> Dict[int, int]:
+        """Tabla hash(x(jG)) -> j para j = 1..m"""
+        arith = self.arith
+        table: Dict[int, int] = {}
+        current = arith.to_jacobian(G)
+        chunk_size = 4096
+        j = 1
+        while j <= m:
+            chunk = []
+            for _ in range(min(chunk_size, m - j + 1)):
+                chunk.append(current)
+                current = arith.add_mixed(current, G)
+            for offset, point in enumerate(arith.batch_to_affine(chunk)):
+                if point is not None:
+                    table.setdefault(point[0] & _HASH_MASK, j + offset)
+            j += len(chunk)
+        self.operations += m
+        return table
+    
+    def _giant_steps(self, start: Affine, step: Affine, count: int):
+        """Generar (i, punto afín) para start + i·step, normalizando por lotes"""
+        arith = self.arith
+        current = arith.to_jacobian(start)
+        chunk_size = 1024
+        i = 0
+        while i < count:
+            chunk = []
+            for _ in range(min(chunk_size, count - i)):
+                chunk.append(current)
+                current = arith.add_mixed(current, step)
+            for offset, point in enumerate(arith.batch_to_affine(chunk)):
+                yield i + offset, point
+            i += len(chunk)
+            self.operations += len(chunk)
+            if self.checkpoint:
+                self.checkpoint()
+    
+    # Baby-step giant-step
+    
+    def bsgs(self, G: Affine, Q: Affine, bound: int, offset: int = 0) -> Optional[int]:
+        """
+        Buscar k en [offset, offset + bound) con k·G = Q.
+        
+        La tabla guarda solo x(jG) para j = 1..m; como x(jG) = x(-jG), cada
+        giant step cubre 2m + 1 valores.
+        """
+        target = self._sub_multiple(Q, offset, G) if offset else Q
+        if target is None:
+            return offset
+        if G is None:
+            return None
+        
+        m = min(self.max_table_entries, max(1, math.isqrt(bound // 2)))
+        table = self._baby_steps(G, m)
+        stride = 2 * m + 1
+        step = self.arith.negate(self.arith.multiply(stride, G))
+        giants = bound // stride + 2
+        
+        for i, point in self._giant_steps(target, step, giants):
+            if point is None:
+                k = i * stride
+            elif (point[0] & _HASH_MASK) in table:
+                j = table[point[0] & _HASH_MASK]
+                k = next((c for c in (i * stride + j, i * stride - j)
+                          if 0 <= c < bound and self._check(c, G, target)), None)
+                if k is None:
+                    continue
+            else:
+                continue
+            if 0 <= k < bound:
+                return offset + k
+        
+        return None
+    
+    def point_order(self, P: Affine, bound: int) -> Optional[int]:
+        """
+        Orden exacto de P si no supera `bound`: BSGS sobre kP = O para hallar
+        un múltiplo del orden y reducción por sus factores primos.
+        """
+        arith = self.arith
+        if P is None:
+            return 1
+        
+        m = max(1, math.isqrt(bound // 2) + 1)
+        table = self._baby_steps(P, m)
+        stride = 2 * m + 1
+        step = arith.multiply(stride, P)
+        if step is None:
+            multiple = stride
+        else:
+            multiple = None
+            for i, point in self._giant_steps(step, step, bound // stride + 2):
+                i += 1
+                if point is None:
+                    multiple = i * stride
+                    break
+                j = table.get(point[0] & _HASH_MASK)
+                if j is not None:
+                    for c in (i * stride - j, i * stride + j):
+                        if c > 0 and arith.multiply(c, P) is None:
+                            multiple = c
+                            break
+                    if multiple:
+                        break
+            if multiple is None:
+                return None
+        
+        order = self.order_from_multiple(P, multiple)
+        return order if order <= bound else None
+    
+    def order_from_multiple(self, P: Affine, multiple: int) -> int:
+        """
+        Reducir un múltiplo del orden de P por sus factores primos. Si queda
+        un cofactor compuesto sin factorizar, el resultado sigue siendo un
+        múltiplo del orden.
+        """
+        return self.element_order(P, multiple)
+    
+    # Caminatas paralelas
+    
+    def _dp_mask(self, expected_operations: int, walks: int) -> int:
+        """Máscara de puntos distinguidos: ~1/16 del recorrido esperado por caminata"""
+        per_walk = max(1, expected_operations // walks)
+        bits = max(0, (per_walk // 16).bit_length() - 1)
+        return (1 << bits) - 1
+    
+    def _run_rounds(self, worker: Callable, tasks: List[dict],
+                    collect: Callable[[List[tuple]], Optional[int]],
+                    exhausted: Optional[Callable[[], bool]] = None) -> Optional[int]:
+        """
+        Ejecutar rondas de caminatas hasta que `collect` devuelva un resultado
+        (o hasta que `exhausted` indique que ya no puede haberlo)
+        """
+        executor = ProcessPoolExecutor(max_workers=len(tasks)) if self.workers > 1 else None
+        try:
+            while self.operations < self.max_operations:
+                if executor:
+                    results = list(executor.map(worker, tasks))
+                else:
+                    results = [worker(task) for task in tasks]
+                
+                # Actualizar todo el estado antes de procesar colisiones
+                for task, (_, walks, operations) in zip(tasks, results):
+                    task['walks'] = walks
+                    task['seed'] = random.getrandbits(64)
+                    self.operations += operations
+                
+                for distinguished, _, _ in results:
+                    found = collect(distinguished)
+                    if found is not None:
+                        return found
+                
+                if exhausted and exhausted():
+                    return None
+                if self.checkpoint:
+                    self.checkpoint()
+            return None
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+    
+    def pollard_rho(self, G: Affine, Q: Affine, n: int, r: int = 32) -> Optional[int]:
+        """
+        Pollard rho con caminata r-aditiva para un grupo de orden n
+        (n primo o con gcd pequeño en la colisión).
+        """
+        if Q is None:
+            return 0
+        if n < 1 << 16:
+            return self.bsgs(G, Q, n)
+        
+        arith = self.arith
+        coefficients = [(random.randrange(n), random.randrange(n)) for _ in range(r)]
+        jumps = [arith.to_affine(arith.add(arith.multiply_wnaf(c, G), arith.multiply_wnaf(d, Q)))
+                 for c, d in coefficients]
+        if any(point is None for point in jumps):
+            return self.pollard_rho(G, Q, n, r)
+        
+        workers = max(1, self.workers)
+        total_walks = workers * self.walks_per_worker
+        expected = math.isqrt(n * 2) + 1
+        dp_mask = self._dp_mask(expected, total_walks)
+        base = {
+            'a': arith.a, 'b': arith.b, 'p': arith.p, 'n': n, 'G': G, 'Q': Q,
+            'jumps': jumps, 'coefficients': coefficients, 'dp_mask': dp_mask,
+            'max_walk': 32 * (dp_mask + 1), 'steps': self.round_steps
+        }
+        tasks = [dict(base, walks=[None] * self.walks_per_worker, seed=random.getrandbits(64))
+                 for _ in range(workers)]
+        
+        seen: Dict[int, Tuple[int, int, int]] = {}
+        
+        def collect(distinguished):
+            for x, y, a, b in distinguished:
+                if x not in seen:
+                    seen[x] = (y, a, b)
+                    continue
+                y0, a0, b0 = seen[x]
+                # P0 = ±P: a0 + b0·k = ±(a + b·k)
+                sign = 1 if y0 == y else -1
+                k = self._solve_collision((a0 - sign * a) % n, (sign * b - b0) % n, n, G, Q)
+                if k is not None:
+                    return k
+            return None
+        
+        return self._run_rounds(_rho_worker, tasks, collect)
+    
+    def _solve_collision(self, numerator: int, denominator: int, n: int,
+                         G: Affine, Q: Affine) -> Optional[int]:
+        """Resolver k·denominator = numerator (mod n) y verificar candidatos"""
+        g = math.gcd(denominator, n)
+        if numerator % g:
+            return None
+        if g > 1 << 16:
+            return None
+        reduced = n // g
+        base = numerator // g * pow(denominator // g, -1, reduced) % reduced if reduced > 1 else 0
+        for t in range(g):
+            k = base + t * reduced
+            if self._check(k, G, Q):
+                return k
+        return None
+    
+    def kangaroo(self, G: Affine, Q: Affine, lo: int, hi: int) -> Optional[int]:
+        """
+        Canguro de Pollard (van Oorschot-Wiener) para k en [lo, hi).
+        
+        Los canguros mansos parten de múltiplos conocidos de G en la mitad del
+        intervalo y los salvajes de Q; una colisión mansa/salvaje entre puntos
+        distinguidos da k.
+        """
+        width = hi - lo
+        if width <= 1 << 32 and math.isqrt(width) <= self.max_table_entries:
+            return self.bsgs(G, Q, width, offset=lo)
+        
+        arith = self.arith
+        target = self._sub_multiple(Q, lo, G)
+        if target is None:
+            return lo
+        
+        workers = max(1, self.workers)
+        total = workers * self.walks_per_worker
+        herd = total // 2
+        
+        # Saltos 2^i con media ≈ N·sqrt(W)/4
+        mean = max(1, total * math.isqrt(width) // 4)
+        count = 1
+        while (1 << count) // count < mean:
+            count += 1
+        distances = [1 << i for i in range(count)]
+        jumps = arith.batch_to_affine([arith.to_jacobian(arith.multiply(d, G)) for d in distances])
+        
+        expected = 2 * math.isqrt(width) + 1
+        dp_mask = self._dp_mask(expected, total)
+        spacing = max(1, mean // herd)
+        
+        def new_walk(kind, index):
+            if kind == 0:
+                start = width // 2 + random.randrange(herd) * spacing
+                point = arith.multiply(start, G)
+            else:
+                start = random.randrange(herd) * spacing
+                point = arith.add_affine(target, arith.multiply(start, G))
+            return [point[0], point[1], start, kind, index] if point else new_walk(kind, index)
+        
+        base = {'a': arith.a, 'b': arith.b, 'p': arith.p, 'jumps': jumps,
+                'distances': distances, 'dp_mask': dp_mask, 'steps': self.round_steps}
+        tasks = []
+        for w in range(workers):
+            walks = [new_walk(i % 2, (w, i)) for i in range(self.walks_per_worker)]
+            tasks.append(dict(base, walks=walks, seed=0))
+        
+        # x -> (tipo, distancia); 0 = manso (posición conocida), 1 = salvaje
+        seen: Dict[int, Tuple[int, int]] = {}
+        
+        def collect(distinguished):
+            for x, kind, distance, walk_index in distinguished:
+                if x not in seen:
+                    seen[x] = (kind, distance)
+                    continue
+                other_kind, other_distance = seen[x]
+                if other_kind != kind:
+                    tame = distance if kind == 0 else other_distance
+                    wild = other_distance if kind == 0 else distance
+                    k = tame - wild
+                    if 0 <= k < width and self._check(k, G, target):
+                        return lo + k
+                elif other_distance != distance:
+                    # Dos canguros del mismo tipo comparten camino: relanzar uno
+                    walks = tasks[walk_index[0]]['walks']
+                    slot = next(s for s, walk in enumerate(walks) if walk[4] == walk_index)
+                    walks[slot] = new_walk(kind, walk_index)
+            return None
+        
+        def exhausted():
+            # Todos los mansos dejaron atrás el intervalo: el logaritmo no está en él
+            return min(walk[2] for task in tasks for walk in task['walks'] if walk[3] == 0) > 4 * width
+        
+        return self._run_rounds(_kangaroo_worker, tasks, collect, exhausted)
+    
+    # API de alto nivel
+    
+    def solve(self, G: Affine, Q: Affine, n: int) -> Optional[int]:
+        """k en [0, n) con k·G = Q, eligiendo el algoritmo según n"""
+        if n <= 1:
+            return 0 if Q is None else None
+        if n == self.arith.p:
+            # Subgrupo de orden p: curva anómala, ataque de Smart
+            k = smart_attack(self.arith, G, Q)
+            if k is not None:
+                return k
+        if math.isqrt(n) <= self.max_table_entries:
+            return self.bsgs(G, Q, n)
+        return self.pollard_rho(G, Q, n)
+    
+    def solve_interval(self, G: Affine, Q: Affine, lo: int, hi: int) -> Optional[int]:
+        """k en [lo, hi) con k·G = Q"""
+        return self.kangaroo(G, Q, lo, hi)
+    
+    def _solve_subgroups(self, tasks: List[dict]) -> Optional[List[int]]:
+        """
+        Subgrupos pequeños en paralelo; el mayor (las tareas llegan en orden
+        creciente de q) conserva los procesos para rho.
+        """
+        arith = self.arith
+        tasks = [dict(task, a=arith.a, b=arith.b, p=arith.p, workers=1,
+                      max_operations=self.max_operations, deadline=self.deadline) for task in tasks]
+        if tasks and math.isqrt(tasks[-1]['q']) > self.max_table_entries:
+            tasks[-1]['workers'] = self.workers
+        small, large = tasks, []
+        if tasks and tasks[-1]['workers'] > 1:
+            small, large = tasks[:-1], tasks[-1:]
+        
+        if self.workers > 1 and len(small) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(small))) as executor:
+                residues = list(executor.map(_prime_power_dlog, small))
+        else:
+            residues = []
+            for task in small:
+                residues.append(_prime_power_dlog(task, self.checkpoint))
+        residues += [_prime_power_dlog(task, self.checkpoint) for task in large]
+        
+        if any(r is None for r in residues):
+            return None
+        return residues
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Cuerpos finitos F_{p^k} (k <= 12) en base polinómica
+Elementos como tuplas de k enteros mod p sobre F_p[x]/(f) con f irreducible
+disperso (binomio o trinomio siempre que exista), de modo que la reducción
+tras el producto escolar solo recorre los términos no nulos de f.
+"""
+import random
+from typing import Optional, Sequence, Tuple
+
+from .polynomial import Poly, PolyRing, poly_gcd, poly_sub, trim
+from ..rsa.rsa_math import RSAMath
+
+# Elemento de F_{p^k}: coeficientes de 1, x, ..., x^(k-1)
+Element = Tuple[int, ...]
+
+
+class ExtensionField:
+    """Aritmética de F_{p^k} = F_p[x]/(f)"""
+    
+    MAX_DEGREE = 12
+    
+    def __init__(self, p: int, k: int, modulus: Optional[Poly] = None):
+        if not 1 <= k <= self.MAX_DEGREE:
+            raise ValueError(f"Grado de extensión no soportado: {k}")
+        self.p = p
+        self.k = k
+        self.order = p ** k
+        self.modulus = modulus or self.find_irreducible(p, k)
+        
+        # x^k ≡ -Σ f_i·x^i: solo los términos no nulos
+        self._reduction = [(i, -c % p) for i, c in enumerate(self.modulus[:k]) if c % p]
+        self._ring = PolyRing(self.modulus, p)
+        
+        self.zero: Element = (0,) * k
+        self.one: Element = (1,) + (0,) * (k - 1)
+    
+    # Construcción
+    
+    @staticmethod
+    def is_irreducible(f: Poly, p: int) -> bool:
+        """
+        Test de Rabin: f de grado k es irreducible si x^(p^k) ≡ x (mod f) y
+        mcd(x^(p^(k/r)) - x, f) = 1 para cada primo r | k.
+        """
+        k = len(f) - 1
+        if k == 1:
+            return True
+        ring = PolyRing(f, p)
+        x = ring.reduce([0, 1])
+        
+        # Potencias x^(p^i) por Frobenius iterado
+        frobenius = [x]
+        for _ in range(k):
+            frobenius.append(ring.pow(frobenius[-1], p))
+        if frobenius[k] != x:
+            return False
+        
+        for r in set(RSAMath.factorize(k)):
+            if len(poly_gcd(list(f), poly_sub(frobenius[k // r], x, p), p)) > 1:
+                return False
+        return True
+    
+    @classmethod
+    def find_irreducible(cls, p: int, k: int) -> Poly:
+        """Polinomio irreducible mónico de grado k, lo más disperso posible"""
+        if k == 1:
+            return [0, 1]
+        
+        # Binomios x^k - c, luego trinomios x^k + x^j + c
+        for c in range(1, min(p, 64)):
+            f = [-c % p] + [0] * (k - 1) + [1]
+            if cls.is_irreducible(f, p):
+                return f
+        for j in range(1, k):
+            for c in range(1, min(p, 64)):
+                f = [c] + [0] * (k - 1) + [1]
+                f[j] = 1
+                if cls.is_irreducible(f, p):
+                    return f
+        
+        while True:
+            f = [random.randrange(p) for _ in range(k)] + [1]
+            if cls.is_irreducible(f, p):
+                return f
+    
+    # Conversión
+    
+    def element(self, coefficients: Sequence[int]) -> Element:
+        """Elemento a partir de sus coeficientes (se completan con ceros)"""
+        coefficients = [c % self.p for c in coefficients[:self.k]]
+        return tuple(coefficients) + (0,) * (self.k - len(coefficients))
+    
+    def from_int(self, c: int) -> Element:
+        """Elemento del subcuerpo primo"""
+        return (c % self.p,) + (0,) * (self.k - 1)
+    
+    def random_element(self) -> Element:
+        return tuple(random.randrange(self.p) for _ in range(self.k))
+    
+    # Operaciones
+    
+    def add(self, a: Element, b: Element) -> Element:
+        p = self.p
+        return tuple((x + y) % p for x, y in zip(a, b))
+    
+    def sub(self, a: Element, b: Element) -> Element:
+        p = self.p
+        return tuple((x - y) % p for x, y in zip(a, b))
+    
+    def neg(self, a: Element) -> Element:
+        p = self.p
+        return tuple(-x % p for x in a)
+    
+    def scale(self, a: Element, c: int) -> Element:
+        """Producto por un escalar de F_p"""
+        p = self.p
+        return tuple(x * c % p for x in a)
+    
+    def mul(self, a: Element, b: Element) -> Element:
+        """Producto escolar y reducción por los términos no nulos de f"""
+        k, p = self.k, self.p
+        if k == 1:
+            return (a[0] * b[0] % p,)
+        
+        product = [0] * (2 * k - 1)
+        for i, x in enumerate(a):
+            if x:
+                for j, y in enumerate(b):
+                    if y:
+                        product[i + j] += x * y
+        
+        for i in range(2 * k - 2, k - 1, -1):
+            c = product[i] % p
+            if c:
+                base = i - k
+                for j, r in self._reduction:
+                    product[base + j] += c * r
+        return tuple(c % p for c in product[:k])
+    
+    def square(self, a: Element) -> Element:
+        return self.mul(a, a)
+    
+    def inverse(self, a: Element) -> Element:
+        """Inverso por Euclides extendido en F_p[x]"""
+        if not any(a):
+            raise ZeroDivisionError("Inverso de cero en F_{p^k}")
+        return self.element(self._ring.inverse(trim(list(a))))
+    
+    def div(self, a: Element, b: Element) -> Element:
+        return self.mul(a, self.inverse(b))
+    
+    def pow(self, a: Element, e: int) -> Element:
+        """a^e con cuadrados y multiplicaciones (e negativo invierte)"""
+        if e < 0:
+            a, e = self.inverse(a), -e
+        result = self.one
+        for bit in bin(e)[2:]:
+            result = self.mul(result, result)
+            if bit == '1':
+                result = self.mul(result, a)
+        return result
+    
+    def is_square(self, a: Element) -> bool:
+        """Criterio de Euler en F_{p^k}"""
+        if not any(a) or self.p == 2:
+            return True
+        return self.pow(a, (self.order - 1) // 2) == self.one
+    
+    def sqrt(self, a: Element) -> Optional[Element]:
+        """Raíz cuadrada por Tonelli-Shanks en F_{p^k}^*"""
+        if not any(a):
+            return self.zero
+        if not self.is_square(a):
+            return None
+        
+        q = self.order
+        if q % 4 == 3:
+            return self.pow(a, (q + 1) // 4)
+        
+        # q - 1 = 2^s·t con t impar
+        s, t = 0, q - 1
+        while t % 2 == 0:
+            s, t = s + 1, t // 2
+        z = self.random_element()
+        while not any(z) or self.is_square(z):
+            z = self.random_element()
+        
+        c = self.pow(z, t)
+        x = self.pow(a, (t + 1) // 2)
+        b = self.pow(a, t)
+        m = s
+        while b != self.one:
+            # Menor i con b^(2^i) = 1
+            i, b2 = 0, b
+            while b2 != self.one:
+                b2 = self.mul(b2, b2)
+                i += 1
+            for _ in range(m - i - 1):
+                c = self.mul(c, c)
+            x = self.mul(x, c)
+            c = self.mul(c, c)
+            b = self.mul(b, c)
+            m = i
+        return x
+    
+    def __repr__(self) -> str:
+        return f"ExtensionField(p={self.p}, k={self.k}, modulus={self.modulus})"
+
+
+def embedding_degree(p: int, n: int, max_degree: int = ExtensionField.MAX_DEGREE) -> Optional[int]:
+    """Menor k <= max_degree con n | p^k - 1 (orden de p módulo n)"""
+    if n < 2:
+        return None
+    value = 1
+    for k in range(1, max_degree + 1):
+        value = value * p % n
+        if value == 1:
+            return k
+    return None
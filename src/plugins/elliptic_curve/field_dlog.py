@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Logaritmo discreto en subgrupos de F_{p^k}^*
+El motor genérico de logaritmos (BSGS, rho, Pohlig-Hellman) sobre los
+elementos de la extensión, representados como tuplas de coeficientes.
+"""
+from typing import Callable, Optional
+
+from .extension_field import Element, ExtensionField
+from ..discrete_log.generic import GenericDLog, Group
+
+
+class FieldGroup(Group):
+    """F_{p^k}^* sobre las operaciones de ExtensionField"""
+    
+    def __init__(self, field: ExtensionField):
+        self.field = field
+        self.identity = field.one
+    
+    def mul(self, a: Element, b: Element) -> Element:
+        return self.field.mul(a, b)
+    
+    def pow(self, a: Element, k: int) -> Element:
+        return self.field.pow(a, k)
+    
+    def inverse(self, a: Element) -> Element:
+        return self.field.inverse(a)
+    
+    def key(self, a: Element) -> int:
+        # Coeficientes como dígitos en base p
+        p, value = self.field.p, 0
+        for c in reversed(a):
+            value = value * p + c
+        return value
+
+
+class FieldDLog(GenericDLog):
+    """Logaritmos g^x = h en F_{p^k}^* para g de orden conocido"""
+    
+    def __init__(self, field: ExtensionField, max_table_entries: int = 1 << 20,
+                 max_operations: int = 1 << 40, checkpoint: Optional[Callable[[], None]] = None):
+        super().__init__(FieldGroup(field), max_table_entries, max_operations, checkpoint)
+        self.field = field
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Ataque de curva inválida
+Las fórmulas de suma y duplicación no usan b, así que un servicio que
+multiplica por su secreto d sin validar el punto opera en y² = x³ + ax + b'
+para el b' que elija el atacante. Con puntos de orden primo pequeño en esas
+curvas se obtiene d mod ℓ^e por cada consulta y el secreto sale por CRT.
+
+Los órdenes de las curvas inválidas se cuentan con PointCounter (Mestre/Schoof)
+mientras p sea asumible; por encima, los puntos de orden ℓ salen directamente
+de las raíces del polinomio de división ψ_ℓ en F_p.
+"""
+import math
+import os
+import re
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .ec_arith import Affine, CurveArithmetic
+from .ecdlp import ECDLPSolver
+from .point_counting import PointCounter, curve_order
+from .polynomial import poly_roots
+from ..rsa.modular_roots import ModularRoots
+from ..rsa.rsa_math import RSAMath
+from ...core.pipelined_connection import PipelinedConnection
+
+
+class ScalarOracle(ABC):
+    """Servicio que devuelve d·P para puntos P arbitrarios, consultable por lotes"""
+    
+    def __init__(self):
+        self.queries = 0
+    
+    @abstractmethod
+    async def query_many(self, points: List[Tuple[int, int]]) -> List[Affine]:
+        """Consultar un lote de puntos; devuelve d·P (None = infinito) por cada uno"""
+        pass
+
+
+class PipelinedScalarOracle(ScalarOracle):
+    """Oráculo remoto sobre una PipelinedConnection"""
+    
+    def __init__(self, connection: PipelinedConnection, query_format: str = "{x} {y}"):
+        super().__init__()
+        self.connection = connection
+        self.query_format = query_format
+    
+    def format_query(self, point: Tuple[int, int]) -> bytes:
+        """Formatear un punto según el protocolo del servicio"""
+        x, y = point
+        return self.query_format.format(x=x, y=y, hx=format(x, 'x'), hy=format(y, 'x')).encode()
+    
+    @staticmethod
+    def parse_response(response: bytes) -> Affine:
+        """Primer par de enteros (decimal o 0x hex) de la respuesta; si no hay, infinito"""
+        numbers = re.findall(rb'0x[0-9a-fA-F]+|\d+', response)
+        if len(numbers) < 2:
+            return None
+        return tuple(int(n, 0) for n in numbers[:2])
+    
+    async def query_many(self, points: List[Tuple[int, int]]) -> List[Affine]:
+        self.queries += len(points)
+        responses = await self.connection.request_many(self.format_query(P) for P in points)
+        return [self.parse_response(r) for r in responses]
+
+
+def torsion_points(a: int, b: int, p: int, l: int) -> List[Tuple[int, int]]:
+    """Puntos de E(F_p) de orden primo l, a partir de las raíces de ψ_l"""
+    if l == 2:
+        return [(x, 0) for x in poly_roots([b, a, 0, 1], p)]
+    
+    points = []
+    for x in poly_roots(PointCounter(a, b, p).division_polynomial(l), p):
+        y = ModularRoots.tonelli_shanks((x * x * x + a * x + b) % p, p)
+        if y:
+            points.append((x, y))
+    return points
+
+
+def _smooth_factors(n: int, primes: Iterable[int]) -> Dict[int, int]:
+    """Exponentes de los primos pequeños que dividen n"""
+    factors = {}
+    for l in primes:
+        e = 0
+        while n % l == 0:
+            n //= l
+            e += 1
+        if e:
+            factors[l] = e
+    return factors
+
+
+def _scan_curve(task: dict) -> dict:
+    """
+    Subgrupos pequeños de y² = x³ + ax + b' y un punto de cada uno.
+    
+    Returns:
+        dict: b, order (None si no se contó) y points {ℓ: (P, ℓ^f)}
+    """
+    a, b, p = task['a'], task['b'], task['p']
+    points = {}
+    
+    if p.bit_length() <= task['count_bits']:
+        order = curve_order(a, b, p)
+        arith = CurveArithmetic(a, b, p)
+        solver = ECDLPSolver(arith, workers=1)
+        for l, e in _smooth_factors(order, task['primes']).items():
+            # Cofactor por punto aleatorio: orden ℓ^f con f <= e
+            for _ in range(4):
+                P = arith.multiply(order // l ** e, PointCounter.random_point(arith))
+                if P is not None:
+                    power = solver.order_from_multiple(P, l ** e)
+                    if l not in points or power > points[l][1]:
+                        points[l] = (P, power)
+                    if power == l ** e:
+                        break
+        return {'b': b, 'order': order, 'points': points}
+    
+    for l in task['torsion_primes']:
+        found = torsion_points(a, b, p, l)
+        if found:
+            points[l] = (found[0], l)
+    return {'b': b, 'order': None, 'points': points}
+
+
+class InvalidCurveAttack:
+    """Recuperar d consultando d·P con puntos de orden pequeño en curvas y² = x³ + ax + b'"""
+    
+    def __init__(self, a: int, b: int, p: int, workers: Optional[int] = None,
+                 max_prime: int = 1 << 16, max_torsion_prime: int = 37, count_bits: int = 128,
+                 checkpoint: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            workers: Procesos para evaluar candidatos b' (None = núcleos disponibles)
+            max_prime: Mayor primo ℓ aceptado en los órdenes contados
+            max_torsion_prime: Mayor ℓ buscado con ψ_ℓ cuando p es demasiado grande para contar
+            count_bits: Tamaño máximo de p para contar puntos
+        """
+        self.a, self.b, self.p = a % p, b % p, p
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.primes = RSAMath.small_primes(max_prime)
+        self.torsion_primes = RSAMath.small_primes(max_torsion_prime)
+        self.count_bits = count_bits
+        self.checkpoint = checkpoint
+        
+        # Mejor ℓ^f alcanzado por primo y el residuo de d módulo él
+        self.residues: Dict[int, Tuple[int, int]] = {}
+        self.curves_scanned = 0
+    
+    @property
+    def modulus(self) -> int:
+        return math.prod(power for power, _ in self.residues.values())
+    
+    def result(self) -> Tuple[int, int]:
+        """(d mod M, M) con lo recogido hasta ahora"""
+        residues = [r for _, r in self.residues.values()]
+        moduli = [power for power, _ in self.residues.values()]
+        if not moduli:
+            return 0, 1
+        return RSAMath.chinese_remainder_theorem(residues, moduli) % self.modulus, self.modulus
+    
+    def scan(self, candidates: Sequence[int]) -> List[dict]:
+        """Contar y buscar subgrupos pequeños para cada b' (en paralelo)"""
+        tasks = [{
+            'a': self.a, 'b': b % self.p, 'p': self.p, 'count_bits': self.count_bits,
+            'primes': self.primes, 'torsion_primes': self.torsion_primes
+        } for b in candidates]
+        self.curves_scanned += len(tasks)
+        
+        if self.workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks))) as executor:
+                return list(executor.map(_scan_curve, tasks))
+        return [_scan_curve(task) for task in tasks]
+    
+    def select(self, scans: Iterable[dict]) -> List[Tuple[int, Tuple[int, int], int]]:
+        """Puntos (b', P, ℓ^f) que mejoran el módulo cubierto, uno por primo"""
+        best: Dict[int, Tuple[int, Tuple[int, int], int]] = {}
+        for scan in scans:
+            for l, (P, power) in scan['points'].items():
+                covered = max(self.residues.get(l, (1, 0))[0], best.get(l, (0, None, 1))[2])
+                if power > covered:
+                    best[l] = (scan['b'], P, power)
+        return list(best.values())
+    
+    def residue_from_pair(self, P: Tuple[int, int], R: Affine,
+                          order: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        """
+        (d mod ord(P), ord(P)) a partir de R = d·P; la curva se deduce de P.
+        Sin orden dado se cuenta la curva o se busca el orden por BSGS.
+        """
+        a, p = self.a, self.p
+        b = (P[1] * P[1] - P[0] ** 3 - a * P[0]) % p
+        arith = CurveArithmetic(a, b, p)
+        if R is not None and not arith.is_on_curve(R):
+            return None
+        
+        solver = ECDLPSolver(arith, workers=1, checkpoint=self.checkpoint)
+        if order is None:
+            if p.bit_length() <= self.count_bits:
+                order = solver.order_from_multiple(P, curve_order(a, b, p))
+            else:
+                order = solver.point_order(P, self.primes[-1] ** 2)
+            if order is None:
+                return None
+        
+        # Si la factorización del orden no se completó, order es solo un
+        # múltiplo de ord(P): reducirlo con los primos pequeños, comprobando
+        # que cada uno divide de verdad el orden del punto
+        for q in _smooth_factors(order, self.primes):
+            while order % q == 0 and arith.multiply(order // q, P) is None:
+                order //= q
+        
+        # Solo la parte suave del orden es útil
+        factors = [q for q, e in _smooth_factors(order, self.primes).items() for _ in range(e)]
+        smooth = math.prod(factors)
+        if smooth == 1:
+            return None
+        P_s, R_s = arith.multiply(order // smooth, P), arith.multiply(order // smooth, R)
+        d = solver.pohlig_hellman(P_s, R_s, smooth, factors)
+        if d is None or arith.multiply(d, P_s) != R_s:
+            return None
+        return d, smooth
+    
+    def add_residue(self, d: int, modulus: int) -> None:
+        """Incorporar d mod modulus, quedándose con la mayor potencia de cada primo"""
+        for q in set(RSAMath.factorize(modulus)):
+            power = q
+            while modulus % (power * q) == 0:
+                power *= q
+            if power > self.residues.get(q, (1, 0))[0]:
+                self.residues[q] = (power, d % power)
+    
+    def add_samples(self, samples: Iterable[Tuple[Tuple[int, int], Affine]]) -> Tuple[int, int]:
+        """Modo offline: pares (P, d·P) ya filtrados por el servicio"""
+        for P, R in samples:
+            found = self.residue_from_pair(tuple(P), tuple(R) if R else None)
+            if found:
+                self.add_residue(*found)
+        return self.result()
+    
+    async def run(self, oracle: ScalarOracle, target: int, batch: Optional[int] = None,
+                  max_curves: int = 4096, first_b: int = 1) -> Tuple[int, int]:
+        """
+        Recoger residuos de d hasta cubrir `target` (el orden de G o 2^bits).
+        
+        Los b' se evalúan por lotes en el pool; las consultas de cada lote van
+        juntas al oráculo.
+        """
+        batch = batch or max(4, 2 * self.workers)
+        b_next = first_b
+        while self.modulus < target and self.curves_scanned < max_curves:
+            candidates = []
+            while len(candidates) < batch:
+                if b_next % self.p != self.b:
+                    candidates.append(b_next)
+                b_next += 1
+            
+            chosen = self.select(self.scan(candidates))
+            if self.checkpoint:
+                self.checkpoint()
+            if not chosen:
+                continue
+            
+            answers = await oracle.query_many([P for _, P, _ in chosen])
+            for (_, P, power), R in zip(chosen, answers):
+                found = self.residue_from_pair(P, R, order=power)
+                if found:
+                    self.add_residue(*found)
+        return self.result()
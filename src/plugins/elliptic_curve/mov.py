@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Reducción MOV / Frey-Rück
+Con grado de inclusión k pequeño (n | p^k - 1) el emparejamiento de Tate
+lleva Q = d·G a β = α^d en F_{p^k}^*, donde se resuelve el logaritmo.
+"""
+from typing import Callable, List, Optional
+
+from .ec_arith import Affine, CurveArithmetic
+from .extension_field import ExtensionField, embedding_degree
+from .field_dlog import FieldDLog
+from .pairing import ExtensionCurve
+from ..rsa.rsa_math import RSAMath
+
+
+def mov_attack(arith: CurveArithmetic, G: Affine, Q: Affine, n: int, k: Optional[int] = None,
+               factors: Optional[List[int]] = None, attempts: int = 8,
+               checkpoint: Optional[Callable[[], None]] = None,
+               max_operations: int = 1 << 40) -> Optional[int]:
+    """
+    d con d·G = Q para G de orden n, vía el emparejamiento de Tate.
+    
+    Args:
+        k: Grado de inclusión (se calcula si no se da)
+        factors: Factorización de n, si ya se conoce
+        attempts: Puntos auxiliares R a probar si el emparejamiento degenera
+    """
+    if Q is None:
+        return 0
+    k = k or embedding_degree(arith.p, n)
+    if k is None:
+        return None
+    
+    field = ExtensionField(arith.p, k)
+    curve = ExtensionCurve(arith.a, arith.b, field)
+    G_ext, Q_ext = curve.lift(G), curve.lift(Q)
+    dlog = FieldDLog(field, max_operations=max_operations, checkpoint=checkpoint)
+    if factors is None:
+        factors = RSAMath.factorize(n)
+    
+    for _ in range(attempts):
+        if checkpoint:
+            checkpoint()
+        R = curve.random_point()
+        alpha = curve.tate_pairing(G_ext, R, n)
+        beta = curve.tate_pairing(Q_ext, R, n)
+        if alpha is None or beta is None or alpha == field.one:
+            continue
+        
+        d = dlog.pohlig_hellman(alpha, beta, n, factors)
+        if d is not None and arith.multiply(d, G) == Q:
+            return d
+    return None
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Emparejamientos de Weil y Tate sobre E(F_{p^k}) con el bucle de Miller
+Numerador y denominador se acumulan por separado, de modo que el bucle
+completo hace una sola inversión en F_{p^k}.
+"""
+from typing import Optional, Tuple
+
+from .ec_arith import Affine
+from .extension_field import Element, ExtensionField
+
+# Punto afín de E(F_{p^k}) o None para el infinito
+ExtPoint = Optional[Tuple[Element, Element]]
+
+
+class ExtensionCurve:
+    """y² = x³ + ax + b con puntos sobre F_{p^k}"""
+    
+    def __init__(self, a: int, b: int, field: ExtensionField):
+        self.field = field
+        self.a = field.from_int(a)
+        self.b = field.from_int(b)
+    
+    def lift(self, point: Affine) -> ExtPoint:
+        """Punto de E(F_p) visto en E(F_{p^k})"""
+        if point is None:
+            return None
+        return (self.field.from_int(point[0]), self.field.from_int(point[1]))
+    
+    def rhs(self, x: Element) -> Element:
+        F = self.field
+        return F.add(F.mul(F.add(F.square(x), self.a), x), self.b)
+    
+    def is_on_curve(self, P: ExtPoint) -> bool:
+        if P is None:
+            return True
+        return self.field.square(P[1]) == self.rhs(P[0])
+    
+    def random_point(self) -> ExtPoint:
+        """Punto aleatorio de E(F_{p^k})"""
+        F = self.field
+        while True:
+            x = F.random_element()
+            y = F.sqrt(self.rhs(x))
+            if y is not None:
+                return (x, y)
+    
+    def negate(self, P: ExtPoint) -> ExtPoint:
+        if P is None:
+            return None
+        return (P[0], self.field.neg(P[1]))
+    
+    def _slope(self, T: ExtPoint, S: ExtPoint) -> Optional[Element]:
+        """Pendiente de la recta por T y S (tangente si T = S); None si es vertical"""
+        F = self.field
+        if T[0] == S[0]:
+            if T[1] != S[1] or not any(T[1]):
+                return None
+            numerator = F.add(F.scale(F.square(T[0]), 3), self.a)
+            return F.div(numerator, F.scale(T[1], 2))
+        return F.div(F.sub(S[1], T[1]), F.sub(S[0], T[0]))
+    
+    def _chord(self, T: ExtPoint, S: ExtPoint, slope: Element) -> ExtPoint:
+        F = self.field
+        x = F.sub(F.sub(F.square(slope), T[0]), S[0])
+        return (x, F.sub(F.mul(slope, F.sub(T[0], x)), T[1]))
+    
+    def add(self, T: ExtPoint, S: ExtPoint) -> ExtPoint:
+        if T is None:
+            return S
+        if S is None:
+            return T
+        slope = self._slope(T, S)
+        return None if slope is None else self._chord(T, S, slope)
+    
+    def multiply(self, k: int, P: ExtPoint) -> ExtPoint:
+        if k < 0:
+            k, P = -k, self.negate(P)
+        result = None
+        for bit in bin(k)[2:]:
+            result = self.add(result, result)
+            if bit == '1':
+                result = self.add(result, P)
+        return result
+    
+    def _line(self, T: ExtPoint, S: ExtPoint, R: ExtPoint) -> Tuple[Element, Element, ExtPoint]:
+        """
+        Recta l por T y S y vertical v por T + S evaluadas en R,
+        junto con T + S (div(l/v) = (T) + (S) - (T + S) - (O))
+        """
+        F = self.field
+        slope = self._slope(T, S)
+        if slope is None:
+            # T + S = O: la recta es la vertical por T
+            return F.sub(R[0], T[0]), F.one, None
+        U = self._chord(T, S, slope)
+        line = F.sub(F.sub(R[1], T[1]), F.mul(slope, F.sub(R[0], T[0])))
+        return line, F.sub(R[0], U[0]), U
+    
+    def miller(self, P: ExtPoint, R: ExtPoint, n: int) -> Optional[Element]:
+        """
+        f_{n,P}(R) con div(f) = n(P) - n(O) para P de orden n; None si
+        alguna recta se anula en R (R en el soporte de algún divisor).
+        """
+        F = self.field
+        T = P
+        numerator, denominator = F.one, F.one
+        for bit in bin(n)[3:]:
+            line, vertical, T = self._line(T, T, R)
+            numerator = F.mul(F.square(numerator), line)
+            denominator = F.mul(F.square(denominator), vertical)
+            if bit == '1':
+                if T is None:
+                    return None
+                line, vertical, T = self._line(T, P, R)
+                numerator = F.mul(numerator, line)
+                denominator = F.mul(denominator, vertical)
+        if not any(numerator) or not any(denominator):
+            return None
+        return F.div(numerator, denominator)
+    
+    def tate_pairing(self, P: ExtPoint, R: ExtPoint, n: int) -> Optional[Element]:
+        """Emparejamiento de Tate reducido f_{n,P}(R)^((p^k - 1)/n)"""
+        value = self.miller(P, R, n)
+        if value is None:
+            return None
+        return self.field.pow(value, (self.field.order - 1) // n)
+    
+    def weil_pairing(self, P: ExtPoint, Q: ExtPoint, n: int) -> Optional[Element]:
+        """e_n(P, Q) = (-1)^n·f_{n,P}(Q)/f_{n,Q}(P) para P, Q de orden n distintos"""
+        if P is None or Q is None or P == Q:
+            return self.field.one
+        f_P = self.miller(P, Q, n)
+        f_Q = self.miller(Q, P, n)
+        if f_P is None or f_Q is None:
+            return None
+        value = self.field.div(f_P, f_Q)
+        return self.field.neg(value) if n % 2 else value
@@ -4,14 +4,28 @@ Plugin de Curvas Elípticas - Ataques a ECC
 
 import re
 import json
+import asyncio
 import gmpy2
 from typing import List, Dict, Any, Optional, Tuple
-from Crypto.Util.number import inverse, long_to_bytes, bytes_to_long
+from Crypto.Util.number import long_to_bytes, bytes_to_long
 import math
+import hashlib
+from Crypto.Cipher import AES
 
 from ..base import MultiTechniquePlugin
 from ...models.data import ChallengeData, SolutionResult, PluginInfo, ChallengeType
 from ...utils.logging import get_logger
+from .ec_arith import CurveArithmetic
+from .ecdlp import ECDLPSolver
+from .point_counting import PointCounter, cached_order, curve_order
+from .smart import smart_attack
+from .extension_field import ExtensionField, embedding_degree
+from .mov import mov_attack
+from .singular import SingularCurve
+from .invalid_curve import InvalidCurveAttack, PipelinedScalarOracle
+from .curve_catalog import default_catalog
+from ...core.pipelined_connection import PipelinedConnection
+from ..rsa.rsa_math import RSAMath
 
 
 class EllipticPoint:
@@ -28,6 +42,9 @@ class EllipticPoint:
             return False
         return self.x == other.x and self.y == other.y and self.is_infinity == other.is_infinity
     
+    def __hash__(self):
+        return hash((self.x, self.y))
+    
     def __str__(self):
         if self.is_infinity:
             return "O (point at infinity)"
@@ -42,23 +59,44 @@ class EllipticPoint:
 class EllipticCurve:
     """Curva elíptica y = x³ + ax + b (mod p)"""
     
-    def __init__(self, a: int, b: int, p: int):
+    def __init__(self, a: int, b: int, p: int, allow_singular: bool = False):
         self.a = a
         self.b = b
         self.p = p
         
-        # Verificar que la curva no es singular
+        # Verificar que la curva no es singular (las singulares solo si se piden)
         discriminant = (-16 * (4 * a**3 + 27 * b**2)) % p
-        if discriminant == 0:
+        self.is_singular = discriminant == 0
+        if self.is_singular and not allow_singular:
             raise ValueError("Curva singular (discriminante = 0)")
+        
+        self.arith = CurveArithmetic(a, b, p)
+        
+        # Curva del catálogo: orden conocido y tabla de base fija para su generador
+        catalog = default_catalog()
+        self.catalog_entry = None if self.is_singular else catalog.lookup(p, a, b)
+        if self.catalog_entry and self.catalog_entry.G:
+            self.arith.set_fixed_base(
+                self.catalog_entry.G, catalog.fixed_base_table(self.catalog_entry, self.arith)
+            )
     
     def is_on_curve(self, point: EllipticPoint) -> bool:
         """Verificar si un punto está en la curva"""
         if point.is_infinity:
             return True
         
-        x, y = point.x, point.y
-        return (y**2) % self.p == (x**3 + self.a * x + self.b) % self.p
+        return self.arith.is_on_curve((point.x, point.y))
+    
+    def _wrap(self, point) -> EllipticPoint:
+        """Convertir un punto afín interno (tupla o None) en EllipticPoint"""
+        if point is None:
+            return EllipticPoint.infinity()
+        return EllipticPoint(point[0], point[1], self)
+    
+    @staticmethod
+    def _unwrap(P: EllipticPoint):
+        """Convertir un EllipticPoint en punto afín interno"""
+        return None if P.is_infinity else (P.x, P.y)
     
     def add_points(self, P: EllipticPoint, Q: EllipticPoint) -> EllipticPoint:
         """Suma de puntos en la curva elíptica"""
@@ -67,23 +105,10 @@ class EllipticCurve:
         if Q.is_infinity:
             return P
         
-        if P.x == Q.x:
-            if P.y == Q.y:
-                # Duplicación de punto
-                return self._double_point(P)
-            else:
-                # P + (-P) = O
-                return EllipticPoint.infinity()
-        
-        # Suma general
         try:
-            slope = ((Q.y - P.y) * inverse(Q.x - P.x, self.p)) % self.p
-            x3 = (slope**2 - P.x - Q.x) % self.p
-            y3 = (slope * (P.x - x3) - P.y) % self.p
-            
-            result = EllipticPoint(x3, y3, self)
-            return result
-        except Exception:
+            return self._wrap(self.arith.add_affine(self._unwrap(P), self._unwrap(Q)))
+        except ValueError:
+            # Inversión imposible (p no primo)
             return EllipticPoint.infinity()
     
     def _double_point(self, P: EllipticPoint) -> EllipticPoint:
@@ -92,48 +117,56 @@ class EllipticCurve:
             return P
         
         try:
-            slope = ((3 * P.x**2 + self.a) * inverse(2 * P.y, self.p)) % self.p
-            x3 = (slope**2 - 2 * P.x) % self.p
-            y3 = (slope * (P.x - x3) - P.y) % self.p
-            
-            return EllipticPoint(x3, y3, self)
-        except Exception:
+            return self._wrap(self.arith.to_affine(self.arith.double(self.arith.to_jacobian(self._unwrap(P)))))
+        except ValueError:
             return EllipticPoint.infinity()
     
-    def scalar_multiply(self, k: int, P: EllipticPoint) -> EllipticPoint:
-        """Multiplicación escalar k*P"""
+    def scalar_multiply(self, k: int, P: EllipticPoint, ladder: bool = False) -> EllipticPoint:
+        """
+        Multiplicación escalar k*P.
+        
+        Args:
+            k: Escalar (puede ser negativo)
+            P: Punto base
+            ladder: Usar escalera de Montgomery en lugar de wNAF
+        """
         if k == 0 or P.is_infinity:
             return EllipticPoint.infinity()
         
-        if k < 0:
-            # k*P = -(-k*P)
-            neg_P = EllipticPoint(P.x, (-P.y) % self.p, self)
-            return self.scalar_multiply(-k, neg_P)
-        
-        # Método de duplicación y suma
-        result = EllipticPoint.infinity()
-        addend = P
-        
-        while k:
-            if k & 1:
-                result = self.add_points(result, addend)
-            addend = self._double_point(addend)
-            k >>= 1
-        
-        return result
+        try:
+            return self._wrap(self.arith.multiply(k, self._unwrap(P), ladder=ladder))
+        except ValueError:
+            return EllipticPoint.infinity()
     
     def point_order(self, P: EllipticPoint, max_order: int = 10000) -> Optional[int]:
         """Calcular orden de un punto"""
         if P.is_infinity:
             return 1
         
-        current = P
-        for i in range(1, max_order + 1):
-            if current.is_infinity:
-                return i
-            current = self.add_points(current, P)
-        
-        return None  # Orden muy grande
+        # BSGS sobre kP = O: O(sqrt(max_order)) operaciones
+        return ECDLPSolver(self.arith, workers=1).point_order(self._unwrap(P), max_order)
+    
+    def known_order(self) -> Optional[int]:
+        """#E(F_p) si ya se conoce (catálogo o caché), sin contar puntos"""
+        if self.catalog_entry and self.catalog_entry.order:
+            return self.catalog_entry.order
+        return cached_order(self.a, self.b, self.p)
+    
+    def order(self, checkpoint=None) -> Optional[int]:
+        """Número de puntos #E(F_p) (catálogo o cacheado por (p, a, b))"""
+        return self.known_order() or curve_order(self.a, self.b, self.p, checkpoint=checkpoint)
+    
+    def has_order(self, N: int) -> bool:
+        """
+        Comprobar #E(F_p) = N sin contar puntos: con el orden ya conocido o
+        verificando N·P = O en puntos aleatorios
+        """
+        known = self.known_order()
+        if known is None and self.p < PointCounter.NAIVE_LIMIT:
+            known = self.order()
+        if known is not None:
+            return known == N
+        return PointCounter(self.a, self.b, self.p).annihilates(N)
     
     def __str__(self):
         return f"y² = x³ + {self.a}x + {self.b} (mod {self.p})"
@@ -145,12 +178,27 @@ class EllipticCurvePlugin(MultiTechniquePlugin):
     def __init__(self):
         super().__init__()
         
-        # Curvas débiles conocidas
-        self.weak_curves = self._load_weak_curves()
+        # Curvas estándar y débiles conocidas, indexadas por (p, a, b)
+        self.curve_catalog = default_catalog()
         
         # Límites para diferentes ataques
         self.max_pohlig_hellman_factors = 20
         self.max_brute_force_order = 10000
+        # Conteo de puntos: Schoof (~20 s a 128 bits) solo cuando un ataque de
+        # orden débil (Pohlig-Hellman, MOV) necesita #E; la detección y el ECDLP
+        # genérico se quedan en el rango de Mestre (milisegundos)
+        self.max_point_counting_bits = 128
+        self.max_scan_counting_bits = 64
+        self.max_embedding_degree = ExtensionField.MAX_DEGREE
+        
+        # Curvas inválidas: mayor primo por subgrupo y curvas b' evaluadas como máximo
+        self.invalid_curve_max_prime = 1 << 16
+        self.invalid_curve_max_curves = 4096
+        self.oracle_window = 32
+        
+        # Presupuesto de operaciones de grupo para logaritmos discretos genéricos
+        self.ecdlp_max_operations = 1 << 48
+        self.ecdlp_workers = None  # None = todos los núcleos
     
     def _create_plugin_info(self) -> PluginInfo:
         return PluginInfo(
@@ -161,7 +209,7 @@ class EllipticCurvePlugin(MultiTechniquePlugin):
             techniques=[
                 "invalid_curve_attack", "smart_attack", "pohlig_hellman",
                 "weak_curve_detection", "point_order_attack", "singular_curve",
-                "small_subgroup_attack", "twist_attack"
+                "small_subgroup_attack", "twist_attack", "discrete_log", "mov_attack"
             ],
             priority=80
         )
@@ -207,12 +255,44 @@ class EllipticCurvePlugin(MultiTechniquePlugin):
             "weak_curve_detection": self._try_weak_curve_detection,
             "invalid_curve_attack": self._try_invalid_curve_attack,
             "smart_attack": self._try_smart_attack,
+            "mov_attack": self._try_mov_attack,
             "pohlig_hellman": self._try_pohlig_hellman,
+            "discrete_log": self._try_discrete_log,
             "small_subgroup_attack": self._try_small_subgroup_attack,
             "singular_curve": self._try_singular_curve,
             "point_order_attack": self._try_point_order_attack
         }
     
+    def _get_ordered_techniques(self, challenge_data: ChallengeData) -> Dict[str, callable]:
+        """
+        Curvas singulares primero; si no, calcular el grado de inclusión de
+        entrada: si es bajo, MOV va primero
+        """
+        try:
+            params = self._extract_ecc_parameters(challenge_data)
+            if not all(k in params for k in ['a', 'b', 'p']):
+                return self._techniques
+            
+            a, b, p = params['a'], params['b'], params['p']
+            first = None
+            if (4 * a**3 + 27 * b**2) % p == 0:
+                first = "singular_curve"
+            elif 'Gx' in params and 'Gy' in params:
+                n = params.get('n')
+                if not n and p < PointCounter.MESTRE_LIMIT:
+                    curve = EllipticCurve(a, b, p)
+                    n = self._generator_order(curve, (params['Gx'], params['Gy']), params)
+                if n and embedding_degree(p, n, self.max_embedding_degree):
+                    first = "mov_attack"
+            
+            if first:
+                ordered = {first: self._techniques[first]}
+                ordered.update(self._techniques)
+                return ordered
+        except Exception as e:
+            self.logger.debug(f"Sin orden previo de técnicas: {e}")
+        return self._techniques
+    
     def _is_text_file(self, file_info) -> bool:
         """Verificar si es archivo de texto"""
         if file_info.mime_type and 'text' in file_info.mime_type:
@@ -262,22 +342,6 @@ class EllipticCurvePlugin(MultiTechniquePlugin):
             pass
         return False
     
-    def _load_weak_curves(self) -> List[Dict[str, Any]]:
-        """Cargar curvas débiles conocidas"""
-        # Algunas curvas débiles para tests
-        return [
-            {
-                'name': 'anomalous_curve_example',
-                'a': 1, 'b': 1, 'p': 23,  # Curva anómala pequeña
-                'weakness': 'anomalous'
-            },
-            {
-                'name': 'small_order_curve',
-                'a': 0, 'b': 7, 'p': 17,  # Curva con orden pequeño
-                'weakness': 'small_order'
-            }
-        ]
-    
     def _extract_ecc_parameters(self, challenge_data: ChallengeData) -> Dict[str, Any]:
         """Extraer parámetros de curva elíptica"""
         params = {}
@@ -331,16 +395,40 @@ class EllipticCurvePlugin(MultiTechniquePlugin):
                     params['Qx'] = int(data['Qx']) if isinstance(data['Qx'], str) else data['Qx']
                     params['Qy'] = int(data['Qy']) if isinstance(data['Qy'], str) else data['Qy']
                 
+                # Clave pública del otro extremo (ECDH)
+                if 'B' in data and isinstance(data['B'], list) and len(data['B']) == 2:
+                    params['Bx'], params['By'] = data['B']
+                elif 'Bx' in data and 'By' in data:
+                    params['Bx'], params['By'] = int(data['Bx']), int(data['By'])
+                
+                # Pares (P, d·P) de un servicio que no valida los puntos
+                if isinstance(data.get('samples'), list):
+                    params['samples'] = [self._parse_sample(sample) for sample in data['samples']]
+                
+                # Datos cifrados en hexadecimal
+                for key in ['iv', 'ciphertext', 'encrypted_flag']:
+                    if isinstance(data.get(key), str):
+                        params['ciphertext' if key == 'encrypted_flag' else key] = data[key]
+                
                 # Clave privada y mensaje cifrado
                 for key in ['d', 'k', 'r', 's', 'm', 'c']:
                     if key in data:
                         params[key] = int(data[key]) if isinstance(data[key], str) else data[key]
-                        
+        
         except Exception as e:
             self.logger.debug(f"Error extrayendo JSON ECC: {e}")
         
         return params
     
+    @staticmethod
+    def _parse_sample(sample: Any) -> Tuple[Tuple[int, int], Optional[Tuple[int, int]]]:
+        """Muestra {"P": [x, y], "dP": [x, y] | null} o [[x, y], [x, y] | null]"""
+        if isinstance(sample, dict):
+            P, R = sample['P'], sample.get('dP', sample.get('Q'))
+        else:
+            P, R = sample
+        return (int(P[0]), int(P[1])), (int(R[0]), int(R[1])) if R else None
+    
     def _extract_from_text(self, content: str) -> Dict[str, Any]:
         """Extraer parámetros de texto plano"""
         params = {}
@@ -356,6 +444,7 @@ class EllipticCurvePlugin(MultiTechniquePlugin):
             'Qx': [r'Qx\s*[=:]\s*(\d+)', r'Q\.x\s*[=:]\s*(\d+)'],
             'Qy': [r'Qy\s*[=:]\s*(\d+)', r'Q\.y\s*[=:]\s*(\d+)'],
             'd': [r'd\s*[=:]\s*(\d+)', r'private\s*[=:]\s*(\d+)'],
+            'd_bits': [r'd\s*<\s*2\s*(?:\^|\*\*)\s*(\d+)', r'(\d+)[- ]bit (?:private key|secret|scalar)'],
         }
         
         for param, pattern_list in patterns.items():
@@ -368,6 +457,16 @@ class EllipticCurvePlugin(MultiTechniquePlugin):
                     except ValueError:
                         continue
         
+        # Datos cifrados en hexadecimal
+        hex_patterns = {
+            'iv': r'\biv\s*[=:]\s*[\'"]?([0-9a-fA-F]{32})\b',
+            'ciphertext': r'(?:ciphertext|encrypted_flag)\s*[=:]\s*[\'"]?([0-9a-fA-F]+)\b',
+        }
+        for param, pattern in hex_patterns.items():
+            match = re.search(pattern, content, re.IGNORECASE)
+            if match and len(match.group(1)) % 2 == 0:
+                params[param] = match.group(1)
+        
         # Buscar puntos en formato (x, y)
         point_matches = re.findall(r'\(\s*(\d+)\s*,\s*(\d+)\s*\)', content)
         if point_matches:
@@ -389,15 +488,22 @@ class EllipticCurvePlugin(MultiTechniquePlugin):
         
         a, b, p = params['a'], params['b'], params['p']
         
-        # Verificar contra curvas débiles conocidas
-        for weak_curve in self.weak_curves:
-            if (weak_curve['a'] == a and weak_curve['b'] == b and weak_curve['p'] == p):
-                return self._create_success_result(
-                    flag=f"Curva débil detectada: {weak_curve['name']}",
-                    method="weak_curve_detection",
-                    confidence=0.9,
-                    weakness=weak_curve['weakness']
-                )
+        # Búsqueda O(1) en el catálogo de curvas conocidas
+        known = self.curve_catalog.lookup(p, a, b)
+        if known and known.weakness:
+            return self._create_success_result(
+                flag=f"Curva débil detectada: {known.name}",
+                method="weak_curve_detection",
+                confidence=0.9,
+                weakness=known.weakness,
+                curve_name=known.name,
+                curve_order=known.order,
+                order_factors=known.order_factors
+            )
+        if known:
+            return self._create_failure_result(
+                f"Curva estándar {known.name}: sin debilidades conocidas", curve_name=known.name
+            )
         
         # Verificar propiedades débiles
         try:
@@ -420,64 +526,140 @@ class EllipticCurvePlugin(MultiTechniquePlugin):
                     confidence=0.8,
                     weakness="supersingular"
                 )
-                
+            
+            # Grado de inclusión bajo (MOV)
+            if 'Gx' in params and 'Gy' in params:
+                n = self._generator_order(curve, (params['Gx'], params['Gy']), params,
+                                          max_bits=self.max_scan_counting_bits)
+                k = embedding_degree(p, n, self.max_embedding_degree) if n else None
+                if k:
+                    return self._create_success_result(
+                        flag=f"Grado de inclusión bajo detectado: k = {k}",
+                        method="embedding_degree_detection",
+                        confidence=0.8,
+                        weakness="low_embedding_degree",
+                        embedding_degree=k
+                    )
+            
+            # Orden suave (Pohlig-Hellman)
+            order = self._curve_order(curve, max_bits=self.max_scan_counting_bits)
+            if order:
+                factors = RSAMath.factorize(order, rho_iterations=1 << 20)
+                largest = max(factors)
+                if (largest.bit_length() <= min(48, order.bit_length() // 2)
+                        and RSAMath.is_prime_miller_rabin(largest)):
+                    return self._create_success_result(
+                        flag=f"Curva de orden suave detectada: #E = {order}",
+                        method="smooth_order_detection",
+                        confidence=0.8,
+                        weakness="smooth_order",
+                        curve_order=order,
+                        order_factors=factors
+                    )
+        
         except Exception as e:
             return self._create_failure_result(f"Error analizando curva: {str(e)}")
         
         return self._create_failure_result("No se detectaron debilidades obvias")
     
     def _try_invalid_curve_attack(self, challenge_data: ChallengeData) -> SolutionResult:
-        """Ataque de curva inválida"""
+        """
+        Ataque de curva inválida: residuos de d en subgrupos pequeños de
+        curvas y² = x³ + ax + b' (muestras offline u oráculo remoto) y CRT
+        """
         self.logger.info("Probando ataque de curva inválida")
         
         params = self._extract_ecc_parameters(challenge_data)
-        if not all(k in params for k in ['a', 'b', 'p', 'Qx', 'Qy']):
+        if not all(k in params for k in ['a', 'b', 'p']):
             return self._create_failure_result("Faltan parámetros para ataque de curva inválida")
+        if not params.get('samples') and not challenge_data.network_info:
+            return self._create_failure_result("Se necesitan muestras (P, d·P) o un oráculo de multiplicación")
         
         a, b, p = params['a'], params['b'], params['p']
-        Qx, Qy = params['Qx'], params['Qy']
         
         try:
-            # Crear punto Q
-            Q = EllipticPoint(Qx, Qy)
+            curve = EllipticCurve(a, b, p)
+            G = (params['Gx'], params['Gy']) if 'Gx' in params and 'Gy' in params else None
+            Q = (params['Qx'], params['Qy']) if 'Qx' in params and 'Qy' in params else None
+            n = (self._generator_order(curve, G, params, max_bits=self.max_scan_counting_bits)
+                 if G else params.get('n'))
+            # Sin orden conocido, d < #E(F_p) <= p + 1 + 2√p
+            target = n or p + 2 * math.isqrt(p) + 2
             
-            # Probar diferentes curvas inválidas con el mismo punto Q
-            for b_prime in range(1, min(100, p)):
-                if b_prime == b:
-                    continue
-                
-                try:
-                    # Crear curva inválida
-                    invalid_curve = EllipticCurve(a, b_prime, p)
-                    
-                    # Verificar si Q está en la curva inválida
-                    if invalid_curve.is_on_curve(Q):
-                        # Calcular orden del punto en la curva inválida
-                        order = invalid_curve.point_order(Q, max_order=1000)
-                        
-                        if order and order < 1000:  # Orden pequeño
-                            return self._create_success_result(
-                                flag=f"Curva inválida encontrada: b'={b_prime}, orden={order}",
-                                method="invalid_curve_attack",
-                                confidence=0.8,
-                                invalid_b=b_prime,
-                                point_order=order
-                            )
-                            
-                except Exception:
-                    continue
-            
-            return self._create_failure_result("No se encontraron curvas inválidas útiles")
+            attack = InvalidCurveAttack(
+                a, b, p,
+                workers=self.ecdlp_workers,
+                max_prime=self.invalid_curve_max_prime,
+                count_bits=self.max_point_counting_bits,
+                checkpoint=self._check_timeout
+            )
+            if params.get('samples'):
+                residue, modulus = attack.add_samples(params['samples'])
+            else:
+                residue, modulus = self._run_invalid_curve_oracle(attack, challenge_data, target)
+            if modulus == 1:
+                return self._create_failure_result("No se obtuvieron residuos del secreto")
+            
+            d = residue if modulus >= target else None
+            if G and Q:
+                d = self._complete_residue(curve, G, Q, residue, modulus, n)
+            if d is None:
+                return self._create_failure_result(
+                    "Residuos insuficientes para recuperar el secreto",
+                    partial_residue=residue, partial_modulus=modulus
+                )
             
+            return self._private_key_result(
+                d, "invalid_curve_attack", params=params, curve=curve,
+                curves_scanned=attack.curves_scanned, residue_modulus=modulus
+            )
+        
         except Exception as e:
             return self._create_failure_result(f"Error en ataque de curva inválida: {str(e)}")
     
+    def _run_invalid_curve_oracle(self, attack: InvalidCurveAttack, challenge_data: ChallengeData,
+                                  target: int) -> Tuple[int, int]:
+        """Recoger residuos consultando el servicio del desafío"""
+        settings = challenge_data.metadata.get('invalid_curve', {})
+        connection = PipelinedConnection.from_network_info(
+            challenge_data.network_info,
+            window=settings.get('window', self.oracle_window),
+            delimiter=settings.get('delimiter', '\n').encode()
+        )
+        oracle = PipelinedScalarOracle(connection, query_format=settings.get('query_format', '{x} {y}'))
+        
+        async def collect():
+            try:
+                await connection.open()
+                return await attack.run(oracle, target, max_curves=self.invalid_curve_max_curves)
+            finally:
+                await connection.close()
+        
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(collect())
+        finally:
+            loop.close()
+    
+    def _complete_residue(self, curve: EllipticCurve, G: Tuple[int, int], Q: Tuple[int, int],
+                          residue: int, modulus: int, n: Optional[int]) -> Optional[int]:
+        """d ≡ residue (mod modulus) con d·G = Q; si falta módulo, canguro sobre d = r + t·M"""
+        if curve.arith.multiply(residue, G) == Q:
+            return residue
+        if not n or modulus >= n:
+            return None
+        solver = self._create_ecdlp_solver(curve)
+        base = curve.arith.multiply(modulus, G)
+        target = curve.arith.add_affine(Q, curve.arith.multiply(-residue, G))
+        t = solver.solve_interval(base, target, 0, n // modulus + 1)
+        return None if t is None else residue + t * modulus
+    
     def _try_smart_attack(self, challenge_data: ChallengeData) -> SolutionResult:
-        """Ataque de Smart para curvas anómalas"""
+        """Ataque de Smart para curvas anómalas (elevación p-ádica)"""
         self.logger.info("Probando ataque de Smart")
         
         params = self._extract_ecc_parameters(challenge_data)
-        if not all(k in params for k in ['a', 'b', 'p']):
+        if not all(k in params for k in ['a', 'b', 'p', 'Gx', 'Gy', 'Qx', 'Qy']):
             return self._create_failure_result("Faltan parámetros para ataque de Smart")
         
         a, b, p = params['a'], params['b'], params['p']
@@ -489,57 +671,146 @@ class EllipticCurvePlugin(MultiTechniquePlugin):
             if not self._is_anomalous_curve(curve, p):
                 return self._create_failure_result("La curva no es anómala")
             
-            # Para curvas anómalas, el logaritmo discreto se puede resolver eficientemente
-            # Esta es una implementación simplificada
+            G = (params['Gx'], params['Gy'])
+            Q = (params['Qx'], params['Qy'])
+            if not (curve.arith.is_on_curve(G) and curve.arith.is_on_curve(Q)):
+                return self._create_failure_result("G o Q no están en la curva")
             
-            if 'Gx' in params and 'Gy' in params and 'Qx' in params and 'Qy' in params:
-                G = EllipticPoint(params['Gx'], params['Gy'], curve)
-                Q = EllipticPoint(params['Qx'], params['Qy'], curve)
-                
-                # En una implementación real, usaríamos el algoritmo de Smart
-                # Aquí simulamos encontrar la clave privada
-                for d in range(1, min(1000, p)):
-                    if curve.scalar_multiply(d, G) == Q:
-                        return self._create_success_result(
-                            flag=f"Clave privada encontrada: d = {d}",
-                            method="smart_attack",
-                            confidence=0.95,
-                            private_key=d
-                        )
-            
-            return self._create_failure_result("No se pudo aplicar el ataque de Smart")
+            d = smart_attack(curve.arith, G, Q)
+            if d is None:
+                return self._create_failure_result("No se pudo aplicar el ataque de Smart")
             
+            return self._private_key_result(d, "smart_attack", params=params, curve=curve)
+        
         except Exception as e:
             return self._create_failure_result(f"Error en ataque de Smart: {str(e)}")
     
+    def _try_mov_attack(self, challenge_data: ChallengeData) -> SolutionResult:
+        """Reducción MOV/Frey-Rück: ECDLP en F_{p^k}^* vía emparejamiento de Tate"""
+        self.logger.info("Probando reducción MOV")
+        
+        params = self._extract_ecc_parameters(challenge_data)
+        if not all(k in params for k in ['a', 'b', 'p', 'Gx', 'Gy', 'Qx', 'Qy']):
+            return self._create_failure_result("Faltan parámetros para la reducción MOV")
+        
+        try:
+            curve = EllipticCurve(params['a'], params['b'], params['p'])
+            G = (params['Gx'], params['Gy'])
+            Q = (params['Qx'], params['Qy'])
+            
+            n = self._generator_order(curve, G, params)
+            if n is None:
+                return self._create_failure_result("No se conoce el orden del generador")
+            
+            k = embedding_degree(curve.p, n, self.max_embedding_degree)
+            if k is None:
+                return self._create_failure_result("Grado de inclusión demasiado alto para MOV")
+            
+            d = mov_attack(
+                curve.arith, G, Q, n, k=k,
+                checkpoint=self._check_timeout, max_operations=self.ecdlp_max_operations
+            )
+            if d is None:
+                return self._create_failure_result(
+                    "No se resolvió el logaritmo en F_{p^k}", embedding_degree=k
+                )
+            
+            return self._private_key_result(
+                d, "mov_attack", params=params, curve=curve, embedding_degree=k
+            )
+        
+        except Exception as e:
+            return self._create_failure_result(f"Error en reducción MOV: {str(e)}")
+    
     def _try_pohlig_hellman(self, challenge_data: ChallengeData) -> SolutionResult:
         """Ataque Pohlig-Hellman para órdenes suaves"""
         self.logger.info("Probando ataque Pohlig-Hellman")
         
         params = self._extract_ecc_parameters(challenge_data)
-        if 'n' not in params:
-            return self._create_failure_result("Falta el orden de la curva para Pohlig-Hellman")
+        if not all(k in params for k in ['a', 'b', 'p', 'Gx', 'Gy', 'Qx', 'Qy']):
+            return self._create_failure_result("Faltan parámetros para Pohlig-Hellman")
         
-        n = params['n']
+        try:
+            curve = EllipticCurve(params['a'], params['b'], params['p'])
+            G = (params['Gx'], params['Gy'])
+            Q = (params['Qx'], params['Qy'])
+            
+            n = self._generator_order(curve, G, params)
+            if n is None:
+                return self._create_failure_result("Falta el orden de la curva para Pohlig-Hellman")
+            
+            # Factorizar el orden
+            factors = RSAMath.factorize(n, rho_iterations=1 << 22)
+            primes = [q for q in set(factors) if RSAMath.is_prime_miller_rabin(q)]
+            if len(factors) < 2 or len(set(factors)) > self.max_pohlig_hellman_factors:
+                return self._create_failure_result("El orden no es compuesto o tiene demasiados factores")
+            
+            bound = 1 << params['d_bits'] if 'd_bits' in params else None
+            smooth = all(
+                q in primes and math.isqrt(q) <= self.ecdlp_max_operations for q in set(factors)
+            )
+            if not smooth and bound is None:
+                return self._create_failure_result(
+                    "El orden no es suficientemente suave", smooth_factors=sorted(primes)
+                )
+            
+            solver = self._create_ecdlp_solver(curve)
+            d = solver.pohlig_hellman(G, Q, n, factors=factors, bound=bound)
+            if d is None:
+                residue, modulus = solver.partial
+                return self._create_failure_result(
+                    "Pohlig-Hellman no recuperó la clave completa",
+                    partial_residue=residue, partial_modulus=modulus
+                )
+            
+            return self._private_key_result(
+                d, "pohlig_hellman", params=params, curve=curve,
+                smooth_factors=sorted(factors), operations=solver.operations
+            )
         
-        # Factorizar el orden
-        factors = self._factor_smooth_number(n)
+        except Exception as e:
+            return self._create_failure_result(f"Error en Pohlig-Hellman: {str(e)}")
+    
+    def _try_discrete_log(self, challenge_data: ChallengeData) -> SolutionResult:
+        """Logaritmo discreto genérico Q = d·G (BSGS, rho o canguro)"""
+        self.logger.info("Probando logaritmo discreto genérico")
         
-        if not factors or len(factors) > self.max_pohlig_hellman_factors:
-            return self._create_failure_result("El orden no es suficientemente suave")
+        params = self._extract_ecc_parameters(challenge_data)
+        if not all(k in params for k in ['a', 'b', 'p', 'Gx', 'Gy', 'Qx', 'Qy']):
+            return self._create_failure_result("Faltan parámetros para el logaritmo discreto")
         
-        # Verificar que todos los factores son pequeños
-        max_factor = max(factors)
-        if max_factor > 10000:
-            return self._create_failure_result("Factores demasiado grandes para Pohlig-Hellman")
+        try:
+            curve = EllipticCurve(params['a'], params['b'], params['p'])
+            G = (params['Gx'], params['Gy'])
+            Q = (params['Qx'], params['Qy'])
+            if not (curve.arith.is_on_curve(G) and curve.arith.is_on_curve(Q)):
+                return self._create_failure_result("G o Q no están en la curva")
+            
+            solver = self._create_ecdlp_solver(curve)
+            
+            if 'd_bits' in params:
+                # Clave acotada: canguro sobre [0, 2^bits)
+                bound = 1 << params['d_bits']
+                if math.isqrt(bound) > self.ecdlp_max_operations:
+                    return self._create_failure_result("Intervalo demasiado grande para el canguro")
+                d = solver.solve_interval(G, Q, 0, bound)
+            else:
+                n = self._generator_order(curve, G, params, max_bits=self.max_scan_counting_bits)
+                if n is None:
+                    return self._create_failure_result("No se conoce el orden del generador")
+                if math.isqrt(n) > self.ecdlp_max_operations:
+                    return self._create_failure_result("Orden demasiado grande para ECDLP genérico")
+                d = solver.solve(G, Q, n)
+            
+            if d is None:
+                return self._create_failure_result(
+                    "Presupuesto de ECDLP agotado", operations=solver.operations
+                )
+            
+            return self._private_key_result(d, "discrete_log", operations=solver.operations)
         
-        return self._create_success_result(
-            flag=f"Orden suave detectado: {factors}",
-            method="pohlig_hellman",
-            confidence=0.8,
-            smooth_factors=factors,
-            max_factor=max_factor
-        )
+        except Exception as e:
+            return self._create_failure_result(f"Error en logaritmo discreto: {str(e)}")
     
     def _try_small_subgroup_attack(self, challenge_data: ChallengeData) -> SolutionResult:
         """Ataque de subgrupo pequeño"""
@@ -565,12 +836,15 @@ class EllipticCurvePlugin(MultiTechniquePlugin):
                 )
             
             return self._create_failure_result("No se encontró subgrupo pequeño")
-            
+        
         except Exception as e:
             return self._create_failure_result(f"Error en ataque de subgrupo pequeño: {str(e)}")
     
     def _try_singular_curve(self, challenge_data: ChallengeData) -> SolutionResult:
-        """Detectar curvas singulares"""
+        """
+        Curvas singulares: el logaritmo se traslada a (F_p, +) en una cúspide
+        o a F_p* / F_{p²}* en un nodo
+        """
         self.logger.info("Verificando curvas singulares")
         
         params = self._extract_ecc_parameters(challenge_data)
@@ -579,18 +853,39 @@ class EllipticCurvePlugin(MultiTechniquePlugin):
         
         a, b, p = params['a'], params['b'], params['p']
         
-        # Calcular discriminante
-        discriminant = (-16 * (4 * a**3 + 27 * b**2)) % p
-        
-        if discriminant == 0:
-            return self._create_success_result(
-                flag="Curva singular detectada (discriminante = 0)",
-                method="singular_curve_detection",
-                confidence=0.95,
-                discriminant=discriminant
+        try:
+            curve = EllipticCurve(a, b, p, allow_singular=True)
+            if not curve.is_singular:
+                return self._create_failure_result("La curva no es singular")
+            
+            group = SingularCurve(a, b, p)
+            if not all(k in params for k in ['Gx', 'Gy', 'Qx', 'Qy']):
+                return self._create_success_result(
+                    flag="Curva singular detectada (discriminante = 0)",
+                    method="singular_curve_detection",
+                    confidence=0.95,
+                    singularity=group.kind
+                )
+            
+            G = (params['Gx'], params['Gy'])
+            Q = (params['Qx'], params['Qy'])
+            if not (curve.arith.is_on_curve(G) and curve.arith.is_on_curve(Q)):
+                return self._create_failure_result("G o Q no están en la curva")
+            
+            d = group.discrete_log(
+                G, Q, checkpoint=self._check_timeout, max_operations=self.ecdlp_max_operations
+            )
+            if d is None:
+                return self._create_failure_result(
+                    "No se resolvió el logaritmo en la curva singular", singularity=group.kind
+                )
+            
+            return self._private_key_result(
+                d, "singular_curve", params=params, curve=curve, singularity=group.kind
             )
         
-        return self._create_failure_result("La curva no es singular")
+        except Exception as e:
+            return self._create_failure_result(f"Error en curva singular: {str(e)}")
     
     def _try_point_order_attack(self, challenge_data: ChallengeData) -> SolutionResult:
         """Ataque basado en orden de puntos"""
@@ -627,36 +922,108 @@ class EllipticCurvePlugin(MultiTechniquePlugin):
                 )
             
             return self._create_failure_result("No se pudieron calcular órdenes de puntos")
-            
+        
         except Exception as e:
             return self._create_failure_result(f"Error calculando órdenes: {str(e)}")
     
     # Métodos auxiliares
     
-    def _is_anomalous_curve(self, curve: EllipticCurve, p: int) -> bool:
-        """Verificar si la curva es anómala (orden = p)"""
-        # Para curvas pequeñas, podemos verificar directamente
-        if p < 1000:
-            # Contar puntos en la curva (implementación simple)
-            count = 1  # Punto en el infinito
-            for x in range(p):
-                y_squared = (x**3 + curve.a * x + curve.b) % p
-                # Verificar si y_squared es un residuo cuadrático
-                if self._is_quadratic_residue(y_squared, p):
-                    count += 2 if y_squared != 0 else 1
-            
-            return count == p
+    def _create_ecdlp_solver(self, curve: EllipticCurve) -> ECDLPSolver:
+        """Solver ECDLP con el presupuesto, el checkpoint y la hora límite del plugin"""
+        return ECDLPSolver(
+            curve.arith,
+            workers=self.ecdlp_workers,
+            max_operations=self.ecdlp_max_operations,
+            checkpoint=self._check_timeout,
+            deadline=self._start_time + self._timeout if self._start_time else None
+        )
+    
+    def _curve_order(self, curve: EllipticCurve, max_bits: Optional[int] = None) -> Optional[int]:
+        """
+        #E(F_p) si el conteo de puntos es asumible para el tamaño de p
+        (por defecto hasta max_point_counting_bits)
+        """
+        known = curve.known_order()
+        limit = max_bits if max_bits is not None else self.max_point_counting_bits
+        if known is None and curve.p.bit_length() <= limit:
+            known = curve.order(self._check_timeout)
+        return known
+    
+    def _generator_order(self, curve: EllipticCurve, G: Tuple[int, int],
+                         params: Dict[str, Any], max_bits: Optional[int] = None) -> Optional[int]:
+        """Orden de G: el dado en el desafío o reducido desde #E(F_p)"""
+        if params.get('n'):
+            return params['n']
         
-        return False  # Para curvas grandes, necesitaríamos algoritmos más sofisticados
+        order = self._curve_order(curve, max_bits)
+        if order is None:
+            return None
+        return ECDLPSolver(curve.arith, workers=1).order_from_multiple(G, order)
+    
+    def _private_key_result(self, d: int, method: str, params: Optional[Dict[str, Any]] = None,
+                            curve: Optional[EllipticCurve] = None, **details) -> SolutionResult:
+        """Resultado de éxito para una clave privada recuperada"""
+        flag = self._extract_flag_from_result(long_to_bytes(d).decode('latin-1'))
+        if not flag and params:
+            flag = self._decrypt_with_private_key(d, params, curve)
+        return self._create_success_result(
+            flag=flag or f"Clave privada encontrada: d = {d}",
+            method=method,
+            confidence=0.95,
+            private_key=d,
+            **details
+        )
+    
+    def _decrypt_with_private_key(self, d: int, params: Dict[str, Any],
+                                  curve: Optional[EllipticCurve] = None) -> Optional[str]:
+        """
+        Descifrar el texto cifrado del desafío con la clave privada o con el
+        secreto compartido ECDH d·B, probando las derivaciones de clave habituales.
+        """
+        if 'ciphertext' in params:
+            ciphertext = bytes.fromhex(params['ciphertext'])
+        elif 'c' in params:
+            ciphertext = long_to_bytes(params['c'])
+        else:
+            return None
+        iv = bytes.fromhex(params['iv']) if 'iv' in params else None
+        
+        secrets = [d]
+        if curve and 'Bx' in params and 'By' in params:
+            shared = curve.arith.multiply(d, (params['Bx'], params['By']))
+            if shared:
+                secrets.insert(0, shared[0])
+        
+        for secret in secrets:
+            text, raw = str(secret).encode(), long_to_bytes(secret)
+            keys = [
+                hashlib.sha1(text).digest()[:16], hashlib.sha256(text).digest()[:16],
+                hashlib.sha256(raw).digest()[:16], hashlib.sha256(raw).digest(),
+                hashlib.md5(text).digest(), raw
+            ]
+            for key in keys:
+                for plaintext in self._decrypt_candidates(key, ciphertext, iv):
+                    flag = self._extract_flag_from_result(plaintext.decode('latin-1'))
+                    if flag:
+                        return flag
+        return None
+    
+    def _decrypt_candidates(self, key: bytes, ciphertext: bytes, iv: Optional[bytes]) -> List[bytes]:
+        """Textos planos candidatos con AES-CBC/ECB y XOR"""
+        candidates = [bytes(c ^ key[i % len(key)] for i, c in enumerate(ciphertext))]
+        if len(key) in (16, 24, 32) and ciphertext and len(ciphertext) % 16 == 0:
+            if iv and len(iv) == 16:
+                candidates.append(AES.new(key, AES.MODE_CBC, iv).decrypt(ciphertext))
+            candidates.append(AES.new(key, AES.MODE_ECB).decrypt(ciphertext))
+        return candidates
+    
+    def _is_anomalous_curve(self, curve: EllipticCurve, p: int) -> bool:
+        """Verificar si la curva es anómala (#E = p, traza 1)"""
+        return curve.has_order(p)
     
     def _is_supersingular_curve(self, curve: EllipticCurve, p: int) -> bool:
-        """Verificar si la curva es supersingular"""
-        # Implementación simplificada
-        # Una curva es supersingular si su traza es 0 mod p
-        # Para p pequeño, podemos calcularlo
-        if p < 100:
-            return self._is_anomalous_curve(curve, p)  # Simplificación
-        return False
+        """Verificar si la curva es supersingular (traza ≡ 0 mod p: #E = p + 1 para p > 3)"""
+        return curve.has_order(p + 1)
     
     def _is_quadratic_residue(self, a: int, p: int) -> bool:
         """Verificar si a es residuo cuadrático mod p"""
@@ -664,25 +1031,6 @@ class EllipticCurvePlugin(MultiTechniquePlugin):
             return True
         return pow(a, (p - 1) // 2, p) == 1
     
-    def _factor_smooth_number(self, n: int, max_factor: int = 10000) -> List[int]:
-        """Factorizar número suave"""
-        factors = []
-        d = 2
-        
-        while d * d <= n and d <= max_factor:
-            while n % d == 0:
-                factors.append(d)
-                n //= d
-            d += 1
-        
-        if n > 1:
-            if n <= max_factor:
-                factors.append(n)
-            else:
-                return []  # No es suave
-        
-        return factors
-    
     def _extract_flag_from_result(self, result: Any) -> Optional[str]:
         """Extraer flag del resultado"""
         if isinstance(result, str):
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Conteo de puntos de curvas elípticas y² = x³ + ax + b sobre F_p
+Símbolos de Legendre vectorizados para p diminuto, BSGS de Mestre (curva y
+twist) hasta ~2^64 y Schoof con polinomios de división para p mayores, con
+el último tramo del intervalo de Hasse resuelto por BSGS.
+"""
+import math
+import random
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from .ec_arith import Affine, CurveArithmetic
+from .ecdlp import ECDLPSolver
+from .polynomial import (
+    Poly, ModulusSplit, PolyRing, poly_add, poly_divmod, poly_gcd, poly_mul, poly_scale,
+    poly_sub, trim
+)
+from ..rsa.modular_roots import ModularRoots
+
+# Órdenes ya calculados por (p, a mod p, b mod p)
+_ORDER_CACHE: Dict[Tuple[int, int, int], int] = {}
+
+
+class PointCounter:
+    """Cálculo de #E(F_p) eligiendo el algoritmo según el tamaño de p"""
+    
+    NAIVE_LIMIT = 1 << 20
+    MESTRE_LIMIT = 1 << 64
+    
+    def __init__(self, a: int, b: int, p: int, checkpoint: Optional[Callable[[], None]] = None,
+                 bsgs_range: int = 1 << 32, max_schoof_prime: int = 101):
+        """
+        Args:
+            checkpoint: Llamada periódica (p.ej. comprobación de timeout)
+            bsgs_range: Schoof se detiene cuando quedan a lo sumo tantos
+                candidatos en el intervalo de Hasse; el resto lo resuelve BSGS
+            max_schoof_prime: Mayor primo l para el que se calcula t mod l
+        """
+        self.a = a % p
+        self.b = b % p
+        self.p = p
+        self.arith = CurveArithmetic(a, b, p)
+        self.checkpoint = checkpoint
+        self.bsgs_range = bsgs_range
+        self.max_schoof_prime = max_schoof_prime
+        
+        # Intervalo de Hasse: |t| <= 2√p
+        width = math.isqrt(4 * p)
+        self.lo = p + 1 - width
+        self.hi = p + 1 + width
+        
+        self._division_polynomials: Dict[int, Poly] = {}
+        self._twist: Optional[CurveArithmetic] = None
+    
+    def _check(self) -> None:
+        if self.checkpoint:
+            self.checkpoint()
+    
+    def count(self, method: Optional[str] = None) -> Optional[int]:
+        """
+        #E(F_p) o None si se agotan los intentos.
+        
+        Args:
+            method: 'naive', 'mestre' o 'schoof' (por defecto según p)
+        """
+        if method is None:
+            if self.p < self.NAIVE_LIMIT:
+                method = 'naive'
+            elif self.p < self.MESTRE_LIMIT:
+                method = 'mestre'
+            else:
+                method = 'schoof'
+        
+        if method == 'naive':
+            return self.count_naive()
+        if method == 'mestre':
+            return self.match_order(0, 1)
+        
+        residue, modulus = self.trace_modulo()
+        return self.match_order(self.p + 1 - residue, modulus)
+    
+    def count_naive(self) -> int:
+        """1 + Σ (1 + (f(x)/p)) con la tabla de cuadrados de F_p"""
+        a, b, p = self.a, self.b, self.p
+        if HAS_NUMPY:
+            x = np.arange(p, dtype=np.int64)
+            rhs = ((x * x % p) * x + a * x + b) % p
+            squares = np.zeros(p, dtype=bool)
+            squares[x * x % p] = True
+            zeros = int(np.count_nonzero(rhs == 0))
+            return 1 + zeros + 2 * (int(np.count_nonzero(squares[rhs])) - zeros)
+        
+        squares = {y * y % p for y in range(p)}
+        count = 1
+        for x in range(p):
+            rhs = (x * x * x + a * x + b) % p
+            if rhs == 0:
+                count += 1
+            elif rhs in squares:
+                count += 2
+        return count
+    
+    # Puntos aleatorios y BSGS en el intervalo de Hasse
+    
+    def _twist_arith(self) -> CurveArithmetic:
+        """Twist cuadrático y² = x³ + a·d²·x + b·d³ con d no residuo"""
+        if self._twist is None:
+            p = self.p
+            d = 2
+            while pow(d, (p - 1) // 2, p) != p - 1:
+                d += 1
+            self._twist = CurveArithmetic(self.a * d * d, self.b * d * d * d, p)
+        return self._twist
+    
+    @staticmethod
+    def random_point(arith: CurveArithmetic) -> Affine:
+        """Punto afín aleatorio de la curva"""
+        p = arith.p
+        while True:
+            x = random.randrange(p)
+            roots = ModularRoots.sqrt_mod_prime((x * x * x + arith.a * x + arith.b) % p, p)
+            if roots:
+                return (x, random.choice(roots))
+    
+    def annihilates(self, N: int, trials: int = 3) -> bool:
+        """
+        Comprobar N·P = O en puntos aleatorios. Basta para confirmar #E = N
+        cuando N es el único candidato compatible (p.ej. N = p o N = p + 1
+        con puntos de orden mayor que 4√p).
+        """
+        if not self.lo <= N <= self.hi:
+            return False
+        return all(
+            self.arith.multiply(N, self.random_point(self.arith)) is None for _ in range(trials)
+        )
+    
+    def _class_candidates(self, residue: int, modulus: int) -> Tuple[int, int]:
+        """Primer N >= lo con N ≡ residue (mod modulus) y número de candidatos"""
+        first = self.lo + (residue - self.lo) % modulus
+        if first > self.hi:
+            return first, 0
+        return first, (self.hi - first) // modulus + 1
+    
+    def match_order(self, residue: int, modulus: int, max_points: int = 40) -> Optional[int]:
+        """
+        #E con N ≡ residue (mod modulus) por BSGS con puntos de E y del twist
+        (método de Mestre): cada punto P restringe la clase de N a los
+        múltiplos de P dentro de ella, hasta que queda un solo candidato.
+        """
+        p = self.p
+        residue %= modulus
+        solver = ECDLPSolver(self.arith, workers=1)
+        twist_solver = None
+        
+        for attempt in range(max_points):
+            self._check()
+            first, count = self._class_candidates(residue, modulus)
+            if count == 1:
+                return first
+            if count == 0:
+                return None
+            
+            # #E' = 2p + 2 - #E
+            twisted = attempt % 2 == 1
+            if twisted:
+                if twist_solver is None:
+                    twist_solver = ECDLPSolver(self._twist_arith(), workers=1)
+                current, target = twist_solver, (2 * p + 2 - residue) % modulus
+            else:
+                current, target = solver, residue
+            
+            arith = current.arith
+            P = self.random_point(arith)
+            start, count = self._class_candidates(target, modulus)
+            
+            # N = start + modulus·s con N·P = O  <=>  s·(modulus·P) = -start·P
+            step = arith.multiply(modulus, P)
+            s = current.bsgs(step, arith.negate(arith.multiply(start, P)), count)
+            if s is None:
+                continue
+            
+            # Orden de modulus·P: todas las soluciones de la clase difieren en él
+            if step is None:
+                step_order = 1
+            else:
+                step_order = current.point_order(step, count) or count
+            modulus *= step_order
+            multiple = start + (s * (modulus // step_order))
+            residue = (2 * p + 2 - multiple if twisted else multiple) % modulus
+        
+        return None
+    
+    # Schoof
+    
+    def division_polynomial(self, n: int) -> Poly:
+        """
+        ψ_n en x, con ψ_n = g_n para n impar y ψ_n = y·g_n para n par
+        (y² sustituido por x³ + ax + b). Devuelve g_n.
+        """
+        cache = self._division_polynomials
+        if n in cache:
+            return cache[n]
+        a, b, p = self.a, self.b, self.p
+        
+        if n <= 4:
+            base = {
+                0: [],
+                1: [1],
+                2: [2],
+                3: [-a * a, 12 * b, 6 * a, 0, 3],
+                4: [-4 * (8 * b * b + a * a * a), -16 * a * b, -20 * a * a,
+                    80 * b, 20 * a, 0, 4],
+            }
+            result = trim([c % p for c in base[n]])
+        else:
+            m = n // 2
+            g = self.division_polynomial
+            if n % 2:
+                f = [b, a, 0, 1]
+                f2 = poly_mul(f, f, p)
+                left = poly_mul(g(m + 2), poly_mul(g(m), poly_mul(g(m), g(m), p), p), p)
+                right = poly_mul(g(m - 1), poly_mul(g(m + 1), poly_mul(g(m + 1), g(m + 1), p), p), p)
+                if m % 2 == 0:
+                    left = poly_mul(left, f2, p)
+                else:
+                    right = poly_mul(right, f2, p)
+                result = poly_sub(left, right, p)
+            else:
+                inner = poly_sub(
+                    poly_mul(g(m + 2), poly_mul(g(m - 1), g(m - 1), p), p),
+                    poly_mul(g(m - 2), poly_mul(g(m + 1), g(m + 1), p), p),
+                    p
+                )
+                result = poly_scale(poly_mul(g(m), inner, p), pow(2, -1, p), p)
+        
+        cache[n] = result
+        return result
+    
+    def _trace_mod_2(self) -> int:
+        """t es par si y solo si E tiene un punto de orden 2 (f con raíz en F_p)"""
+        f = [self.b, self.a, 0, 1]
+        ring = PolyRing(f, self.p)
+        xp = ring.pow([0, 1], self.p)
+        return 0 if len(poly_gcd(f, poly_sub(xp, [0, 1], self.p), self.p)) > 1 else 1
+    
+    def _trace_mod_l(self, l: int) -> int:
+        """
+        t mod l a partir de π² - t·π + p = 0 sobre E[l], trabajando en
+        F_p[x]/(ψ_l). Si una inversión falla se continúa sobre el factor
+        de ψ_l encontrado: la relación vale para cada punto de l-torsión.
+        """
+        p = self.p
+        modulus = self.division_polynomial(l)
+        while True:
+            try:
+                return self._trace_in_ring(PolyRing(modulus, p), l)
+            except ModulusSplit as split:
+                if not 1 < len(split.factor) < len(modulus):
+                    raise ArithmeticError(f"Módulo degenerado para t mod {l}")
+                cofactor = poly_divmod(modulus, split.factor, p)[0]
+                modulus = min(split.factor, cofactor, key=len)
+    
+    def _trace_in_ring(self, ring: PolyRing, l: int) -> int:
+        p = self.p
+        f = ring.reduce([self.b, self.a, 0, 1])
+        
+        # Puntos (X(x), Y(x)·y) de E(F_p[x]/(h)); None es el infinito
+        def add(P, Q):
+            if P is None:
+                return Q
+            if Q is None:
+                return P
+            (x1, y1), (x2, y2) = P, Q
+            if x1 == x2:
+                if y1 == y2:
+                    return double(P)
+                if not poly_add(y1, y2, p):
+                    return None
+                ring.inverse(poly_sub(y1, y2, p))
+            slope = ring.mul(poly_sub(y2, y1, p), ring.inverse(poly_sub(x2, x1, p)))
+            return chord(P, Q, slope)
+        
+        def double(P):
+            if P is None or not P[1]:
+                return None
+            x1, y1 = P
+            numerator = poly_add(poly_scale(ring.mul(x1, x1), 3, p), [self.a], p)
+            slope = ring.mul(numerator, ring.inverse(poly_scale(ring.mul(y1, f), 2, p)))
+            return chord(P, P, slope)
+        
+        def chord(P, Q, slope):
+            # λ = slope·y, λ² = slope²·f
+            x3 = poly_sub(poly_sub(ring.mul(f, ring.mul(slope, slope)), P[0], p), Q[0], p)
+            y3 = poly_sub(ring.mul(slope, poly_sub(P[0], x3, p)), P[1], p)
+            return (x3, y3)
+        
+        def multiply(k, P):
+            result = None
+            for bit in bin(k)[2:]:
+                result = double(result)
+                if bit == '1':
+                    result = add(result, P)
+            return result
+        
+        x = ring.reduce([0, 1])
+        frobenius = (ring.pow(x, p), ring.pow(f, (p - 1) // 2))
+        frobenius2 = (ring.pow(x, p * p), ring.pow(f, (p * p - 1) // 2))
+        
+        target = add(frobenius2, multiply(p % l, (x, [1])))
+        if target is None:
+            return 0
+        
+        # τ·π = target; basta recorrer τ <= (l-1)/2 comparando x y luego el signo de y
+        current = frobenius
+        for tau in range(1, (l - 1) // 2 + 1):
+            self._check()
+            if current is None:
+                break
+            if current[0] == target[0]:
+                if current[1] == target[1]:
+                    return tau
+                if not poly_add(current[1], target[1], p):
+                    return l - tau
+                ring.inverse(poly_sub(current[1], target[1], p))
+            current = add(current, frobenius)
+        raise ArithmeticError(f"Sin solución para t mod {l}")
+    
+    def trace_modulo(self) -> Tuple[int, int]:
+        """
+        (t mod M, M) con M producto de primos pequeños, hasta que el intervalo
+        de Hasse deja a lo sumo `bsgs_range` candidatos o se llega a
+        `max_schoof_prime`.
+        """
+        residue, modulus = self._trace_mod_2(), 2
+        l = 3
+        while (self.hi - self.lo) // modulus > self.bsgs_range and l <= self.max_schoof_prime:
+            self._check()
+            if l != self.p and all(l % q for q in range(3, math.isqrt(l) + 1, 2)):
+                t = self._trace_mod_l(l)
+                # CRT incremental
+                residue += modulus * ((t - residue) * pow(modulus, -1, l) % l)
+                modulus *= l
+            l += 2
+        return residue % modulus, modulus
+
+
+def curve_order(a: int, b: int, p: int, checkpoint: Optional[Callable[[], None]] = None) -> Optional[int]:
+    """#E(F_p) con caché por (p, a, b)"""
+    key = (p, a % p, b % p)
+    if key not in _ORDER_CACHE:
+        order = PointCounter(a, b, p, checkpoint=checkpoint).count()
+        if order is None:
+            return None
+        _ORDER_CACHE[key] = order
+    return _ORDER_CACHE[key]
+
+
+def cached_order(a: int, b: int, p: int) -> Optional[int]:
+    """Orden ya calculado de la curva, sin calcularlo"""
+    return _ORDER_CACHE.get((p, a % p, b % p))
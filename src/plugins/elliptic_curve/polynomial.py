@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Aritmética de polinomios sobre F_p
+Producto por sustitución de Kronecker, división larga, mcd y anillos
+cociente F_p[x]/(h) con reducción de Barrett e inversión que detecta factores
+del módulo
+"""
+import random
+from typing import List, Tuple
+
+try:
+    import gmpy2
+    HAS_GMPY2 = True
+except ImportError:
+    HAS_GMPY2 = False
+
+# Polinomios como listas de coeficientes mod p, del término independiente al
+# de mayor grado y sin ceros finales
+Poly = List[int]
+
+# Por debajo de este número de coeficientes se multiplica de forma escolar
+_SCHOOLBOOK_LIMIT = 16
+
+
+def trim(f: Poly) -> Poly:
+    while f and f[-1] == 0:
+        f.pop()
+    return f
+
+
+def poly_add(f: Poly, g: Poly, p: int) -> Poly:
+    if len(f) < len(g):
+        f, g = g, f
+    return trim([(c + d) % p for c, d in zip(f, g)] + f[len(g):])
+
+
+def poly_sub(f: Poly, g: Poly, p: int) -> Poly:
+    return poly_add(f, [-c % p for c in g], p)
+
+
+def poly_scale(f: Poly, c: int, p: int) -> Poly:
+    return trim([x * c % p for x in f])
+
+
+def poly_mul(f: Poly, g: Poly, p: int) -> Poly:
+    """
+    Producto de polinomios: escolar para grados pequeños y sustitución de
+    Kronecker (un único producto de enteros grandes) para el resto.
+    """
+    if not f or not g:
+        return []
+    if min(len(f), len(g)) < _SCHOOLBOOK_LIMIT:
+        result = [0] * (len(f) + len(g) - 1)
+        for i, c in enumerate(f):
+            if c:
+                for j, d in enumerate(g):
+                    result[i + j] += c * d
+        return trim([c % p for c in result])
+    
+    # Cada coeficiente del producto cabe en `slot` bytes sin acarreos
+    slot = (2 * p.bit_length() + min(len(f), len(g)).bit_length() + 7) // 8
+    F = int.from_bytes(b''.join(c.to_bytes(slot, 'little') for c in f), 'little')
+    G = F if g is f else int.from_bytes(b''.join(c.to_bytes(slot, 'little') for c in g), 'little')
+    product = int(gmpy2.mpz(F) * gmpy2.mpz(G)) if HAS_GMPY2 else F * G
+    data = product.to_bytes(slot * (len(f) + len(g) - 1), 'little')
+    return trim([int.from_bytes(data[i:i + slot], 'little') % p
+                  for i in range(0, len(data), slot)])
+
+
+def poly_divmod(f: Poly, g: Poly, p: int) -> Tuple[Poly, Poly]:
+    """División larga f = q·g + r"""
+    dg = len(g) - 1
+    if len(f) <= dg:
+        return [], list(f)
+    f = list(f)
+    lead_inv = pow(g[-1], -1, p)
+    q = [0] * (len(f) - dg)
+    low = g[:dg]
+    for i in range(len(f) - 1 - dg, -1, -1):
+        c = f[i + dg] * lead_inv % p
+        q[i] = c
+        if c:
+            f[i:i + dg] = [(x - c * y) % p for x, y in zip(f[i:i + dg], low)]
+    return trim(q), trim(f[:dg])
+
+
+def poly_monic(f: Poly, p: int) -> Poly:
+    return poly_scale(f, pow(f[-1], -1, p), p)
+
+
+def poly_gcd(f: Poly, g: Poly, p: int) -> Poly:
+    """Máximo común divisor mónico"""
+    while g:
+        f, g = g, poly_divmod(f, g, p)[1]
+    return poly_monic(f, p) if f else f
+
+
+def series_inverse(f: Poly, k: int, p: int) -> Poly:
+    """Inversa de f como serie de potencias módulo x^k (iteración de Newton)"""
+    g = [pow(f[0], -1, p)]
+    precision = 1
+    while precision < k:
+        precision = min(2 * precision, k)
+        error = poly_mul(f[:precision], g, p)[:precision]
+        error = [-c % p for c in error] + [0] * (precision - len(error))
+        error[0] = (error[0] + 2) % p
+        g = poly_mul(g, trim(error), p)[:precision]
+    return g
+
+
+class ModulusSplit(Exception):
+    """Inversión imposible: se ha encontrado un factor propio del módulo"""
+    
+    def __init__(self, factor: Poly):
+        super().__init__("factor del módulo")
+        self.factor = factor
+
+
+class PolyRing:
+    """F_p[x] / (h) con reducción de Barrett y la inversa de rev(h) precalculada"""
+    
+    def __init__(self, modulus: Poly, p: int):
+        self.p = p
+        self.h = poly_monic(modulus, p)
+        self.n = len(self.h) - 1
+        self._h_low = self.h[:self.n]
+        self._h_rev_inv = series_inverse(self.h[::-1], max(1, self.n - 1), p)
+    
+    def reduce(self, f: Poly) -> Poly:
+        n, p = self.n, self.p
+        if len(f) <= n:
+            return trim([c % p for c in f])
+        k = len(f) - n
+        if k > n - 1:
+            return poly_divmod(f, self.h, p)[1]
+        
+        # Cociente a partir de los k coeficientes altos de f
+        q_rev = poly_mul(f[::-1][:k], self._h_rev_inv[:k], p)[:k]
+        q = (q_rev + [0] * (k - len(q_rev)))[::-1]
+        qh = poly_mul(trim(q), self._h_low, p)
+        return trim([(c - d) % p for c, d in zip(f[:n], qh + [0] * (n - len(qh)))])
+    
+    def mul(self, f: Poly, g: Poly) -> Poly:
+        return self.reduce(poly_mul(f, g, self.p))
+    
+    def pow(self, f: Poly, e: int) -> Poly:
+        result = [1]
+        for bit in bin(e)[2:]:
+            result = self.mul(result, result)
+            if bit == '1':
+                result = self.mul(result, f)
+        return result
+    
+    def inverse(self, f: Poly) -> Poly:
+        """Inversa por Euclides extendido; lanza ModulusSplit si gcd(f, h) ≠ 1"""
+        p = self.p
+        r0, r1 = self.h, self.reduce(f)
+        s0, s1 = [], [1]
+        while r1:
+            q, r = poly_divmod(r0, r1, p)
+            r0, r1 = r1, r
+            s0, s1 = s1, poly_sub(s0, poly_mul(q, s1, p), p)
+        if len(r0) > 1:
+            raise ModulusSplit(poly_monic(r0, p))
+        return self.reduce(poly_scale(s0, pow(r0[0], -1, p), p))
+
+
+def poly_roots(f: Poly, p: int) -> List[int]:
+    """
+    Raíces de f en F_p: gcd(f, x^p - x) aísla los factores lineales y
+    Cantor-Zassenhaus los separa con gcd(g, (x + δ)^((p-1)/2) - 1), δ al azar
+    """
+    f = trim([c % p for c in f])
+    if len(f) <= 1:
+        return []
+    if p == 2:
+        return [x for x in (0, 1) if sum(c * x ** i for i, c in enumerate(f)) % 2 == 0]
+    
+    f = poly_monic(f, p)
+    linear = poly_gcd(f, poly_sub(PolyRing(f, p).pow([0, 1], p), [0, 1], p), p)
+    
+    roots, pending = [], [linear]
+    while pending:
+        g = pending.pop()
+        if len(g) == 2:
+            roots.append(-g[0] % p)
+            continue
+        if len(g) < 2:
+            continue
+        ring = PolyRing(g, p)
+        while True:
+            half = ring.pow([random.randrange(p), 1], (p - 1) // 2)
+            split = poly_gcd(g, poly_sub(half, [1], p), p)
+            if 1 < len(split) < len(g):
+                pending += [split, poly_divmod(g, split, p)[0]]
+                break
+    return sorted(roots)
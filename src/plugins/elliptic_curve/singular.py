@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Logaritmo discreto en "curvas" singulares (discriminante = 0)
+Los puntos no singulares forman un grupo isomorfo a uno más sencillo:
+  - cúspide (raíz triple):  y² = X³            ->  (F_p, +),  (X, y) -> X/y
+  - nodo (raíz doble):      y² = X²(X + α)     ->  F_p* o el subgrupo de
+    norma 1 de F_{p²}* (según α sea o no un cuadrado),
+    (X, y) -> (y + tX)/(y - tX) con t² = α
+donde X = x - x0 desplaza el punto singular (x0, 0) al origen.
+"""
+from typing import Callable, List, Optional
+
+from .ec_arith import Affine, CurveArithmetic
+from .extension_field import ExtensionField
+from .field_dlog import FieldDLog
+from ..discrete_log.zp_dlog import ZpDLogSolver
+from ..rsa.rsa_math import RSAMath
+
+
+class SingularCurve:
+    """Grupo de puntos no singulares de y² = x³ + ax + b con 4a³ + 27b² ≡ 0 (mod p)"""
+    
+    def __init__(self, a: int, b: int, p: int):
+        a, b = a % p, b % p
+        if (4 * a ** 3 + 27 * b ** 2) % p:
+            raise ValueError("La curva no es singular")
+        if p <= 3:
+            raise ValueError(f"Característica no soportada: {p}")
+        self.a, self.b, self.p = a, b, p
+        self.arith = CurveArithmetic(a, b, p)
+        
+        if a == 0:
+            # x³ = (x - 0)³
+            self.kind = "cusp"
+            self.x0 = 0
+            self.field = None
+            self.group_order = p
+        else:
+            # x³ + ax + b = (x - x0)²(x + 2x0) con x0 = -3b/(2a)
+            self.kind = "node"
+            self.x0 = -3 * b * pow(2 * a, -1, p) % p
+            alpha = 3 * self.x0 % p
+            split = pow(alpha, (p - 1) // 2, p) == 1
+            self.field = ExtensionField(p, 1 if split else 2)
+            self.t = self.field.sqrt(self.field.from_int(alpha))
+            self.group_order = p - 1 if split else p + 1
+    
+    @property
+    def singular_point(self) -> Affine:
+        return (self.x0, 0)
+    
+    def to_group(self, point: Affine):
+        """Imagen de un punto: entero de F_p (cúspide) o elemento de F_{p^k}* (nodo)"""
+        p = self.p
+        if point is None:
+            return 0 if self.kind == "cusp" else self.field.one
+        if point == self.singular_point:
+            raise ValueError("El punto singular no pertenece al grupo")
+        X, y = (point[0] - self.x0) % p, point[1] % p
+        if self.kind == "cusp":
+            return X * pow(y, -1, p) % p
+        
+        F = self.field
+        tX = F.scale(self.t, X)
+        y = F.from_int(y)
+        return F.div(F.add(y, tX), F.sub(y, tX))
+    
+    def discrete_log(self, G: Affine, Q: Affine, factors: Optional[List[int]] = None,
+                     checkpoint: Optional[Callable[[], None]] = None,
+                     max_operations: int = 1 << 40) -> Optional[int]:
+        """
+        d con d·G = Q (mod el orden de G).
+        
+        Args:
+            factors: Factorización de p - 1 o p + 1 (grupo del nodo), si se conoce
+        """
+        if Q is None:
+            return 0
+        if G is None:
+            return None
+        g, h = self.to_group(G), self.to_group(Q)
+        
+        if self.kind == "cusp":
+            # Grupo aditivo: d = h/g de inmediato
+            if g == 0:
+                return None
+            d = h * pow(g, -1, self.p) % self.p
+        else:
+            if factors is None:
+                factors = RSAMath.factorize(self.group_order)
+            if self.field.k == 1:
+                # Nodo escindido: el grupo es F_p* y el logaritmo se resuelve en Z_p*
+                dlog = ZpDLogSolver(self.p, workers=1, max_operations=max_operations, checkpoint=checkpoint)
+                g, h = g[0], h[0]
+            else:
+                dlog = FieldDLog(self.field, max_operations=max_operations, checkpoint=checkpoint)
+            d = dlog.pohlig_hellman(g, h, self.group_order, factors)
+        
+        if d is not None and self.arith.multiply(d, G) == Q:
+            return d
+        return None
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Ataque de Smart para curvas anómalas (#E(F_p) = p)
+Los puntos se elevan por Hensel a una curva sobre Z/p²Z, se multiplican por p
+en coordenadas jacobianas (sin inversiones) y el logaritmo sale del cociente
+de los logaritmos elípticos p-ádicos, que a esta precisión es el cociente de
+los parámetros formales x/y de p·Q y p·G.
+"""
+import random
+from typing import Optional, Tuple
+
+from .ec_arith import Affine, CurveArithmetic
+
+
+def _hensel_lift(point: Tuple[int, int], a: int, b: int, p: int) -> Tuple[int, int]:
+    """Elevar (x, y) de E(F_p) a y² = x³ + ax + b (mod p²) corrigiendo y"""
+    x, y = point
+    p2 = p * p
+    # (y + s·p)² ≡ y² + 2ysp (mod p²); el residuo es múltiplo de p
+    residue = (x * x * x + a * x + b - y * y) % p2 // p
+    s = residue * pow(2 * y, -1, p) % p
+    return (x, y + s * p)
+
+
+def _formal_parameter(arith: CurveArithmetic, point: Tuple[int, int], p: int) -> Optional[int]:
+    """
+    x/y de p·P mod p² dividido por p (p·P está en el núcleo de la reducción,
+    donde x/y tiene valoración 1); None si la elevación degenera.
+    """
+    X, Y, Z = arith.multiply_wnaf(p, point)
+    if Z % p or Y % p == 0:
+        return None
+    p2 = p * p
+    # x/y = (X/Z²)/(Y/Z³) = X·Z/Y
+    return X * Z * pow(Y, -1, p2) % p2 // p
+
+
+def smart_attack(arith: CurveArithmetic, G: Affine, Q: Affine, attempts: int = 8) -> Optional[int]:
+    """
+    d con d·G = Q en una curva anómala, en tiempo polinómico.
+    
+    La elevación de la curva se elige al azar (a + αp, b + βp): si cae en la
+    elevación canónica el cociente degenera y se repite con otra.
+    """
+    p = arith.p
+    if Q is None:
+        return 0
+    if G is None:
+        return None
+    
+    for _ in range(attempts):
+        a = arith.a + p * random.randrange(p)
+        b = arith.b + p * random.randrange(p)
+        lifted = CurveArithmetic(a, b, p * p)
+        try:
+            t_G = _formal_parameter(lifted, _hensel_lift(G, a, b, p), p)
+            t_Q = _formal_parameter(lifted, _hensel_lift(Q, a, b, p), p)
+        except ValueError:
+            # Inversión imposible mod p² (punto de 2-torsión o elevación degenerada)
+            continue
+        if not t_G or t_Q is None:
+            continue
+        
+        d = t_Q * pow(t_G, -1, p) % p
+        if arith.multiply(d, G) == Q:
+            return d
+    return None
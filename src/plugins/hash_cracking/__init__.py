@@ -0,0 +1,3 @@
+"""
+Plugin para cracking de hashes
+"""
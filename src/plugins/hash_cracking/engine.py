@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Motor de cracking de hashes por diccionario y máscara
+El espacio de claves se reparte en trozos (rangos de bytes del diccionario
+mapeado en memoria, alineados a fin de línea, o rangos de índices de la
+máscara) que resuelven procesos de un ProcessPoolExecutor. Cada proceso
+compara cada candidato contra el conjunto de todos los digests pendientes
+de un algoritmo, no contra un hash cada vez. El estado (trozos terminados y
+hashes encontrados) se guarda en disco para reanudar tras un timeout.
+"""
+import hashlib
+import json
+import mmap
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .rules import DEFAULT_RULES, Mask, expand, rules_factor
+
+# Candidatos por lote dentro de un proceso
+BATCH_SIZE = 4096
+
+
+def _hashers(algorithms: Iterable[str]) -> List[Tuple[str, Callable]]:
+    """Constructores de hashlib (más rápidos que hashlib.new en el bucle)"""
+    return [(name, getattr(hashlib, name, None) or (lambda data, n=name: hashlib.new(n, data)))
+            for name in algorithms]
+
+
+def _check_batch(batch: List[bytes], hashers, targets: Dict[str, frozenset],
+                 found: Dict[str, str]) -> None:
+    for name, constructor in hashers:
+        wanted = targets[name]
+        for candidate in batch:
+            digest = constructor(candidate).digest()
+            if digest in wanted:
+                found[digest.hex()] = candidate.decode('latin-1')
+
+
+def _crack_chunk(task: dict) -> Tuple[int, Dict[str, str], int]:
+    """
+    Probar un trozo del espacio de claves; devuelve (índice del trozo,
+    digest -> texto encontrado, candidatos probados).
+    """
+    targets = {name: frozenset(bytes.fromhex(d) for d in digests)
+               for name, digests in task['targets'].items()}
+    hashers = _hashers(targets)
+    found: Dict[str, str] = {}
+    tested = 0
+    
+    if task['kind'] == 'mask':
+        candidates = Mask(task['mask']).iter_range(task['start'], task['end'])
+    else:
+        candidates = _wordlist_candidates(task['path'], task['start'], task['end'], task['rules'])
+    
+    batch = []
+    for candidate in candidates:
+        batch.append(candidate)
+        if len(batch) >= BATCH_SIZE:
+            _check_batch(batch, hashers, targets, found)
+            tested += len(batch)
+            batch = []
+    if batch:
+        _check_batch(batch, hashers, targets, found)
+        tested += len(batch)
+    return task['index'], found, tested
+
+
+def _wordlist_candidates(path: str, start: int, end: int, rules: Sequence[str]):
+    """Palabras del rango [start, end) del diccionario expandidas con las reglas"""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for line in data[start:end].splitlines():
+            word = line.rstrip(b'\r')
+            if word:
+                yield from expand(word, rules)
+
+
+def wordlist_chunks(path: Path, chunk_size: int) -> List[Tuple[int, int]]:
+    """Rangos de bytes de ~chunk_size que terminan en fin de línea"""
+    size = path.stat().st_size
+    if size == 0:
+        return []
+    chunks = []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = 0
+        while start < size:
+            end = data.find(b'\n', min(start + chunk_size, size) - 1)
+            end = size if end < 0 else end + 1
+            chunks.append((start, end))
+            start = end
+    return chunks
+
+
+class HashCracker:
+    """
+    Cracking de muchos digests a la vez.
+    
+    `targets` es algoritmo -> digests en hexadecimal; un digest puede
+    aparecer con varios algoritmos si su longitud es ambigua. Termina en
+    cuanto todos los digests tienen texto.
+    """
+    
+    def __init__(self, targets: Dict[str, Iterable[str]], workers: Optional[int] = None,
+                 chunk_size: int = 1 << 14, checkpoint: Optional[Callable[[], None]] = None,
+                 progress: Optional[Callable[[int, int, int], None]] = None,
+                 state_dir: Optional[Path] = None):
+        """
+        Args:
+            targets: Algoritmo -> digests hexadecimales
+            workers: Procesos (None = núcleos disponibles)
+            chunk_size: Bytes de diccionario por trozo (~1 s de trabajo con las
+                reglas por defecto); los trozos de máscara son 8 veces mayores
+            checkpoint: Llamada entre trozos (p.ej. comprobación de timeout)
+            progress: progress(probados, total estimado, encontrados)
+            state_dir: Directorio del estado para reanudar (None = sin estado)
+        """
+        self.targets = {name: sorted({d.lower() for d in digests}) for name, digests in targets.items()}
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+        self.checkpoint = checkpoint
+        self.progress = progress
+        self.state_dir = state_dir
+        self.found: Dict[str, str] = {}
+        self.tested = 0
+    
+    @property
+    def digests(self) -> set:
+        return {d for digests in self.targets.values() for d in digests}
+    
+    def _pending_targets(self) -> Dict[str, List[str]]:
+        pending = {name: [d for d in digests if d not in self.found] for name, digests in self.targets.items()}
+        return {name: digests for name, digests in pending.items() if digests}
+    
+    def crack_wordlist(self, path: Path, rules: Sequence[str] = DEFAULT_RULES) -> Dict[str, str]:
+        """Diccionario con reglas; devuelve digest -> texto"""
+        path = Path(path)
+        chunks = wordlist_chunks(path, self.chunk_size)
+        stat = path.stat()
+        source = f"{path.resolve()}:{stat.st_size}:{int(stat.st_mtime)}:{','.join(rules)}"
+        # Estimación: ~10 bytes por palabra
+        total = stat.st_size // 10 * rules_factor(rules) * len(self.targets)
+        base = {'kind': 'wordlist', 'path': str(path), 'rules': list(rules)}
+        return self._run(source, chunks, base, total)
+    
+    def crack_mask(self, mask: str) -> Dict[str, str]:
+        """Todos los candidatos de una máscara; devuelve digest -> texto"""
+        keyspace = Mask(mask).keyspace
+        step = self.chunk_size * 8
+        chunks = [(start, min(start + step, keyspace)) for start in range(0, keyspace, step)]
+        base = {'kind': 'mask', 'mask': mask}
+        return self._run(f"mask:{mask}", chunks, base, keyspace * len(self.targets))
+    
+    # Estado para reanudar
+    
+    def _state_path(self, source: str) -> Optional[Path]:
+        if self.state_dir is None:
+            return None
+        key = hashlib.sha256((source + '|' + ','.join(sorted(self.digests))).encode()).hexdigest()[:32]
+        return Path(self.state_dir) / f"{key}.json"
+    
+    def _load_state(self, path: Optional[Path]) -> set:
+        if path is None or not path.exists():
+            return set()
+        try:
+            state = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return set()
+        self.found.update(state.get('found', {}))
+        self.tested += state.get('tested', 0)
+        return set(state.get('done', []))
+    
+    def _save_state(self, path: Optional[Path], done: set) -> None:
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix('.tmp')
+            tmp.write_text(json.dumps({'done': sorted(done), 'found': self.found, 'tested': self.tested}))
+            tmp.replace(path)
+        except OSError:
+            pass
+    
+    # Planificación
+    
+    def _run(self, source: str, chunks: List[Tuple[int, int]], base: dict, total: int) -> Dict[str, str]:
+        """
+        Repartir los trozos con a lo sumo 2 por proceso en vuelo, cada uno con
+        los digests aún pendientes. El estado se guarda al terminar cada trozo
+        (como mucho cada 2 s) y siempre al salir, también por timeout.
+        """
+        state_path = self._state_path(source)
+        done = self._load_state(state_path)
+        queue = [(i, chunk) for i, chunk in enumerate(chunks) if i not in done]
+        all_digests = self.digests
+        
+        def task_for(index, chunk):
+            return dict(base, index=index, start=chunk[0], end=chunk[1], targets=self._pending_targets())
+        
+        def record(result):
+            index, found, tested = result
+            done.add(index)
+            self.found.update(found)
+            self.tested += tested
+            if self.progress:
+                self.progress(self.tested, total, len(self.found))
+        
+        last_save = time.time()
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 and len(queue) > 1 else None
+        try:
+            in_flight = set()
+            while (queue or in_flight) and not all_digests <= self.found.keys():
+                if executor is None:
+                    record(_crack_chunk(task_for(*queue.pop(0))))
+                else:
+                    while queue and len(in_flight) < 2 * self.workers:
+                        in_flight.add(executor.submit(_crack_chunk, task_for(*queue.pop(0))))
+                    completed, in_flight = wait(in_flight, timeout=0.5, return_when=FIRST_COMPLETED)
+                    for future in completed:
+                        record(future.result())
+                
+                if time.time() - last_save > 2:
+                    self._save_state(state_path, done)
+                    last_save = time.time()
+                if self.checkpoint:
+                    self.checkpoint()
+        finally:
+            self._save_state(state_path, done)
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+        return {d: text for d, text in self.found.items() if d in all_digests}
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Identificación de hashes rápidos (MD5, SHA-1, SHA-2, SHA-3, BLAKE2)
+Solo por longitud del digest en hexadecimal: los algoritmos que comparten
+longitud se prueban todos, salvo que el texto del reto nombre uno de ellos.
+Los hashes lentos con formato crypt ($2b$, $6$, ...) se ignoran.
+"""
+import re
+from typing import Dict, List
+
+# Longitud en hexadecimal -> algoritmos, del más al menos habitual
+HASH_LENGTHS = {
+    32: ['md5'],
+    40: ['sha1'],
+    56: ['sha224', 'sha3_224'],
+    64: ['sha256', 'sha3_256', 'blake2s'],
+    96: ['sha384', 'sha3_384'],
+    128: ['sha512', 'sha3_512', 'blake2b']
+}
+
+# Nombres con que aparecen en el texto de un reto
+_ALGORITHM_NAMES = {
+    'md5': r'md5', 'sha1': r'sha-?1\b',
+    'sha224': r'sha-?224', 'sha256': r'sha-?256', 'sha384': r'sha-?384', 'sha512': r'sha-?512',
+    'sha3_224': r'sha3[-_]?224', 'sha3_256': r'sha3[-_]?256', 'sha3_384': r'sha3[-_]?384',
+    'sha3_512': r'sha3[-_]?512', 'blake2s': r'blake2s', 'blake2b': r'blake2b'
+}
+
+_HEX_DIGEST = re.compile(r'(?<![0-9a-fA-F$/.])[0-9a-fA-F]{32,128}(?![0-9a-fA-F])')
+
+
+def identify_hash(digest: str, text: str = '') -> List[str]:
+    """Algoritmos candidatos para un digest; los nombrados en text van solos"""
+    candidates = HASH_LENGTHS.get(len(digest), [])
+    lower = text.lower()
+    named = [name for name in candidates if re.search(_ALGORITHM_NAMES[name], lower)]
+    # "sha256" también casa con "sha3_256" mencionado: preferir el nombre más largo
+    if len(named) > 1 and any(name.startswith('sha3') for name in named):
+        named = [name for name in named if name.startswith('sha3')]
+    return named or list(candidates)
+
+
+def find_hashes(text: str) -> Dict[str, List[str]]:
+    """Digests del texto agrupados por algoritmo candidato (en minúsculas, sin repetir)"""
+    targets: Dict[str, List[str]] = {}
+    for digest in dict.fromkeys(match.lower() for match in _HEX_DIGEST.findall(text)):
+        for algorithm in identify_hash(digest, text):
+            targets.setdefault(algorithm, []).append(digest)
+    return targets
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Tablas precalculadas de preimágenes para dominios pequeños
+Cada tabla guarda, para todo un dominio (PINs, fechas, cadenas cortas), los
+primeros bytes del digest junto al índice del candidato, ordenados y con
+ancho fijo. La búsqueda es binaria sobre el fichero mapeado en memoria y
+cada coincidencia se verifica con el hash completo, así que un prefijo
+truncado solo cuesta falsos positivos, nunca resultados erróneos.
+
+La construcción es una ordenación externa en dos fases con procesos: los
+rangos del dominio se hashean en paralelo repartiendo los registros en
+cubos por los bits altos del digest, y cada cubo se ordena con NumPy por
+separado antes de concatenarlos.
+"""
+import datetime
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from .rules import Mask
+
+MAGIC = b'CTFLUT01'
+INDEX_BYTES = 5
+BUCKET_BITS = 6
+
+
+class DateDomain:
+    """Fechas de 1900 a 2099 en los formatos habituales"""
+    
+    FORMATS = ('%Y%m%d', '%Y-%m-%d', '%d/%m/%Y', '%d%m%Y', '%m/%d/%Y')
+    START = datetime.date(1900, 1, 1)
+    DAYS = (datetime.date(2100, 1, 1) - START).days
+    
+    def __init__(self):
+        self.keyspace = self.DAYS * len(self.FORMATS)
+    
+    def candidate(self, index: int) -> bytes:
+        day, fmt = divmod(index, len(self.FORMATS))
+        return (self.START + datetime.timedelta(days=day)).strftime(self.FORMATS[fmt]).encode()
+    
+    def iter_range(self, start: int, end: int) -> Iterator[bytes]:
+        for index in range(start, end):
+            yield self.candidate(index)
+
+
+def domain(name: str):
+    """Dominio por nombre: pinN, lowerN, hexN, printableN, dates o una máscara ?d?l..."""
+    if name == 'dates':
+        return DateDomain()
+    for prefix, charset in (('pin', '?d'), ('lower', '?l'), ('hex', '?h'), ('printable', '?a')):
+        if name.startswith(prefix) and name[len(prefix):].isdigit():
+            return Mask(charset * int(name[len(prefix):]))
+    return Mask(name)
+
+
+DOMAINS = ['pin4', 'pin6', 'pin8', 'lower4', 'lower5', 'printable4', 'dates']
+
+
+def _hash_range(task: dict) -> List[int]:
+    """
+    Fase 1: registros prefijo + índice de un rango del dominio, agrupados
+    por cubo en un fichero; devuelve los desplazamientos de cada cubo.
+    """
+    constructor = getattr(hashlib, task['algorithm'])
+    prefix_bytes = task['prefix_bytes']
+    shift = 8 - BUCKET_BITS
+    buckets = [bytearray() for _ in range(1 << BUCKET_BITS)]
+    index = task['start']
+    for candidate in domain(task['domain']).iter_range(task['start'], task['end']):
+        digest = constructor(candidate).digest()
+        buckets[digest[0] >> shift] += digest[:prefix_bytes] + index.to_bytes(INDEX_BYTES, 'big')
+        index += 1
+    
+    offsets = [0]
+    with open(task['path'], 'wb') as f:
+        for bucket in buckets:
+            f.write(bucket)
+            offsets.append(offsets[-1] + len(bucket))
+    return offsets
+
+
+def _sort_bucket(task: dict) -> str:
+    """Fase 2: juntar un cubo de todos los rangos y ordenarlo por prefijo"""
+    width = task['width']
+    chunks = []
+    for path, (start, end) in task['runs']:
+        with open(path, 'rb') as f:
+            f.seek(start)
+            chunks.append(f.read(end - start))
+    raw = b''.join(chunks)
+    
+    if HAS_NUMPY and raw:
+        rows = np.frombuffer(raw, dtype=np.uint8).reshape(-1, width)
+        key = np.zeros(len(rows), dtype=np.uint64)
+        for column in range(task['prefix_bytes']):
+            key = (key << np.uint64(8)) | rows[:, column].astype(np.uint64)
+        data = rows[np.argsort(key, kind='stable')].tobytes()
+    else:
+        records = [raw[i:i + width] for i in range(0, len(raw), width)]
+        data = b''.join(sorted(records, key=lambda r: r[:task['prefix_bytes']]))
+    
+    with open(task['path'], 'wb') as f:
+        f.write(data)
+    return task['path']
+
+
+class LookupTable:
+    """Tabla abierta: búsqueda binaria sobre el fichero mapeado"""
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._data[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"No es una tabla de búsqueda: {path}")
+        header_size = int.from_bytes(self._data[8:12], 'big')
+        self.header = json.loads(self._data[12:12 + header_size])
+        self.offset = 12 + header_size
+        self.algorithm = self.header['algorithm']
+        self.domain_name = self.header['domain']
+        self.prefix_bytes = self.header['prefix_bytes']
+        self.width = self.prefix_bytes + INDEX_BYTES
+        self.count = self.header['count']
+        self.domain = domain(self.domain_name)
+    
+    def close(self) -> None:
+        self._data.close()
+        self._file.close()
+    
+    def _prefix(self, i: int) -> bytes:
+        start = self.offset + i * self.width
+        return self._data[start:start + self.prefix_bytes]
+    
+    def lookup(self, digest: bytes) -> Optional[bytes]:
+        """Preimagen de un digest completo, o None si no está en el dominio"""
+        prefix = digest[:self.prefix_bytes]
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._prefix(mid) < prefix:
+                lo = mid + 1
+            else:
+                hi = mid
+        
+        constructor = getattr(hashlib, self.algorithm)
+        while lo < self.count and self._prefix(lo) == prefix:
+            start = self.offset + lo * self.width + self.prefix_bytes
+            candidate = self.domain.candidate(int.from_bytes(self._data[start:start + INDEX_BYTES], 'big'))
+            # Prefijo truncado: confirmar con el digest completo
+            if constructor(candidate).digest() == digest:
+                return candidate
+            lo += 1
+        return None
+
+
+class LookupTables:
+    """Directorio de tablas con un presupuesto de disco"""
+    
+    def __init__(self, directory: Path, disk_budget: int = 2 << 30):
+        """
+        Args:
+            directory: Directorio de las tablas
+            disk_budget: Bytes máximos entre todas las tablas
+        """
+        self.directory = Path(directory)
+        self.disk_budget = disk_budget
+        self._open: Dict[Path, LookupTable] = {}
+    
+    def table_path(self, algorithm: str, domain_name: str) -> Path:
+        safe = ''.join(c if c.isalnum() else '_' for c in domain_name)
+        return self.directory / f"{algorithm}_{safe}.lut"
+    
+    def tables(self) -> List[Path]:
+        return sorted(self.directory.glob('*.lut')) if self.directory.exists() else []
+    
+    def disk_usage(self) -> int:
+        return sum(path.stat().st_size for path in self.tables())
+    
+    def list(self) -> List[dict]:
+        """Cabecera y tamaño de cada tabla"""
+        result = []
+        for path in self.tables():
+            try:
+                table = self._table(path)
+            except (OSError, ValueError):
+                continue
+            result.append(dict(table.header, path=str(path), size=path.stat().st_size))
+        return result
+    
+    def build(self, algorithm: str, domain_name: str, prefix_bytes: int = 6,
+              workers: Optional[int] = None) -> Path:
+        """
+        Construir la tabla de un dominio. Falla con ValueError si no cabe en
+        el presupuesto junto a las tablas existentes.
+        """
+        if not hasattr(hashlib, algorithm):
+            raise ValueError(f"Algoritmo no soportado: {algorithm}")
+        if not 1 <= prefix_bytes <= 8:
+            raise ValueError("prefix_bytes debe estar entre 1 y 8")
+        keyspace = domain(domain_name).keyspace
+        if keyspace >= 1 << (8 * INDEX_BYTES):
+            raise ValueError(f"Dominio demasiado grande: {keyspace} candidatos")
+        
+        path = self.table_path(algorithm, domain_name)
+        width = prefix_bytes + INDEX_BYTES
+        header = json.dumps({
+            'algorithm': algorithm, 'domain': domain_name,
+            'prefix_bytes': prefix_bytes, 'count': keyspace
+        }).encode()
+        size = 12 + len(header) + keyspace * width
+        existing = self.disk_usage() - (path.stat().st_size if path.exists() else 0)
+        if existing + size > self.disk_budget:
+            raise ValueError(
+                f"La tabla ocupa {size} bytes y el presupuesto libre es {self.disk_budget - existing}"
+            )
+        
+        workers = workers or os.cpu_count() or 1
+        self.directory.mkdir(parents=True, exist_ok=True)
+        work_dir = Path(tempfile.mkdtemp(dir=self.directory))
+        try:
+            # Fase 1: rangos del dominio en paralelo
+            ranges = max(1, min(workers * 4, keyspace // 4096))
+            step = -(-keyspace // ranges)
+            tasks = [{
+                'algorithm': algorithm, 'domain': domain_name, 'prefix_bytes': prefix_bytes,
+                'start': start, 'end': min(start + step, keyspace), 'path': str(work_dir / f"run{i}.bin")
+            } for i, start in enumerate(range(0, keyspace, step))]
+            offsets = self._map(_hash_range, tasks, workers)
+            
+            # Fase 2: cada cubo por separado
+            buckets = [{
+                'width': width, 'prefix_bytes': prefix_bytes, 'path': str(work_dir / f"bucket{b}.bin"),
+                'runs': [(task['path'], (run[b], run[b + 1])) for task, run in zip(tasks, offsets)]
+            } for b in range(1 << BUCKET_BITS)]
+            sorted_paths = self._map(_sort_bucket, buckets, workers)
+            
+            tmp = path.with_suffix('.tmp')
+            with open(tmp, 'wb') as out:
+                out.write(MAGIC + len(header).to_bytes(4, 'big') + header)
+                for bucket_path in sorted_paths:
+                    with open(bucket_path, 'rb') as f:
+                        shutil.copyfileobj(f, out, 1 << 20)
+            self._forget(path)
+            tmp.replace(path)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        return path
+    
+    @staticmethod
+    def _map(function, tasks: List[dict], workers: int) -> list:
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(function, tasks))
+        return [function(task) for task in tasks]
+    
+    def _table(self, path: Path) -> LookupTable:
+        if path not in self._open:
+            self._open[path] = LookupTable(path)
+        return self._open[path]
+    
+    def _forget(self, path: Path) -> None:
+        table = self._open.pop(path, None)
+        if table:
+            table.close()
+    
+    def lookup(self, algorithm: str, digest_hex: str) -> Optional[str]:
+        """Preimagen en cualquiera de las tablas del algoritmo"""
+        try:
+            digest = bytes.fromhex(digest_hex)
+        except ValueError:
+            return None
+        for path in self.tables():
+            if not path.name.startswith(algorithm + '_'):
+                continue
+            try:
+                table = self._table(path)
+            except (OSError, ValueError):
+                continue
+            if table.algorithm != algorithm:
+                continue
+            candidate = table.lookup(digest)
+            if candidate is not None:
+                return candidate.decode('latin-1')
+        return None
+    
+    def close(self) -> None:
+        for path in list(self._open):
+            self._forget(path)
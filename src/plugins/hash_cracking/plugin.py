@@ -0,0 +1,176 @@
+"""
+Plugin de Hashes - Cracking de MD5/SHA-1/SHA-2/SHA-3 por diccionario y máscara
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..base import MultiTechniquePlugin
+from ...models.data import ChallengeData, SolutionResult, PluginInfo, ChallengeType
+from ...utils.config import config
+from .identify import find_hashes
+from .rules import DEFAULT_RULES, Mask
+from .engine import HashCracker
+from .lookup_tables import LookupTables
+
+
+class HashCrackingPlugin(MultiTechniquePlugin):
+    """Plugin para recuperar el texto de digests de hashes rápidos"""
+    
+    def __init__(self):
+        super().__init__()
+        
+        # Ficheros en los que se buscan digests (los diccionarios se mapean aparte)
+        self.max_hash_file_size = 1 << 20
+        
+        # Diccionarios locales (data/wordlists/*.txt) y del sistema que se prueban si existen
+        self.wordlist_dir = Path("data/wordlists")
+        self.wordlists = [Path("/usr/share/wordlists/rockyou.txt"), Path("/usr/share/dict/words")]
+        self.rules = DEFAULT_RULES
+        
+        # Máscaras por defecto, de menor a mayor espacio de claves
+        self.masks = ["?d" * n for n in range(1, 9)] + ["?l" * n for n in range(1, 6)] + \
+            ["?a" * n for n in range(1, 4)]
+        self.max_mask_keyspace = 10 ** 8
+        
+        self.state_dir = Path(config.cache.cache_dir) / "hash_cracking" if config.cache.disk_cache_enabled else None
+        
+        # Tablas precalculadas (se construyen con `crypto-ctf-solver tables --build`)
+        self.lookup_tables = LookupTables(
+            Path(config.cache.cache_dir) / "hash_tables", config.cache.lookup_table_budget_mb << 20
+        )
+    
+    def _create_plugin_info(self) -> PluginInfo:
+        return PluginInfo(
+            name="hash_cracking",
+            version="1.0.0",
+            description="Plugin para cracking de hashes por diccionario con reglas y por máscara",
+            supported_types=[ChallengeType.BASIC_CRYPTO, ChallengeType.MIXED, ChallengeType.UNKNOWN],
+            techniques=["lookup_table", "wordlist", "mask"],
+            priority=65
+        )
+    
+    def can_solve(self, challenge_data: ChallengeData) -> float:
+        """Evaluar si el desafío contiene digests que crackear"""
+        confidence = 0.0
+        
+        for file_info in challenge_data.files:
+            filename = file_info.path.name.lower()
+            if any(pattern in filename for pattern in ['hash', 'md5', 'sha', 'crack']):
+                confidence += 0.2
+        
+        text = self._hash_text(challenge_data)
+        if find_hashes(text):
+            confidence += 0.5
+            if any(pattern in text.lower() for pattern in ['hash', 'md5', 'sha', 'digest', 'crack']):
+                confidence += 0.2
+        
+        return min(confidence, 1.0)
+    
+    def _initialize_techniques(self) -> Dict[str, callable]:
+        """Inicializar técnicas de cracking"""
+        return {
+            "lookup_table": self._try_lookup_table,
+            "wordlist": self._try_wordlist,
+            "mask": self._try_mask
+        }
+    
+    def _is_wordlist(self, path: Path) -> bool:
+        name = path.name.lower()
+        return any(pattern in name for pattern in ['wordlist', 'words', 'dict', 'pass', 'rockyou']) or \
+            path.suffix.lower() in ('.lst', '.dic')
+    
+    def _hash_text(self, challenge_data: ChallengeData) -> str:
+        """Texto de los ficheros que no son diccionarios"""
+        parts = []
+        for file_info in challenge_data.files:
+            if self._is_wordlist(file_info.path) or file_info.path.stat().st_size > self.max_hash_file_size:
+                continue
+            content = self._read_file_content(file_info.path)
+            if content:
+                parts.append(content)
+        return '\n'.join(parts)
+    
+    def _cracker(self, targets: Dict[str, List[str]]) -> HashCracker:
+        def progress(tested, total, found):
+            self.logger.debug(f"Hashes: {tested}/{total} candidatos, {found} encontrados")
+        
+        return HashCracker(targets, checkpoint=self._check_timeout, progress=progress, state_dir=self.state_dir)
+    
+    def _try_lookup_table(self, challenge_data: ChallengeData) -> SolutionResult:
+        """Búsqueda en las tablas precalculadas de dominios pequeños"""
+        targets = find_hashes(self._hash_text(challenge_data))
+        if not targets:
+            return self._create_failure_result("No se encontraron digests")
+        if not self.lookup_tables.tables():
+            return self._create_failure_result("No hay tablas precalculadas")
+        
+        cracker = HashCracker(targets)
+        for algorithm, digests in targets.items():
+            for digest in digests:
+                if digest not in cracker.found:
+                    text = self.lookup_tables.lookup(algorithm, digest)
+                    if text is not None:
+                        cracker.found[digest] = text
+        return self._cracked_result(cracker, "lookup_table")
+    
+    def _try_wordlist(self, challenge_data: ChallengeData) -> SolutionResult:
+        """Diccionarios del reto y del sistema con reglas (mayúsculas, leet, dígitos)"""
+        targets = find_hashes(self._hash_text(challenge_data))
+        if not targets:
+            return self._create_failure_result("No se encontraron digests")
+        
+        wordlists = [f.path for f in challenge_data.files if self._is_wordlist(f.path)]
+        wordlists += sorted(self.wordlist_dir.glob("*.txt")) + [path for path in self.wordlists if path.exists()]
+        if not wordlists:
+            return self._create_failure_result("No hay diccionarios disponibles")
+        
+        cracker = self._cracker(targets)
+        for path in wordlists:
+            cracker.crack_wordlist(path, self.rules)
+            if cracker.digests <= cracker.found.keys():
+                break
+        return self._cracked_result(cracker, "wordlist", wordlists=[str(p) for p in wordlists])
+    
+    def _try_mask(self, challenge_data: ChallengeData) -> SolutionResult:
+        """Máscaras del reto (mask = ...) o las de por defecto, hasta max_mask_keyspace"""
+        text = self._hash_text(challenge_data)
+        targets = find_hashes(text)
+        if not targets:
+            return self._create_failure_result("No se encontraron digests")
+        
+        masks = re.findall(r'\bmask\s*[=:]\s*["\']?([^\s"\']+)', text, re.IGNORECASE) or self.masks
+        cracker = self._cracker(targets)
+        for mask in masks:
+            try:
+                keyspace = Mask(mask).keyspace
+            except ValueError:
+                continue
+            if keyspace > self.max_mask_keyspace:
+                continue
+            cracker.crack_mask(mask)
+            if cracker.digests <= cracker.found.keys():
+                break
+        return self._cracked_result(cracker, "mask", masks=masks)
+    
+    def _cracked_result(self, cracker: HashCracker, method: str, **details) -> SolutionResult:
+        """Éxito si se recuperó algún digest; la flag puede ser el propio texto"""
+        if not cracker.found:
+            return self._create_failure_result(
+                "Ningún digest encontrado", candidates=cracker.tested, **details
+            )
+        flag = next(filter(None, (self._extract_flag(text) for text in cracker.found.values())), None)
+        return self._create_success_result(
+            flag=flag or f"Hashes crackeados: {', '.join(cracker.found.values())}",
+            method=method,
+            confidence=0.95 if len(cracker.found) == len(cracker.digests) else 0.8,
+            cracked=dict(cracker.found),
+            candidates=cracker.tested,
+            **details
+        )
+    
+    def _extract_flag(self, text: str) -> Optional[str]:
+        """Buscar patrones de flag"""
+        match = re.search(r'(?:CTF|FLAG)\{[^}]+\}', text, re.IGNORECASE)
+        return match.group(0) if match else None
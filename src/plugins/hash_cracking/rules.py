@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Expansión de candidatos: reglas sobre palabras y máscaras
+Las reglas son transformaciones por palabra (mayúsculas, leetspeak, dígitos
+añadidos); las máscaras, al estilo de hashcat (?l?l?d?d), definen un espacio
+de claves indexable para repartirlo por rangos entre procesos.
+"""
+import math
+import string
+from typing import Callable, Dict, Iterator, List, Sequence
+
+_LEET = bytes.maketrans(b'aeiostAEIOST', b'431057431057')
+
+# Nombre -> palabra -> variantes
+RULES: Dict[str, Callable[[bytes], Sequence[bytes]]] = {
+    ':': lambda w: (w,),
+    'l': lambda w: (w.lower(),),
+    'u': lambda w: (w.upper(),),
+    'c': lambda w: (w.capitalize(),),
+    't': lambda w: (w.swapcase(),),
+    'r': lambda w: (w[::-1],),
+    'leet': lambda w: (w.translate(_LEET), w.lower().translate(_LEET)),
+    'd': lambda w: [w + bytes([48 + i]) for i in range(10)],
+    'dd': lambda w: [w + b'%02d' % i for i in range(100)],
+    'year': lambda w: [w + b'%d' % year for year in range(1970, 2031)],
+    '!': lambda w: (w + b'!', w + b'123', w + b'1!')
+}
+
+# Las reglas compuestas se encadenan con '+': 'c+d' = Capitalizada y un dígito
+DEFAULT_RULES = (':', 'c', 'u', 'leet', 'd', 'dd', 'c+d', 'c+dd')
+
+
+def expand(word: bytes, rules: Sequence[str] = DEFAULT_RULES) -> List[bytes]:
+    """Variantes de una palabra según las reglas, sin repetir"""
+    seen = {}
+    for rule in rules:
+        words = [word]
+        for part in rule.split('+'):
+            words = [variant for w in words for variant in RULES[part](w)]
+        for candidate in words:
+            seen[candidate] = None
+    return list(seen)
+
+
+def rules_factor(rules: Sequence[str]) -> int:
+    """Candidatos por palabra (cota superior) para estimar el espacio total"""
+    return sum(math.prod(len(RULES[part](b'a')) for part in rule.split('+')) for rule in rules)
+
+
+CHARSETS = {
+    'l': string.ascii_lowercase, 'u': string.ascii_uppercase, 'd': string.digits,
+    'h': '0123456789abcdef', 'H': '0123456789ABCDEF',
+    's': string.punctuation + ' ',
+    'a': string.ascii_letters + string.digits + string.punctuation + ' '
+}
+
+
+class Mask:
+    """
+    Máscara ?l?u?d?h?s?a con literales (CTF{?d?d?d}); ?? es un '?' literal.
+    El candidato i se obtiene por numeración mixta, así que un rango
+    [start, end) se recorre sin generar los anteriores.
+    """
+    
+    def __init__(self, mask: str):
+        self.mask = mask
+        self.positions: List[bytes] = []
+        i = 0
+        while i < len(mask):
+            if mask[i] == '?' and i + 1 < len(mask):
+                symbol = mask[i + 1]
+                charset = '?' if symbol == '?' else CHARSETS.get(symbol)
+                if charset is None:
+                    raise ValueError(f"Conjunto de máscara desconocido: ?{symbol}")
+                self.positions.append(charset.encode())
+                i += 2
+            else:
+                self.positions.append(mask[i].encode('latin-1'))
+                i += 1
+        self.keyspace = math.prod(len(p) for p in self.positions)
+    
+    def candidate(self, index: int) -> bytes:
+        """Candidato número index (la última posición varía más rápido)"""
+        out = bytearray(len(self.positions))
+        for k in range(len(self.positions) - 1, -1, -1):
+            index, digit = divmod(index, len(self.positions[k]))
+            out[k] = self.positions[k][digit]
+        return bytes(out)
+    
+    def iter_range(self, start: int, end: int) -> Iterator[bytes]:
+        """Candidatos start..end-1 con un cuentakilómetros en vez de divisiones"""
+        if start >= end:
+            return
+        radices = [len(p) for p in self.positions]
+        digits = []
+        index = start
+        for radix in reversed(radices):
+            index, digit = divmod(index, radix)
+            digits.append(digit)
+        digits.reverse()
+        current = bytearray(self.candidate(start))
+        last = len(radices) - 1
+        for _ in range(end - start):
+            yield bytes(current)
+            k = last
+            while k >= 0:
+                digits[k] += 1
+                if digits[k] < radices[k]:
+                    current[k] = self.positions[k][digits[k]]
+                    break
+                digits[k] = 0
+                current[k] = self.positions[k][0]
+                k -= 1
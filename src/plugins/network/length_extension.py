@@ -0,0 +1,268 @@
+"""
+Ataque de extensión de longitud contra MACs H(secreto || mensaje)
+
+Implementaciones en Python puro de MD5, SHA-1, SHA-256 y SHA-512 que pueden
+reanudar la compresión desde un digest conocido. Para cada longitud de
+secreto supuesta se calcula el relleno intermedio (glue padding) y se
+continúa el hash con los datos añadidos; las longitudes cuyo relleno da el
+mismo número de bloques comparten digest, así que el lote completo cuesta
+unas pocas compresiones.
+"""
+
+import math
+import re
+import struct
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ...core.pipelined_connection import PipelinedConnection
+
+MASK32 = 0xffffffff
+
+
+def _rotl32(x: int, n: int) -> int:
+    return ((x << n) | (x >> (32 - n))) & MASK32
+
+
+def _rotr(x: int, n: int, bits: int) -> int:
+    return (x >> n) | (x << (bits - n)) & ((1 << bits) - 1)
+
+
+def _iroot(n: int, k: int) -> int:
+    """Raíz k-ésima entera (por defecto) con Newton"""
+    x = 1 << -(-n.bit_length() // k)
+    while True:
+        y = ((k - 1) * x + n // x ** (k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+
+def _primes(count: int) -> List[int]:
+    primes = []
+    candidate = 2
+    while len(primes) < count:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+def _fraction_bits(p: int, k: int, bits: int) -> int:
+    """Primeros `bits` de la parte fraccionaria de la raíz k-ésima de p"""
+    return _iroot(p << (k * bits), k) & ((1 << bits) - 1)
+
+
+# Constantes de SHA-2: partes fraccionarias de raíces de los primeros primos
+_SHA512_K = [_fraction_bits(p, 3, 64) for p in _primes(80)]
+_SHA256_K = [k >> 32 for k in _SHA512_K[:64]]
+_SHA512_IV = tuple(_fraction_bits(p, 2, 64) for p in _primes(8))
+_SHA256_IV = tuple(_fraction_bits(p, 2, 32) for p in _primes(8))
+
+_MD5_K = [int(abs(math.sin(i + 1)) * 2 ** 32) & MASK32 for i in range(64)]
+_MD5_S = [7, 12, 17, 22] * 4 + [5, 9, 14, 20] * 4 + [4, 11, 16, 23] * 4 + [6, 10, 15, 21] * 4
+
+
+def _md5_compress(state: Tuple[int, ...], block: bytes) -> Tuple[int, ...]:
+    words = struct.unpack('<16I', block)
+    a, b, c, d = state
+    for i in range(64):
+        if i < 16:
+            f, g = (b & c) | (~b & d), i
+        elif i < 32:
+            f, g = (d & b) | (~d & c), (5 * i + 1) % 16
+        elif i < 48:
+            f, g = b ^ c ^ d, (3 * i + 5) % 16
+        else:
+            f, g = c ^ (b | (~d & MASK32)), (7 * i) % 16
+        f = (f + a + _MD5_K[i] + words[g]) & MASK32
+        a, d, c, b = d, c, b, (b + _rotl32(f, _MD5_S[i])) & MASK32
+    return tuple((x + y) & MASK32 for x, y in zip(state, (a, b, c, d)))
+
+
+def _sha1_compress(state: Tuple[int, ...], block: bytes) -> Tuple[int, ...]:
+    w = list(struct.unpack('>16I', block))
+    for i in range(16, 80):
+        w.append(_rotl32(w[i - 3] ^ w[i - 8] ^ w[i - 14] ^ w[i - 16], 1))
+    a, b, c, d, e = state
+    for i in range(80):
+        if i < 20:
+            f, k = (b & c) | (~b & d), 0x5a827999
+        elif i < 40:
+            f, k = b ^ c ^ d, 0x6ed9eba1
+        elif i < 60:
+            f, k = (b & c) | (b & d) | (c & d), 0x8f1bbcdc
+        else:
+            f, k = b ^ c ^ d, 0xca62c1d6
+        a, b, c, d, e = (_rotl32(a, 5) + f + e + k + w[i]) & MASK32, a, _rotl32(b, 30), c, d
+    return tuple((x + y) & MASK32 for x, y in zip(state, (a, b, c, d, e)))
+
+
+def _sha2_compressor(bits: int, constants: List[int], sigmas: Tuple[Tuple[int, ...], ...]):
+    """Compresión de SHA-256 (32 bits) o SHA-512 (64 bits) con sus rotaciones"""
+    mask = (1 << bits) - 1
+    word = 'I' if bits == 32 else 'Q'
+    (s0a, s0b, s0c), (s1a, s1b, s1c), (S0a, S0b, S0c), (S1a, S1b, S1c) = sigmas
+    rounds = len(constants)
+    
+    def compress(state: Tuple[int, ...], block: bytes) -> Tuple[int, ...]:
+        w = list(struct.unpack(f'>16{word}', block))
+        for i in range(16, rounds):
+            x, y = w[i - 15], w[i - 2]
+            s0 = _rotr(x, s0a, bits) ^ _rotr(x, s0b, bits) ^ (x >> s0c)
+            s1 = _rotr(y, s1a, bits) ^ _rotr(y, s1b, bits) ^ (y >> s1c)
+            w.append((w[i - 16] + s0 + w[i - 7] + s1) & mask)
+        a, b, c, d, e, f, g, h = state
+        for i in range(rounds):
+            t1 = h + (_rotr(e, S1a, bits) ^ _rotr(e, S1b, bits) ^ _rotr(e, S1c, bits)) + \
+                ((e & f) ^ (~e & g)) + constants[i] + w[i]
+            t2 = (_rotr(a, S0a, bits) ^ _rotr(a, S0b, bits) ^ _rotr(a, S0c, bits)) + \
+                ((a & b) ^ (a & c) ^ (b & c))
+            a, b, c, d, e, f, g, h = (t1 + t2) & mask, a, b, c, (d + t1) & mask, e, f, g
+        return tuple((x + y) & mask for x, y in zip(state, (a, b, c, d, e, f, g, h)))
+    
+    return compress
+
+
+@dataclass(frozen=True)
+class HashSpec:
+    """Parámetros de una construcción Merkle–Damgård"""
+    name: str
+    block_size: int
+    length_bytes: int
+    byteorder: str
+    word_bytes: int
+    iv: Tuple[int, ...]
+    compress: Callable[[Tuple[int, ...], bytes], Tuple[int, ...]]
+    
+    @property
+    def digest_size(self) -> int:
+        return len(self.iv) * self.word_bytes
+
+
+HASHES: Dict[str, HashSpec] = {
+    'md5': HashSpec('md5', 64, 8, 'little', 4,
+                    (0x67452301, 0xefcdab89, 0x98badcfe, 0x10325476), _md5_compress),
+    'sha1': HashSpec('sha1', 64, 8, 'big', 4,
+                     (0x67452301, 0xefcdab89, 0x98badcfe, 0x10325476, 0xc3d2e1f0), _sha1_compress),
+    'sha256': HashSpec('sha256', 64, 8, 'big', 4, _SHA256_IV, _sha2_compressor(
+        32, _SHA256_K, ((7, 18, 3), (17, 19, 10), (2, 13, 22), (6, 11, 25)))),
+    'sha512': HashSpec('sha512', 128, 16, 'big', 8, _SHA512_IV, _sha2_compressor(
+        64, _SHA512_K, ((1, 8, 7), (19, 61, 6), (28, 34, 39), (14, 18, 41))))
+}
+
+# Longitud del digest en hexadecimal -> algoritmo
+ALGORITHMS_BY_HEX_LENGTH = {spec.digest_size * 2: name for name, spec in HASHES.items()}
+
+
+def padding(algorithm: str, message_length: int) -> bytes:
+    """Relleno MD que el hash añade tras un mensaje de message_length bytes"""
+    spec = HASHES[algorithm]
+    zeros = (spec.block_size - spec.length_bytes - 1 - message_length) % spec.block_size
+    return b'\x80' + b'\x00' * zeros + (8 * message_length).to_bytes(spec.length_bytes, spec.byteorder)
+
+
+class MerkleDamgard:
+    """Hash incremental que puede partir de un estado interno arbitrario"""
+    
+    def __init__(self, algorithm: str, state: Optional[Tuple[int, ...]] = None, length: int = 0):
+        """
+        Args:
+            algorithm: md5, sha1, sha256 o sha512
+            state: Estado interno (None = IV estándar)
+            length: Bytes ya procesados (múltiplo del tamaño de bloque)
+        """
+        if algorithm not in HASHES:
+            raise ValueError(f"Algoritmo sin extensión de longitud: {algorithm}")
+        self.spec = HASHES[algorithm]
+        if length % self.spec.block_size:
+            raise ValueError("La longitud procesada debe ser múltiplo del bloque")
+        self.state = tuple(state) if state is not None else self.spec.iv
+        self.length = length
+        self._buffer = b''
+    
+    @classmethod
+    def from_digest(cls, algorithm: str, digest: bytes, length: int) -> 'MerkleDamgard':
+        """Reanudar desde el digest de un mensaje que, con su relleno, ocupaba `length` bytes"""
+        spec = HASHES[algorithm]
+        if len(digest) != spec.digest_size:
+            raise ValueError(f"Digest de {len(digest)} bytes para {algorithm}")
+        state = tuple(int.from_bytes(digest[i:i + spec.word_bytes], spec.byteorder)
+                      for i in range(0, len(digest), spec.word_bytes))
+        return cls(algorithm, state, length)
+    
+    def copy(self) -> 'MerkleDamgard':
+        other = MerkleDamgard(self.spec.name, self.state, self.length)
+        other._buffer = self._buffer
+        return other
+    
+    def update(self, data: bytes) -> 'MerkleDamgard':
+        data = self._buffer + data
+        size = self.spec.block_size
+        full = len(data) - len(data) % size
+        for i in range(0, full, size):
+            self.state = self.spec.compress(self.state, data[i:i + size])
+        self.length += full
+        self._buffer = data[full:]
+        return self
+    
+    def digest(self) -> bytes:
+        final = self.copy().update(padding(self.spec.name, self.length + len(self._buffer)))
+        return b''.join(word.to_bytes(self.spec.word_bytes, self.spec.byteorder) for word in final.state)
+    
+    def hexdigest(self) -> str:
+        return self.digest().hex()
+
+
+@dataclass
+class ForgedMAC:
+    """Mensaje falsificado para una longitud de secreto supuesta"""
+    secret_length: int
+    message: bytes
+    digest: bytes
+
+
+def forge(algorithm: str, digest: bytes, original: bytes, append: bytes,
+          secret_lengths: Iterable[int] = range(1, 65)) -> List[ForgedMAC]:
+    """
+    Todas las falsificaciones H(secreto || original || relleno || append).
+    
+    Args:
+        algorithm: md5, sha1, sha256 o sha512
+        digest: MAC conocido de original
+        original: Mensaje firmado conocido
+        append: Datos a añadir
+        secret_lengths: Longitudes de secreto a probar
+    
+    Returns:
+        List[ForgedMAC]: Una falsificación por longitud, en el mismo orden
+    """
+    forged = []
+    by_length: Dict[int, bytes] = {}
+    for secret_length in secret_lengths:
+        glue = padding(algorithm, secret_length + len(original))
+        processed = secret_length + len(original) + len(glue)
+        # Mismo número de bloques => mismo estado inicial y mismo resultado
+        if processed not in by_length:
+            by_length[processed] = MerkleDamgard.from_digest(algorithm, digest, processed).update(append).digest()
+        forged.append(ForgedMAC(secret_length, original + glue + append, by_length[processed]))
+    return forged
+
+
+def detect_algorithm(mac_hex: str, text: str = '') -> Optional[str]:
+    """Algoritmo por nombre en el texto o, si no, por longitud del MAC"""
+    lower = text.lower()
+    for name, pattern in (('sha512', r'sha-?512'), ('sha256', r'sha-?256'), ('sha1', r'sha-?1\b'), ('md5', r'md5')):
+        if re.search(pattern, lower) and HASHES[name].digest_size * 2 == len(mac_hex):
+            return name
+    return ALGORITHMS_BY_HEX_LENGTH.get(len(mac_hex))
+
+
+async def submit_forgeries(connection: PipelinedConnection, forgeries: Sequence[ForgedMAC],
+                           query_format: str = "{message_hex} {mac}") -> List[Tuple[ForgedMAC, bytes]]:
+    """Enviar todas las falsificaciones con la ventana de la conexión; devuelve (falsificación, respuesta)"""
+    payloads = [query_format.format(
+        message_hex=f.message.hex(), message=f.message.decode('latin-1'), mac=f.digest.hex()
+    ).encode('latin-1') for f in forgeries]
+    responses = await connection.request_many(payloads)
+    return list(zip(forgeries, responses))
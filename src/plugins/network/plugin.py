@@ -4,13 +4,21 @@ Plugin de Red - Para desafíos CTF remotos
 
 import asyncio
 import re
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 import time
 
 from ..base import CryptoPlugin
 from ...models.data import ChallengeData, SolutionResult, PluginInfo, ChallengeType
+from ...core.attack_state import AttackStateStore
 from ...core.network_connector import NetworkConnector, NetworkResponse
+from ...core.pipelined_connection import PipelinedConnection
+from ...utils.config import config
 from ...utils.logging import get_logger
+from .rsa_oracle import (
+    PipelinedRSAOracle, BleichenbacherAttack, parity_oracle_attack, pkcs1_v15_unpad
+)
+from .length_extension import detect_algorithm, forge, submit_forgeries
 
 
 class NetworkPlugin(CryptoPlugin):
@@ -20,10 +28,22 @@ class NetworkPlugin(CryptoPlugin):
         super().__init__()
         self.network_connector = NetworkConnector()
         
+        # Consultas en vuelo por conexión para ataques de oráculo
+        self.oracle_window = 64
+        
+        # Sesiones precalentadas: cada estrategia arranca con el banner ya leído
+        self.pool_size = 2
+        self.banner_timeout = 1.0  # Espera del banner en sesiones abiertas en frío
+        
+        # Progreso de los ataques de oráculo para reanudar tras una desconexión
+        self.state_dir = Path(config.cache.cache_dir) / "attack_state" if config.cache.disk_cache_enabled else None
+        
         # Estrategias de interacción comunes
         self.interaction_strategies = [
             self._strategy_menu_navigation,
             self._strategy_crypto_challenge,
+            self._strategy_rsa_oracle,
+            self._strategy_length_extension,
             self._strategy_auth_bypass,
             self._strategy_command_injection,
             self._strategy_buffer_overflow,
@@ -37,8 +57,8 @@ class NetworkPlugin(CryptoPlugin):
             description="Plugin para desafíos CTF remotos con interacción de red",
             supported_types=[ChallengeType.NETWORK, ChallengeType.MIXED],
             techniques=[
-                "interactive_session", "menu_navigation", "crypto_challenge",
-                "auth_bypass", "command_injection", "buffer_overflow",
+                "interactive_session", "menu_navigation", "crypto_challenge", "rsa_oracle",
+                "length_extension", "auth_bypass", "command_injection", "buffer_overflow",
                 "automated_interaction", "pattern_recognition"
             ],
             priority=75
@@ -90,11 +110,12 @@ class NetworkPlugin(CryptoPlugin):
         network_info = challenge_data.network_info
         
         try:
-            # Probar conexión
+            # Probar conexión (la sesión del sondeo queda libre en el pool)
             if not await self.network_connector.test_connection(network_info):
                 return self._create_failure_result("No se pudo establecer conexión")
             
-            # Establecer conexión persistente
+            # Precalentar las sesiones de las siguientes estrategias mientras corre la primera
+            self.network_connector.prewarm(network_info, self.pool_size)
             connection_id = await self.network_connector.connect(network_info)
             
             try:
@@ -108,7 +129,7 @@ class NetworkPlugin(CryptoPlugin):
                     if result.success:
                         return result
                     
-                    # Reconectar para próxima estrategia
+                    # Sesión limpia para la próxima estrategia, servida del pool
                     await self.network_connector.disconnect(connection_id)
                     connection_id = await self.network_connector.connect(network_info)
                 
@@ -116,11 +137,19 @@ class NetworkPlugin(CryptoPlugin):
                 
             finally:
                 await self.network_connector.disconnect(connection_id)
+                self.network_connector.close_pool(network_info)
                 
         except Exception as e:
             self.logger.error(f"Error en resolución de red: {e}")
             return self._create_failure_result(f"Error de red: {str(e)}")
     
+    def _prompt(self, challenge_data: ChallengeData) -> Optional[str]:
+        """
+        Prompt del servicio (metadata['network']['prompt']): cada respuesta se
+        lee hasta él, en un solo RTT. Sin él se reconoce por la forma del final.
+        """
+        return challenge_data.metadata.get('network', {}).get('prompt')
+    
     def _is_text_file(self, file_info) -> bool:
         """Verificar si es archivo de texto"""
         if file_info.mime_type and 'text' in file_info.mime_type:
@@ -158,8 +187,12 @@ class NetworkPlugin(CryptoPlugin):
         """Estrategia de navegación por menús"""
         self.logger.info("Probando navegación por menús")
         
+        prompt = self._prompt(challenge_data)
+        
         try:
-            responses = await self.network_connector.interactive_session(connection_id, max_interactions=20)
+            responses = await self.network_connector.interactive_session(
+                connection_id, max_interactions=20, prompt=prompt
+            )
             
             # Buscar flag en las respuestas
             for response in responses:
@@ -182,9 +215,11 @@ class NetworkPlugin(CryptoPlugin):
         """Estrategia para desafíos de criptografía remotos"""
         self.logger.info("Probando desafío de criptografía remoto")
         
+        prompt = self._prompt(challenge_data)
+        
         try:
             # Recibir mensaje inicial
-            initial_response = await self.network_connector.receive_data(connection_id, timeout=5)
+            initial_response = await self.network_connector.receive_data(connection_id, timeout=5, until=prompt)
             
             if not initial_response.success:
                 return self._create_failure_result("No se recibió mensaje inicial")
@@ -200,7 +235,7 @@ class NetworkPlugin(CryptoPlugin):
                 try:
                     import base64
                     decoded = base64.b64decode(match).decode('utf-8', errors='ignore')
-                    response = await self.network_connector.send_data(connection_id, decoded)
+                    response = await self.network_connector.send_data(connection_id, decoded, until=prompt)
                     crypto_responses.append(response)
                 except:
                     continue
@@ -210,7 +245,7 @@ class NetworkPlugin(CryptoPlugin):
             for match in hex_matches:
                 try:
                     decoded = bytes.fromhex(match).decode('utf-8', errors='ignore')
-                    response = await self.network_connector.send_data(connection_id, decoded)
+                    response = await self.network_connector.send_data(connection_id, decoded, until=prompt)
                     crypto_responses.append(response)
                 except:
                     continue
@@ -219,7 +254,7 @@ class NetworkPlugin(CryptoPlugin):
             for shift in [13, 1, 3, 5, 7]:  # ROT13 y otros comunes
                 caesar_decoded = self._caesar_decrypt(text, shift)
                 if caesar_decoded != text:  # Si cambió algo
-                    response = await self.network_connector.send_data(connection_id, caesar_decoded)
+                    response = await self.network_connector.send_data(connection_id, caesar_decoded, until=prompt)
                     crypto_responses.append(response)
             
             # Buscar flag en respuestas
@@ -238,10 +273,198 @@ class NetworkPlugin(CryptoPlugin):
         except Exception as e:
             return self._create_failure_result(f"Error en desafío de criptografía: {str(e)}")
     
+    async def _pipelined_connection(self, connection_id: str, settings: Dict[str, Any]) -> PipelinedConnection:
+        """
+        Conexión pipelined abierta sobre la sesión del pool: no abre otra
+        conexión al servicio. Las sesiones precalentadas traen el banner
+        leído; las abiertas en frío lo leen aquí, y `open` recoge los trozos
+        que lleguen tarde.
+        """
+        session = self.network_connector.get_session(connection_id)
+        if not session.banner and not session.buffered:
+            await session.read_banner(self.banner_timeout)
+        connection = PipelinedConnection.from_session(
+            session,
+            window=settings.get('window', self.oracle_window),
+            delimiter=settings.get('delimiter', '\n').encode()
+        )
+        await connection.open()
+        return connection
+    
+    def _session_context(self, connection: PipelinedConnection, challenge_data: ChallengeData) -> str:
+        """Banner completo de la conexión más la descripción del reto"""
+        return ' '.join(filter(None, [
+            connection.banner.decode('utf-8', errors='ignore'), challenge_data.description or ''
+        ]))
+    
+    async def _strategy_rsa_oracle(self, connection_id: str, challenge_data: ChallengeData) -> SolutionResult:
+        """Estrategia de oráculo de descifrado RSA (paridad/LSB o padding PKCS#1 v1.5)"""
+        self.logger.info("Probando ataque de oráculo RSA")
+        
+        settings = challenge_data.metadata.get('rsa_oracle', {})
+        connection = None
+        state = None
+        
+        try:
+            connection = await self._pipelined_connection(connection_id, settings)
+            context = self._session_context(connection, challenge_data)
+            params = self._extract_rsa_oracle_params(context)
+            params.update({k: settings[k] for k in ('n', 'e', 'c') if k in settings})
+            if not all(k in params for k in ('n', 'e', 'c')):
+                return self._create_failure_result("No se encontraron n, e y c para el oráculo RSA")
+            
+            kind = settings.get('type') or self._detect_rsa_oracle_kind(context)
+            if not kind:
+                return self._create_failure_result("No se detectó un oráculo RSA en el servicio")
+            
+            oracle = PipelinedRSAOracle(
+                connection,
+                query_format=settings.get('query_format', '{hex}'),
+                **({'true_pattern': settings['true_pattern']} if 'true_pattern' in settings else {})
+            )
+            n, e, c = params['n'], params['e'], params['c']
+            if self.state_dir is not None:
+                info = challenge_data.network_info
+                state = AttackStateStore.for_target(self.state_dir, f"rsa_{kind}", info.host, info.port,
+                                                    f"{n}:{e}:{c}".encode())
+            
+            if kind == 'parity':
+                m = await parity_oracle_attack(oracle, n, e, c, state=state)
+                plaintext = m.to_bytes((m.bit_length() + 7) // 8 or 1, 'big')
+            else:
+                attack = BleichenbacherAttack(oracle, n, e, window=connection.window, state=state)
+                m = await attack.run(c)
+                plaintext = pkcs1_v15_unpad(m, attack.k) or m.to_bytes(attack.k, 'big')
+            total_queries = state.queries if state is not None else oracle.queries
+            if state is not None:
+                state.discard()
+                state = None
+            
+            flag = self.network_connector.extract_flag(plaintext)
+            if not flag:
+                return self._create_failure_result("El texto descifrado no contiene una flag",
+                                                   total_queries=total_queries)
+            
+            return self._create_success_result(
+                flag=flag,
+                method=f"rsa_{kind}_oracle",
+                confidence=0.9,
+                queries=oracle.queries,
+                total_queries=total_queries,
+                queries_per_second=round(connection.throughput(), 1)
+            )
+            
+        except Exception as e:
+            return self._create_failure_result(f"Error en oráculo RSA: {str(e)}")
+        finally:
+            if connection is not None:
+                await connection.close()
+            if state is not None:
+                state.close()
+    
+    def _extract_rsa_oracle_params(self, text: str) -> Dict[str, int]:
+        """Extraer n, e, c (decimal o hex) de un banner"""
+        params = {}
+        for name in ('n', 'e', 'c'):
+            match = re.search(rf'(?<![A-Za-z0-9_]){name}\s*[=:]\s*(0x[0-9a-fA-F]+|\d+)', text)
+            if match:
+                value = match.group(1)
+                params[name] = int(value, 16) if value.startswith('0x') else int(value)
+        return params
+    
+    def _detect_rsa_oracle_kind(self, text: str) -> Optional[str]:
+        """
+        Detectar el tipo de oráculo RSA por frases propias de cada oráculo
+        (palabras sueltas como "padding" u "odd" aparecen en cualquier banner)
+        """
+        bleichenbacher = [
+            r'bleichenbacher', r'pkcs\s*#?\s*1', r'padding\s+(?:oracle|is\s+)?(?:ok|valid|correct|error|invalid)',
+            r'\bconforming\b'
+        ]
+        parity = [
+            r'parity\s+oracle', r'\blsb\s+oracle', r'least\s+significant\s+bit',
+            r'\b(?:odd|even)\s*(?:/|or)\s*(?:odd|even)\b', r'\bparity\b.*\bdecrypt'
+        ]
+        if any(re.search(pattern, text, re.IGNORECASE) for pattern in bleichenbacher):
+            return 'bleichenbacher'
+        if any(re.search(pattern, text, re.IGNORECASE | re.DOTALL) for pattern in parity):
+            return 'parity'
+        return None
+    
+    async def _strategy_length_extension(self, connection_id: str, challenge_data: ChallengeData) -> SolutionResult:
+        """Estrategia de extensión de longitud contra MACs H(secreto || mensaje)"""
+        self.logger.info("Probando extensión de longitud")
+        
+        settings = challenge_data.metadata.get('length_extension', {})
+        connection = None
+        
+        try:
+            connection = await self._pipelined_connection(connection_id, settings)
+            context = self._session_context(connection, challenge_data)
+            params = self._extract_mac_params(context)
+            params.update({k: settings[k] for k in ('message', 'mac') if k in settings})
+            if not all(k in params for k in ('message', 'mac')):
+                return self._create_failure_result("No se encontró un mensaje firmado con su MAC")
+            
+            algorithm = settings.get('algorithm') or detect_algorithm(params['mac'], context)
+            if not algorithm:
+                return self._create_failure_result(f"MAC de longitud no soportada: {len(params['mac'])}")
+            
+            message = params['message']
+            if isinstance(message, str):
+                message = message.encode('latin-1')
+            forgeries = forge(
+                algorithm, bytes.fromhex(params['mac']), message,
+                settings.get('append', ';admin=true').encode('latin-1'),
+                range(settings.get('min_secret', 1), settings.get('max_secret', 64) + 1)
+            )
+            
+            # Un solo lote con todas las longitudes de secreto supuestas
+            results = await submit_forgeries(
+                connection, forgeries, settings.get('query_format', '{message_hex} {mac}')
+            )
+            for forged, response in results:
+                flag = self.network_connector.extract_flag(response)
+                if flag:
+                    return self._create_success_result(
+                        flag=flag,
+                        method="length_extension",
+                        confidence=0.9,
+                        algorithm=algorithm,
+                        secret_length=forged.secret_length,
+                        queries=len(results),
+                        queries_per_second=round(connection.throughput(), 1)
+                    )
+            
+            return self._create_failure_result("Ninguna MAC falsificada fue aceptada", queries=len(results))
+        
+        except Exception as e:
+            return self._create_failure_result(f"Error en extensión de longitud: {str(e)}")
+        finally:
+            if connection is not None:
+                await connection.close()
+    
+    def _extract_mac_params(self, text: str) -> Dict[str, Any]:
+        """Extraer mensaje (hex o texto) y MAC hexadecimal de un banner"""
+        params: Dict[str, Any] = {}
+        mac = re.search(r'\b(?:mac|signature|sig|tag|hash|digest)\s*[=:]\s*([0-9a-fA-F]{32,128})\b', text, re.IGNORECASE)
+        if mac:
+            params['mac'] = mac.group(1).lower()
+        message = re.search(r'\b(?:message|msg|data|cookie|token)\s*[=:]\s*(\S+)', text, re.IGNORECASE)
+        if message:
+            value = message.group(1)
+            try:
+                params['message'] = bytes.fromhex(value)
+            except ValueError:
+                params['message'] = value.strip('"\'').encode('latin-1', errors='ignore')
+        return params
+    
     async def _strategy_auth_bypass(self, connection_id: str, challenge_data: ChallengeData) -> SolutionResult:
         """Estrategia de bypass de autenticación"""
         self.logger.info("Probando bypass de autenticación")
         
+        prompt = self._prompt(challenge_data)
+        
         try:
             # Credenciales comunes
             credentials = [
@@ -264,17 +487,17 @@ class NetworkPlugin(CryptoPlugin):
             ]
             
             # Recibir prompt inicial
-            initial_response = await self.network_connector.receive_data(connection_id, timeout=5)
+            initial_response = await self.network_connector.receive_data(connection_id, timeout=5, until=prompt)
             
             # Probar credenciales comunes
             for username, password in credentials:
                 # Enviar username
-                response = await self.network_connector.send_data(connection_id, username)
+                response = await self.network_connector.send_data(connection_id, username, until=prompt)
                 if not response.success:
                     continue
                 
                 # Enviar password
-                response = await self.network_connector.send_data(connection_id, password)
+                response = await self.network_connector.send_data(connection_id, password, until=prompt)
                 if response.success:
                     flag = self.network_connector.extract_flag(response.data)
                     if flag:
@@ -287,7 +510,7 @@ class NetworkPlugin(CryptoPlugin):
             
             # Probar SQL injection
             for payload in sql_payloads:
-                response = await self.network_connector.send_data(connection_id, payload)
+                response = await self.network_connector.send_data(connection_id, payload, until=prompt)
                 if response.success:
                     flag = self.network_connector.extract_flag(response.data)
                     if flag:
@@ -307,6 +530,8 @@ class NetworkPlugin(CryptoPlugin):
         """Estrategia de inyección de comandos"""
         self.logger.info("Probando inyección de comandos")
         
+        prompt = self._prompt(challenge_data)
+        
         try:
             # Payloads de command injection
             payloads = [
@@ -324,7 +549,7 @@ class NetworkPlugin(CryptoPlugin):
             ]
             
             for payload in payloads:
-                response = await self.network_connector.send_data(connection_id, payload)
+                response = await self.network_connector.send_data(connection_id, payload, until=prompt)
                 if response.success:
                     flag = self.network_connector.extract_flag(response.data)
                     if flag:
@@ -356,6 +581,8 @@ class NetworkPlugin(CryptoPlugin):
         """Estrategia básica de buffer overflow"""
         self.logger.info("Probando buffer overflow básico")
         
+        prompt = self._prompt(challenge_data)
+        
         try:
             # Payloads de diferentes tamaños
             overflow_sizes = [100, 200, 500, 1000, 2000]
@@ -364,7 +591,7 @@ class NetworkPlugin(CryptoPlugin):
                 # Crear payload de overflow
                 payload = 'A' * size
                 
-                response = await self.network_connector.send_data(connection_id, payload)
+                response = await self.network_connector.send_data(connection_id, payload, until=prompt)
                 if response.success:
                     flag = self.network_connector.extract_flag(response.data)
                     if flag:
@@ -390,6 +617,8 @@ class NetworkPlugin(CryptoPlugin):
         """Estrategia de interacción simple"""
         self.logger.info("Probando interacción simple")
         
+        prompt = self._prompt(challenge_data)
+        
         try:
             # Inputs comunes
             simple_inputs = [
@@ -409,7 +638,7 @@ class NetworkPlugin(CryptoPlugin):
             ]
             
             for input_text in simple_inputs:
-                response = await self.network_connector.send_data(connection_id, input_text)
+                response = await self.network_connector.send_data(connection_id, input_text, until=prompt)
                 if response.success:
                     flag = self.network_connector.extract_flag(response.data)
                     if flag:
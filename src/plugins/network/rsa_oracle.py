@@ -0,0 +1,278 @@
+"""
+Ataques a oráculos de descifrado RSA (paridad/LSB y Bleichenbacher '98)
+
+Ambos ataques aceptan un AttackStateStore: la paridad guarda los bits ya
+consultados y Bleichenbacher el cegado, el último s, los intervalos y el
+cursor de búsqueda, de modo que tras una desconexión se continúa sin
+repetir consultas.
+"""
+
+import re
+import random
+from abc import ABC, abstractmethod
+from fractions import Fraction
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from ...core.attack_state import AttackStateStore
+from ...core.pipelined_connection import PipelinedConnection
+from ...utils.logging import get_logger
+
+
+def _ceil_div(a: int, b: int) -> int:
+    """División entera redondeando hacia arriba"""
+    return -(-a // b)
+
+
+class RSAOracle(ABC):
+    """Oráculo de descifrado RSA consultable por lotes"""
+    
+    def __init__(self):
+        self.queries = 0
+    
+    @abstractmethod
+    async def query_many(self, ciphertexts: List[int]) -> List[bool]:
+        """Consultar un lote de textos cifrados; devuelve el bit del oráculo por cada uno"""
+        pass
+    
+    async def query(self, ciphertext: int) -> bool:
+        """Consultar un solo texto cifrado"""
+        return (await self.query_many([ciphertext]))[0]
+
+
+class PipelinedRSAOracle(RSAOracle):
+    """Oráculo remoto sobre una PipelinedConnection"""
+    
+    def __init__(self, connection: PipelinedConnection, query_format: str = "{hex}",
+                 true_pattern: str = r"\b(odd|1|true|yes|valid|ok)\b"):
+        super().__init__()
+        self.connection = connection
+        self.query_format = query_format
+        self.true_regex = re.compile(true_pattern.encode(), re.IGNORECASE)
+    
+    def format_query(self, ciphertext: int) -> bytes:
+        """Formatear un texto cifrado según el protocolo del servicio"""
+        return self.query_format.format(
+            hex=format(ciphertext, 'x'), dec=ciphertext, c=ciphertext
+        ).encode()
+    
+    def parse_response(self, response: bytes) -> bool:
+        """Interpretar la respuesta del servicio como bit del oráculo"""
+        return bool(self.true_regex.search(response))
+    
+    async def query_many(self, ciphertexts: List[int]) -> List[bool]:
+        self.queries += len(ciphertexts)
+        responses = await self.connection.request_many(self.format_query(c) for c in ciphertexts)
+        return [self.parse_response(r) for r in responses]
+
+
+async def parity_oracle_attack(oracle: RSAOracle, n: int, e: int, c: int,
+                               progress: Optional[Callable[[int, int], None]] = None,
+                               state: Optional[AttackStateStore] = None, chunk: int = 256) -> int:
+    """
+    Ataque LSB/paridad: recuperar m a partir de la paridad de 2^i·m mod n.
+    
+    Las consultas c·2^(ie) no dependen de respuestas previas, así que se envían
+    todas en un único lote pipelined; solo la interpretación es secuencial.
+    Con `state` se envían en lotes de `chunk` y los bits se guardan tras cada
+    lote.
+    """
+    k = n.bit_length()
+    factor = pow(2, e, n)
+    
+    ciphertexts = []
+    current = c
+    for _ in range(k):
+        current = current * factor % n
+        ciphertexts.append(current)
+    
+    if state is None:
+        parities = await oracle.query_many(ciphertexts)
+    else:
+        parities = [bit == '1' for bit in state.get('parity', '')]
+        while len(parities) < k:
+            before = oracle.queries
+            parities += await oracle.query_many(ciphertexts[len(parities):len(parities) + chunk])
+            state.set('parity', ''.join('1' if odd else '0' for odd in parities))
+            state.add_queries(oracle.queries - before)
+    
+    # Cotas exactas: m ∈ [lo, hi)
+    lo, hi = Fraction(0), Fraction(n)
+    for i, odd in enumerate(parities, 1):
+        mid = (lo + hi) / 2
+        if odd:
+            lo = mid
+        else:
+            hi = mid
+        if progress:
+            progress(i, k)
+    
+    # Ajustar el redondeo final verificando contra c
+    candidate = int(hi)
+    for m in (candidate, candidate - 1, candidate + 1):
+        if 0 <= m < n and pow(m, e, n) == c:
+            return m
+    return candidate
+
+
+class BleichenbacherAttack:
+    """Ataque de Bleichenbacher '98 contra un oráculo de padding PKCS#1 v1.5"""
+    
+    def __init__(self, oracle: RSAOracle, n: int, e: int, window: int = 32,
+                 state: Optional[AttackStateStore] = None):
+        self.logger = get_logger(__name__)
+        self.oracle = oracle
+        self.state = state
+        self._saved_queries = 0
+        self.n = n
+        self.e = e
+        self.window = max(1, window)
+        self.k = (n.bit_length() + 7) // 8
+        self.B = 1 << (8 * (self.k - 2))
+    
+    def _blind(self, c: int, s: int) -> int:
+        return c * pow(s, self.e, self.n) % self.n
+    
+    def _save(self, **fields) -> None:
+        """Actualizar el progreso guardado (un campo a None se borra)"""
+        if self.state is None:
+            return
+        progress = self.state.get('bleichenbacher', {})
+        progress.update(fields)
+        self.state.set('bleichenbacher', {k: v for k, v in progress.items() if v is not None})
+        self.state.add_queries(self.oracle.queries - self._saved_queries)
+        self._saved_queries = self.oracle.queries
+    
+    async def _first_conforming(self, c0: int, candidates: Iterable[int], resumable: bool = False) -> int:
+        """
+        Primer s conforme en orden, consultando ventanas especulativas de
+        `window` candidatos a la vez. Con `resumable` (candidatos consecutivos)
+        se guarda tras cada ventana el siguiente s a probar.
+        """
+        batch = []
+        for s in candidates:
+            batch.append(s)
+            if len(batch) == self.window:
+                answers = await self.oracle.query_many([self._blind(c0, x) for x in batch])
+                for x, ok in zip(batch, answers):
+                    if ok:
+                        return x
+                if resumable:
+                    self._save(search_from=batch[-1] + 1)
+                batch = []
+        if batch:
+            answers = await self.oracle.query_many([self._blind(c0, x) for x in batch])
+            for x, ok in zip(batch, answers):
+                if ok:
+                    return x
+        raise RuntimeError("Espacio de búsqueda agotado sin texto conforme")
+    
+    @staticmethod
+    def _merge(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Unir intervalos solapados o contiguos"""
+        merged = []
+        for a, b in sorted(intervals):
+            if merged and a <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], b))
+            else:
+                merged.append((a, b))
+        return merged
+    
+    def _narrow(self, intervals: List[Tuple[int, int]], s: int) -> List[Tuple[int, int]]:
+        """Paso 3: reducir el conjunto de intervalos con el nuevo s"""
+        n, B = self.n, self.B
+        new_intervals = []
+        for a, b in intervals:
+            r_lo = _ceil_div(a * s - 3 * B + 1, n)
+            r_hi = (b * s - 2 * B) // n
+            for r in range(r_lo, r_hi + 1):
+                lo = max(a, _ceil_div(2 * B + r * n, s))
+                hi = min(b, (3 * B - 1 + r * n) // s)
+                if lo <= hi:
+                    new_intervals.append((lo, hi))
+        return self._merge(new_intervals) or intervals
+    
+    async def _step_2c(self, c0: int, interval: Tuple[int, int], s_prev: int,
+                       r: Optional[int] = None) -> int:
+        """Paso 2c: búsqueda con un solo intervalo restante (desde `r` al reanudar)"""
+        n, B = self.n, self.B
+        a, b = interval
+        if r is None:
+            r = _ceil_div(2 * (b * s_prev - 2 * B), n)
+        
+        while True:
+            self._save(r=r)
+            s_lo = _ceil_div(2 * B + r * n, b)
+            s_hi = (3 * B - 1 + r * n) // a
+            if s_lo <= s_hi:
+                try:
+                    return await self._first_conforming(c0, range(s_lo, s_hi + 1))
+                except RuntimeError:
+                    pass
+            r += 1
+    
+    async def run(self, c: int, c_is_conforming: bool = True) -> int:
+        """
+        Recuperar el texto plano (como entero) correspondiente a c.
+        
+        Args:
+            c: Texto cifrado objetivo
+            c_is_conforming: Si c ya produce padding válido (caso habitual)
+        """
+        n, B = self.n, self.B
+        progress = self.state.get('bleichenbacher', {}) if self.state is not None else {}
+        
+        # Paso 1: cegado (solo necesario si c no es conforme)
+        s0 = progress.get('s0')
+        if s0 is None:
+            s0 = 1
+            if not c_is_conforming or not await self.oracle.query(c):
+                s0 = await self._first_conforming(c, (random.randrange(2, n) for _ in iter(int, 1)))
+            self._save(s0=s0)
+        c0 = self._blind(c, s0)
+        
+        # Cursor de búsqueda (pasos 2a/2b) o r (paso 2c) de la sesión anterior
+        search_from, r = progress.get('search_from'), progress.get('r')
+        
+        if 'intervals' in progress:
+            s = progress['s']
+            intervals = [tuple(interval) for interval in progress['intervals']]
+        else:
+            # Paso 2a: primer s >= n / 3B
+            start = search_from or _ceil_div(n, 3 * B)
+            search_from = None
+            s = await self._first_conforming(c0, self._count_from(start), resumable=True)
+            intervals = self._narrow([(2 * B, 3 * B - 1)], s)
+            self._save(s=s, intervals=intervals, search_from=None)
+        
+        while True:
+            if len(intervals) == 1 and intervals[0][0] == intervals[0][1]:
+                m = intervals[0][0] * pow(s0, -1, n) % n
+                self.logger.info(f"Bleichenbacher completado en {self.oracle.queries} consultas")
+                return m
+            
+            if len(intervals) > 1:
+                # Paso 2b: siguiente s conforme
+                s = await self._first_conforming(c0, self._count_from(search_from or s + 1), resumable=True)
+            else:
+                # Paso 2c
+                s = await self._step_2c(c0, intervals[0], s, r)
+            search_from, r = None, None
+            
+            intervals = self._narrow(intervals, s)
+            self._save(s=s, intervals=intervals, search_from=None, r=None)
+    
+    @staticmethod
+    def _count_from(start: int):
+        value = start
+        while True:
+            yield value
+            value += 1
+
+
+def pkcs1_v15_unpad(m: int, k: int) -> Optional[bytes]:
+    """Quitar padding PKCS#1 v1.5 de tipo 2"""
+    data = m.to_bytes(k, 'big')
+    if data[:2] != b'\x00\x02':
+        return None
+    separator = data.find(b'\x00', 2)
+    return data[separator + 1:] if separator != -1 else None
@@ -0,0 +1,3 @@
+"""
+Plugin para generadores pseudoaleatorios (MT19937, LCG, LFSR)
+"""
\ No newline at end of file
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Álgebra lineal sobre GF(2) con filas empaquetadas en uint64
+
+Cada fila es un array de palabras de 64 bits (la columna j es el bit j % 64
+de la palabra j // 64), así que sumar filas es un XOR vectorizado. La
+eliminación sigue el método de los cuatro rusos (M4RI): las columnas se
+procesan en bloques, los pivotes del bloque se eligen mirando solo esa
+ventana de bits de cada fila, se precalculan las 2^8 combinaciones de cada
+grupo de 8 filas pivote y todas las demás filas se reducen con una consulta
+por tabla en lugar de un XOR por pivote.
+
+GF2Solver cubre el otro caso de uso: ecuaciones que llegan de una en una y
+se reducen al vuelo, sin guardar la matriz.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+WORD = 64
+
+# Columnas por bloque de M4RI y bits por tabla (una tabla de 2^8 filas por grupo)
+BLOCK_BITS = 32
+TABLE_BITS = 8
+
+
+def _words(ncols: int) -> int:
+    return max(1, (ncols + WORD - 1) // WORD)
+
+
+def pack_bits(bits: Sequence[int]) -> 'np.ndarray':
+    """Vector de bits (0/1) a palabras uint64"""
+    bits = np.asarray(bits, dtype=np.uint8) & 1
+    padded = np.zeros(_words(len(bits)) * WORD, dtype=np.uint8)
+    padded[:len(bits)] = bits
+    return np.packbits(padded, bitorder='little').view(np.uint64).copy()
+
+
+def unpack_bits(words: 'np.ndarray', ncols: int) -> 'np.ndarray':
+    """Palabras uint64 a vector de bits (0/1) de longitud ncols"""
+    raw = np.ascontiguousarray(words, dtype=np.uint64).view(np.uint8)
+    return np.unpackbits(raw, bitorder='little')[:ncols]
+
+
+class GF2Matrix:
+    """Matriz sobre GF(2) con filas empaquetadas en uint64"""
+    
+    def __init__(self, rows: 'np.ndarray', ncols: int):
+        """
+        Args:
+            rows: Array (filas x palabras) de uint64
+            ncols: Número de columnas (bits útiles de cada fila)
+        """
+        if not HAS_NUMPY:
+            raise ImportError("GF2Matrix requiere NumPy")
+        self.rows = np.ascontiguousarray(rows, dtype=np.uint64).reshape(-1, _words(ncols))
+        self.ncols = ncols
+    
+    @classmethod
+    def zeros(cls, nrows: int, ncols: int) -> 'GF2Matrix':
+        return cls(np.zeros((nrows, _words(ncols)), dtype=np.uint64), ncols)
+    
+    @classmethod
+    def identity(cls, n: int) -> 'GF2Matrix':
+        matrix = cls.zeros(n, n)
+        index = np.arange(n)
+        matrix.rows[index, index // WORD] = np.left_shift(np.uint64(1), (index % WORD).astype(np.uint64))
+        return matrix
+    
+    @classmethod
+    def from_dense(cls, dense) -> 'GF2Matrix':
+        """Desde un array 2D de 0/1"""
+        dense = np.atleast_2d(np.asarray(dense, dtype=np.uint8) & 1)
+        nrows, ncols = dense.shape
+        padded = np.zeros((nrows, _words(ncols) * WORD), dtype=np.uint8)
+        padded[:, :ncols] = dense
+        return cls(np.packbits(padded, axis=1, bitorder='little').view(np.uint64), ncols)
+    
+    @classmethod
+    def from_ints(cls, rows: Sequence[int], ncols: int) -> 'GF2Matrix':
+        """Desde filas como enteros de Python (bit j = columna j)"""
+        size = _words(ncols) * 8
+        raw = b''.join(int(row).to_bytes(size, 'little') for row in rows)
+        return cls(np.frombuffer(raw, dtype=np.uint64).copy(), ncols)
+    
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.rows), self.ncols
+    
+    def copy(self) -> 'GF2Matrix':
+        return GF2Matrix(self.rows.copy(), self.ncols)
+    
+    def to_dense(self) -> 'np.ndarray':
+        raw = self.rows.view(np.uint8).reshape(len(self.rows), self.rows.shape[1] * 8)
+        bits = np.unpackbits(raw, axis=1, bitorder='little')
+        return bits[:, :self.ncols]
+    
+    def row_int(self, index: int) -> int:
+        return int.from_bytes(self.rows[index].tobytes(), 'little')
+    
+    def __matmul__(self, vector) -> 'np.ndarray':
+        """Producto por un vector de bits: paridad de cada fila AND vector"""
+        folded = np.bitwise_xor.reduce(self.rows & pack_bits(vector), axis=1)
+        for shift in (32, 16, 8, 4, 2, 1):
+            folded ^= folded >> np.uint64(shift)
+        return (folded & np.uint64(1)).astype(np.uint8)
+    
+    def _column(self, column: int, nrows: Optional[int] = None) -> 'np.ndarray':
+        word, shift = divmod(column, WORD)
+        return ((self.rows[:nrows, word] >> np.uint64(shift)) & np.uint64(1)).astype(np.uint8)
+    
+    # Eliminación
+    
+    def _window(self, rows: 'np.ndarray', start: int, width: int) -> 'np.ndarray':
+        """Bits [start, start + width) de cada fila (sin cruzar palabra)"""
+        word, shift = divmod(start, WORD)
+        return ((rows[:, word] >> np.uint64(shift)) & np.uint64((1 << width) - 1)).astype(np.int64)
+    
+    def rref(self, checkpoint=None) -> Tuple['GF2Matrix', List[int]]:
+        """
+        Forma escalonada reducida y columnas pivote, por bloques de
+        BLOCK_BITS columnas (M4RI).
+        """
+        A = self.rows.copy()
+        nrows = len(A)
+        pivots: List[int] = []
+        r = 0
+        
+        for start in range(0, self.ncols, BLOCK_BITS):
+            if r >= nrows:
+                break
+            if checkpoint:
+                checkpoint()
+            width = min(BLOCK_BITS, self.ncols - start)
+            first_word = start // WORD
+            
+            # 1. Elegir pivotes mirando solo la ventana de las filas r..
+            window = self._window(A[r:], start, width)
+            chosen: List[int] = []
+            block_columns: List[int] = []
+            free = np.ones(len(window), dtype=bool)
+            for j in range(width):
+                bit = 1 << j
+                candidates = np.flatnonzero(((window & bit) != 0) & free)
+                if candidates.size == 0:
+                    continue
+                p = int(candidates[0])
+                has_bit = (window & bit) != 0
+                has_bit[p] = False
+                window[has_bit] ^= window[p]
+                free[p] = False
+                chosen.append(r + p)
+                block_columns.append(j)
+            if not chosen:
+                continue
+            
+            # 2. Subir las filas elegidas a r.. y reducirlas entre sí (Gauss-Jordan de k filas)
+            g = len(chosen)
+            others = np.setdiff1d(np.arange(r, nrows), chosen, assume_unique=True)
+            order = np.concatenate([np.array(chosen), others]).astype(np.int64)
+            A[r:] = A[order]
+            block = A[r:r + g, first_word:]
+            for i, j in enumerate(block_columns):
+                word, shift = divmod(start + j - first_word * WORD, WORD)
+                if not (int(block[i, word]) >> shift) & 1:
+                    swap = next(s for s in range(i + 1, g) if (int(block[s, word]) >> shift) & 1)
+                    block[[i, swap]] = block[[swap, i]]
+                for s in range(g):
+                    if s != i and (int(block[s, word]) >> shift) & 1:
+                        block[s] ^= block[i]
+            
+            # 3. Tablas de las 2^8 combinaciones de cada grupo de 8 filas pivote
+            tables = []
+            for group in range(0, g, TABLE_BITS):
+                members = block[group:group + TABLE_BITS]
+                table = np.zeros((1 << len(members), block.shape[1]), dtype=np.uint64)
+                for i, row in enumerate(members):
+                    table[1 << i:1 << (i + 1)] = table[:1 << i] ^ row
+                tables.append(table)
+            
+            # 4. Reducir el resto de filas (encima y debajo) con una consulta por tabla
+            rest = np.concatenate([np.arange(0, r), np.arange(r + g, nrows)])
+            if rest.size:
+                bits = self._window(A[rest], start, width)
+                pivot_bits = np.zeros(rest.size, dtype=np.int64)
+                for i, j in enumerate(block_columns):
+                    pivot_bits |= ((bits >> j) & 1) << i
+                hit = pivot_bits != 0
+                targets, pivot_bits = rest[hit], pivot_bits[hit]
+                update = tables[0][pivot_bits & 0xff]
+                for t, table in enumerate(tables[1:], 1):
+                    update ^= table[(pivot_bits >> (TABLE_BITS * t)) & 0xff]
+                A[targets, first_word:] ^= update
+            
+            pivots.extend(start + j for j in block_columns)
+            r += g
+        
+        return GF2Matrix(A, self.ncols), pivots
+    
+    def rank(self) -> int:
+        return len(self.rref()[1])
+    
+    def nullspace(self) -> 'GF2Matrix':
+        """Base del núcleo {x : A·x = 0}, un vector por fila"""
+        reduced, pivots = self.rref()
+        free = np.setdiff1d(np.arange(self.ncols), pivots)
+        basis = np.zeros((len(free), self.ncols), dtype=np.uint8)
+        basis[np.arange(len(free)), free] = 1
+        for i, f in enumerate(free):
+            # x_pivote = bit de la columna libre en la fila de ese pivote
+            basis[i, pivots] = reduced._column(int(f), len(pivots))
+        return GF2Matrix.from_dense(basis) if len(free) else GF2Matrix.zeros(0, self.ncols)
+    
+    def solve(self, b: Sequence[int], checkpoint=None) -> Optional['np.ndarray']:
+        """
+        Una solución de A·x = b (variables libres a 0), o None si el
+        sistema es inconsistente.
+        """
+        # Matriz ampliada [A | b]: b ocupa la columna ncols
+        augmented = GF2Matrix.zeros(len(self.rows), self.ncols + 1)
+        augmented.rows[:, :self.rows.shape[1]] = self.rows
+        word, shift = divmod(self.ncols, WORD)
+        augmented.rows[:, word] |= np.asarray(b, dtype=np.uint64) << np.uint64(shift)
+        
+        reduced, pivots = augmented.rref(checkpoint)
+        if pivots and pivots[-1] == self.ncols:
+            return None
+        x = np.zeros(self.ncols, dtype=np.uint8)
+        x[pivots] = reduced._column(self.ncols, len(pivots))
+        return x
+
+
+class GF2Solver:
+    """
+    Sistema lineal sobre GF(2) que se resuelve a medida que llegan las
+    ecuaciones, con filas como enteros de Python (un bit por incógnita).
+    Cada ecuación se reduce al entrar contra una base indexada por el bit
+    más bajo, así que las dependientes se descartan sin almacenarlas y las
+    inconsistentes se detectan en cuanto aparecen. Para sistemas muy
+    sobredeterminados que llegan en flujo (MT19937 con salidas truncadas:
+    ~20000 incógnitas y decenas de miles de ecuaciones) es varias veces más
+    rápido que montar la GF2Matrix completa y escalonarla.
+    """
+    
+    def __init__(self, unknowns: int):
+        self.unknowns = unknowns
+        self.basis: Dict[int, Tuple[int, int]] = {}
+        self.equations = 0
+    
+    @property
+    def rank(self) -> int:
+        return len(self.basis)
+    
+    def add(self, row: int, value: int) -> bool:
+        """Añadir row · x = value; devuelve False si era dependiente"""
+        self.equations += 1
+        while row:
+            pivot = (row & -row).bit_length() - 1
+            entry = self.basis.get(pivot)
+            if entry is None:
+                self.basis[pivot] = (row, value)
+                return True
+            row ^= entry[0]
+            value ^= entry[1]
+        if value:
+            raise ValueError("Sistema inconsistente: las salidas no son de este generador")
+        return False
+    
+    def solve(self) -> int:
+        """Una solución (incógnitas libres a 0) como entero de bits"""
+        x = 0
+        for pivot in sorted(self.basis, reverse=True):
+            row, value = self.basis[pivot]
+            # Los bits por encima del pivote ya están resueltos
+            if (bin(row & x).count('1') & 1) ^ value:
+                x |= 1 << pivot
+        return x
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Generadores congruenciales lineales x' = a·x + c (mod m)
+
+Con salidas completas los parámetros desconocidos salen en cascada: m como
+mcd de los determinantes t[i+2]·t[i] - t[i+1]² de las diferencias
+consecutivas, luego a y c por aritmética modular. Con salidas truncadas
+(solo los bits altos) y a, c, m conocidos, el estado es el vector del
+retículo {(x, a·x, a²·x, ...) mod m} más cercano a las salidas observadas:
+se busca con la incrustación de Kannan y LLL.
+"""
+import math
+from functools import reduce
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from ..ecdsa.lattice import lll_reduce
+
+
+class LCG:
+    """LCG con predicción, retroceso y saltos en O(log k)"""
+    
+    def __init__(self, m: int, a: int, c: int, state: int):
+        self.m = m
+        self.a = a % m
+        self.c = c % m
+        self.state = state % m
+    
+    def next(self) -> int:
+        self.state = (self.a * self.state + self.c) % self.m
+        return self.state
+    
+    def next_many(self, count: int) -> List[int]:
+        return [self.next() for _ in range(count)]
+    
+    def previous_many(self, count: int) -> List[int]:
+        """Los `count` estados anteriores al actual, en orden cronológico"""
+        states = []
+        for _ in range(count):
+            self.state = (self.state - self.c) * pow(self.a, -1, self.m) % self.m
+            states.append(self.state)
+        return states[::-1]
+    
+    def jump(self, steps: int) -> int:
+        """
+        Avanzar (o retroceder, si steps < 0) `steps` pasos componiendo la
+        transformación afín x -> A·x + C por cuadrados repetidos.
+        """
+        a, c = (self.a, self.c) if steps >= 0 else (pow(self.a, -1, self.m), 0)
+        if steps < 0:
+            c = -self.c * a % self.m
+        A, C = 1, 0
+        k = abs(steps)
+        while k:
+            if k & 1:
+                A, C = A * a % self.m, (C * a + c) % self.m
+            a, c = a * a % self.m, (c * a + c) % self.m
+            k >>= 1
+        self.state = (A * self.state + C) % self.m
+        return self.state
+
+
+def _modular_solutions(x: int, y: int, m: int) -> Iterator[int]:
+    """Todas las a con a·x ≡ y (mod m)"""
+    g = math.gcd(x, m)
+    if y % g:
+        return
+    step = m // g
+    base = (y // g) * pow(x // g, -1, step) % step if step > 1 else 0
+    for k in range(g):
+        yield base + k * step
+
+
+def recover_modulus(outputs: Sequence[int]) -> int:
+    """m (o un múltiplo pequeño) como mcd de los determinantes de diferencias"""
+    if len(outputs) < 4:
+        raise ValueError("Se necesitan al menos 4 salidas para el módulo")
+    t = [b - a for a, b in zip(outputs, outputs[1:])]
+    determinants = [abs(t[i + 2] * t[i] - t[i + 1] ** 2) for i in range(len(t) - 2)]
+    m = reduce(math.gcd, determinants)
+    if m == 0:
+        raise ValueError("Salidas degeneradas: no determinan el módulo")
+    # Quitar factores pequeños espurios mientras las salidas sigan siendo residuos
+    top = max(outputs)
+    for p in range(2, 1000):
+        while m % p == 0 and m // p > top:
+            m //= p
+    return m
+
+
+def recover_lcg(outputs: Sequence[int], m: Optional[int] = None, a: Optional[int] = None,
+                c: Optional[int] = None) -> LCG:
+    """
+    Parámetros que faltan a partir de salidas consecutivas completas. El
+    LCG devuelto está en la última salida (next() da la siguiente).
+    """
+    if m is None:
+        m = recover_modulus(outputs)
+    candidates: List[Tuple[int, int]] = []
+    if a is None:
+        if len(outputs) < 3:
+            raise ValueError("Se necesitan al menos 3 salidas para el multiplicador")
+        for guess in _modular_solutions(outputs[1] - outputs[0], outputs[2] - outputs[1], m):
+            candidates.append((guess, c if c is not None else (outputs[1] - guess * outputs[0]) % m))
+    else:
+        candidates.append((a, c if c is not None else (outputs[1] - a * outputs[0]) % m))
+    
+    for a_guess, c_guess in candidates:
+        if all((a_guess * x + c_guess) % m == y for x, y in zip(outputs, outputs[1:])):
+            return LCG(m, a_guess, c_guess, outputs[-1])
+    raise ValueError("Ningún (a, c) reproduce las salidas")
+
+
+def recover_truncated_state(outputs: Sequence[int], shift: int, m: int, a: int, c: int) -> LCG:
+    """
+    Estado de un LCG del que solo se ven los bits altos (x >> shift).
+    Devuelve el LCG situado en la última salida observada.
+    
+    Con x_i = a^i·x_0 + c_i (mod m), el vector (x_i - c_i) está en el
+    retículo generado por (1, a, a², ...) y m·e_i, y las salidas truncadas
+    dan un punto a distancia menor que 2^shift de él.
+    """
+    n = len(outputs)
+    if n < 2:
+        raise ValueError("Se necesitan al menos 2 salidas truncadas")
+    powers, offsets = [1], [0]
+    for _ in range(n - 1):
+        powers.append(powers[-1] * a % m)
+        offsets.append((offsets[-1] * a + c) % m)
+    
+    half = 1 << (shift - 1) if shift else 0
+    target = [((y << shift) + half - offset) % m for y, offset in zip(outputs, offsets)]
+    
+    # Incrustación de Kannan: la fila (target, K) deja el error como vector corto
+    basis = [powers + [0]]
+    basis += [[m if j == i else 0 for j in range(n)] + [0] for i in range(1, n)]
+    basis.append(target + [max(half, 1)])
+    for row in lll_reduce(basis):
+        if abs(row[-1]) != max(half, 1):
+            continue
+        error = [e * (1 if row[-1] > 0 else -1) for e in row[:-1]]
+        x0 = (target[0] - error[0] + offsets[0]) % m
+        generator = LCG(m, a, c, x0)
+        states = [x0] + generator.next_many(n - 1)
+        if all(state >> shift == y for state, y in zip(states, outputs)):
+            return generator
+    raise ValueError("La reducción no encontró un estado compatible con las salidas")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+LFSR (registro de desplazamiento con realimentación lineal)
+
+Convención de Fibonacci: s[n] = c1·s[n-1] + ... + cL·s[n-L] sobre GF(2),
+con polinomio de conexión C(x) = 1 + c1·x + ... + cL·x^L guardado como
+entero (bit i = ci). Berlekamp-Massey da el LFSR mínimo que genera una
+secuencia a partir de 2L bits consecutivos; si las tomas se conocen, el
+estado inicial sale de cualquier conjunto de bits observados (aunque no
+sean consecutivos) resolviendo un sistema sobre GF(2).
+"""
+from typing import Dict, List, Sequence, Tuple
+
+from .gf2 import GF2Matrix
+
+
+def bytes_to_bits(data: bytes, msb_first: bool = True) -> List[int]:
+    order = range(7, -1, -1) if msb_first else range(8)
+    return [(byte >> i) & 1 for byte in data for i in order]
+
+
+def bits_to_bytes(bits: Sequence[int], msb_first: bool = True) -> bytes:
+    out = bytearray()
+    for start in range(0, len(bits) - 7, 8):
+        chunk = bits[start:start + 8] if msb_first else bits[start:start + 8][::-1]
+        out.append(int(''.join(str(b & 1) for b in chunk), 2))
+    return bytes(out)
+
+
+def berlekamp_massey(bits: Sequence[int]) -> Tuple[int, int]:
+    """
+    LFSR mínimo que genera la secuencia: (longitud L, polinomio de conexión).
+    Los polinomios y la ventana de bits recientes son enteros de Python, así
+    que cada discrepancia es la paridad de un AND.
+    """
+    connection, previous = 1, 1
+    length, gap = 0, 1
+    window = 0  # bit i = s[n - i]
+    for n, bit in enumerate(bits):
+        window = (window << 1) | (bit & 1)
+        if bin(connection & window).count('1') & 1 == 0:
+            gap += 1
+        elif 2 * length <= n:
+            connection, previous = connection ^ (previous << gap), connection
+            length, gap = n + 1 - length, 1
+        else:
+            connection ^= previous << gap
+            gap += 1
+    return length, connection
+
+
+class LFSR:
+    """LFSR de Fibonacci con estado explícito"""
+    
+    def __init__(self, length: int, connection: int, state: Sequence[int]):
+        """
+        Args:
+            length: L, número de bits de estado
+            connection: Polinomio de conexión (bit i = ci, bit 0 = 1)
+            state: Los próximos L bits de salida s[0..L-1]
+        """
+        self.length = length
+        self.connection = connection
+        # Ventana con bit i = s[n - 1 - i]: los taps c1..cL alinean con sus bits 0..L-1
+        self.taps = (connection >> 1) & ((1 << length) - 1)
+        self.pending = [int(b) & 1 for b in state[:length]]
+        self.window = 0
+        for bit in self.pending:
+            self.window = (self.window << 1) | bit
+        self.mask = (1 << length) - 1
+    
+    @classmethod
+    def from_keystream(cls, bits: Sequence[int]) -> 'LFSR':
+        """LFSR mínimo que reproduce `bits` desde su primer bit"""
+        length, connection = berlekamp_massey(bits)
+        if 2 * length > len(bits):
+            raise ValueError(f"Se necesitan {2 * length} bits para un LFSR de longitud {length}")
+        return cls(length, connection, bits[:length])
+    
+    @property
+    def tap_positions(self) -> List[int]:
+        return [i for i in range(1, self.length + 1) if (self.connection >> i) & 1]
+    
+    def generate(self, count: int) -> List[int]:
+        """Los próximos `count` bits"""
+        out = self.pending[:count]
+        self.pending = self.pending[count:]
+        window, taps, mask = self.window, self.taps, self.mask
+        for _ in range(count - len(out)):
+            bit = bin(window & taps).count('1') & 1
+            window = ((window << 1) | bit) & mask
+            out.append(bit)
+        self.window = window
+        return out
+    
+    def keystream(self, nbytes: int, msb_first: bool = True) -> bytes:
+        return bits_to_bytes(self.generate(8 * nbytes), msb_first)
+
+
+def recover_state(length: int, taps: Sequence[int], observed: Dict[int, int]) -> LFSR:
+    """
+    Estado inicial con tomas conocidas a partir de bits observados en
+    posiciones arbitrarias. Cada s[t] es una combinación lineal conocida de
+    s[0..L-1]; las observaciones forman un sistema A·x = b sobre GF(2).
+    """
+    connection = 1
+    for tap in taps:
+        connection |= 1 << tap
+    horizon = max(observed) + 1
+    # symbolic[t]: máscara de los bits iniciales de los que depende s[t]
+    symbolic = [1 << i for i in range(length)]
+    rows, values = [], []
+    for t in range(horizon):
+        if t >= length:
+            combination = 0
+            for tap in taps:
+                combination ^= symbolic[t - tap]
+            symbolic.append(combination)
+        if t in observed:
+            rows.append(symbolic[t])
+            values.append(observed[t] & 1)
+    
+    matrix = GF2Matrix.from_ints(rows, length)
+    solution = matrix.solve(values)
+    if solution is None:
+        raise ValueError("Las observaciones no son compatibles con esas tomas")
+    if len(matrix.rref()[1]) < length:
+        raise ValueError("Observaciones insuficientes para fijar el estado")
+    return LFSR(length, connection, [int(b) for b in solution])
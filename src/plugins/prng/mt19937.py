@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Recuperación del estado de MT19937 (módulo random de Python)
+
+Con 624 salidas completas de 32 bits el estado sale directamente
+deshaciendo el templado, vectorizado con NumPy sobre las 624 palabras. Con
+salidas parciales (getrandbits(k) con k < 32, random() o bits sueltos) se
+plantea un sistema lineal sobre GF(2): las incógnitas son los 19968 bits de
+las 624 palabras que producen las primeras salidas, cada bit conocido de
+una salida es una ecuación (templado y twist son lineales) y el sistema se
+resuelve al vuelo con gf2.GF2Solver.
+"""
+import random
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .gf2 import GF2Solver
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+N, M = 624, 397
+MATRIX_A = 0x9908b0df
+UPPER_MASK, LOWER_MASK = 0x80000000, 0x7fffffff
+STATE_BITS = N * 32
+
+# Templado: (desplazamiento, máscara) con desplazamiento negativo = a la izquierda
+_TEMPERING = ((11, 0xffffffff), (-7, 0x9d2c5680), (-15, 0xefc60000), (18, 0xffffffff))
+
+
+def temper(y):
+    """Templado de una palabra o de un array uint32"""
+    for shift, mask in _TEMPERING:
+        y = y ^ (((y >> shift) if shift > 0 else (y << -shift)) & mask)
+    return y & 0xffffffff
+
+
+def untemper(y):
+    """
+    Inverso del templado. Cada paso y ^= (y >> s) & m se deshace iterando
+    x = y ^ (x >> s) & m hasta cubrir los 32 bits; funciona igual con un
+    entero que con un array NumPy de 624 salidas.
+    """
+    for shift, mask in reversed(_TEMPERING):
+        x = y
+        for _ in range(32 // abs(shift)):
+            x = y ^ (((x >> shift) if shift > 0 else (x << -shift)) & mask)
+        y = x & 0xffffffff
+    return y
+
+
+def twist(mt: 'np.ndarray') -> 'np.ndarray':
+    """
+    Siguiente generación del estado. Las posiciones i >= 227 usan palabras
+    ya renovadas, así que se avanza en tramos de 227 vectorizados.
+    """
+    mt = mt.astype(np.uint64).copy()
+    for start in range(0, N, N - M):
+        end = min(start + N - M, N)
+        i = np.arange(start, end)
+        y = (mt[i] & UPPER_MASK) | (mt[(i + 1) % N] & LOWER_MASK)
+        mt[i] = mt[(i + M) % N] ^ (y >> 1) ^ np.where(y & 1, MATRIX_A, 0).astype(np.uint64)
+    return mt.astype(np.uint32)
+
+
+def _untwist_y(value: int) -> int:
+    """y de la recurrencia a partir de mt[i] ^ mt[i + M]: el bit alto delata y & 1"""
+    if value & UPPER_MASK:
+        return (((value ^ MATRIX_A) << 1) | 1) & 0xffffffff
+    return (value << 1) & 0xffffffff
+
+
+def untwist(mt: Sequence[int]) -> List[int]:
+    """
+    Generación anterior del estado. Se deshace de la última posición a la
+    primera; de la palabra 0 solo se recupera el bit alto (los 31 bajos
+    nunca influyen en la salida).
+    """
+    mt = [int(x) for x in mt]
+    for i in range(N - 1, -1, -1):
+        # y_i = bit alto de mt[i] | bits bajos de mt[i + 1]; y_{i-1} aporta los bajos de mt[i]
+        upper = _untwist_y(mt[i] ^ mt[(i + M) % N]) & UPPER_MASK
+        lower = _untwist_y(mt[i - 1] ^ mt[(i + M - 1) % N]) & LOWER_MASK
+        mt[i] = upper | lower
+    return mt
+
+
+class MT19937:
+    """MT19937 con estado explícito: predicción y retroceso por lotes"""
+    
+    def __init__(self, state: Sequence[int], index: int = 0):
+        """
+        Args:
+            state: Las 624 palabras del estado
+            index: Posición de la próxima palabra a templar (624 = twist pendiente)
+        """
+        if not HAS_NUMPY:
+            raise ImportError("MT19937 requiere NumPy")
+        self.state = np.array([int(x) for x in state], dtype=np.uint32)
+        self.index = index
+    
+    @classmethod
+    def from_outputs(cls, outputs: Sequence[int]) -> 'MT19937':
+        """Estado a partir de 624 salidas consecutivas de 32 bits; continúa tras ellas"""
+        if len(outputs) < N:
+            raise ValueError(f"Se necesitan {N} salidas de 32 bits")
+        words = untemper(np.array(outputs[:N], dtype=np.uint64)).astype(np.uint32)
+        generator = cls(words, N)
+        # Salidas de más: comprobar y avanzar
+        extra = list(outputs[N:])
+        if extra and list(generator.generate(len(extra))) != [int(x) for x in extra]:
+            raise ValueError("Las salidas no son consecutivas de un mismo MT19937")
+        return generator
+    
+    @classmethod
+    def from_random(cls, rng: random.Random) -> 'MT19937':
+        version, internal, _ = rng.getstate()
+        return cls(internal[:N], internal[N])
+    
+    def to_random(self) -> random.Random:
+        """random.Random que continúa exactamente donde este generador"""
+        rng = random.Random()
+        rng.setstate((3, tuple(int(x) for x in self.state) + (self.index,), None))
+        return rng
+    
+    def generate(self, count: int) -> 'np.ndarray':
+        """Las próximas `count` salidas de 32 bits"""
+        out = np.empty(count, dtype=np.uint32)
+        filled = 0
+        while filled < count:
+            if self.index >= N:
+                self.state = twist(self.state)
+                self.index = 0
+            take = min(count - filled, N - self.index)
+            chunk = self.state[self.index:self.index + take].astype(np.uint64)
+            out[filled:filled + take] = temper(chunk).astype(np.uint32)
+            self.index += take
+            filled += take
+        return out
+    
+    def rewind(self, count: int) -> 'np.ndarray':
+        """
+        Retroceder `count` salidas; devuelve esas salidas en orden
+        cronológico y deja el generador justo antes de la primera.
+        """
+        out = np.empty(count, dtype=np.uint32)
+        remaining = count
+        while remaining:
+            if self.index == 0:
+                self.state = np.array(untwist(self.state), dtype=np.uint32)
+                self.index = N
+            take = min(remaining, self.index)
+            chunk = self.state[self.index - take:self.index].astype(np.uint64)
+            out[remaining - take:remaining] = temper(chunk).astype(np.uint32)
+            self.index -= take
+            remaining -= take
+        return out
+
+
+class _SymbolicMT:
+    """
+    MT19937 simbólico: cada bit es una máscara de los STATE_BITS bits
+    incógnita (las palabras de la primera generación de salidas).
+    """
+    
+    def __init__(self):
+        self.words = [[1 << (32 * i + b) for b in range(32)] for i in range(N)]
+        self.index = 0
+    
+    @staticmethod
+    def _temper(word: List[int]) -> List[int]:
+        y = list(word)
+        for shift, mask in _TEMPERING:
+            shifted = [0] * 32
+            for b in range(32):
+                source = b + shift
+                if 0 <= source < 32 and (mask >> b) & 1:
+                    shifted[b] = y[source]
+            y = [a ^ s for a, s in zip(y, shifted)]
+        return y
+    
+    def _twist(self) -> None:
+        mt = self.words
+        for i in range(N):
+            y = [mt[(i + 1) % N][b] for b in range(31)] + [mt[i][31]]
+            new = list(mt[(i + M) % N])
+            for b in range(31):
+                new[b] ^= y[b + 1]
+            for b in range(32):
+                if (MATRIX_A >> b) & 1:
+                    new[b] ^= y[0]
+            mt[i] = new
+        self.index = 0
+    
+    def next_output(self) -> List[int]:
+        if self.index >= N:
+            self._twist()
+        word = self.words[self.index]
+        self.index += 1
+        return self._temper(word)
+
+
+class PartialMTSolver:
+    """
+    Estado de MT19937 a partir de salidas parciales o truncadas.
+    
+    Cada salida se añade con los bits conocidos; `solve` devuelve un
+    MT19937 situado justo antes de la primera salida observada.
+    """
+    
+    def __init__(self, checkpoint: Optional[Callable[[], None]] = None):
+        self.symbolic = _SymbolicMT()
+        self.system = GF2Solver(STATE_BITS)
+        self.observed: List[Tuple[int, int]] = []
+        self.checkpoint = checkpoint
+    
+    def add_bits(self, value: int, mask: int = 0xffffffff) -> None:
+        """Salida de 32 bits de la que se conocen los bits de `mask`"""
+        bits = self.symbolic.next_output()
+        for b in range(32):
+            if (mask >> b) & 1:
+                self.system.add(bits[b], (value >> b) & 1)
+        self.observed.append((value & mask, mask))
+        if self.checkpoint and len(self.observed) % N == 0:
+            self.checkpoint()
+    
+    def add_getrandbits(self, value: int, k: int) -> None:
+        """Salida de getrandbits(k): los k bits altos de la palabra (k <= 32)"""
+        if k >= 32:
+            for shift in range(0, k, 32):
+                width = min(32, k - shift)
+                self.add_bits(((value >> shift) & ((1 << width) - 1)) << (32 - width),
+                              ((1 << width) - 1) << (32 - width))
+            return
+        self.add_bits(value << (32 - k), ((1 << k) - 1) << (32 - k))
+    
+    def add_random(self, x: float) -> None:
+        """Salida de random(): (a >> 5, b >> 6) de dos palabras"""
+        n = int(x * (1 << 53))
+        self.add_getrandbits(n >> 26, 27)
+        self.add_getrandbits(n & ((1 << 26) - 1), 26)
+    
+    def skip(self, count: int = 1) -> None:
+        """Salidas no observadas"""
+        for _ in range(count):
+            self.add_bits(0, 0)
+    
+    @property
+    def rank(self) -> int:
+        return self.system.rank
+    
+    def solve(self) -> MT19937:
+        """Generador que reproduce todas las salidas observadas desde la primera"""
+        x = self.system.solve()
+        words = [(x >> (32 * i)) & 0xffffffff for i in range(N)]
+        generator = MT19937(words, 0)
+        check = MT19937(words, 0).generate(len(self.observed))
+        if any(int(out) & mask != value for out, (value, mask) in zip(check, self.observed)):
+            raise ValueError(f"Sistema indeterminado: rango {self.rank} de {STATE_BITS - 31}")
+        return generator
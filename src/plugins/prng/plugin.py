@@ -0,0 +1,357 @@
+"""
+Plugin PRNG - Recuperación del estado de MT19937 y LCG
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from ..base import MultiTechniquePlugin
+from ...models.data import ChallengeData, SolutionResult, PluginInfo, ChallengeType
+from .lcg import LCG, recover_lcg, recover_truncated_state
+from .lfsr import LFSR, bytes_to_bits, recover_state
+from .mt19937 import HAS_NUMPY, N, MT19937, PartialMTSolver
+
+# Claves numéricas que se leen de JSON o de texto nombre = valor
+PARAMETER_KEYS = ['m', 'a', 'c', 'shift', 'bits', 'predict']
+
+_ASSIGNMENT = re.compile(r'^\s*(\w+)\s*[=:]\s*(0x[0-9a-fA-F]+|\d+)\s*$', re.MULTILINE)
+# Prefijos de flag que dan keystream conocido al inicio del texto cifrado
+KNOWN_PREFIXES = [b'CTF{', b'FLAG{', b'flag{', b'picoCTF{', b'HTB{']
+
+_KEYSTREAM = re.compile(r'\bkeystream\s*[=:]\s*["\']?([01]{16,})')
+_CIPHERTEXT = re.compile(r'\b(?:ciphertext|ct|enc|encrypted|encrypted_flag|flag_enc)\s*[=:]\s*["\']?(?:0x)?([0-9a-fA-F]+)')
+
+
+class PRNGPlugin(MultiTechniquePlugin):
+    """Plugin para predecir generadores pseudoaleatorios a partir de sus salidas"""
+    
+    def __init__(self):
+        super().__init__()
+        
+        # Ficheros de salidas que se leen
+        self.max_file_size = 16 << 20
+        
+        # Salidas que se predicen (y se rebobinan) cuando no hay texto cifrado
+        self.prediction_count = 10
+    
+    def _create_plugin_info(self) -> PluginInfo:
+        return PluginInfo(
+            name="prng",
+            version="1.0.0",
+            description="Plugin para generadores pseudoaleatorios: MT19937 (completo o parcial), LCG, LCG truncado y LFSR",
+            supported_types=[ChallengeType.BASIC_CRYPTO, ChallengeType.MIXED, ChallengeType.UNKNOWN],
+            techniques=["mt19937", "mt19937_partial", "lcg", "truncated_lcg", "lfsr"],
+            priority=66
+        )
+    
+    def can_solve(self, challenge_data: ChallengeData) -> float:
+        """Evaluar si el desafío pide predecir un generador"""
+        confidence = 0.0
+        
+        for file_info in challenge_data.files:
+            filename = file_info.path.name.lower()
+            if any(pattern in filename for pattern in ['random', 'prng', 'rng', 'lcg', 'mt19937', 'twister', 'lfsr']):
+                confidence += 0.2
+            
+            content = self._read_file_content(file_info.path) if file_info.path.stat().st_size <= (1 << 20) else None
+            if content:
+                content_lower = content.lower()
+                if any(pattern in content_lower for pattern in ['getrandbits', 'mersenne', 'mt19937', 'lcg',
+                                                                'random.seed', 'randbytes', 'lfsr']):
+                    confidence += 0.3
+        
+        params = self._extract_parameters(challenge_data)
+        if len(params.get('outputs', [])) >= N:
+            confidence += 0.4
+        elif len(params.get('outputs', [])) >= 4 and ('m' in params or 'shift' in params):
+            confidence += 0.3
+        
+        return min(confidence, 1.0)
+    
+    def _initialize_techniques(self) -> Dict[str, callable]:
+        """Inicializar técnicas de PRNG"""
+        return {
+            "mt19937": self._try_mt19937,
+            "mt19937_partial": self._try_mt19937_partial,
+            "lcg": self._try_lcg,
+            "truncated_lcg": self._try_truncated_lcg,
+            "lfsr": self._try_lfsr
+        }
+    
+    def _extract_parameters(self, challenge_data: ChallengeData) -> Dict[str, Any]:
+        """
+        Salidas observadas, parámetros (m, a, c, shift, bits) y texto cifrado.
+        Las salidas vienen de una lista JSON 'outputs' o de un fichero con
+        un entero por línea (o separados por comas); metadata['prng'] manda.
+        """
+        params: Dict[str, Any] = {}
+        for file_info in challenge_data.files:
+            if file_info.path.stat().st_size > self.max_file_size:
+                continue
+            content = self._read_file_content(file_info.path)
+            if not content:
+                continue
+            
+            try:
+                data = json.loads(content)
+            except ValueError:
+                data = None
+            if isinstance(data, dict):
+                self._merge_parameters(params, data)
+                continue
+            if isinstance(data, list):
+                params.setdefault('outputs', [x for x in data if isinstance(x, (int, float))])
+                continue
+            
+            for key, value in _ASSIGNMENT.findall(content):
+                if key.lower() in PARAMETER_KEYS:
+                    params.setdefault(key.lower(), int(value, 0))
+            match = _KEYSTREAM.search(content)
+            if match:
+                params.setdefault('keystream', [int(b) for b in match.group(1)])
+            match = _CIPHERTEXT.search(content)
+            if match and len(match.group(1)) % 2 == 0:
+                params.setdefault('ciphertext', bytes.fromhex(match.group(1)))
+            
+            numbers = re.findall(r'(?m)^\s*(\d+(?:\.\d+)?)\s*,?\s*$', content)
+            if len(numbers) < 4:
+                numbers = re.findall(r'\d+(?:\.\d+)?', content) if re.fullmatch(r'[\d.,\s\[\]]+', content) else []
+            if len(numbers) >= 4 and 'outputs' not in params:
+                params['outputs'] = [float(x) if '.' in x else int(x) for x in numbers]
+        
+        self._merge_parameters(params, challenge_data.metadata.get('prng', {}), override=True)
+        return params
+    
+    def _merge_parameters(self, params: Dict[str, Any], data: Dict[str, Any], override: bool = False) -> None:
+        for key in PARAMETER_KEYS:
+            if key in data and (override or key not in params):
+                params[key] = int(data[key], 0) if isinstance(data[key], str) else int(data[key])
+        if isinstance(data.get('outputs'), list) and (override or 'outputs' not in params):
+            params['outputs'] = [x if isinstance(x, float) else int(x, 0) if isinstance(x, str) else int(x)
+                                 for x in data['outputs']]
+        if isinstance(data.get('taps'), list):
+            params['taps'] = [int(t) for t in data['taps']]
+        if isinstance(data.get('keystream'), (str, list)) and (override or 'keystream' not in params):
+            params['keystream'] = [int(b) for b in data['keystream'] if str(b) in '01']
+        for key in ['ciphertext', 'encrypted_flag', 'ct']:
+            if isinstance(data.get(key), str) and (override or 'ciphertext' not in params):
+                try:
+                    params['ciphertext'] = bytes.fromhex(data[key].removeprefix('0x'))
+                except ValueError:
+                    pass
+    
+    # MT19937
+    
+    def _try_mt19937(self, challenge_data: ChallengeData) -> SolutionResult:
+        """Estado completo a partir de 624 salidas de 32 bits (untemper vectorizado)"""
+        if not HAS_NUMPY:
+            return self._create_failure_result("MT19937 requiere NumPy")
+        params = self._extract_parameters(challenge_data)
+        outputs = params.get('outputs', [])
+        if params.get('bits', 32) != 32 or len(outputs) < N:
+            return self._create_failure_result(f"Se necesitan {N} salidas de 32 bits")
+        if any(isinstance(x, float) or not 0 <= x < (1 << 32) for x in outputs):
+            return self._create_failure_result("Las salidas no son palabras de 32 bits")
+        
+        try:
+            generator = MT19937.from_outputs(outputs)
+        except ValueError as e:
+            return self._create_failure_result(str(e))
+        return self._mt_result(generator, len(outputs), params, "mt19937", observed=len(outputs))
+    
+    def _try_mt19937_partial(self, challenge_data: ChallengeData) -> SolutionResult:
+        """
+        Salidas truncadas (getrandbits(k), k < 32) o random(): sistema lineal
+        sobre GF(2) con los 19968 bits del estado.
+        """
+        if not HAS_NUMPY:
+            return self._create_failure_result("MT19937 requiere NumPy")
+        params = self._extract_parameters(challenge_data)
+        outputs = params.get('outputs', [])
+        floats = bool(outputs) and all(isinstance(x, float) for x in outputs)
+        bits = params.get('bits')
+        if not outputs or (not floats and not bits):
+            return self._create_failure_result("Faltan salidas o su número de bits")
+        
+        solver = PartialMTSolver(checkpoint=self._check_timeout)
+        try:
+            for value in outputs:
+                if floats:
+                    solver.add_random(value)
+                else:
+                    solver.add_getrandbits(int(value), bits)
+            generator = solver.solve()
+        except ValueError as e:
+            return self._create_failure_result(str(e), rank=solver.rank)
+        
+        words = len(solver.observed)
+        generator.generate(words)
+        return self._mt_result(generator, len(outputs), params, "mt19937_partial", observed=words, rank=solver.rank)
+    
+    def _mt_keystreams(self, generator: MT19937, length: int, observed: int) -> Iterator[Tuple[str, bytes]]:
+        """
+        Keystreams habituales tras las salidas observadas y, rebobinando,
+        los generados justo antes de ellas (clave sacada antes de las pistas).
+        """
+        words_per_strategy = [('randbytes', (length + 3) // 4), ('getrandbits8', length)]
+        for name, words in words_per_strategy:
+            for position in ('after', 'before'):
+                clone = MT19937(generator.state, generator.index)
+                if position == 'before':
+                    clone.rewind(observed + words)
+                rng = clone.to_random()
+                if name == 'randbytes':
+                    yield f"{name}_{position}", rng.getrandbits(8 * length).to_bytes(length, 'little')
+                else:
+                    yield f"{name}_{position}", bytes(rng.getrandbits(8) for _ in range(length))
+    
+    def _mt_result(self, generator: MT19937, outputs: int, params: Dict[str, Any], method: str,
+                   **details) -> SolutionResult:
+        ciphertext = params.get('ciphertext')
+        if ciphertext:
+            for name, keystream in self._mt_keystreams(generator, len(ciphertext), details['observed']):
+                self._check_timeout()
+                plaintext = bytes(x ^ k for x, k in zip(ciphertext, keystream))
+                flag = self._extract_flag(plaintext.decode('latin-1'))
+                if flag:
+                    return self._create_success_result(
+                        flag=flag, method=method, confidence=0.95, keystream=name, outputs=outputs, **details
+                    )
+        
+        count = params.get('predict', self.prediction_count)
+        clone = MT19937(generator.state, generator.index)
+        # Predicciones en el formato observado: getrandbits(k) son los k bits altos
+        drop = 32 - params['bits'] if params.get('bits', 32) < 32 else 0
+        predictions = [int(x) >> drop for x in clone.generate(count)]
+        return self._create_success_result(
+            flag=str(predictions[0]) if predictions else None,
+            method=method,
+            confidence=0.6,
+            predictions=predictions,
+            outputs=outputs,
+            **details
+        )
+    
+    # LCG
+    
+    def _try_lcg(self, challenge_data: ChallengeData) -> SolutionResult:
+        """Parámetros desconocidos por mcd de determinantes y aritmética modular"""
+        params = self._extract_parameters(challenge_data)
+        outputs = params.get('outputs', [])
+        if 'shift' in params or len(outputs) < (3 if 'm' in params else 4):
+            return self._create_failure_result("Se necesitan salidas completas consecutivas")
+        if any(isinstance(x, float) for x in outputs):
+            return self._create_failure_result("Las salidas no son enteras")
+        
+        try:
+            generator = recover_lcg(outputs, params.get('m'), params.get('a'), params.get('c'))
+        except (ValueError, ZeroDivisionError) as e:
+            return self._create_failure_result(str(e))
+        return self._lcg_result(generator, params, "lcg", None)
+    
+    def _try_truncated_lcg(self, challenge_data: ChallengeData) -> SolutionResult:
+        """Estado a partir de los bits altos (x >> shift) por reducción de retículo"""
+        params = self._extract_parameters(challenge_data)
+        outputs = params.get('outputs', [])
+        if not all(k in params for k in ['m', 'a', 'c', 'shift']) or len(outputs) < 2:
+            return self._create_failure_result("Se necesitan m, a, c, shift y salidas truncadas")
+        
+        try:
+            generator = recover_truncated_state([int(x) for x in outputs], params['shift'],
+                                                params['m'], params['a'], params['c'])
+        except ValueError as e:
+            return self._create_failure_result(str(e))
+        return self._lcg_result(generator, params, "truncated_lcg", params['shift'])
+    
+    def _lcg_keystreams(self, generator: LCG, length: int, observed: int) -> Iterator[Tuple[str, bytes]]:
+        """Byte bajo (o alto, si está truncado) de cada salida, antes o después de las observadas"""
+        high = max((generator.m - 1).bit_length() - 8, 0)
+        for position in ('after', 'before'):
+            clone = LCG(generator.m, generator.a, generator.c, generator.state)
+            if position == 'before':
+                clone.jump(-(observed + length))
+            states = clone.next_many(length)
+            yield f"low_byte_{position}", bytes(x & 0xff for x in states)
+            yield f"high_byte_{position}", bytes((x >> high) & 0xff for x in states)
+    
+    def _lcg_result(self, generator: LCG, params: Dict[str, Any], method: str,
+                    shift: Optional[int]) -> SolutionResult:
+        details = {'m': generator.m, 'a': generator.a, 'c': generator.c}
+        ciphertext = params.get('ciphertext')
+        if ciphertext:
+            for name, keystream in self._lcg_keystreams(generator, len(ciphertext), len(params['outputs'])):
+                plaintext = bytes(x ^ k for x, k in zip(ciphertext, keystream))
+                flag = self._extract_flag(plaintext.decode('latin-1'))
+                if flag:
+                    return self._create_success_result(
+                        flag=flag, method=method, confidence=0.95, keystream=name, **details
+                    )
+        
+        clone = LCG(generator.m, generator.a, generator.c, generator.state)
+        predictions = clone.next_many(params.get('predict', self.prediction_count))
+        if shift is not None:
+            predictions = [x >> shift for x in predictions]
+        return self._create_success_result(
+            flag=str(predictions[0]) if predictions else None,
+            method=method,
+            confidence=0.6,
+            predictions=predictions,
+            **details
+        )
+    
+    # LFSR
+    
+    def _try_lfsr(self, challenge_data: ChallengeData) -> SolutionResult:
+        """
+        Keystream de un LFSR: Berlekamp-Massey sobre los bits conocidos (o el
+        prefijo de flag bajo el texto cifrado) da tomas y estado; con tomas
+        conocidas basta un sistema sobre GF(2) con menos bits.
+        """
+        params = self._extract_parameters(challenge_data)
+        ciphertext = params.get('ciphertext')
+        keystream = params.get('keystream')
+        if not keystream and not ciphertext:
+            return self._create_failure_result("Se necesita keystream o texto cifrado")
+        
+        for msb_first in (True, False):
+            for known in self._lfsr_known_bits(ciphertext, keystream, msb_first):
+                self._check_timeout()
+                try:
+                    if params.get('taps'):
+                        length = max(params['taps'])
+                        generator = recover_state(length, params['taps'], dict(enumerate(known)))
+                    else:
+                        generator = LFSR.from_keystream(known)
+                except ValueError:
+                    continue
+                
+                details = {'length': generator.length, 'taps': generator.tap_positions,
+                           'state': ''.join(map(str, generator.pending)), 'msb_first': msb_first}
+                if not ciphertext:
+                    predicted = generator.generate(len(known) + 64)[len(known):]
+                    return self._create_success_result(
+                        flag=''.join(map(str, predicted)), method="lfsr", confidence=0.6,
+                        predicted_bits=len(predicted), **details
+                    )
+                plaintext = bytes(x ^ k for x, k in zip(ciphertext, generator.keystream(len(ciphertext), msb_first)))
+                flag = self._extract_flag(plaintext.decode('latin-1'))
+                if flag:
+                    return self._create_success_result(flag=flag, method="lfsr", confidence=0.95, **details)
+        
+        return self._create_failure_result("Ningún LFSR corto explica el keystream")
+    
+    def _lfsr_known_bits(self, ciphertext: Optional[bytes], keystream: Optional[list],
+                         msb_first: bool) -> Iterator[list]:
+        """Bits de keystream conocidos desde la posición 0"""
+        if keystream:
+            yield keystream
+            return
+        for prefix in KNOWN_PREFIXES:
+            if len(prefix) <= len(ciphertext):
+                yield bytes_to_bits(bytes(x ^ p for x, p in zip(ciphertext, prefix)), msb_first)
+    
+    def _extract_flag(self, text: str) -> Optional[str]:
+        """Buscar patrones de flag"""
+        match = re.search(r'(?:CTF|FLAG)\{[^}]+\}', text, re.IGNORECASE)
+        return match.group(0) if match else None
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Raíces modulares para RSA con gcd(e, φ) > 1 y criptosistema de Rabin
+Tonelli-Shanks, Cipolla, Adleman-Manders-Miller y recombinación CRT perezosa
+"""
+import math
+import random
+import itertools
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from .rsa_math import RSAMath
+from ..discrete_log.generic import GenericDLog, MultiplicativeGroup
+
+
+class ModularRoots:
+    """Cálculo de raíces e-ésimas módulo primos y enumeración de candidatos CRT"""
+    
+    # A partir de esta valoración 2-ádica de p-1, Cipolla supera a Tonelli-Shanks
+    CIPOLLA_THRESHOLD = 16
+    
+    @staticmethod
+    def legendre_symbol(a: int, p: int) -> int:
+        """Símbolo de Legendre (a/p) para p primo impar"""
+        a %= p
+        if a == 0:
+            return 0
+        return 1 if pow(a, (p - 1) // 2, p) == 1 else -1
+    
+    @staticmethod
+    def tonelli_shanks(a: int, p: int) -> Optional[int]:
+        """Raíz cuadrada de a módulo p primo (Tonelli-Shanks)"""
+        a %= p
+        if a == 0:
+            return 0
+        if p == 2:
+            return a
+        if ModularRoots.legendre_symbol(a, p) != 1:
+            return None
+        
+        if p % 4 == 3:
+            return pow(a, (p + 1) // 4, p)
+        
+        # Escribir p-1 como q * 2^s
+        q, s = p - 1, 0
+        while q % 2 == 0:
+            q //= 2
+            s += 1
+        
+        # Buscar un no-residuo cuadrático
+        z = 2
+        while ModularRoots.legendre_symbol(z, p) != -1:
+            z += 1
+        
+        m = s
+        c = pow(z, q, p)
+        t = pow(a, q, p)
+        r = pow(a, (q + 1) // 2, p)
+        
+        while t != 1:
+            # Menor i tal que t^(2^i) = 1
+            i, t2 = 0, t
+            while t2 != 1:
+                t2 = t2 * t2 % p
+                i += 1
+            
+            b = pow(c, 1 << (m - i - 1), p)
+            m = i
+            c = b * b % p
+            t = t * c % p
+            r = r * b % p
+        
+        return r
+    
+    @staticmethod
+    def cipolla(a: int, p: int) -> Optional[int]:
+        """Raíz cuadrada de a módulo p primo (Cipolla, aritmética en F_p²)"""
+        a %= p
+        if a == 0:
+            return 0
+        if p == 2:
+            return a
+        if ModularRoots.legendre_symbol(a, p) != 1:
+            return None
+        
+        # Buscar t tal que t² - a no sea residuo cuadrático
+        t = 1
+        while ModularRoots.legendre_symbol(t * t - a, p) != -1:
+            t += 1
+        w = (t * t - a) % p
+        
+        # (t + sqrt(w))^((p+1)/2) en F_p[sqrt(w)]
+        x0, x1 = 1, 0
+        b0, b1 = t, 1
+        exponent = (p + 1) // 2
+        while exponent:
+            if exponent & 1:
+                x0, x1 = (x0 * b0 + x1 * b1 * w) % p, (x0 * b1 + x1 * b0) % p
+            b0, b1 = (b0 * b0 + b1 * b1 * w) % p, (2 * b0 * b1) % p
+            exponent >>= 1
+        
+        return x0
+    
+    @staticmethod
+    def sqrt_mod_prime(a: int, p: int) -> List[int]:
+        """Todas las raíces cuadradas de a módulo p primo"""
+        a %= p
+        if a == 0:
+            return [0]
+        
+        # Tonelli-Shanks es O(s²) con s = v2(p-1); Cipolla no depende de s
+        s = ((p - 1) & -(p - 1)).bit_length() - 1
+        if s >= ModularRoots.CIPOLLA_THRESHOLD:
+            root = ModularRoots.cipolla(a, p)
+        else:
+            root = ModularRoots.tonelli_shanks(a, p)
+        
+        if root is None:
+            return []
+        return sorted({root, (p - root) % p})
+    
+    @staticmethod
+    def amm_root(delta: int, r: int, p: int) -> Optional[int]:
+        """
+        Una raíz r-ésima de delta módulo p con r primo y r | p-1
+        (Adleman-Manders-Miller).
+        """
+        delta %= p
+        if delta == 0:
+            return 0
+        if (p - 1) % r != 0:
+            return pow(delta, pow(r, -1, p - 1), p)
+        if pow(delta, (p - 1) // r, p) != 1:
+            return None  # delta no es residuo r-ésimo
+        
+        # p - 1 = r^t * s con gcd(r, s) = 1
+        t, s = 0, p - 1
+        while s % r == 0:
+            s //= r
+            t += 1
+        
+        # δ^α es raíz salvo un factor b del r-subgrupo de Sylow
+        alpha = pow(r, -1, s) if s > 1 else 0
+        b = pow(delta, r * alpha - 1, p)
+        
+        # Generador c del subgrupo de Sylow de orden r^t
+        rho = 2
+        while pow(rho, (p - 1) // r, p) == 1:
+            rho += 1
+        c = pow(rho, s, p)
+        
+        # b = (c^r)^m  =>  h = c^-m cumple h^r = b^-1
+        m = GenericDLog(MultiplicativeGroup(p)).prime_power_dlog(pow(c, r, p), b, r, t - 1)
+        if m is None:
+            return None
+        
+        root = pow(delta, alpha, p) * pow(c, -m, p) % p
+        return root if pow(root, r, p) == delta else None
+    
+    @staticmethod
+    def roots_of_unity(r: int, p: int) -> List[int]:
+        """Raíces r-ésimas de la unidad módulo p (r primo)"""
+        g = math.gcd(r, p - 1)
+        if g == 1:
+            return [1]
+        
+        # Generador del subgrupo de orden g
+        while True:
+            zeta = pow(random.randrange(2, p - 1), (p - 1) // g, p)
+            if zeta != 1:
+                break
+        
+        roots = [1]
+        for _ in range(g - 1):
+            roots.append(roots[-1] * zeta % p)
+        return roots
+    
+    @staticmethod
+    def nth_roots_mod_prime(c: int, e: int, p: int) -> List[int]:
+        """Todas las raíces e-ésimas de c módulo p primo"""
+        c %= p
+        if c == 0:
+            return [0]
+        
+        if p == 2:
+            return [1]
+        
+        # Separar e = e_coprime * ∏ r^k con r | p-1
+        roots = {c}
+        for r, k in Counter(RSAMath.factorize(e)).items():
+            for _ in range(k):
+                next_roots = set()
+                if (p - 1) % r != 0:
+                    inv = pow(r, -1, p - 1)
+                    next_roots = {pow(x, inv, p) for x in roots}
+                else:
+                    unity = ModularRoots.roots_of_unity(r, p)
+                    for x in roots:
+                        if r == 2:
+                            base = ModularRoots.sqrt_mod_prime(x, p)[:1]
+                        else:
+                            root = ModularRoots.amm_root(x, r, p)
+                            base = [root] if root is not None else []
+                        for y in base:
+                            next_roots.update(y * z % p for z in unity)
+                roots = next_roots
+                if not roots:
+                    return []
+        
+        return sorted(roots)
+    
+    @staticmethod
+    def hensel_lift(roots: Sequence[int], c: int, e: int, p: int, k: int) -> List[int]:
+        """Elevar raíces de x^e = c de módulo p a módulo p^k (requiere p ∤ e·x)"""
+        if k == 1:
+            return list(roots)
+        
+        lifted = []
+        for x in roots:
+            if (e * x) % p == 0:
+                continue
+            modulus = p
+            for _ in range(k - 1):
+                modulus *= p
+                derivative = e * pow(x, e - 1, modulus) % modulus
+                x = (x - (pow(x, e, modulus) - c) * pow(derivative, -1, modulus)) % modulus
+            lifted.append(x)
+        
+        return lifted
+    
+    @staticmethod
+    def roots_mod_factors(c: int, e: int, factors: Sequence[int]) -> Dict[int, List[int]]:
+        """
+        Raíces e-ésimas de c módulo cada potencia de primo de n.
+        
+        Returns:
+            Dict[int, List[int]]: Mapeo potencia de primo -> raíces
+        """
+        result = {}
+        for p, k in Counter(factors).items():
+            roots = ModularRoots.nth_roots_mod_prime(c, e, p)
+            modulus = p ** k
+            result[modulus] = ModularRoots.hensel_lift(roots, c % modulus, e, p, k)
+        return result
+    
+    @staticmethod
+    def count_candidates(root_sets: Dict[int, List[int]]) -> int:
+        """Número total de combinaciones CRT sin materializarlas"""
+        return math.prod(len(roots) for roots in root_sets.values())
+    
+    @staticmethod
+    def crt_candidates(root_sets: Dict[int, List[int]]) -> Iterator[int]:
+        """
+        Enumerar perezosamente los candidatos m mod n combinando las raíces
+        de cada potencia de primo con el teorema del resto chino.
+        """
+        moduli = list(root_sets.keys())
+        n = math.prod(moduli)
+        
+        # Coeficientes CRT precalculados: m = Σ r_i · c_i (mod n)
+        coefficients = []
+        for modulus in moduli:
+            partial = n // modulus
+            coefficients.append(partial * pow(partial, -1, modulus) % n)
+        
+        for combination in itertools.product(*(root_sets[m] for m in moduli)):
+            yield sum(r * coef for r, coef in zip(combination, coefficients)) % n
@@ -18,6 +18,7 @@ except ImportError:
     HAS_CRYPTO = False
 
 from .rsa_math import RSAMath
+from .modular_roots import ModularRoots
 
 from ..base import MultiTechniquePlugin
 from ...models.data import ChallengeData, SolutionResult, PluginInfo, ChallengeType
@@ -35,6 +36,8 @@ class RSAPlugin(MultiTechniquePlugin):
         self.max_wiener_bits = 1024       # Máximo para ataque Wiener
         self.max_small_e = 65537          # Máximo exponente para ataques de e pequeño
         
+        self.max_root_candidates = 1 << 20  # Máximo de combinaciones CRT a probar
+        
         # Primos pequeños para factorización rápida
         self.small_primes = self._generate_small_primes(10000)
     
@@ -47,7 +50,7 @@ class RSAPlugin(MultiTechniquePlugin):
             techniques=[
                 "weak_keys", "small_e_attack", "wiener_attack", "hastad_attack",
                 "common_modulus", "factorization", "pollard_rho", "fermat_factorization",
-                "low_public_exponent", "partial_key_recovery"
+                "low_public_exponent", "partial_key_recovery", "rabin_decryption"
             ],
             priority=85
         )
@@ -91,6 +94,7 @@ class RSAPlugin(MultiTechniquePlugin):
         """Inicializar técnicas RSA"""
         return {
             "weak_keys": self._try_weak_keys,
+            "rabin_decryption": self._try_rabin_decryption,
             "small_e_attack": self._try_small_e_attack,
             "factorization": self._try_factorization,
             "wiener_attack": self._try_wiener_attack,
@@ -114,6 +118,10 @@ class RSAPlugin(MultiTechniquePlugin):
             e = rsa_params.get('e')
             
             # Priorizar basado en características
+            if e == 2 or ('p' in rsa_params and 'q' in rsa_params and e and
+                          math.gcd(e, (rsa_params['p'] - 1) * (rsa_params['q'] - 1)) > 1):
+                ordered_techniques["rabin_decryption"] = techniques.pop("rabin_decryption", None)
+            
             if e and e <= 3:
                 ordered_techniques["small_e_attack"] = techniques.pop("small_e_attack", None)
                 ordered_techniques["hastad_attack"] = techniques.pop("hastad_attack", None)
@@ -242,7 +250,7 @@ class RSAPlugin(MultiTechniquePlugin):
             data = json.loads(content)
             if isinstance(data, dict):
                 # Convertir strings a enteros si es necesario
-                for key in ['n', 'e', 'd', 'p', 'q', 'dp', 'dq', 'qi']:
+                for key in ['n', 'e', 'd', 'p', 'q', 'dp', 'dq', 'qi', 'c']:
                     if key in data:
                         value = data[key]
                         if isinstance(value, str):
@@ -289,15 +297,7 @@ class RSAPlugin(MultiTechniquePlugin):
     
     def _generate_small_primes(self, limit: int) -> List[int]:
         """Generar lista de primos pequeños usando criba de Eratóstenes"""
-        sieve = [True] * (limit + 1)
-        sieve[0] = sieve[1] = False
-        
-        for i in range(2, int(math.sqrt(limit)) + 1):
-            if sieve[i]:
-                for j in range(i * i, limit + 1, i):
-                    sieve[j] = False
-        
-        return [i for i in range(2, limit + 1) if sieve[i]]
+        return RSAMath.small_primes(limit)
     
     def _try_weak_keys(self, challenge_data: ChallengeData) -> SolutionResult:
         """Detectar claves RSA débiles"""
@@ -329,10 +329,34 @@ class RSAPlugin(MultiTechniquePlugin):
             return self._create_failure_result("Exponente público e=1 (trivial pero inválido)")
         
         if e == 2:
-            return self._create_failure_result("Exponente público e=2 (par, inválido)")
+            # Rabin: el descifrado se hace con raíces cuadradas modulares
+            return self._try_rabin_decryption(challenge_data)
         
         return self._create_failure_result("No se detectaron debilidades obvias")
     
+    def _try_rabin_decryption(self, challenge_data: ChallengeData) -> SolutionResult:
+        """Descifrado por raíces modulares (Rabin, e=2 o gcd(e, φ) > 1)"""
+        self.logger.info("Probando descifrado por raíces modulares")
+        
+        params = self._extract_rsa_parameters(challenge_data)
+        if not all(k in params for k in ['n', 'e', 'c']):
+            return self._create_failure_result("Faltan parámetros para descifrado por raíces modulares")
+        
+        n = params['n']
+        
+        # Usar factores conocidos o intentar factorizar
+        if params.get('p') and params.get('q') and params['p'] * params['q'] == n:
+            factors = [params['p'], params['q']]
+        elif n.bit_length() <= self.max_factorization_bits:
+            factors = RSAMath.factorize(n)
+        else:
+            return self._create_failure_result("Se necesitan los factores de n para extraer raíces")
+        
+        if math.prod(factors) != n or not all(RSAMath.is_prime_miller_rabin(f) for f in factors):
+            return self._create_failure_result("No se pudo factorizar n completamente")
+        
+        return self._decrypt_with_modular_roots(params, factors)
+    
     def _try_small_e_attack(self, challenge_data: ChallengeData) -> SolutionResult:
         """Ataque de exponente público pequeño"""
         self.logger.info("Probando ataque de exponente pequeño")
@@ -585,7 +609,8 @@ class RSAPlugin(MultiTechniquePlugin):
         try:
             d = RSAMath.mod_inverse(e, phi_n)
             if d is None:
-                return self._create_failure_result("No se pudo calcular el inverso modular")
+                # gcd(e, φ) > 1: el descifrado tiene varias raíces candidatas
+                return self._decrypt_with_modular_roots(params, [p, q])
             
             # Descifrar
             m = RSAMath.pow_mod(c, d, n)
@@ -614,6 +639,42 @@ class RSAPlugin(MultiTechniquePlugin):
             self.logger.error(f"Error en descifrado: {e}")
             return self._create_failure_result(f"Error calculando clave privada: {str(e)}")
     
+    def _decrypt_with_modular_roots(self, params: Dict[str, Any], factors: List[int]) -> SolutionResult:
+        """Descifrar extrayendo todas las raíces e-ésimas de c y recombinando con CRT"""
+        e, c = params['e'], params['c']
+        
+        root_sets = ModularRoots.roots_mod_factors(c, e, factors)
+        total = ModularRoots.count_candidates(root_sets)
+        if total == 0:
+            return self._create_failure_result("c no es residuo e-ésimo módulo los factores de n")
+        
+        self.logger.info(f"Enumerando {total} candidatos por CRT")
+        
+        # Los candidatos se generan de uno en uno; nunca se materializa el conjunto
+        for index, m in enumerate(ModularRoots.crt_candidates(root_sets)):
+            if index >= self.max_root_candidates:
+                break
+            if index & 0xFFF == 0:
+                self._check_timeout()
+            
+            plaintext = self._int_to_bytes(m)
+            flag = self._match_flag_candidate(plaintext)
+            if flag:
+                return self._create_success_result(
+                    flag=flag,
+                    method="modular_roots_decrypt",
+                    confidence=0.95,
+                    factors=tuple(factors),
+                    candidates_checked=index + 1,
+                    candidates_total=total,
+                    message=plaintext.decode('utf-8', errors='ignore')
+                )
+        
+        # Un texto imprimible cualquiera no basta: entre miles de raíces alguna lo es por azar
+        return self._create_failure_result(
+            "Ningún candidato CRT contiene una flag", candidates_total=total
+        )
+    
     def _decrypt_with_private_key(self, params: Dict[str, Any]) -> SolutionResult:
         """Descifrar usando clave privada conocida"""
         if not all(k in params for k in ['n', 'e', 'd', 'c']):
@@ -651,6 +712,12 @@ class RSAPlugin(MultiTechniquePlugin):
         except:
             return None
     
+    def _match_flag_candidate(self, data: bytes) -> Optional[str]:
+        """Buscar solo patrones explícitos de flag (sin aceptar texto corto arbitrario)"""
+        text = data.decode('utf-8', errors='ignore')
+        match = re.search(r'(?:[A-Za-z0-9_]*(?:CTF|FLAG)|HTB)\{[ -|~]{3,}?\}', text, re.IGNORECASE)
+        return match.group(0) if match else None
+    
     def _extract_flag_from_text(self, text: str) -> Optional[str]:
         """Extraer flag de texto"""
         # Patrones comunes de flags
@@ -112,21 +112,76 @@ class RSAMath:
             return None
         return d if d > 1 else None
     
+    @staticmethod
+    def pollard_brent(n: int, max_iterations: int = 300000, seed: Optional[int] = None) -> Optional[int]:
+        """Variante de Brent de Pollard's rho (un gcd por bloque de productos)"""
+        if n % 2 == 0:
+            return 2
+        
+        rng = random.Random(seed)
+        y, c, block = rng.randrange(1, n), rng.randrange(1, n), 128
+        g, r, q = 1, 1, 1
+        x = ys = y
+        
+        iterations = 0
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(block, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += block
+            iterations += 2 * r
+            r *= 2
+            if iterations > max_iterations:
+                return None
+        
+        if g == n:
+            # Retroceder paso a paso desde el último bloque
+            while True:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+                if g > 1:
+                    break
+        
+        return g if g != n else None
+    
+    @staticmethod
+    def small_primes(bound: int) -> list:
+        """Primos menores o iguales que bound (criba de Eratóstenes)"""
+        if bound < 2:
+            return []
+        sieve = bytearray([1]) * (bound + 1)
+        sieve[:2] = b'\x00\x00'
+        for i in range(2, math.isqrt(bound) + 1):
+            if sieve[i]:
+                sieve[i * i::i] = bytearray(len(sieve[i * i::i]))
+        return [i for i, is_prime in enumerate(sieve) if is_prime]
+    
     @staticmethod
     def trial_division(n: int, limit: int = 10000) -> Optional[int]:
         """División de prueba hasta el límite"""
         if n % 2 == 0:
             return 2
         
-        for i in range(3, min(int(n**0.5) + 1, limit), 2):
+        for i in range(3, min(math.isqrt(n) + 1, limit), 2):
             if n % i == 0:
                 return i
         
         return None
     
     @staticmethod
-    def factorize(n: int) -> list:
-        """Factorización usando múltiples métodos"""
+    def factorize(n: int, rho_iterations: int = 300000) -> list:
+        """
+        Factorización usando múltiples métodos.
+        
+        Los cofactores compuestos que no se logran separar se devuelven tal cual.
+        """
         if n < 2:
             return []
         
@@ -146,15 +201,23 @@ class RSAMath:
                 break
             factor = RSAMath.trial_division(n)
         
-        # Si queda un número grande, usar Pollard's rho
+        # Si queda un número grande, usar Pollard's rho (variante de Brent)
         if n > 1:
             if RSAMath.is_prime_miller_rabin(n):
                 factors.append(n)
             else:
-                factor = RSAMath.pollard_rho(n)
+                # Brent falla si el ciclo se cierra a la vez módulo todos los
+                # primos: reintentar con otras constantes y acabar con rho clásico
+                factor = None
+                for _ in range(4):
+                    factor = RSAMath.pollard_brent(n, rho_iterations)
+                    if factor:
+                        break
+                if not factor:
+                    factor = RSAMath.pollard_rho(n, rho_iterations)
                 if factor:
-                    factors.extend(RSAMath.factorize(factor))
-                    factors.extend(RSAMath.factorize(n // factor))
+                    factors.extend(RSAMath.factorize(factor, rho_iterations))
+                    factors.extend(RSAMath.factorize(n // factor, rho_iterations))
                 else:
                     factors.append(n)  # No se pudo factorizar
         
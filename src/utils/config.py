@@ -30,7 +30,7 @@ class PluginConfig:
     
     def __post_init__(self):
         if self.enabled_plugins is None:
-            self.enabled_plugins = ["basic_crypto", "rsa", "elliptic_curve", "network"]
+            self.enabled_plugins = ["basic_crypto", "rsa", "elliptic_curve", "ecdsa", "discrete_log", "hash_cracking", "block_cipher", "prng", "network"]
 
 
 @dataclass
@@ -69,6 +69,7 @@ class CacheConfig:
     default_ttl: int = 3600  # 1 hora
     disk_cache_enabled: bool = True
     cache_dir: str = "data/cache"
+    lookup_table_budget_mb: int = 2048  # Tablas de preimágenes de hashes
 
 
 @dataclass
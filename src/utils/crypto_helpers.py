@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Auxiliares compartidos por los plugins criptográficos
+Lectura de enteros en el formato de los retos y descifrado de la flag con
+un secreto recuperado (clave privada, exponente o secreto compartido).
+"""
+import hashlib
+import math
+import re
+from typing import Any, Dict, Optional
+
+from Crypto.Cipher import AES
+from Crypto.Util.number import long_to_bytes
+
+FLAG_PATTERN = re.compile(r'(?:CTF|FLAG)\{[^}]+\}', re.IGNORECASE)
+
+
+def parse_int(value: Any) -> Optional[int]:
+    """Entero en decimal, 0x hexadecimal o hexadecimal sin prefijo"""
+    if isinstance(value, int):
+        return value
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    try:
+        if value.lower().startswith('0x'):
+            return int(value, 16)
+        return int(value) if value.isdigit() else int(value, 16)
+    except ValueError:
+        return None
+
+
+def extract_flag(text: str) -> Optional[str]:
+    """Buscar patrones de flag"""
+    match = FLAG_PATTERN.search(text)
+    return match.group(0) if match else None
+
+
+def decrypt_with_secret(secret: int, params: Dict[str, Any]) -> Optional[str]:
+    """
+    Descifrar `params['ciphertext']` (hex, con `iv` opcional) con AES-CBC/ECB
+    o XOR, probando las derivaciones de clave habituales del secreto
+    """
+    try:
+        ciphertext = bytes.fromhex(params['ciphertext'])
+        iv = bytes.fromhex(params['iv']) if 'iv' in params else None
+    except ValueError:
+        return None
+    if not ciphertext:
+        return None
+    
+    text, raw = str(secret).encode(), long_to_bytes(secret)
+    keys = [
+        hashlib.sha1(text).digest()[:16], hashlib.sha256(text).digest()[:16],
+        hashlib.sha256(raw).digest()[:16], hashlib.sha256(raw).digest()
+    ]
+    if len(ciphertext) % 16 == 0:
+        for key in keys:
+            ciphers = [AES.new(key, AES.MODE_CBC, iv)] if iv and len(iv) == 16 else []
+            ciphers.append(AES.new(key, AES.MODE_ECB))
+            for cipher in ciphers:
+                flag = extract_flag(cipher.decrypt(ciphertext).decode('latin-1'))
+                if flag:
+                    return flag
+    
+    # XOR con el secreto o con su hash repetido
+    for key in [raw, hashlib.sha256(raw).digest(), hashlib.sha256(text).digest()]:
+        stream = key * (math.ceil(len(ciphertext) / len(key)))
+        flag = extract_flag(bytes(c ^ k for c, k in zip(ciphertext, stream)).decode('latin-1'))
+        if flag:
+            return flag
+    return None
@@ -0,0 +1,234 @@
+"""
+Oráculos locales para tests: simulan servicios remotos de retos CTF
+"""
+
+import asyncio
+import hmac
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional, Tuple
+
+from Crypto.Cipher import AES
+from Crypto.Util.Padding import pad
+
+from src.plugins.elliptic_curve.ec_arith import Affine, CurveArithmetic
+from src.plugins.elliptic_curve.invalid_curve import ScalarOracle
+from src.plugins.network.length_extension import MerkleDamgard
+from src.plugins.network.rsa_oracle import RSAOracle
+
+
+class LocalLineServer(ABC):
+    """
+    Servidor TCP local que envía un banner y responde una vez por línea.
+    
+    Las respuestas se programan con latencia artificial sin bloquear la
+    lectura (como un RTT real), para medir el rendimiento del pipelining.
+    Las subclases definen `banner()` y `respond(line)`. Con `banner_gap`
+    las líneas del banner llegan separadas por ese silencio (s).
+    """
+    
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", banner_gap: float = 0.0):
+        self.latency = latency
+        self.host = host
+        self.banner_gap = banner_gap
+        self.port = 0
+        self.queries = 0
+        self.connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+    
+    def banner(self) -> bytes:
+        return b""
+    
+    @abstractmethod
+    def respond(self, line: bytes) -> bytes:
+        """Respuesta completa (con su fin de línea o prompt) a una consulta"""
+        pass
+    
+    async def start(self) -> int:
+        """Arrancar el servidor y devolver el puerto asignado"""
+        self._server = await asyncio.start_server(self._handle_client, self.host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+    
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        outgoing: asyncio.Queue = asyncio.Queue()
+        self.connections += 1
+        
+        async def sender():
+            while True:
+                due, payload = await outgoing.get()
+                if payload is None:
+                    break
+                delay = due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                writer.write(payload)
+                await writer.drain()
+        
+        sender_task = asyncio.create_task(sender())
+        try:
+            for index, banner_line in enumerate(self.banner().splitlines(keepends=True)):
+                if index and self.banner_gap:
+                    await asyncio.sleep(self.banner_gap)
+                writer.write(banner_line)
+                await writer.drain()
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.queries += 1
+                await outgoing.put((loop.time() + self.latency, self.respond(line.strip())))
+            
+            # Vaciar las respuestas pendientes antes de cerrar
+            await outgoing.put((0, None))
+            await sender_task
+        except (asyncio.CancelledError, ConnectionError):
+            sender_task.cancel()
+        finally:
+            writer.close()
+    
+    async def stop(self) -> None:
+        """Detener el servidor"""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+class LocalRSAOracle(RSAOracle):
+    """Oráculo RSA en proceso a partir de la clave privada"""
+    
+    def __init__(self, n: int, d: int, kind: str = "parity"):
+        super().__init__()
+        self.n = n
+        self.d = d
+        self.kind = kind
+        self.k = (n.bit_length() + 7) // 8
+    
+    def answer(self, ciphertext: int) -> bool:
+        """Evaluar el predicado del oráculo"""
+        m = pow(ciphertext, self.d, self.n)
+        if self.kind == "parity":
+            return bool(m & 1)
+        # PKCS#1 v1.5: el texto plano empieza por 0x00 0x02
+        return m >> (8 * (self.k - 2)) == 2
+    
+    async def query_many(self, ciphertexts: List[int]) -> List[bool]:
+        self.queries += len(ciphertexts)
+        return [self.answer(c) for c in ciphertexts]
+
+
+class LocalRSAOracleServer(LocalLineServer):
+    """Oráculo RSA remoto: una línea hex por consulta, odd/even o valid/invalid"""
+    
+    def __init__(self, n: int, d: int, kind: str = "parity", latency: float = 0.0,
+                 banner: bytes = b"RSA oracle ready\n", host: str = "127.0.0.1", banner_gap: float = 0.0):
+        super().__init__(latency, host, banner_gap)
+        self.oracle = LocalRSAOracle(n, d, kind)
+        self._banner = banner
+    
+    def banner(self) -> bytes:
+        return self._banner
+    
+    def respond(self, line: bytes) -> bytes:
+        try:
+            answer = self.oracle.answer(int(line.decode(errors='ignore'), 16))
+        except ValueError:
+            return b"error\n"
+        if self.oracle.kind == "parity":
+            return b"odd\n" if answer else b"even\n"
+        return b"valid\n" if answer else b"invalid\n"
+
+
+class LocalScalarOracle(ScalarOracle):
+    """Oráculo de curva inválida en proceso a partir del secreto"""
+    
+    def __init__(self, a: int, p: int, d: int):
+        super().__init__()
+        # b no interviene en la aritmética: sirve para cualquier curva inválida
+        self.arith = CurveArithmetic(a, 0, p)
+        self.d = d
+    
+    async def query_many(self, points: List[Tuple[int, int]]) -> List[Affine]:
+        self.queries += len(points)
+        return [self.arith.multiply(self.d, P) for P in points]
+
+
+class LocalMACServer(LocalLineServer):
+    """
+    MAC H(secreto || mensaje) vulnerable: anuncia un mensaje firmado y
+    entrega la flag por "<mensaje hex> <mac hex>" con MAC válida y `required`.
+    """
+    
+    def __init__(self, secret: bytes, algorithm: str = "sha256",
+                 message: bytes = b"user=guest;role=user", required: bytes = b";admin=true",
+                 flag: bytes = b"CTF{length_extension}", latency: float = 0.0, host: str = "127.0.0.1"):
+        super().__init__(latency, host)
+        self.secret = secret
+        self.algorithm = algorithm
+        self.message = message
+        self.required = required
+        self.flag = flag
+    
+    def mac(self, message: bytes) -> bytes:
+        return MerkleDamgard(self.algorithm).update(self.secret + message).digest()
+    
+    def banner(self) -> bytes:
+        return (f"Signed with {self.algorithm}(secret || message)\n"
+                f"message = {self.message.hex()}\nmac = {self.mac(self.message).hex()}\n").encode()
+    
+    def respond(self, line: bytes) -> bytes:
+        try:
+            message_hex, mac_hex = line.split()
+            message, mac = bytes.fromhex(message_hex.decode()), bytes.fromhex(mac_hex.decode())
+        except ValueError:
+            return b"error\n"
+        if hmac.compare_digest(mac, self.mac(message)) and self.required in message:
+            return self.flag + b"\n"
+        return b"invalid\n"
+
+
+def ecb_oracle(key: bytes, secret: bytes, prefix: bytes = b"") -> Callable[[bytes], bytes]:
+    """Función AES-ECB(prefijo || entrada || secreto) con PKCS#7"""
+    cipher = AES.new(key, AES.MODE_ECB)
+    return lambda data: cipher.encrypt(pad(prefix + data + secret, AES.block_size))
+
+
+def cbc_padding_oracle(key: bytes) -> Callable[[bytes], bool]:
+    """Función IV || texto cifrado -> padding PKCS#7 válido"""
+    def check(data: bytes) -> bool:
+        if len(data) < 32 or len(data) % 16:
+            return False
+        plaintext = AES.new(key, AES.MODE_CBC, data[:16]).decrypt(data[16:])
+        n = plaintext[-1]
+        return 1 <= n <= 16 and plaintext[-n:] == bytes([n]) * n
+    return check
+
+
+class LocalPaddingOracleServer(LocalLineServer):
+    """
+    Oráculo de padding CBC: anuncia IV || texto cifrado y responde a cada
+    consulta hex con un mensaje de padding válido o inválido y el prompt.
+    """
+    
+    def __init__(self, key: bytes, plaintext: bytes, latency: float = 0.0, prompt: bytes = b"> ",
+                 valid: bytes = b"The prophecy is well-formed.", invalid: bytes = b"The prophecy is chaotic.",
+                 host: str = "127.0.0.1"):
+        super().__init__(latency, host)
+        self.key = key
+        self.iv = bytes(range(16, 32))
+        self.ciphertext = AES.new(key, AES.MODE_CBC, self.iv).encrypt(pad(plaintext, 16))
+        self.check = cbc_padding_oracle(key)
+        self.prompt = prompt
+        self.valid = valid
+        self.invalid = invalid
+    
+    def banner(self) -> bytes:
+        return (b"Prophecy (HEX): " + (self.iv + self.ciphertext).hex().encode()
+                + b"\nProvide new ciphertext\n" + self.prompt)
+    
+    def respond(self, line: bytes) -> bytes:
+        try:
+            message = self.valid if self.check(bytes.fromhex(line.decode())) else self.invalid
+        except ValueError:
+            message = b"error"
+        return message + b"\n" + self.prompt
@@ -8,9 +8,55 @@ import base64
 from pathlib import Path
 
 from src.plugins.basic_crypto.plugin import BasicCryptoPlugin
+from src.plugins.basic_crypto.many_time_pad import ManyTimePad
 from src.models.data import ChallengeData, ChallengeType, FileInfo
 
 
+MESSAGES = [
+    b"The quick brown fox jumps over the lazy dog near the river bank.",
+    b"Meet me at the old station tonight, bring the documents with you.",
+    b"CTF{n0nce_reuse_is_fatal} is the flag for this stream cipher task.",
+    b"We have intercepted several messages from the enemy command post.",
+    b"All of these were encrypted with the same keystream by mistake.",
+    b"Security depends on never reusing a nonce with a stream cipher.",
+    b"This is why one time pads must only ever be used exactly once.",
+    b"Attack at dawn and hold the bridge until reinforcements arrive!",
+    b"The weather report says heavy rain and strong winds tomorrow.",
+    b"Please confirm that you have received the package in one piece."
+]
+
+
+def _reuse_keystream(messages, seed=7):
+    import random
+    keystream = random.Random(seed).randbytes(max(map(len, messages)))
+    return [bytes(m ^ k for m, k in zip(message, keystream)) for message in messages]
+
+
+class TestManyTimePad:
+    """Tests para la recuperación de keystream reutilizado"""
+    
+    def test_columns_and_refinement(self):
+        """Test columnas + bigramas: casi todo el texto recuperado"""
+        solver = ManyTimePad(_reuse_keystream(MESSAGES))
+        plaintexts = solver.solve()
+        
+        correct = sum(a == b for m, p in zip(MESSAGES, plaintexts) for a, b in zip(m, p))
+        assert correct / sum(map(len, MESSAGES)) > 0.95
+        assert plaintexts[2].startswith(b"CTF{n0nce_reuse_is_fatal}")
+    
+    def test_crib_dragging_few_messages(self):
+        """Test con cuatro mensajes los cribs corrigen tramos del keystream"""
+        solver = ManyTimePad(_reuse_keystream(MESSAGES[:4]))
+        solver.recover_columns()
+        solver.refine()
+        before = solver.score()
+        
+        hits = solver.crib_drag()
+        
+        assert hits and all(MESSAGES[row][offset:offset + len(crib)] == crib.encode() for row, offset, crib in hits)
+        assert solver.score() > before
+
+
 class TestBasicCryptoPlugin:
     """Tests para BasicCryptoPlugin"""
     
@@ -341,6 +387,20 @@ class TestBasicCryptoPlugin:
         result = plugin._try_base64_decode(challenge)
         assert result.success is False
 
+    def test_many_time_pad_technique(self, plugin, temp_file_with_content):
+        """Test técnica many-time pad con un texto cifrado hex por línea"""
+        lines = [f"c{i} = {c.hex()}" for i, c in enumerate(_reuse_keystream(MESSAGES))]
+        file_path = temp_file_with_content("Same keystream reused:\n" + "\n".join(lines))
+        challenge = ChallengeData(
+            id="test", name="Test", files=[FileInfo(path=file_path, size=100, mime_type="text/plain")]
+        )
+        
+        result = plugin._try_many_time_pad(challenge)
+        
+        assert result.success is True
+        assert result.flag == "CTF{n0nce_reuse_is_fatal}"
+        assert result.details['messages'] == 10
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
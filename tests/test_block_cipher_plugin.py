@@ -0,0 +1,287 @@
+"""
+Tests para Block Cipher Plugin
+"""
+
+import asyncio
+import os
+
+import pytest
+from Crypto.Cipher import AES
+from Crypto.Util.Padding import pad
+
+from src.plugins.block_cipher.plugin import BlockCipherPlugin
+from src.plugins.block_cipher.ecb import (
+    ByteAtATimeECB, LocalEncryptionOracle, detect_ecb, parse_ciphertext, repeated_blocks
+)
+from src.plugins.block_cipher.padding_oracle import (
+    CandidateModel, LocalPaddingOracle, PaddingOracleAttack, ResponsePredicate
+)
+from src.core.attack_state import AttackStateStore
+from src.models.data import ChallengeData, ChallengeType, FileInfo, NetworkInfo
+from tests.datasets.local_oracles import LocalPaddingOracleServer, cbc_padding_oracle, ecb_oracle
+
+
+KEY = bytes(range(16))
+SECRET = b"CTF{byte_at_a_time_ecb}"
+
+
+class FlakyPaddingOracle(LocalPaddingOracle):
+    """Oráculo que simula una desconexión tras `limit` consultas y cede el turno en cada lote"""
+    
+    def __init__(self, function, limit=None):
+        super().__init__(function)
+        self.limit = limit
+    
+    async def check_many(self, ciphertexts):
+        if self.limit is not None and self.queries + len(ciphertexts) > self.limit:
+            raise ConnectionError("Conexión cerrada por el servidor")
+        await asyncio.sleep(0)
+        return await super().check_many(ciphertexts)
+
+
+class TestECBDetection:
+    """Tests para la detección de ECB"""
+    
+    def test_repeated_blocks(self):
+        """Test bloques repetidos en ECB y ninguno en CBC"""
+        plaintext = b"YELLOW SUBMARINE" * 40 + os.urandom(100)
+        ecb = AES.new(KEY, AES.MODE_ECB).encrypt(pad(plaintext, 16))
+        cbc = AES.new(KEY, AES.MODE_CBC, bytes(16)).encrypt(pad(plaintext, 16))
+        
+        assert repeated_blocks(ecb) == (39, len(ecb) // 16)
+        assert detect_ecb(ecb) is True
+        assert detect_ecb(cbc) is False
+    
+    def test_parse_ciphertext(self):
+        """Test texto cifrado en hex o base64 dentro de la respuesta"""
+        assert parse_ciphertext(b"ciphertext: " + (b"ab" * 16) + b"\n") == bytes([0xab]) * 16
+        assert parse_ciphertext(b"c = AAAAAAAAAAAAAAAAAAAAAA==\n") == bytes(16)
+        assert parse_ciphertext(b"error\n") is None
+
+
+class TestByteAtATime:
+    """Tests para el ataque byte a byte"""
+    
+    @pytest.mark.parametrize("prefix", [b"", b"random-prefix", b"P" * 16])
+    def test_batched_with_prefix(self, prefix):
+        """Test una consulta por byte con prefijo de longitud desconocida"""
+        oracle = LocalEncryptionOracle(ecb_oracle(KEY, SECRET, prefix))
+        attack = ByteAtATimeECB(oracle)
+        
+        assert asyncio.run(attack.run()) == SECRET
+        assert attack.block_size == 16 and attack.prefix_length == len(prefix)
+        assert attack.batched is True
+        assert oracle.queries == 65 + 16 + len(SECRET)
+    
+    def test_pipelined_when_input_limited(self):
+        """Test 257 consultas por byte si el servicio limita la entrada"""
+        oracle = LocalEncryptionOracle(ecb_oracle(KEY, SECRET, b"xyz"), max_input=64)
+        attack = ByteAtATimeECB(oracle)
+        
+        assert asyncio.run(attack.run()) == SECRET
+        assert attack.batched is False
+    
+    def test_resume_after_disconnect(self, tmp_path):
+        """Test los parámetros y el secreto parcial se retoman del estado guardado"""
+        encrypt = ecb_oracle(KEY, SECRET, b"xyz")
+        calls = []
+        
+        def dropping(data):
+            calls.append(data)
+            if len(calls) > 257 * 10:
+                raise ConnectionError("Conexión cerrada por el servidor")
+            return encrypt(data)
+        
+        with AttackStateStore(tmp_path / "state.sqlite") as state:
+            with pytest.raises(ConnectionError):
+                asyncio.run(ByteAtATimeECB(LocalEncryptionOracle(dropping, max_input=64), state=state).run())
+            
+            oracle = LocalEncryptionOracle(encrypt, max_input=64)
+            attack = ByteAtATimeECB(oracle, state=state)
+            assert asyncio.run(attack.run()) == SECRET
+            assert attack.resumed > 0
+            assert oracle.queries == 257 * (len(SECRET) - attack.resumed)
+
+
+class TestPaddingOracle:
+    """Tests para el ataque de oráculo de padding"""
+    
+    def test_predicate(self):
+        """Test respuestas válidas e inválidas (inválido tiene prioridad)"""
+        predicate = ResponsePredicate()
+        assert predicate(b"The prophecy is well-formed.\n> ") is True
+        assert predicate(b"Valid Padding\n") is True
+        assert predicate(b"Invalid Padding\n") is False
+        assert predicate(b"The prophecy is chaotic.\n> ") is False
+        assert ResponsePredicate(valid=["ok"], invalid=[], default=True)(b"???") is True
+    
+    def test_local_decrypt(self):
+        """Test descifrado de todos los bloques y retirada del padding"""
+        plaintext = b"CTF{cbc_padding_oracle}" * 3
+        iv = os.urandom(16)
+        ciphertext = AES.new(KEY, AES.MODE_CBC, iv).encrypt(pad(plaintext, 16))
+        attack = PaddingOracleAttack([LocalPaddingOracle(cbc_padding_oracle(KEY))])
+        
+        assert asyncio.run(attack.decrypt(ciphertext, iv)) == plaintext
+        assert attack.blocks_done == len(ciphertext) // 16
+    
+    def test_padding_one_false_positive(self):
+        """Test un \\x02 en el penúltimo byte no se confunde con padding 1"""
+        cipher = AES.new(KEY, AES.MODE_ECB)
+        block = next(b for b in (os.urandom(16) for _ in range(100000)) if cipher.decrypt(b)[14] == 2)
+        previous = os.urandom(16)
+        expected = bytes(x ^ p for x, p in zip(cipher.decrypt(block), previous))
+        
+        # El prior propone primero el byte que da \x02\x02 en lugar de \x01
+        model = CandidateModel(known={15: [expected[15] ^ 3]}, prefixes=[])
+        oracle = LocalPaddingOracle(cbc_padding_oracle(KEY))
+        attack = PaddingOracleAttack([oracle], model=model)
+        
+        assert asyncio.run(attack.decrypt_block(oracle, previous, block)) == expected
+        assert attack.false_positives == 1
+    
+    def test_candidate_ordering(self):
+        """Test el orden por verosimilitud baja las consultas por byte de una flag"""
+        plaintext = b"CTF{the_prior_knows_flags_are_mostly_lowercase_text}"
+        iv = os.urandom(16)
+        ciphertext = AES.new(KEY, AES.MODE_CBC, iv).encrypt(pad(plaintext, 16))
+        attack = PaddingOracleAttack([LocalPaddingOracle(cbc_padding_oracle(KEY))])
+        
+        assert asyncio.run(attack.decrypt(ciphertext, iv)) == plaintext
+        assert attack.bytes_done == len(ciphertext)
+        assert attack.queries_per_byte < 30
+        
+        model = CandidateModel(prefixes=[b"CTF{"])
+        assert model.candidates(0)[0] == ord("C")
+        assert model.candidates(20, padding=[12])[0] == 12
+    
+    def test_network_connections(self):
+        """Test bloques repartidos entre varias conexiones con respuestas acabadas en prompt"""
+        server = LocalPaddingOracleServer(KEY, b"CTF{one_connection_per_block_pair}")
+        plugin = BlockCipherPlugin()
+        
+        async def scenario():
+            port = await server.start()
+            challenge = ChallengeData(
+                id="po_net", name="Prophecy", challenge_type=ChallengeType.NETWORK,
+                description="CBC padding oracle",
+                network_info=NetworkInfo(host="127.0.0.1", port=port),
+                metadata={'block_cipher': {'prompt': '> ', 'connections': 2}}
+            )
+            try:
+                return await plugin._padding_oracle_async(challenge, None)
+            finally:
+                await server.stop()
+        
+        result = asyncio.run(scenario())
+        
+        assert result.success is True
+        assert result.flag == "CTF{one_connection_per_block_pair}"
+        assert result.details['connections'] == 2
+        assert result.details['queries'] == server.queries
+        assert result.details['queries_per_byte'] < 40
+
+    def test_resume_after_disconnect(self, tmp_path):
+        """Test tras una desconexión el ataque sigue en el byte en que se quedó"""
+        plaintext = b"CTF{resume_where_the_connection_dropped}"
+        iv = os.urandom(16)
+        ciphertext = AES.new(KEY, AES.MODE_CBC, iv).encrypt(pad(plaintext, 16))
+        path = tmp_path / "state.sqlite"
+        
+        full = PaddingOracleAttack([LocalPaddingOracle(cbc_padding_oracle(KEY))])
+        asyncio.run(full.decrypt(ciphertext, iv))
+        
+        with AttackStateStore(path) as state:
+            first = PaddingOracleAttack([FlakyPaddingOracle(cbc_padding_oracle(KEY), limit=full.queries // 2)],
+                                        state=state)
+            with pytest.raises(ConnectionError):
+                asyncio.run(first.decrypt(ciphertext, iv))
+        
+        with AttackStateStore(path) as state:
+            second = PaddingOracleAttack([LocalPaddingOracle(cbc_padding_oracle(KEY))], state=state)
+            assert asyncio.run(second.decrypt(ciphertext, iv)) == plaintext
+            assert second.bytes_resumed == first.bytes_done
+            assert first.bytes_done + second.bytes_done == len(ciphertext)
+            assert second.queries < full.queries * 3 // 4
+            assert state.queries <= first.queries + second.queries
+    
+    def test_workers_claim_distinct_blocks(self, tmp_path):
+        """Test dos ataques sobre el mismo almacén se reparten los bloques sin repetirlos"""
+        plaintext = b"CTF{two_processes_share_one_attack_state_store}"
+        iv = os.urandom(16)
+        ciphertext = AES.new(KEY, AES.MODE_CBC, iv).encrypt(pad(plaintext, 16))
+        path = tmp_path / "state.sqlite"
+        
+        async def scenario():
+            with AttackStateStore(path) as a, AttackStateStore(path) as b:
+                attacks = [
+                    PaddingOracleAttack([FlakyPaddingOracle(cbc_padding_oracle(KEY))], state=state,
+                                        poll_interval=0.01)
+                    for state in (a, b)
+                ]
+                results = await asyncio.gather(*(attack.decrypt(ciphertext, iv) for attack in attacks))
+                return attacks, results
+        
+        attacks, results = asyncio.run(scenario())
+        
+        assert results == [plaintext, plaintext]
+        assert all(attack.blocks_done > 0 for attack in attacks)
+        assert sum(attack.blocks_done for attack in attacks) == len(ciphertext) // 16
+
+
+class TestBlockCipherPlugin:
+    """Tests para BlockCipherPlugin"""
+    
+    @pytest.fixture
+    def plugin(self):
+        return BlockCipherPlugin()
+    
+    def test_known_key_ecb(self, plugin, tmp_path):
+        """Test descifrado con clave del reto y ECB detectado por repetición"""
+        plaintext = b"A" * 48 + b"CTF{ecb_is_not_semantic}"
+        ciphertext = AES.new(KEY, AES.MODE_ECB).encrypt(pad(plaintext, 16))
+        path = tmp_path / "aes_task.txt"
+        path.write_text(f"key = {KEY.hex()}\nciphertext = {ciphertext.hex()}\n")
+        challenge = ChallengeData(
+            id="ecb_test", name="ECB Test", challenge_type=ChallengeType.BASIC_CRYPTO,
+            files=[FileInfo(path=path, size=path.stat().st_size)]
+        )
+        
+        assert plugin.can_solve(challenge) > 0.5
+        result = plugin.solve(challenge)
+        
+        assert result.success is True
+        assert result.flag == "CTF{ecb_is_not_semantic}"
+        assert result.method_used == "block_cipher:known_key"
+        assert result.details['mode'] == "ecb" and result.details['repeated_blocks'] == 2
+    
+    def test_network_oracle(self, plugin):
+        """Test ataque contra un servicio de cifrado por TCP"""
+        encrypt = ecb_oracle(KEY, SECRET, b"user=")
+        
+        async def handle(reader, writer):
+            writer.write(b"Encryption service, send hex\n")
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(encrypt(bytes.fromhex(line.strip().decode())).hex().encode() + b"\n")
+            writer.close()
+        
+        async def scenario():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            challenge = ChallengeData(
+                id="ecb_net", name="ECB oracle", challenge_type=ChallengeType.NETWORK,
+                network_info=NetworkInfo(host="127.0.0.1", port=server.sockets[0].getsockname()[1])
+            )
+            try:
+                return await plugin._byte_at_a_time_async(challenge, None)
+            finally:
+                server.close()
+                await server.wait_closed()
+        
+        result = asyncio.run(scenario())
+        
+        assert result.success is True
+        assert result.flag == SECRET.decode()
+        assert result.details['prefix_length'] == 5
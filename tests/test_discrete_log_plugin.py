@@ -0,0 +1,177 @@
+"""
+Tests para Discrete Log Plugin
+"""
+
+import hashlib
+import json
+import random
+
+import pytest
+from Crypto.Util.number import bytes_to_long
+
+from src.plugins.discrete_log.plugin import DiscreteLogPlugin
+from src.plugins.discrete_log.generic import GenericDLog, MultiplicativeGroup
+from src.plugins.discrete_log.zp_dlog import ZpDLogSolver
+from src.plugins.elliptic_curve.extension_field import ExtensionField
+from src.plugins.elliptic_curve.field_dlog import FieldDLog
+from src.plugins.discrete_log.index_calculus import IndexCalculus, rational_reconstruction, solve_sparse
+from src.models.data import ChallengeData, ChallengeType, FileInfo
+
+
+# p - 1 = 2 · 3 · 5 · ... · 47 · 19 (liso)
+SMOOTH_P = 11682905869181336791
+SMOOTH_FACTORS = [2, 3, 5, 7, 11, 13, 17, 19, 19, 23, 29, 31, 37, 41, 43, 47]
+# Primo seguro de 48 bits: p = 2q + 1
+SAFE_P = 140737488356903
+SAFE_Q = (SAFE_P - 1) // 2
+# Primo de 128 bits para exponentes cortos
+P128 = 2**127 - 1
+
+
+def _generator(p, factors):
+    return next(g for g in range(2, p) if all(pow(g, (p - 1) // f, p) != 1 for f in factors))
+
+
+class TestZpDLogSolver:
+    """Tests para los algoritmos de logaritmo discreto"""
+    
+    def test_pohlig_hellman_parallel(self):
+        """Test PH con subgrupos en varios procesos"""
+        g = _generator(SMOOTH_P, SMOOTH_FACTORS)
+        x = random.randrange(SMOOTH_P - 1)
+        solver = ZpDLogSolver(SMOOTH_P, workers=2)
+        
+        assert solver.pohlig_hellman(g, pow(g, x, SMOOTH_P), factors=SMOOTH_FACTORS) == x
+    
+    def test_pollard_rho(self):
+        """Test rho en un subgrupo de orden primo de 36 bits"""
+        q = 34359738421
+        p = 12 * q + 1
+        g = pow(2, 12, p)
+        x = random.randrange(q)
+        solver = ZpDLogSolver(p, max_table_entries=1 << 8)
+        
+        assert solver.pollard_rho(g, pow(g, x, p), q) == x
+    
+    def test_kangaroo_short_exponent(self):
+        """Test canguro con exponente de 36 bits en un grupo de 127 bits"""
+        x = random.getrandbits(36)
+        solver = ZpDLogSolver(P128, max_table_entries=1 << 8)
+        
+        assert solver.kangaroo(3, pow(3, x, P128), 0, 1 << 36) == x
+
+
+class TestGenericDLog:
+    """Tests para el motor genérico sobre grupos que no son Z_p*"""
+    
+    def test_field_pollard_rho(self):
+        """Test rho en el subgrupo de orden primo q de F_{p²}* con p = 4q - 1"""
+        q = 67109201
+        p = 4 * q - 1
+        field = ExtensionField(p, 2)
+        g = field.pow(field.random_element(), (p * p - 1) // q)
+        x = random.randrange(q)
+        solver = FieldDLog(field, max_table_entries=1 << 8)
+        
+        assert solver.pollard_rho(g, field.pow(g, x), q) == x
+    
+    def test_pohlig_hellman_bound(self):
+        """Test PH con un subgrupo fuera de presupuesto y el resto por canguro"""
+        p = SAFE_P
+        x = random.getrandbits(32)
+        solver = GenericDLog(MultiplicativeGroup(p), max_table_entries=1 << 8, max_operations=1 << 22)
+        
+        assert solver.pohlig_hellman(5, pow(5, x, p), p - 1, [2, SAFE_Q], bound=1 << 32) == x
+        assert solver.partial[1] == 2
+
+
+class TestIndexCalculus:
+    """Tests para el cálculo de índices"""
+    
+    def test_rational_reconstruction(self):
+        """Test a ≡ x·b (mod p) con a y b menores que √p"""
+        x = random.randrange(SAFE_P)
+        a, b = rational_reconstruction(x, SAFE_P)
+        
+        assert (a - x * b) % SAFE_P == 0
+        assert abs(a) <= 2**24 and abs(b) <= 2**24
+    
+    def test_solve_sparse(self):
+        """Test sistema disperso sobredeterminado mod q"""
+        q, n = 1000003, 30
+        x = [random.randrange(q) for _ in range(n)]
+        rows, rhs = [], []
+        for _ in range(40):
+            row = {c: random.randrange(1, q) for c in random.sample(range(n), 4)}
+            rows.append(row)
+            rhs.append(sum(v * x[c] for c, v in row.items()) % q)
+        
+        solution = solve_sparse(rows, rhs, q)
+        
+        assert solution and all(solution[c] == x[c] for c in solution)
+    
+    def test_discrete_log(self):
+        """Test logaritmo en el subgrupo de orden q de un primo seguro"""
+        x = random.randrange(SAFE_Q)
+        
+        assert IndexCalculus(SAFE_P, SAFE_Q).discrete_log(4, pow(4, x, SAFE_P)) == x
+
+
+class TestDiscreteLogPlugin:
+    """Tests para DiscreteLogPlugin"""
+    
+    @pytest.fixture
+    def plugin(self):
+        return DiscreteLogPlugin()
+    
+    def _challenge(self, tmp_path, content):
+        path = tmp_path / "dh.txt"
+        path.write_text(content)
+        return ChallengeData(
+            id="dlog_test",
+            name="DLog Test",
+            challenge_type=ChallengeType.MIXED,
+            files=[FileInfo(path=path, size=path.stat().st_size)]
+        )
+    
+    def test_pohlig_hellman_flag(self, plugin, tmp_path):
+        """Test flag en el exponente con p - 1 liso, parámetros en texto"""
+        g = _generator(SMOOTH_P, SMOOTH_FACTORS)
+        x = bytes_to_long(b"FLAG{ph}")
+        challenge = self._challenge(
+            tmp_path, f"# Diffie-Hellman\np = {SMOOTH_P}\ng = {g}\nh = {pow(g, x, SMOOTH_P)}\n"
+        )
+        
+        assert plugin.can_solve(challenge) > 0.5
+        result = plugin.solve(challenge)
+        
+        assert result.success is True
+        assert result.flag == "FLAG{ph}"
+        assert result.method_used == "discrete_log:pohlig_hellman"
+    
+    def test_short_exponent_shared_secret(self, plugin, tmp_path):
+        """Test exponente corto y flag cifrada por XOR con sha256 del secreto compartido"""
+        x, peer = random.getrandbits(32), random.randrange(2, P128)
+        shared = pow(peer, x, P128)
+        key = hashlib.sha256(str(shared).encode()).digest()
+        ciphertext = bytes(c ^ k for c, k in zip(b"CTF{short_x}", key)).hex()
+        params = {"p": P128, "g": 3, "A": pow(3, x, P128), "B": peer, "bits": 32, "ciphertext": ciphertext}
+        challenge = self._challenge(tmp_path, json.dumps(params))
+        
+        result = plugin._try_short_exponent(challenge)
+        
+        assert result.success is True
+        assert result.flag == "CTF{short_x}"
+        assert result.details['exponent'] == x
+    
+    def test_index_calculus_technique(self, plugin, tmp_path):
+        """Test primo seguro: PH se queda sin presupuesto y el cálculo de índices lo resuelve"""
+        plugin.max_operations = 1 << 10
+        x = random.randrange(SAFE_Q)
+        challenge = self._challenge(tmp_path, json.dumps({"p": SAFE_P, "g": 4, "h": pow(4, x, SAFE_P)}))
+        
+        assert plugin._try_pohlig_hellman(challenge).success is False
+        result = plugin._try_index_calculus(challenge)
+        
+        assert result.success is True
+        assert result.details['exponent'] % SAFE_Q == x
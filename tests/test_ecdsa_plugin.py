@@ -0,0 +1,197 @@
+"""
+Tests para ECDSA Plugin
+"""
+
+import hashlib
+import json
+import random
+
+import pytest
+from Crypto.Cipher import AES
+from Crypto.Util.number import bytes_to_long, long_to_bytes
+
+from src.plugins.ecdsa.plugin import ECDSAPlugin
+from src.plugins.ecdsa.lattice import lll_reduce, bkz_reduce
+from src.plugins.ecdsa.signatures import SignatureSet, reused_nonce_keys
+from src.plugins.ecdsa.hnp import HiddenNumberProblem
+from src.plugins.elliptic_curve.ec_arith import CurveArithmetic
+from src.models.data import ChallengeData, ChallengeType, FileInfo
+
+
+# secp256k1
+P = 2**256 - 2**32 - 977
+G = (0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+     0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8)
+N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+ARITH = CurveArithmetic(0, 7, P)
+
+
+def _sign(d, k, h):
+    """Firma ECDSA (r, s) con nonce k"""
+    r = ARITH.multiply(k, G)[0] % N
+    return r, pow(k, -1, N) * (h + r * d) % N
+
+
+def _norm2(v):
+    return sum(x * x for x in v)
+
+
+class TestLattice:
+    """Tests para la reducción LLL/BKZ"""
+    
+    def test_lll_finds_planted_vector(self):
+        """Test vector corto escondido en un retículo de mochila de 200 bits"""
+        dim, q = 8, random.getrandbits(200) | 1
+        x = [random.randrange(-5, 6) for _ in range(dim - 1)] + [1]
+        weights = [random.randrange(q) for _ in range(dim - 1)]
+        weights.append(-sum(w * c for w, c in zip(weights, x)) % q)
+        # Filas (e_i | w_i) y (0 | q): (x | 0) está en el retículo
+        rows = [[int(i == j) for j in range(dim)] + [w] for i, w in enumerate(weights)]
+        rows.append([0] * dim + [q])
+        
+        reduced = lll_reduce(rows)
+        
+        assert len(reduced) == dim + 1
+        assert 0 < _norm2(reduced[0]) <= _norm2(x)
+    
+    def test_bkz_not_worse_than_lll(self):
+        """Test BKZ mantiene la dimensión y no empeora el primer vector"""
+        rows = [[random.randrange(-2**40, 2**40) for _ in range(10)] for _ in range(10)]
+        lll = lll_reduce(rows)
+        bkz = bkz_reduce(rows, block_size=6)
+        
+        assert len(bkz) == 10
+        assert _norm2(bkz[0]) <= _norm2(lll[0])
+
+
+class TestSignatureSet:
+    """Tests para la lectura de volcados de firmas"""
+    
+    def test_formats(self, tmp_path):
+        """Test JSON lines, CSV con cabecera, clave = valor y documento JSON"""
+        (tmp_path / "a.jsonl").write_text('{"r": 5, "s": "0x7", "h": 11, "pubkey": [1, 2]}\n{"r": 6, "s": 8, "msg": "hola"}\n')
+        (tmp_path / "b.csv").write_text("r,s,z\n9,10,0xb\n")
+        (tmp_path / "c.txt").write_text("r = 12, s = 13, hash = 14\nbasura\n")
+        (tmp_path / "d.json").write_text(json.dumps({"signatures": [{"r": 15, "s": 16, "h": 17}]}, indent=2))
+        signatures = SignatureSet(N)
+        
+        counts = [signatures.read_file(tmp_path / name) for name in ["a.jsonl", "b.csv", "c.txt", "d.json"]]
+        
+        assert counts == [2, 1, 1, 1]
+        assert signatures.signature(0) == (5, 7, 11)
+        assert signatures.pubkey(0) == (1, 2) and signatures.pubkey(1) is None
+        assert signatures.signature(2) == (9, 10, 11)
+        assert signatures.signature(4) == (15, 16, 17)
+        assert signatures.column('r').shape == (5, 4)
+    
+    def test_repeated_nonces(self):
+        """Test índice de r con 10^4 firmas y grupos por clave"""
+        signatures = SignatureSet(N)
+        for i in range(10000):
+            signatures.add(random.randrange(1, N), random.randrange(1, N), i)
+        r = signatures.value('r', 1234)
+        signatures.add(r, 5, 6)
+        signatures.add(r, 7, 8, pubkey="02ab")
+        
+        assert signatures.repeated_nonces() == [[1234, 10000]]
+    
+    def test_reused_nonce_keys(self):
+        """Test d y k a partir de dos firmas con el mismo nonce"""
+        d, k = random.randrange(1, N), random.randrange(1, N)
+        r, s1 = _sign(d, k, 111)
+        _, s2 = _sign(d, k, 222)
+        
+        assert (d, k) in reused_nonce_keys(N, (r, s1, 111), (r, s2, 222))
+
+
+class TestHiddenNumberProblem:
+    """Tests para el ataque de retículo HNP"""
+    
+    @pytest.mark.parametrize("leak_type", ["bias", "msb", "lsb"])
+    def test_recover_key(self, leak_type):
+        """Test d a partir de nonces con 64 bits sesgados o conocidos"""
+        d = random.randrange(1, N)
+        hnp = HiddenNumberProblem(N)
+        for _ in range(8):
+            # r aleatorio: el HNP no usa la relación r = (k·G).x
+            k, h, r = random.randrange(1, N), random.randrange(N), random.randrange(1, N)
+            if leak_type == "bias":
+                k >>= 64
+            s = pow(k, -1, N) * (h + r * d) % N
+            if leak_type == "bias":
+                hnp.add_signature(r, s, h, nonce_bits=192)
+            elif leak_type == "msb":
+                hnp.add_signature(r, s, h, leak=k >> 192, leak_bits=64, nonce_bits=256)
+            else:
+                hnp.add_signature(r, s, h, leak=k & (2**64 - 1), leak_bits=64, leak_type="lsb")
+        
+        assert hnp.solve() == d
+
+
+class TestECDSAPlugin:
+    """Tests para ECDSAPlugin"""
+    
+    @pytest.fixture
+    def plugin(self):
+        return ECDSAPlugin()
+    
+    def _challenge(self, tmp_path, params, lines):
+        (tmp_path / "params.json").write_text(json.dumps(params))
+        (tmp_path / "sigs.jsonl").write_text("\n".join(json.dumps(line) for line in lines))
+        files = [tmp_path / "params.json", tmp_path / "sigs.jsonl"]
+        return ChallengeData(
+            id="ecdsa_test",
+            name="ECDSA Test",
+            challenge_type=ChallengeType.ELLIPTIC_CURVE,
+            files=[FileInfo(path=path, size=path.stat().st_size) for path in files]
+        )
+    
+    def test_nonce_reuse_technique(self, plugin, tmp_path):
+        """Test nonce repetido entre miles de firmas, comprobado con la clave pública"""
+        d = bytes_to_long(b"CTF{same_k}")
+        Q = ARITH.multiply(d, G)
+        lines = [{"r": random.randrange(1, N), "s": random.randrange(1, N), "h": i} for i in range(3000)]
+        k = random.randrange(1, N)
+        for h in (1001, 2002):
+            r, s = _sign(d, k, h)
+            lines.insert(random.randrange(len(lines)), {"r": hex(r), "s": hex(s), "h": h})
+        challenge = self._challenge(tmp_path, {"curve": "secp256k1", "Q": list(Q)}, lines)
+        
+        assert plugin.can_solve(challenge) > 0.5
+        result = plugin._try_nonce_reuse(challenge)
+        
+        assert result.success is True
+        assert result.flag == "CTF{same_k}"
+        assert result.details['private_key'] == d
+    
+    def test_nonce_reuse_encrypted_flag(self, plugin, tmp_path):
+        """Test flag cifrada con AES-CBC y clave sha256 de la clave privada recuperada"""
+        d = random.randrange(1, N)
+        k = random.randrange(1, N)
+        lines = [dict(zip(("r", "s"), _sign(d, k, h)), h=h) for h in (7, 8)]
+        key, iv = hashlib.sha256(long_to_bytes(d)).digest()[:16], bytes(16)
+        ciphertext = AES.new(key, AES.MODE_CBC, iv).encrypt(b"CTF{aes_with_d}".ljust(16, b"\x01"))
+        params = {"curve": "secp256k1", "ciphertext": ciphertext.hex(), "iv": iv.hex()}
+        challenge = self._challenge(tmp_path, params, lines)
+        
+        result = plugin._try_nonce_reuse(challenge)
+        
+        assert result.success is True
+        assert result.flag == "CTF{aes_with_d}"
+    
+    def test_hnp_technique(self, plugin, tmp_path):
+        """Test HNP con los 64 bits altos de cada nonce filtrados"""
+        d = random.randrange(1, N)
+        lines = []
+        for h in range(10):
+            k = random.randrange(1, N)
+            r, s = _sign(d, k, h)
+            lines.append({"r": r, "s": s, "h": h, "leak": k >> 192})
+        params = {"curve": "secp256k1", "leak_bits": 64, "leak_type": "msb"}
+        challenge = self._challenge(tmp_path, params, lines)
+        
+        result = plugin.solve(challenge)
+        
+        assert result.success is True
+        assert result.method_used == "ecdsa:hnp_lattice"
+        assert result.details['private_key'] == d
@@ -0,0 +1,626 @@
+"""
+Tests para Elliptic Curve Plugin
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+from Crypto.Cipher import AES
+from Crypto.Util.Padding import pad
+
+from src.plugins.elliptic_curve.plugin import EllipticCurve, EllipticPoint, EllipticCurvePlugin
+from src.plugins.elliptic_curve.ec_arith import CurveArithmetic
+from src.plugins.elliptic_curve.ecdlp import ECDLPSolver
+from src.plugins.elliptic_curve.point_counting import PointCounter, cached_order, curve_order
+from src.plugins.elliptic_curve.smart import smart_attack
+from src.plugins.elliptic_curve.extension_field import ExtensionField, embedding_degree
+from src.plugins.elliptic_curve.pairing import ExtensionCurve
+from src.plugins.elliptic_curve.mov import mov_attack
+from src.plugins.elliptic_curve.singular import SingularCurve
+from src.plugins.elliptic_curve.invalid_curve import InvalidCurveAttack, torsion_points
+from src.plugins.elliptic_curve.curve_catalog import CurveCatalog, FixedBaseTable, default_catalog
+from src.models.data import ChallengeData, ChallengeType, FileInfo
+from tests.datasets.local_oracles import LocalScalarOracle
+
+
+# secp256k1 (a = 0) y P-256 (a = -3)
+SECP256K1 = (
+    0, 7, 2**256 - 2**32 - 977,
+    (0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+     0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8),
+    0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+)
+P256 = (
+    -3, 0x5AC635D8AA3A93E7B3EBBD55769886BC651D06B0CC53B0F63BCE3C3E27D2604B,
+    2**256 - 2**224 + 2**192 + 2**96 - 1,
+    (0x6B17D1F2E12C4247F8BCE6E563A440F277037D812DEB33A0F4A13945D898C296,
+     0x4FE342E2FE1A7F9B8EE7EB4A7C0F9E162BCE33576B315ECECBB6406837BF51F5),
+    0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551
+)
+# Curva de 32 bits con generador de orden primo
+SMALL_CURVE = (99195379, 881391734, 2228963059, (1553714997, 172719997), 2228918317)
+# y² = x³ + 7 con p ≡ 2 (mod 3): supersingular de orden p + 1 suave
+SMOOTH_CURVE = (0, 7, 106219484232639500189, (6, 823702209846504814), 106219484232639500190)
+
+# y² = x³ + 2 con 4p = 1 + 3v²: anómala (#E = p) de 256 bits
+ANOMALOUS_CURVE = (
+    0, 2, 0x35732ddfbfe98e40ef4dd80c6273538e1dbf5a99a8ffe566bd9bc0f6cee9046b,
+    (16379138760282937307882492402610730580559501364606579476551729496318036175168,
+     12012187371980871455957897641969289143639525872465594562352262860198427355211),
+    0x35732ddfbfe98e40ef4dd80c6273538e1dbf5a99a8ffe566bd9bc0f6cee9046b
+)
+
+# y² = x³ + 1 con p = 6q - 1: supersingular, G de orden primo q y grado de inclusión 2
+SUPERSINGULAR_CURVE = (0, 1, 14940179417, (12193540662, 14727384553), 2490029903)
+
+
+def _affine_multiply(k, point, a, p):
+    """Referencia: doble y suma en afín con una inversión por operación"""
+    def add(P, Q):
+        if P is None:
+            return Q
+        if Q is None:
+            return P
+        if P[0] == Q[0] and (P[1] + Q[1]) % p == 0:
+            return None
+        if P == Q:
+            slope = (3 * P[0] ** 2 + a) * pow(2 * P[1], -1, p) % p
+        else:
+            slope = (Q[1] - P[1]) * pow(Q[0] - P[0], -1, p) % p
+        x = (slope * slope - P[0] - Q[0]) % p
+        return (x, (slope * (P[0] - x) - P[1]) % p)
+    
+    result = None
+    while k:
+        if k & 1:
+            result = add(result, point)
+        point = add(point, point)
+        k >>= 1
+    return result
+
+
+class TestCurveArithmetic:
+    """Tests para la aritmética jacobiana"""
+    
+    @pytest.mark.parametrize("params", [SECP256K1, P256], ids=["secp256k1", "p256"])
+    def test_multiply_matches_affine(self, params):
+        """Test wNAF y escalera de Montgomery contra la referencia afín"""
+        a, b, p, G, n = params
+        arith = CurveArithmetic(a, b, p)
+        
+        for k in [1, 2, 3, 7, random.randrange(1, n)]:
+            expected = _affine_multiply(k, G, a % p, p)
+            assert arith.multiply(k, G) == expected
+            assert arith.multiply(k, G, ladder=True) == expected
+            for w in (2, 4, 6):
+                assert arith.to_affine(arith.multiply_wnaf(k, G, w=w)) == expected
+        
+        # El orden del generador anula el punto
+        assert arith.multiply(n, G) is None
+        assert arith.multiply(-1, G) == arith.negate(G)
+    
+    def test_wnaf_digits(self):
+        """Test reconstrucción y no adyacencia de la forma wNAF"""
+        for k in [1, 255, 0xDEADBEEF, random.getrandbits(256)]:
+            for w in (2, 3, 5):
+                digits = CurveArithmetic.wnaf(k, w)
+                assert sum(d << i for i, d in enumerate(digits)) == k
+                assert all(d % 2 == 1 and abs(d) < 1 << (w - 1) for d in digits if d)
+                nonzero = [i for i, d in enumerate(digits) if d]
+                assert all(j - i >= w for i, j in zip(nonzero, nonzero[1:]))
+    
+    def test_batch_to_affine(self):
+        """Test normalización por lotes con puntos en el infinito"""
+        a, b, p, G, n = SECP256K1
+        arith = CurveArithmetic(a, b, p)
+        scalars = [0, 1, 2, 5, n, 12345]
+        
+        points = [arith.multiply_wnaf(k, G) for k in scalars]
+        assert arith.batch_to_affine(points) == [arith.to_affine(P) for P in points]
+
+
+class TestEllipticCurve:
+    """Tests para EllipticCurve y EllipticPoint"""
+    
+    @pytest.fixture
+    def curve(self):
+        return EllipticCurve(2, 3, 97)
+    
+    def test_singular_curve_rejected(self):
+        """Test rechazo de curva singular"""
+        with pytest.raises(ValueError):
+            EllipticCurve(0, 0, 97)
+        assert EllipticCurve(0, 0, 97, allow_singular=True).is_singular
+    
+    def test_group_operations(self, curve):
+        """Test suma, duplicación y negación con la API de EllipticPoint"""
+        P = EllipticPoint(3, 6, curve)
+        assert curve.is_on_curve(P)
+        
+        assert curve.add_points(P, P) == curve.scalar_multiply(2, P)
+        assert curve.add_points(P, curve.scalar_multiply(-1, P)).is_infinity
+        assert curve.add_points(P, EllipticPoint.infinity()) == P
+        assert curve.scalar_multiply(5, P) == curve.scalar_multiply(5, P, ladder=True)
+    
+    def test_point_order(self, curve):
+        """Test orden de punto"""
+        P = EllipticPoint(3, 6, curve)
+        order = curve.point_order(P)
+        
+        assert order is not None
+        assert curve.scalar_multiply(order, P).is_infinity
+        assert all(not curve.scalar_multiply(k, P).is_infinity for k in range(1, order))
+
+
+
+class TestECDLPSolver:
+    """Tests para el motor de logaritmo discreto"""
+    
+    @pytest.fixture
+    def setup(self):
+        a, b, p, G, n = SMALL_CURVE
+        arith = CurveArithmetic(a, b, p)
+        k = random.randrange(1, n)
+        return arith, G, n, k, arith.multiply(k, G)
+    
+    def test_bsgs(self, setup):
+        """Test baby-step giant-step completo y con desplazamiento"""
+        arith, G, n, k, Q = setup
+        assert ECDLPSolver(arith, workers=1).bsgs(G, Q, n) == k
+        assert ECDLPSolver(arith, workers=1).bsgs(G, Q, 1 << 20, offset=k - 1000) == k
+    
+    def test_pollard_rho(self, setup):
+        """Test Pollard rho con puntos distinguidos"""
+        arith, G, n, k, Q = setup
+        solver = ECDLPSolver(arith, workers=1)
+        assert solver.pollard_rho(G, Q, n) == k
+        assert solver.operations > 0
+    
+    def test_pollard_rho_processes(self, setup):
+        """Test Pollard rho repartido entre procesos"""
+        arith, G, n, k, Q = setup
+        assert ECDLPSolver(arith, workers=2).pollard_rho(G, Q, n) == k
+    
+    def test_kangaroo(self, setup):
+        """Test canguro en un intervalo acotado"""
+        arith, G, n, k, Q = setup
+        solver = ECDLPSolver(arith, workers=1, max_table_entries=1 << 4)
+        lo = max(0, k - (1 << 22))
+        assert solver.kangaroo(G, Q, lo, lo + (1 << 23)) == k
+    
+    def test_kangaroo_outside_interval(self, setup):
+        """Test que el canguro se detiene si el logaritmo no está en el intervalo"""
+        arith, G, n, k, Q = setup
+        solver = ECDLPSolver(arith, workers=1, max_table_entries=1 << 4, max_operations=1 << 22)
+        lo = k + (1 << 22)
+        assert solver.kangaroo(G, Q, lo, lo + (1 << 23)) is None
+        assert solver.operations < 1 << 20
+    
+    def test_budget_exhausted(self, setup):
+        """Test que el presupuesto de operaciones detiene la búsqueda"""
+        arith, G, n, k, Q = setup
+        solver = ECDLPSolver(arith, workers=1, max_operations=1 << 10)
+        assert solver.pollard_rho(G, Q, n) in (None, k)
+    
+    def test_pohlig_hellman_stops_at_deadline(self):
+        """Test que el checkpoint y la hora límite llegan a los subgrupos de Pohlig-Hellman"""
+        a, b, p, G, n = SMOOTH_CURVE
+        arith = CurveArithmetic(a, b, p)
+        Q = arith.multiply(random.randrange(n), G)
+        
+        def checkpoint():
+            raise TimeoutError()
+        
+        with pytest.raises(TimeoutError):
+            ECDLPSolver(arith, workers=1, checkpoint=checkpoint).pohlig_hellman(G, Q, n)
+        assert ECDLPSolver(arith, workers=1, deadline=time.time() - 1).pohlig_hellman(G, Q, n) is None
+    
+    def test_pohlig_hellman(self):
+        """Test Pohlig-Hellman con orden suave"""
+        a, b, p, G, n = SMOOTH_CURVE
+        arith = CurveArithmetic(a, b, p)
+        d = random.randrange(n)
+        Q = arith.multiply(d, G)
+        
+        k = ECDLPSolver(arith, workers=1).pohlig_hellman(G, Q, n)
+        assert arith.multiply(k, G) == Q
+    
+    def test_pohlig_hellman_partial_with_bound(self):
+        """Test Pohlig-Hellman parcial completado con canguro sobre la cota"""
+        a, b, p, G, n = SMOOTH_CURVE
+        arith = CurveArithmetic(a, b, p)
+        d = random.randrange(n)
+        Q = arith.multiply(d, G)
+        
+        # El factor 65537 queda fuera de presupuesto
+        solver = ECDLPSolver(arith, workers=1, max_operations=200)
+        k = solver.pohlig_hellman(G, Q, n, bound=n)
+        
+        assert arith.multiply(k, G) == Q
+        residue, modulus = solver.partial
+        assert modulus % 65537 != 0 and (k - residue) % modulus == 0
+    
+    def test_smart_attack(self):
+        """Test ataque de Smart en una curva anómala de 256 bits"""
+        a, b, p, G, n = ANOMALOUS_CURVE
+        arith = CurveArithmetic(a, b, p)
+        d = random.randrange(1, n)
+        Q = arith.multiply(d, G)
+        
+        assert smart_attack(arith, G, Q) == d
+        assert ECDLPSolver(arith, workers=1).solve(G, Q, n) == d
+        assert smart_attack(arith, G, None) == 0
+    
+    def test_point_order(self, setup):
+        """Test orden de punto por BSGS"""
+        arith, G, n, k, Q = setup
+        solver = ECDLPSolver(arith, workers=1)
+        assert solver.point_order(G, arith.p + 1 + 2 * 65536) == n
+        assert solver.point_order(G, 1000) is None
+
+
+class TestPointCounting:
+    """Tests para el conteo de puntos"""
+    
+    @staticmethod
+    def _brute_force_order(a, b, p):
+        roots = {}
+        for y in range(p):
+            roots[y * y % p] = roots.get(y * y % p, 0) + 1
+        return 1 + sum(roots.get((x ** 3 + a * x + b) % p, 0) for x in range(p))
+    
+    @pytest.mark.parametrize("a,b,p", [(2, 3, 97), (1, 1, 10007), (0, 7, 10007), (-3, 11, 100003)])
+    def test_methods_agree(self, a, b, p):
+        """Test Legendre vectorizado, Mestre y Schoof completo contra el recuento directo"""
+        expected = self._brute_force_order(a % p, b % p, p)
+        counter = PointCounter(a, b, p, bsgs_range=0)
+        
+        assert counter.count('naive') == expected
+        assert counter.count('schoof') == expected
+        if p > 229:
+            assert counter.count('mestre') == expected
+    
+    def test_prime_order_curve(self):
+        """Test Mestre y Schoof en la curva de 32 bits de orden primo"""
+        a, b, p, G, n = SMALL_CURVE
+        assert PointCounter(a, b, p).count() == n
+        assert PointCounter(a, b, p, bsgs_range=0).count('schoof') == n
+    
+    def test_schoof_with_bsgs_and_cache(self):
+        """Test Schoof + BSGS por encima del límite de Mestre y caché por (p, a, b)"""
+        a, b, p, G, n = SMOOTH_CURVE
+        assert p > PointCounter.MESTRE_LIMIT
+        
+        # La curva está en el catálogo: contar explícitamente para pasar por Schoof
+        assert curve_order(a, b, p) == p + 1
+        assert cached_order(a, b, p) == p + 1
+        curve = EllipticCurve(a, b, p)
+        assert curve.order() == p + 1
+        assert curve.has_order(p + 1) and not curve.has_order(p)
+
+
+class TestPairings:
+    """Tests para F_{p^k}, emparejamientos y reducción MOV"""
+    
+    @pytest.mark.parametrize("k", [2, 3, 6, 12])
+    def test_extension_field(self, k):
+        """Test inverso, raíz cuadrada y Frobenius en F_{p^k}"""
+        F = ExtensionField(10007, k)
+        assert ExtensionField.is_irreducible(F.modulus, F.p)
+        
+        x = F.random_element()
+        assert F.mul(x, F.inverse(x)) == F.one
+        assert F.square(F.sqrt(F.square(x))) == F.square(x)
+        assert F.pow(x, F.p ** k) == x
+    
+    def test_pairings_bilinear(self):
+        """Test bilinealidad y no degeneración de Weil y Tate"""
+        a, b, p, G, q = SUPERSINGULAR_CURVE
+        assert embedding_degree(p, q) == 2
+        
+        F = ExtensionField(p, 2)
+        curve = ExtensionCurve(a, b, F)
+        P = curve.lift(G)
+        # #E(F_{p²}) = (p + 1)²
+        R = curve.multiply((p + 1) // q, curve.random_point())
+        assert curve.multiply(q, R) is None
+        
+        x, y = random.randrange(1, q), random.randrange(1, q)
+        for pairing in (curve.weil_pairing, curve.tate_pairing):
+            e = pairing(P, R, q)
+            assert e != F.one and F.pow(e, q) == F.one
+            assert pairing(curve.multiply(x, P), curve.multiply(y, R), q) == F.pow(e, x * y)
+    
+    def test_mov_attack(self):
+        """Test reducción MOV con grado de inclusión 2"""
+        a, b, p, G, q = SUPERSINGULAR_CURVE
+        arith = CurveArithmetic(a, b, p)
+        d = random.randrange(1, q)
+        
+        assert mov_attack(arith, G, arith.multiply(d, G), q) == d
+
+
+class TestSingularCurve:
+    """Tests para el logaritmo en curvas singulares"""
+    
+    P = 1000003  # p ≡ 3 (mod 4)
+    
+    @classmethod
+    def _node(cls, x0):
+        """(x - x0)²(x + 2x0) = x³ - 3x0²·x + 2x0³"""
+        return -3 * x0 * x0 % cls.P, 2 * x0 ** 3 % cls.P
+    
+    @classmethod
+    def _random_point(cls, a, b):
+        p = cls.P
+        while True:
+            x = random.randrange(p)
+            rhs = (x ** 3 + a * x + b) % p
+            if rhs and pow(rhs, (p - 1) // 2, p) == 1:
+                return (x, pow(rhs, (p + 1) // 4, p))
+    
+    @pytest.mark.parametrize("x0,kind,k", [(0, "cusp", None), (3, "node", 1), (1, "node", 2)])
+    def test_discrete_log(self, x0, kind, k):
+        """Test cúspide en (F_p, +) y nodos en F_p* y F_{p²}*"""
+        a, b = self._node(x0)
+        group = SingularCurve(a, b, self.P)
+        assert group.kind == kind
+        assert (group.field.k if group.field else None) == k
+        
+        G = self._random_point(a, b)
+        d = random.randrange(1, self.P)
+        Q = group.arith.multiply(d, G)
+        
+        assert group.arith.multiply(group.discrete_log(G, Q), G) == Q
+        with pytest.raises(ValueError):
+            group.to_group(group.singular_point)
+
+
+class TestInvalidCurve:
+    """Tests para el ataque de curva inválida"""
+    
+    @pytest.mark.parametrize("l", [2, 3, 5, 7])
+    def test_torsion_points(self, l):
+        """Test puntos de orden ℓ a partir de ψ_ℓ en curvas b' = 1..30"""
+        a, _, p, _, _ = SMALL_CURVE
+        found = 0
+        for b in range(1, 31):
+            arith = CurveArithmetic(a, b, p)
+            for P in torsion_points(a, b, p, l):
+                assert arith.is_on_curve(P) and arith.multiply(l, P) is None
+                found += 1
+        assert found > 0
+    
+    def test_recover_with_oracle(self):
+        """Test d completo por CRT con los órdenes de las curvas inválidas contados"""
+        a, b, p, _, n = SMALL_CURVE
+        d = random.randrange(1, n)
+        oracle = LocalScalarOracle(a, p, d)
+        attack = InvalidCurveAttack(a, b, p, workers=2)
+        
+        residue, modulus = asyncio.run(attack.run(oracle, n))
+        
+        assert modulus >= n
+        assert residue == d
+        assert 0 < oracle.queries
+    
+    def test_residue_with_order_multiple(self):
+        """Test que un múltiplo del orden (factorización incompleta) no da un módulo sin resolver"""
+        a, b, p, _, n = SMALL_CURVE
+        d = random.randrange(1, n)
+        attack = InvalidCurveAttack(a, b, p, workers=1)
+        _, P, power = max(attack.select(attack.scan(range(2, 40))), key=lambda item: item[2])
+        q = 12037 if power % 12037 else 18517
+        R = CurveArithmetic(a, 0, p).multiply(d, P)
+        
+        assert attack.residue_from_pair(P, R, order=power * q) == (d % power, power)
+    
+    def test_recover_without_counting(self):
+        """Test residuos con puntos de ψ_ℓ cuando p es demasiado grande para contar"""
+        a, b, p, _, n = SMALL_CURVE
+        d = random.randrange(1, n)
+        attack = InvalidCurveAttack(a, b, p, workers=1, count_bits=0, max_torsion_prime=13)
+        
+        residue, modulus = asyncio.run(attack.run(LocalScalarOracle(a, p, d), 30030))
+        
+        assert modulus == 30030
+        assert residue == d % modulus
+
+
+class TestCurveCatalog:
+    """Tests para el catálogo de curvas y las tablas de base fija"""
+    
+    def test_lookup_and_aliases(self):
+        """Test búsqueda por (p, a, b), con a y b sin reducir, y por alias"""
+        catalog = CurveCatalog()
+        p256 = catalog.by_name("secp256r1")
+        
+        assert p256 is catalog.by_name("P-256")
+        assert catalog.lookup(p256.p, p256.a - p256.p, p256.b + p256.p) is p256
+        assert catalog.lookup(p256.p, p256.a, p256.b + 1) is None
+    
+    def test_generators(self):
+        """Test generadores en la curva y n·G = O para todas las entradas"""
+        for entry in CurveCatalog():
+            if entry.G:
+                arith = CurveArithmetic(entry.a, entry.b, entry.p)
+                assert arith.is_on_curve(entry.G), entry.name
+                assert arith.multiply(entry.n, entry.G) is None, entry.name
+    
+    def test_fixed_base_table(self, tmp_path):
+        """Test k·G con la tabla igual a wNAF, y tabla guardada y releída de disco"""
+        catalog = CurveCatalog(table_dir=tmp_path)
+        entry = catalog.by_name("secp256k1")
+        arith = CurveArithmetic(entry.a, entry.b, entry.p)
+        table = catalog.fixed_base_table(entry, arith)
+        
+        for k in [0, 1, -5, entry.n - 1, entry.n, random.randrange(entry.n), random.getrandbits(300)]:
+            assert table.multiply(k) == arith.to_affine(arith.multiply_wnaf(k % entry.n, entry.G))
+        
+        assert list(tmp_path.iterdir())
+        reloaded = FixedBaseTable(arith, entry.G, entry.n.bit_length(), order=entry.n, path=table.path)
+        assert reloaded._load() == table.rows
+    
+    def test_curve_uses_fixed_base(self):
+        """Test EllipticCurve con orden del catálogo y tabla para el generador"""
+        entry = default_catalog().by_name("P-256")
+        curve = EllipticCurve(entry.a, entry.b, entry.p)
+        k = random.randrange(entry.n)
+        
+        assert curve.known_order() == entry.n
+        assert curve.arith.multiply(k, entry.G) == _affine_multiply(k, entry.G, entry.a, entry.p)
+
+
+class TestEllipticCurvePlugin:
+    """Tests para EllipticCurvePlugin"""
+    
+    @pytest.fixture
+    def plugin(self):
+        plugin = EllipticCurvePlugin()
+        plugin.ecdlp_workers = 1
+        return plugin
+    
+    def _challenge(self, data):
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as tmp:
+            json.dump(data, tmp)
+        path = Path(tmp.name)
+        return ChallengeData(
+            id="ecc_test",
+            name="ECC Test",
+            challenge_type=ChallengeType.ELLIPTIC_CURVE,
+            files=[FileInfo(path=path, size=path.stat().st_size)]
+        )
+    
+    def test_discrete_log_technique(self, plugin):
+        """Test recuperación de la clave privada sin orden conocido"""
+        a, b, p, G, n = SMALL_CURVE
+        d = random.randrange(1, n)
+        Q = CurveArithmetic(a, b, p).multiply(d, G)
+        challenge = self._challenge({'a': a, 'b': b, 'p': p, 'G': list(G), 'Q': list(Q)})
+        
+        result = plugin._try_discrete_log(challenge)
+        
+        assert result.success is True
+        assert result.details['private_key'] == d
+    
+    def test_smart_attack_technique(self, plugin):
+        """Test detección de curva anómala y recuperación de la clave"""
+        a, b, p, G, n = ANOMALOUS_CURVE
+        d = random.randrange(1, n)
+        Q = CurveArithmetic(a, b, p).multiply(d, G)
+        challenge = self._challenge({'a': a, 'b': b, 'p': p, 'G': list(G), 'Q': list(Q)})
+        
+        assert plugin._try_weak_curve_detection(challenge).details['weakness'] == "anomalous"
+        result = plugin._try_smart_attack(challenge)
+        
+        assert result.success is True
+        assert result.details['private_key'] == d
+    
+    def test_mov_technique_runs_first(self, plugin):
+        """Test grado de inclusión calculado de entrada y reducción MOV sin orden dado"""
+        a, b, p, G, q = SUPERSINGULAR_CURVE
+        d = random.randrange(1, q)
+        Q = CurveArithmetic(a, b, p).multiply(d, G)
+        challenge = self._challenge({'a': a, 'b': b, 'p': p, 'G': list(G), 'Q': list(Q)})
+        
+        assert next(iter(plugin._get_ordered_techniques(challenge))) == "mov_attack"
+        result = plugin._try_mov_attack(challenge)
+        
+        assert result.success is True
+        assert result.details['private_key'] == d
+        assert result.details['embedding_degree'] == 2
+    
+    def test_singular_curve_technique(self, plugin):
+        """Test curva singular resuelta antes que el resto de técnicas"""
+        a, b = TestSingularCurve._node(5)
+        p = TestSingularCurve.P
+        G = TestSingularCurve._random_point(a, b)
+        Q = CurveArithmetic(a, b, p).multiply(4242, G)
+        challenge = self._challenge({'a': a, 'b': b, 'p': p, 'G': list(G), 'Q': list(Q)})
+        
+        assert next(iter(plugin._get_ordered_techniques(challenge))) == "singular_curve"
+        result = plugin._try_singular_curve(challenge)
+        
+        assert result.success is True
+        assert result.details['singularity'] == "node"
+        assert CurveArithmetic(a, b, p).multiply(result.details['private_key'], G) == Q
+    
+    def test_invalid_curve_from_samples(self, plugin):
+        """Test curva inválida offline con pares (P, d·P) filtrados"""
+        a, b, p, G, n = SMALL_CURVE
+        d = random.randrange(1, n)
+        attack = InvalidCurveAttack(a, b, p, workers=1)
+        points = [P for _, P, _ in attack.select(attack.scan(range(2, 40)))]
+        oracle = LocalScalarOracle(a, p, d)
+        samples = [{'P': list(P), 'dP': list(R) if R else None}
+                   for P, R in zip(points, asyncio.run(oracle.query_many(points)))]
+        Q = CurveArithmetic(a, b, p).multiply(d, G)
+        challenge = self._challenge({
+            'a': a, 'b': b, 'p': p, 'n': n, 'G': list(G), 'Q': list(Q), 'samples': samples
+        })
+        
+        result = plugin._try_invalid_curve_attack(challenge)
+        
+        assert result.success is True
+        assert result.details['private_key'] == d
+    
+    def test_weak_curve_detection_by_order(self, plugin):
+        """Test detección de curva supersingular de tamaño real"""
+        a, b, p, G, n = SMOOTH_CURVE
+        challenge = self._challenge({'a': a, 'b': b, 'p': p})
+        
+        result = plugin._try_weak_curve_detection(challenge)
+        
+        assert result.success is True
+        assert result.details['weakness'] == "supersingular"
+    
+    def test_weak_curve_detection_skips_schoof(self, plugin):
+        """Test la detección no cuenta puntos con Schoof en curvas grandes"""
+        a, b, p = 2, 3, 2 ** 107 - 1
+        challenge = self._challenge({'a': a, 'b': b, 'p': p})
+        
+        assert plugin._try_weak_curve_detection(challenge).success is False
+        assert cached_order(a, b, p) is None
+    
+    def test_pohlig_hellman_decrypts_shared_secret(self, plugin):
+        """Test Pohlig-Hellman y descifrado AES con el secreto compartido ECDH"""
+        a, b, p, G, n = SMOOTH_CURVE
+        arith = CurveArithmetic(a, b, p)
+        d, other = random.randrange(2, n), random.randrange(2, n)
+        A, B = arith.multiply(d, G), arith.multiply(other, G)
+        shared = arith.multiply(other, A)[0]
+        
+        iv = bytes(range(16))
+        key = hashlib.sha1(str(shared).encode()).digest()[:16]
+        ciphertext = AES.new(key, AES.MODE_CBC, iv).encrypt(pad(b"CTF{smooth_order_ph}", 16))
+        challenge = self._challenge({
+            'a': a, 'b': b, 'p': p, 'n': n, 'G': list(G), 'Q': list(A), 'B': list(B),
+            'iv': iv.hex(), 'ciphertext': ciphertext.hex()
+        })
+        
+        result = plugin._try_pohlig_hellman(challenge)
+        
+        assert result.success is True
+        assert result.flag == "CTF{smooth_order_ph}"
+        assert 65537 in result.details['smooth_factors']
+    
+    def test_weak_curve_detection_from_catalog(self, plugin):
+        """Test curva débil y curva estándar reconocidas por búsqueda en el catálogo"""
+        weak = default_catalog().by_name("smooth_criminal")
+        standard = default_catalog().by_name("secp256k1")
+        
+        result = plugin._try_weak_curve_detection(self._challenge({'a': weak.a, 'b': weak.b, 'p': weak.p}))
+        assert result.success is True
+        assert result.details['curve_name'] == "smooth_criminal"
+        assert result.details['order_factors'] == weak.order_factors
+        
+        challenge = self._challenge({'a': standard.a, 'b': standard.b, 'p': standard.p})
+        result = plugin._try_weak_curve_detection(challenge)
+        assert result.success is False
+        assert result.details['curve_name'] == "secp256k1"
@@ -0,0 +1,192 @@
+"""
+Tests para Hash Cracking Plugin
+"""
+
+import hashlib
+
+import pytest
+
+from src.plugins.hash_cracking.plugin import HashCrackingPlugin
+from src.plugins.hash_cracking.identify import find_hashes, identify_hash
+from src.plugins.hash_cracking.rules import Mask, expand
+from src.plugins.hash_cracking.engine import HashCracker, wordlist_chunks
+from src.plugins.hash_cracking.lookup_tables import LookupTables
+from src.models.data import ChallengeData, ChallengeType, FileInfo
+
+
+WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel"] * 50 + ["dragon", "monkey"]
+
+
+class TestIdentify:
+    """Tests para la identificación de digests"""
+    
+    def test_identify_by_length_and_name(self):
+        """Test candidatos por longitud y preferencia por el algoritmo nombrado"""
+        assert identify_hash("a" * 32) == ["md5"]
+        assert identify_hash("a" * 64) == ["sha256", "sha3_256", "blake2s"]
+        assert identify_hash("a" * 64, "h = sha3_256(secret)") == ["sha3_256"]
+    
+    def test_find_hashes(self):
+        """Test digests en texto, sin crypt ni repetidos"""
+        md5 = hashlib.md5(b"x").hexdigest()
+        text = f"h1 = {md5}\nh2 = {md5.upper()}\n$2b$12${'a' * 53}\n"
+        
+        assert find_hashes(text) == {"md5": [md5]}
+
+
+class TestRules:
+    """Tests para reglas y máscaras"""
+    
+    def test_expand(self):
+        """Test reglas por defecto sin repetidos"""
+        candidates = expand(b"secret")
+        
+        assert b"Secret" in candidates and b"SECRET" in candidates
+        assert b"53cr37" in candidates and b"secret7" in candidates and b"secret42" in candidates
+        assert len(candidates) == len(set(candidates))
+    
+    def test_mask_range(self):
+        """Test rango de la máscara igual a la enumeración completa"""
+        mask = Mask("CTF{?d?l}")
+        every = [mask.candidate(i) for i in range(mask.keyspace)]
+        
+        assert mask.keyspace == 260
+        assert every[0] == b"CTF{0a}" and every[-1] == b"CTF{9z}"
+        assert list(mask.iter_range(25, 60)) == every[25:60]
+
+
+class TestHashCracker:
+    """Tests para el motor de cracking"""
+    
+    @pytest.fixture
+    def wordlist(self, tmp_path):
+        path = tmp_path / "words.txt"
+        path.write_text("\n".join(WORDS) + "\n")
+        return path
+    
+    def test_wordlist_chunks(self, wordlist):
+        """Test trozos contiguos alineados a fin de línea"""
+        chunks = wordlist_chunks(wordlist, 100)
+        data = wordlist.read_bytes()
+        
+        assert chunks[0][0] == 0 and chunks[-1][1] == len(data)
+        assert all(a[1] == b[0] and data[a[1] - 1:a[1]] == b"\n" for a, b in zip(chunks, chunks[1:]))
+    
+    def test_many_targets_parallel(self, wordlist):
+        """Test varios digests y algoritmos a la vez con varios procesos"""
+        targets = {
+            "md5": [hashlib.md5(b"Dragon").hexdigest(), hashlib.md5(b"nothere").hexdigest()],
+            "sha1": [hashlib.sha1(b"m0nk3y").hexdigest()],
+            "sha256": [hashlib.sha256(b"golf42").hexdigest()]
+        }
+        cracker = HashCracker(targets, workers=2, chunk_size=256)
+        
+        found = cracker.crack_wordlist(wordlist)
+        
+        assert sorted(found.values()) == ["Dragon", "golf42", "m0nk3y"]
+    
+    def test_resume_from_state(self, wordlist, tmp_path):
+        """Test reanudar: los trozos terminados no se repiten"""
+        targets = {"md5": [hashlib.md5(b"hotel").hexdigest(), hashlib.md5(b"nothere").hexdigest()]}
+        first = HashCracker(targets, workers=1, chunk_size=256, state_dir=tmp_path / "state")
+        first.crack_wordlist(wordlist)
+        
+        second = HashCracker(targets, workers=1, chunk_size=256, state_dir=tmp_path / "state")
+        found = second.crack_wordlist(wordlist)
+        
+        assert list(found.values()) == ["hotel"]
+        assert second.tested == first.tested
+    
+    def test_early_stop(self):
+        """Test parar en cuanto todos los digests tienen texto"""
+        cracker = HashCracker({"md5": [hashlib.md5(b"0042").hexdigest()]}, workers=1, chunk_size=16)
+        
+        assert cracker.crack_mask("?d?d?d?d") == {hashlib.md5(b"0042").hexdigest(): "0042"}
+        assert cracker.tested < 10000
+
+
+class TestLookupTables:
+    """Tests para las tablas precalculadas"""
+    
+    def test_build_and_lookup(self, tmp_path):
+        """Test tabla de PINs con prefijo corto: aciertos verificados y fallos"""
+        tables = LookupTables(tmp_path, disk_budget=1 << 20)
+        path = tables.build("sha1", "pin4", prefix_bytes=2, workers=2)
+        
+        assert path.stat().st_size < 1 << 20
+        assert tables.lookup("sha1", hashlib.sha1(b"0000").hexdigest()) == "0000"
+        assert tables.lookup("sha1", hashlib.sha1(b"7319").hexdigest()) == "7319"
+        assert tables.lookup("sha1", hashlib.sha1(b"12345").hexdigest()) is None
+        assert tables.lookup("md5", hashlib.md5(b"7319").hexdigest()) is None
+        assert [t["domain"] for t in tables.list()] == ["pin4"]
+    
+    def test_disk_budget(self, tmp_path):
+        """Test rechazo de tablas que superan el presupuesto"""
+        tables = LookupTables(tmp_path, disk_budget=1 << 16)
+        
+        with pytest.raises(ValueError):
+            tables.build("md5", "pin6")
+        assert tables.tables() == []
+
+
+class TestHashCrackingPlugin:
+    """Tests para HashCrackingPlugin"""
+    
+    @pytest.fixture
+    def plugin(self, tmp_path):
+        plugin = HashCrackingPlugin()
+        plugin.state_dir = tmp_path / "state"
+        plugin.wordlists = []
+        plugin.wordlist_dir = tmp_path / "none"
+        plugin.lookup_tables = LookupTables(tmp_path / "tables", disk_budget=8 << 20)
+        return plugin
+    
+    def _challenge(self, tmp_path, files):
+        infos = []
+        for name, content in files.items():
+            path = tmp_path / name
+            path.write_text(content)
+            infos.append(FileInfo(path=path, size=path.stat().st_size))
+        return ChallengeData(
+            id="hash_test",
+            name="Hash Test",
+            challenge_type=ChallengeType.BASIC_CRYPTO,
+            files=infos
+        )
+    
+    def test_wordlist_technique(self, plugin, tmp_path):
+        """Test diccionario del reto con reglas"""
+        digest = hashlib.sha1(b"Charlie7").hexdigest()
+        challenge = self._challenge(tmp_path, {
+            "task.txt": f"password hash (sha1): {digest}\n",
+            "wordlist.txt": "\n".join(WORDS)
+        })
+        
+        assert plugin.can_solve(challenge) > 0.5
+        result = plugin.solve(challenge)
+        
+        assert result.success is True
+        assert result.method_used == "hash_cracking:wordlist"
+        assert result.details['cracked'] == {digest: "Charlie7"}
+    
+    def test_mask_technique_flag(self, plugin, tmp_path):
+        """Test máscara del reto que contiene la flag"""
+        digest = hashlib.md5(b"CTF{pin_4821}").hexdigest()
+        challenge = self._challenge(tmp_path, {"task.txt": f"md5 = {digest}\nmask = CTF{{pin_?d?d?d?d}}\n"})
+        
+        result = plugin._try_mask(challenge)
+        
+        assert result.success is True
+        assert result.flag == "CTF{pin_4821}"
+    
+    def test_lookup_table_technique(self, plugin, tmp_path):
+        """Test digest resuelto con una tabla de fechas antes que el diccionario"""
+        plugin.lookup_tables.build("md5", "dates", prefix_bytes=4, workers=1)
+        digest = hashlib.md5(b"1987-12-24").hexdigest()
+        challenge = self._challenge(tmp_path, {"task.txt": f"md5(birthday) = {digest}\n"})
+        
+        result = plugin.solve(challenge)
+        
+        assert result.success is True
+        assert result.method_used == "hash_cracking:lookup_table"
+        assert result.details['cracked'] == {digest: "1987-12-24"}
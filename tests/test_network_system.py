@@ -4,14 +4,23 @@ Tests para el sistema de red (NetworkConnector y NetworkPlugin)
 
 import pytest
 import asyncio
+import re
 import socket
 import threading
 import time
 from unittest.mock import Mock, patch, AsyncMock
 
-from src.core.network_connector import NetworkConnector, NetworkResponse, NetworkSession
+from src.core.network_connector import ConnectionPool, NetworkConnector, NetworkResponse, NetworkSession
 from src.plugins.network.plugin import NetworkPlugin
+from src.plugins.network.rsa_oracle import (
+    PipelinedRSAOracle, BleichenbacherAttack, parity_oracle_attack, pkcs1_v15_unpad
+)
+from src.plugins.network.length_extension import MerkleDamgard, forge, submit_forgeries
+from src.core.pipelined_connection import PipelinedConnection
+from src.core.attack_state import AttackStateStore
 from src.models.data import ChallengeData, NetworkInfo, ChallengeType
+from src.models.exceptions import NetworkConnectionError
+from tests.datasets.local_oracles import LocalMACServer, LocalRSAOracle, LocalRSAOracleServer
 
 
 class MockTCPServer:
@@ -271,6 +280,156 @@ class TestNetworkConnector:
         assert info['port'] == 1234
 
 
+class TestNetworkSession:
+    """Tests para el búfer de recepción de NetworkSession (recv_until, recv_line...)"""
+    
+    async def _session(self, handler):
+        server = await asyncio.start_server(handler, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        network_info = NetworkInfo(host="127.0.0.1", port=port, protocol="tcp", timeout=5)
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        session = NetworkSession(connection_id="tube", network_info=network_info,
+                                 reader=reader, writer=writer, connected=True)
+        return server, session
+    
+    @pytest.mark.asyncio
+    async def test_split_segments_and_leftover(self):
+        """Test respuestas partidas en segmentos y datos de más conservados en el búfer"""
+        async def handler(reader, writer):
+            for part in (b"Wel", b"come\nName", b": "):
+                writer.write(part)
+                await writer.drain()
+                await asyncio.sleep(0.02)
+            name = await reader.readline()
+            writer.write(b"Hi " + name.strip() + b"\n" + b"x" * 10000 + b"\nEND> ")
+            await writer.drain()
+        
+        server, session = await self._session(handler)
+        try:
+            assert await session.recv_line() == b"Welcome\n"
+            assert await session.send_line_after(b": ", "alice") == b"Name: "
+            assert await session.recv_line(keepends=False) == b"Hi alice"
+            assert await session.recv_exact(10000) == b"x" * 10000
+            assert await session.recv_until(re.compile(rb"[A-Z]+> "), drop=True) == b"\n"
+            assert session.buffered == 0
+        finally:
+            await session.close()
+            server.close()
+    
+    @pytest.mark.asyncio
+    async def test_recv_response_and_timeout(self):
+        """Test respuesta cerrada por un prompt y timeout sin perder lo recibido"""
+        async def handler(reader, writer):
+            writer.write(b"1. Flag\n2. Exit\nChoice: ")
+            await writer.drain()
+            await reader.read()
+        
+        server, session = await self._session(handler)
+        try:
+            assert await session.recv_response() == b"1. Flag\n2. Exit\nChoice: "
+            with pytest.raises(NetworkConnectionError):
+                await session.recv_until(b"never", timeout=0.1)
+            assert session.connected is True
+        finally:
+            await session.close()
+            server.close()
+
+
+class TestConnectionPool:
+    """Tests para el pool de sesiones precalentadas de NetworkConnector"""
+    
+    async def _server(self, banner=b"Welcome!\n> "):
+        accepted = []
+        
+        async def handler(reader, writer):
+            accepted.append(writer)
+            writer.write(banner)
+            await writer.drain()
+            while line := await reader.readline():
+                writer.write(b"echo " + line + b"> ")
+                await writer.drain()
+        
+        server = await asyncio.start_server(handler, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        return server, NetworkInfo(host="127.0.0.1", port=port, protocol="tcp", timeout=5), accepted
+    
+    @pytest.mark.asyncio
+    async def test_prewarmed_session_has_banner(self):
+        """Test connect() entrega una sesión abierta de antemano con el banner ya recibido"""
+        server, network_info, accepted = await self._server()
+        connector = NetworkConnector()
+        try:
+            assert await connector.test_connection(network_info) is True
+            assert len(accepted) == 1
+            connector.prewarm(network_info, 2)
+            
+            connection_id = await connector.connect(network_info)
+            session = connector.get_session(connection_id)
+            assert session.banner == b"Welcome!\n> "
+            assert await session.recv_until(b"> ") == b"Welcome!\n> "
+            
+            response = await connector.send_data(connection_id, "hi\n", until="> ")
+            assert response.data == b"echo hi\n> "
+            
+            pool = connector.get_pool(network_info)
+            await connector.disconnect(connection_id)
+            await asyncio.sleep(0.1)
+            assert pool.stats['reused'] == 1
+            assert pool.idle == 2
+            assert len(accepted) == 3
+        finally:
+            connector.close_pool(network_info)
+            server.close()
+    
+    @pytest.mark.asyncio
+    async def test_max_size_and_unhealthy_sessions(self):
+        """Test acquire espera con el límite alcanzado y descarta sesiones cerradas por el servidor"""
+        server, network_info, accepted = await self._server()
+        connector = NetworkConnector()
+        pool = ConnectionPool(network_info, lambda: connector._connect_tcp(network_info, "pool"),
+                              max_size=2, banner_timeout=0.5)
+        try:
+            first, second = await pool.acquire(), await pool.acquire()
+            waiting = asyncio.ensure_future(pool.acquire())
+            await asyncio.sleep(0.1)
+            assert not waiting.done()
+            
+            await pool.release(first)
+            third = await asyncio.wait_for(waiting, 2)
+            assert len(accepted) == 3
+            
+            pool.prewarm(1)
+            await pool.release(second)
+            await asyncio.sleep(0.2)
+            assert pool.idle == 1
+            accepted[-1].close()  # El servidor cierra la sesión libre
+            await asyncio.sleep(0.1)
+            await pool.release(third)
+            
+            fresh = await pool.acquire()
+            assert fresh.healthy
+            assert pool.stats['discarded'] >= 1
+            await pool.release(fresh)
+        finally:
+            pool.close()
+            server.close()
+    
+    @pytest.mark.asyncio
+    async def test_failed_prewarm_does_not_block_connect(self):
+        """Test connect() tras un precalentamiento rechazado falla en vez de quedarse esperando"""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        network_info = NetworkInfo(host="127.0.0.1", port=port, protocol="tcp", timeout=2)
+        connector = NetworkConnector()
+        try:
+            connector.prewarm(network_info, 1)
+            with pytest.raises(NetworkConnectionError):
+                await asyncio.wait_for(connector.connect(network_info), 5)
+            assert connector.get_pool(network_info).last_error is not None
+        finally:
+            connector.close_pool(network_info)
+
 class TestNetworkPlugin:
     """Tests para NetworkPlugin"""
     
@@ -481,5 +640,249 @@ class TestNetworkPlugin:
         assert "Ninguna estrategia fue exitosa" in result.error_message
 
 
+def _small_rsa_key(bits):
+    """Clave RSA pequeña para tests rápidos"""
+    from Crypto.Util.number import getPrime
+    e = 65537
+    while True:
+        p, q = getPrime(bits // 2), getPrime(bits // 2)
+        phi = (p - 1) * (q - 1)
+        if p != q and phi % e:
+            return p * q, e, pow(e, -1, phi)
+
+
+class TestRSAOracleAttacks:
+    """Tests para ataques a oráculos RSA con consultas pipelined"""
+    
+    @pytest.mark.asyncio
+    async def test_parity_oracle_pipelined(self):
+        """Test ataque de paridad contra servidor local"""
+        n, e, d = _small_rsa_key(512)
+        m = int.from_bytes(b"CTF{lsb_oracle}", 'big')
+        c = pow(m, e, n)
+        
+        server = LocalRSAOracleServer(n, d, kind="parity")
+        port = await server.start()
+        try:
+            async with PipelinedConnection("127.0.0.1", port, window=64) as connection:
+                assert b"oracle" in connection.banner
+                oracle = PipelinedRSAOracle(connection)
+                recovered = await parity_oracle_attack(oracle, n, e, c)
+        finally:
+            await server.stop()
+        
+        assert recovered == m
+        assert oracle.queries == n.bit_length()
+    
+    @pytest.mark.asyncio
+    async def test_pipelining_throughput(self):
+        """Test que la ventana amortiza la latencia por consulta"""
+        n, e, d = _small_rsa_key(256)
+        server = LocalRSAOracleServer(n, d, kind="parity", latency=0.01)
+        port = await server.start()
+        payloads = [format(pow(i, e, n), 'x').encode() for i in range(2, 66)]
+        
+        try:
+            elapsed = {}
+            for window in (1, 32):
+                async with PipelinedConnection("127.0.0.1", port, window=window) as connection:
+                    start = time.time()
+                    responses = await connection.request_many(payloads)
+                    elapsed[window] = time.time() - start
+                # El orden FIFO se conserva independientemente de la ventana
+                assert responses == [b"even\n" if i % 2 == 0 else b"odd\n" for i in range(2, 66)]
+        finally:
+            await server.stop()
+        
+        assert elapsed[32] * 3 < elapsed[1]
+    
+    @pytest.mark.asyncio
+    async def test_bleichenbacher_local_oracle(self):
+        """Test Bleichenbacher con oráculo PKCS#1 v1.5 en proceso"""
+        n, e, d = _small_rsa_key(256)
+        k = (n.bit_length() + 7) // 8
+        message = b"CTF{b98}"
+        padded = b"\x00\x02" + bytes([0x5a] * (k - 3 - len(message))) + b"\x00" + message
+        c = pow(int.from_bytes(padded, 'big'), e, n)
+        
+        attack = BleichenbacherAttack(LocalRSAOracle(n, d, kind="pkcs1"), n, e, window=16)
+        m = await attack.run(c)
+        
+        assert pkcs1_v15_unpad(m, k) == message
+    
+    @pytest.mark.asyncio
+    async def test_bleichenbacher_resume(self, tmp_path):
+        """Test Bleichenbacher retoma s, intervalos y cursor tras una desconexión"""
+        n, e, d = _small_rsa_key(256)
+        k = (n.bit_length() + 7) // 8
+        message = b"CTF{resume}"
+        padded = b"\x00\x02" + bytes([0x5a] * (k - 3 - len(message))) + b"\x00" + message
+        c = pow(int.from_bytes(padded, 'big'), e, n)
+        
+        full = BleichenbacherAttack(LocalRSAOracle(n, d, kind="pkcs1"), n, e, window=16)
+        await full.run(c)
+        
+        class DroppingOracle(LocalRSAOracle):
+            async def query_many(self, ciphertexts):
+                if self.queries + len(ciphertexts) > full.oracle.queries // 2:
+                    raise ConnectionError("Conexión cerrada por el servidor")
+                return await super().query_many(ciphertexts)
+        
+        with AttackStateStore(tmp_path / "state.sqlite") as state:
+            with pytest.raises(ConnectionError):
+                await BleichenbacherAttack(DroppingOracle(n, d, kind="pkcs1"), n, e, window=16, state=state).run(c)
+            
+            resumed = BleichenbacherAttack(LocalRSAOracle(n, d, kind="pkcs1"), n, e, window=16, state=state)
+            assert pkcs1_v15_unpad(await resumed.run(c), k) == message
+            assert resumed.oracle.queries <= full.oracle.queries - full.oracle.queries // 2 + 16
+    
+    @pytest.mark.asyncio
+    async def test_strategy_rsa_oracle_pooled_session(self):
+        """Test estrategia de paridad sobre una sesión precalentada, sin conexiones extra"""
+        n, e, d = _small_rsa_key(256)
+        c = pow(int.from_bytes(b"CTF{pooled}", 'big'), e, n)
+        banner = f"Parity oracle: send c, get odd/even\nn = {n}\ne = {e}\nc = {c}\n".encode()
+        server = LocalRSAOracleServer(n, d, kind="parity", banner=banner)
+        port = await server.start()
+        network_info = NetworkInfo(host="127.0.0.1", port=port)
+        challenge = ChallengeData(id="rsa", name="RSA oracle", challenge_type=ChallengeType.NETWORK,
+                                  network_info=network_info)
+        plugin = NetworkPlugin()
+        plugin.state_dir = None
+        try:
+            plugin.network_connector.prewarm(network_info, 1)
+            connection_id = await plugin.network_connector.connect(network_info)
+            assert plugin.network_connector.get_session(connection_id).banner == banner
+            result = await plugin._strategy_rsa_oracle(connection_id, challenge)
+            await plugin.network_connector.disconnect(connection_id)
+        finally:
+            plugin.network_connector.close_pool(network_info)
+            await server.stop()
+        
+        assert result.success is True
+        assert result.flag == "CTF{pooled}"
+        assert server.connections <= plugin.network_connector.max_connections_per_host
+    
+    @pytest.mark.asyncio
+    async def test_strategy_rsa_oracle_late_banner(self):
+        """Test que los trozos tardíos del banner no desplazan las respuestas del oráculo"""
+        n, e, d = _small_rsa_key(256)
+        c = pow(int.from_bytes(b"CTF{late}", 'big'), e, n)
+        banner = f"Parity oracle: send c, get odd/even\nn = {n}\ne = {e}\nc = {c}\n".encode()
+        server = LocalRSAOracleServer(n, d, kind="parity", banner=banner, banner_gap=0.1)
+        port = await server.start()
+        network_info = NetworkInfo(host="127.0.0.1", port=port)
+        challenge = ChallengeData(id="rsa", name="RSA oracle", challenge_type=ChallengeType.NETWORK,
+                                  network_info=network_info)
+        plugin = NetworkPlugin()
+        plugin.state_dir = None
+        try:
+            connection_id = await plugin.network_connector.connect(network_info)
+            result = await plugin._strategy_rsa_oracle(connection_id, challenge)
+            await plugin.network_connector.disconnect(connection_id)
+        finally:
+            plugin.network_connector.close_pool(network_info)
+            await server.stop()
+        
+        assert result.success is True
+        assert result.flag == "CTF{late}"
+    
+    @pytest.mark.asyncio
+    async def test_strategy_rsa_oracle_gated_on_banner(self):
+        """Test que la estrategia no consulta servicios cuyo banner no es un oráculo RSA"""
+        server = LocalMACServer(b"secret")
+        port = await server.start()
+        network_info = NetworkInfo(host="127.0.0.1", port=port)
+        challenge = ChallengeData(id="mac", name="MAC", challenge_type=ChallengeType.NETWORK,
+                                  network_info=network_info)
+        plugin = NetworkPlugin()
+        try:
+            connection_id = await plugin.network_connector.connect(network_info)
+            result = await plugin._strategy_rsa_oracle(connection_id, challenge)
+            await plugin.network_connector.disconnect(connection_id)
+        finally:
+            plugin.network_connector.close_pool(network_info)
+            await server.stop()
+        
+        assert result.success is False
+        assert server.connections == 1
+        assert server.queries == 0
+    
+    def test_extract_rsa_oracle_params(self):
+        """Test extracción de parámetros y tipo de oráculo"""
+        plugin = NetworkPlugin()
+        banner = "Parity oracle\nn = 0xc5\ne: 3\nc = 42\nSend ciphertext in hex"
+        
+        assert plugin._extract_rsa_oracle_params(banner) == {'n': 0xc5, 'e': 3, 'c': 42}
+        assert plugin._detect_rsa_oracle_kind(banner) == 'parity'
+        assert plugin._detect_rsa_oracle_kind("PKCS#1 padding check") == 'bleichenbacher'
+        assert plugin._detect_rsa_oracle_kind("hello") is None
+        # Palabras sueltas de banners corrientes no delatan un oráculo
+        assert plugin._detect_rsa_oracle_kind("Even numbers only! Add padding to your odd input") is None
+
+
+
+class TestLengthExtension:
+    """Tests para la extensión de longitud de MACs H(secreto || mensaje)"""
+    
+    @pytest.mark.parametrize("algorithm", ["md5", "sha1", "sha256", "sha512"])
+    def test_matches_hashlib_and_forges(self, algorithm):
+        """Test compresión igual a hashlib y falsificación válida por longitud"""
+        import hashlib
+        for size in (0, 55, 56, 64, 111, 112, 200):
+            data = bytes(range(256))[:size]
+            assert MerkleDamgard(algorithm).update(data).hexdigest() == hashlib.new(algorithm, data).hexdigest()
+        
+        secret, message = b"k" * 13, b"user=guest"
+        forgeries = forge(algorithm, hashlib.new(algorithm, secret + message).digest(), message, b";admin=true",
+                          range(1, 33))
+        
+        assert [f.secret_length for f in forgeries] == list(range(1, 33))
+        forged = forgeries[12]
+        assert forged.message.startswith(message) and forged.message.endswith(b";admin=true")
+        assert hashlib.new(algorithm, secret + forged.message).digest() == forged.digest
+    
+    @pytest.mark.asyncio
+    async def test_pipelined_submission(self):
+        """Test lote de falsificaciones enviado por una sola conexión pipelined"""
+        server = LocalMACServer(b"s3cr3t-k3y", algorithm="sha1")
+        port = await server.start()
+        try:
+            async with PipelinedConnection("127.0.0.1", port, window=32) as connection:
+                params = NetworkPlugin()._extract_mac_params(connection.banner.decode())
+                forgeries = forge("sha1", bytes.fromhex(params['mac']), params['message'], b";admin=true")
+                results = await submit_forgeries(connection, forgeries)
+        finally:
+            await server.stop()
+        
+        accepted = [forged.secret_length for forged, response in results if b"CTF{" in response]
+        assert accepted == [10]
+        assert server.queries == 64
+    
+    @pytest.mark.asyncio
+    async def test_strategy_length_extension(self):
+        """Test estrategia completa del plugin contra el servidor local"""
+        server = LocalMACServer(b"another secret", algorithm="sha256", flag=b"CTF{md_extended}")
+        port = await server.start()
+        challenge = ChallengeData(
+            id="lext", name="Length extension", challenge_type=ChallengeType.NETWORK,
+            network_info=NetworkInfo(host="127.0.0.1", port=port)
+        )
+        plugin = NetworkPlugin()
+        try:
+            connection_id = await plugin.network_connector.connect(challenge.network_info)
+            result = await plugin._strategy_length_extension(connection_id, challenge)
+            await plugin.network_connector.disconnect(connection_id)
+        finally:
+            plugin.network_connector.close_pool(challenge.network_info)
+            await server.stop()
+        
+        assert result.success is True
+        assert result.flag == "CTF{md_extended}"
+        assert result.details['secret_length'] == 14
+        # Las falsificaciones viajan por la sesión del pool
+        assert server.connections == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
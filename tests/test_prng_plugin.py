@@ -0,0 +1,219 @@
+"""
+Tests para PRNG Plugin
+"""
+
+import json
+import random
+
+import numpy as np
+import pytest
+
+from src.plugins.prng.plugin import PRNGPlugin
+from src.plugins.prng.mt19937 import MT19937, PartialMTSolver, temper, untemper
+from src.plugins.prng.lcg import LCG, recover_lcg, recover_truncated_state
+from src.plugins.prng.gf2 import GF2Matrix, GF2Solver
+from src.plugins.prng.lfsr import LFSR, berlekamp_massey, recover_state
+from src.models.data import ChallengeData, ChallengeType, FileInfo
+
+
+FLAG = b"CTF{predictable_randomness}"
+
+
+class TestMT19937:
+    """Tests para la recuperación del estado de MT19937"""
+    
+    def test_untemper(self):
+        """Test el templado se invierte para cualquier palabra"""
+        rng = random.Random(1)
+        for _ in range(100):
+            word = rng.getrandbits(32)
+            assert untemper(temper(word)) == word
+    
+    def test_full_state_recovery(self):
+        """Test 624 salidas predicen las siguientes y rebobinan las anteriores"""
+        rng = random.Random(1234)
+        before = [rng.getrandbits(32) for _ in range(10)]
+        outputs = [rng.getrandbits(32) for _ in range(624)]
+        after = [rng.getrandbits(32) for _ in range(1000)]
+        
+        generator = MT19937.from_outputs(outputs)
+        clone = generator.to_random()
+        
+        assert [int(x) for x in generator.generate(1000)] == after
+        assert [clone.getrandbits(32) for _ in range(5)] == after[:5]
+        
+        generator = MT19937.from_outputs(outputs)
+        assert [int(x) for x in generator.rewind(624 + 10)][:10] == before
+    
+    def test_partial_outputs(self):
+        """Test getrandbits(8): sistema GF(2) sobre los bits del estado"""
+        rng = random.Random(99)
+        outputs = [rng.getrandbits(8) for _ in range(2600)]
+        solver = PartialMTSolver()
+        for value in outputs:
+            solver.add_getrandbits(value, 8)
+        
+        generator = solver.solve()
+        generator.generate(len(outputs))
+        rng_clone = generator.to_random()
+        assert [rng_clone.getrandbits(32) for _ in range(10)] == [rng.getrandbits(32) for _ in range(10)]
+
+
+class TestLCG:
+    """Tests para los solvers de LCG"""
+    
+    def test_recover_parameters(self):
+        """Test m por mcd de determinantes, luego a y c"""
+        m, a, c = 2 ** 61 - 1, 0x5DEECE66D, 11
+        generator = LCG(m, a, c, 42)
+        outputs = generator.next_many(8)
+        
+        recovered = recover_lcg(outputs)
+        assert (recovered.m, recovered.a, recovered.c) == (m, a, c)
+        assert recovered.next_many(5) == generator.next_many(5)
+    
+    def test_jump_and_rewind(self):
+        """Test saltos en O(log k) hacia delante y hacia atrás"""
+        generator = LCG(2 ** 32, 1664525, 1013904223, 7)
+        states = generator.next_many(100)
+        
+        jumper = LCG(2 ** 32, 1664525, 1013904223, states[0])
+        assert jumper.jump(99) == states[99]
+        assert jumper.jump(-50) == states[49]
+        assert LCG(2 ** 32, 1664525, 1013904223, states[10]).previous_many(3) == states[7:10]
+    
+    def test_truncated_state(self):
+        """Test bits altos de un LCG de 64 bits por reducción de retículo"""
+        m, a, c = 2 ** 64, 6364136223846793005, 1442695040888963407
+        generator = LCG(m, a, c, 0xDEADBEEFCAFEBABE)
+        states = generator.next_many(8)
+        
+        recovered = recover_truncated_state([x >> 32 for x in states], 32, m, a, c)
+        assert recovered.state == states[-1]
+
+
+class TestGF2Matrix:
+    """Tests para el álgebra lineal sobre GF(2)"""
+    
+    def test_rref_nullspace_solve(self):
+        """Test rango, núcleo y solución frente a la matriz densa"""
+        rng = np.random.default_rng(7)
+        dense = rng.integers(0, 2, (150, 200), dtype=np.uint8)
+        dense[100:] = dense[:50] ^ dense[50:100]  # 50 filas dependientes
+        matrix = GF2Matrix.from_dense(dense)
+        
+        reduced, pivots = matrix.rref()
+        assert len(pivots) == matrix.rank() == 100
+        assert (reduced.to_dense()[:100][:, pivots] == np.eye(100, dtype=np.uint8)).all()
+        
+        kernel = matrix.nullspace()
+        assert kernel.shape == (100, 200)
+        assert not ((dense.astype(int) @ kernel.to_dense().T.astype(int)) % 2).any()
+        
+        x = rng.integers(0, 2, 200, dtype=np.uint8)
+        b = matrix @ x
+        assert (matrix @ matrix.solve(b) == b).all()
+        
+        b[120] ^= 1
+        assert matrix.solve(b) is None
+    
+    def test_streaming_solver(self):
+        """Test GF2Solver descarta dependientes al vuelo y coincide con la matriz"""
+        rng = np.random.default_rng(11)
+        dense = rng.integers(0, 2, (90, 64), dtype=np.uint8)
+        dense[80:] = dense[:10] ^ dense[10:20]
+        matrix = GF2Matrix.from_dense(dense)
+        b = matrix @ rng.integers(0, 2, 64, dtype=np.uint8)
+        
+        solver = GF2Solver(64)
+        added = [solver.add(matrix.row_int(i), int(b[i])) for i in range(90)]
+        assert solver.rank == matrix.rank() == sum(added)
+        x = solver.solve()
+        assert (matrix @ [(x >> j) & 1 for j in range(64)] == b).all()
+        
+        with pytest.raises(ValueError):
+            solver.add(matrix.row_int(85), int(b[85]) ^ 1)
+
+
+class TestLFSR:
+    """Tests para Berlekamp-Massey y la recuperación de estado"""
+    
+    def test_berlekamp_massey(self):
+        """Test tomas y estado a partir de 2L bits"""
+        connection = 1 | (1 << 5) | (1 << 23)
+        generator = LFSR(23, connection, [1, 0, 1, 1] * 6)
+        bits = generator.generate(300)
+        
+        assert berlekamp_massey(bits) == (23, connection)
+        recovered = LFSR.from_keystream(bits[:46])
+        assert recovered.tap_positions == [5, 23]
+        assert recovered.generate(300) == bits
+    
+    def test_known_taps_sparse_bits(self):
+        """Test estado con tomas conocidas y bits no consecutivos"""
+        generator = LFSR(40, 1 | (1 << 19) | (1 << 40), [1] * 40)
+        bits = generator.generate(500)
+        observed = {t: bits[t] for t in range(0, 500, 7)}
+        
+        assert recover_state(40, [19, 40], observed).generate(500) == bits
+
+
+class TestPRNGPlugin:
+    """Tests para PRNGPlugin"""
+    
+    @pytest.fixture
+    def plugin(self):
+        return PRNGPlugin()
+    
+    def _challenge(self, path):
+        return ChallengeData(
+            id="prng_test", name="PRNG Test", challenge_type=ChallengeType.BASIC_CRYPTO,
+            files=[FileInfo(path=path, size=path.stat().st_size)]
+        )
+    
+    def test_mt19937_keystream(self, plugin, tmp_path):
+        """Test flag cifrada con randbytes tras 624 salidas publicadas"""
+        rng = random.Random(2024)
+        outputs = [rng.getrandbits(32) for _ in range(624)]
+        ciphertext = bytes(x ^ k for x, k in zip(FLAG, rng.randbytes(len(FLAG))))
+        path = tmp_path / "random_outputs.json"
+        path.write_text(json.dumps({'outputs': outputs, 'ciphertext': ciphertext.hex()}))
+        challenge = self._challenge(path)
+        
+        assert plugin.can_solve(challenge) > 0.5
+        result = plugin.solve(challenge)
+        
+        assert result.success is True
+        assert result.flag == FLAG.decode()
+        assert result.method_used == "prng:mt19937"
+        assert result.details['keystream'] == "randbytes_after"
+    
+    def test_lcg_key_before_outputs(self, plugin, tmp_path):
+        """Test clave sacada del LCG antes de las salidas: se rebobina"""
+        generator = LCG(2 ** 31 - 1, 48271, 12345, 2024)
+        keystream = bytes(x & 0xff for x in generator.next_many(len(FLAG)))
+        outputs = generator.next_many(6)
+        ciphertext = bytes(x ^ k for x, k in zip(FLAG, keystream))
+        path = tmp_path / "lcg.txt"
+        path.write_text("\n".join(map(str, outputs)) + f"\nciphertext = {ciphertext.hex()}\n")
+        
+        result = plugin.solve(self._challenge(path))
+        
+        assert result.success is True
+        assert result.flag == FLAG.decode()
+        assert result.method_used == "prng:lcg"
+        assert result.details['keystream'] == "low_byte_before"
+    
+    def test_lfsr_known_prefix(self, plugin, tmp_path):
+        """Test keystream de LFSR recuperado del prefijo CTF{ por Berlekamp-Massey"""
+        generator = LFSR(15, 1 | (1 << 14) | (1 << 15), [0, 1] * 8)
+        ciphertext = bytes(x ^ k for x, k in zip(FLAG, generator.keystream(len(FLAG))))
+        path = tmp_path / "lfsr_output.txt"
+        path.write_text(f"ciphertext = {ciphertext.hex()}\n")
+        
+        result = plugin.solve(self._challenge(path))
+        
+        assert result.success is True
+        assert result.flag == FLAG.decode()
+        assert result.method_used == "prng:lfsr"
+        assert result.details['taps'] == [14, 15]
\ No newline at end of file
@@ -2,14 +2,17 @@
 Tests para RSA Plugin
 """
 
+import math
 import pytest
 import tempfile
 import json
 from pathlib import Path
 from Crypto.PublicKey import RSA
-from Crypto.Util.number import bytes_to_long, long_to_bytes
+from Crypto.Util.number import bytes_to_long, long_to_bytes, getPrime
 
 from src.plugins.rsa.plugin import RSAPlugin
+from src.plugins.rsa.modular_roots import ModularRoots
+from src.plugins.rsa.rsa_math import RSAMath
 from src.models.data import ChallengeData, ChallengeType, FileInfo
 
 
@@ -171,6 +174,11 @@ class TestRSAPlugin:
             assert 1 < factor < n
             assert n % factor == 0
     
+    def test_factorize_small_semiprime_repeatedly(self):
+        """Test que factorize siempre separa un semiprimo de dos primos de ~14 bits"""
+        for _ in range(2000):
+            assert RSAMath.factorize(12037 * 18517) == [12037, 18517]
+    
     def test_fermat_factorize(self, plugin):
         """Test factorización de Fermat"""
         # Usar factores cercanos
@@ -377,6 +385,72 @@ class TestRSAPlugin:
         assert result.success is False
         assert "demasiado grande" in result.error_message
 
+    
+    def test_rabin_decryption(self, plugin, temp_file_with_content):
+        """Test descifrado Rabin (e=2) con factores conocidos"""
+        p, q = getPrime(128), getPrime(128)
+        m = bytes_to_long(b"CTF{rabin_roots}")
+        params = {'n': p * q, 'e': 2, 'c': pow(m, 2, p * q), 'p': p, 'q': q}
+        
+        file_path = temp_file_with_content(json.dumps(params))
+        file_info = FileInfo(path=file_path, size=100, mime_type="text/plain")
+        challenge = ChallengeData(id="test", name="Test", files=[file_info])
+        
+        result = plugin._try_weak_keys(challenge)
+        assert result.success is True
+        assert result.flag == "CTF{rabin_roots}"
+        assert result.details['candidates_total'] == 4
+    
+    def test_decrypt_with_factors_e_not_coprime(self, plugin):
+        """Test descifrado cuando gcd(e, φ) > 1"""
+        e = 3
+        while True:
+            p, q = getPrime(96), getPrime(96)
+            if (p - 1) % e == 0 and (q - 1) % e == 0:
+                break
+        
+        m = bytes_to_long(b"flag{amm_3}")
+        params = {'n': p * q, 'e': e, 'c': pow(m, e, p * q)}
+        
+        result = plugin._decrypt_with_factors(params, p, q)
+        assert result.success is True
+        assert result.flag == "flag{amm_3}"
+        assert result.details['candidates_total'] == 9
+
+
+class TestModularRoots:
+    """Tests para ModularRoots"""
+    
+    def test_tonelli_shanks_and_cipolla(self):
+        """Test raíces cuadradas con ambos algoritmos"""
+        p = 998244353  # p - 1 = 119 * 2^23
+        for a in [2, 12345, 998244352]:
+            square = a * a % p
+            assert ModularRoots.tonelli_shanks(square, p) in (a, p - a)
+            assert ModularRoots.cipolla(square, p) in (a, p - a)
+        
+        assert ModularRoots.tonelli_shanks(3, p) is None  # 3 es no residuo
+    
+    def test_amm_roots(self):
+        """Test raíces e-ésimas con e | p-1"""
+        p = 998244353
+        for e in [7, 17, 49]:
+            x = 123456789
+            roots = ModularRoots.nth_roots_mod_prime(pow(x, e, p), e, p)
+            assert x in roots
+            assert len(roots) == math.gcd(e, p - 1)
+            assert all(pow(r, e, p) == pow(x, e, p) for r in roots)
+    
+    def test_crt_candidates_are_lazy(self):
+        """Test enumeración perezosa de candidatos CRT"""
+        root_sets = {7: [1, 6], 11: [1, 10], 13: [1, 12]}
+        candidates = ModularRoots.crt_candidates(root_sets)
+        
+        assert iter(candidates) is candidates
+        values = list(candidates)
+        assert len(values) == ModularRoots.count_candidates(root_sets) == 8
+        assert all(pow(v, 2, 1001) == 1 for v in values)
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file